@@ -20,6 +20,11 @@ from .state_utils import (
     get_attributes_for_entity,
     has_entity,
 )
+from .schema_index import (
+    SchemaIndex,
+    ForeignKeyRecord,
+    get_schema_index,
+)
 
 __all__ = [
     "GenerationState",
@@ -38,5 +43,8 @@ __all__ = [
     "get_entity_names",
     "get_attributes_for_entity",
     "has_entity",
+    "SchemaIndex",
+    "ForeignKeyRecord",
+    "get_schema_index",
 ]
 
@@ -0,0 +1,222 @@
+"""Indexed view of the schema held in an IRGenerationState.
+
+The pipeline state keeps entities, attributes and foreign keys as lists of dicts
+(or pydantic models). Looking up "does entity X have attribute Y" in that shape
+means a linear scan with `isinstance(x, dict)` / `getattr` fallbacks, which gates
+and validators used to repeat for every check. `SchemaIndex` builds the lookups
+once:
+
+- entity names are interned and mapped to dense ids (exact and case-folded)
+- per-entity attribute name arrays plus exact and case-folded name sets
+- per-entity primary key tuples
+- foreign keys normalized to records, with outgoing/incoming adjacency by entity id
+
+`get_schema_index(state)` builds the index of a state. A gate or node builds it
+once and passes it down to the validators it calls; the next gate or node
+rebuilds it from the updated state, which is a single linear pass over the
+schema. Indexes are not cached at module level: that would share one index
+between runs with the same description and keep finished runs' states alive.
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+_EMPTY: Tuple[str, ...] = ()
+
+
+def item_field(item: Any, field: str, default: Any = None) -> Any:
+    """Field of a state item, which may be a dict or a pydantic model."""
+    if isinstance(item, dict):
+        return item.get(field, default)
+    return getattr(item, field, default)
+
+
+def item_name(item: Any) -> str:
+    """Name of a state item (dict or model), "" if missing."""
+    return item_field(item, "name") or ""
+
+
+@dataclass(frozen=True)
+class ForeignKeyRecord:
+    """Foreign key normalized from its state representation."""
+    from_entity: str
+    to_entity: str
+    from_attributes: Tuple[str, ...]
+    to_attributes: Tuple[str, ...]
+    source: Any  # Original FK item in the state
+
+
+class _AttributeSlot:
+    """Attribute names of one entity."""
+
+    __slots__ = ("names", "exact", "folded")
+
+    def __init__(self, attrs: Iterable[Any]):
+        names = []
+        for attr in attrs:
+            name = item_name(attr)
+            if name:
+                names.append(sys.intern(name))
+        self.names: Tuple[str, ...] = tuple(names)
+        self.exact: FrozenSet[str] = frozenset(self.names)
+        self.folded: FrozenSet[str] = frozenset(name.lower() for name in self.names)
+
+
+_NO_ATTRIBUTES = _AttributeSlot(())
+
+
+class SchemaIndex:
+    """
+    Compact, indexed schema: entities, attributes, primary keys and FK adjacency.
+
+    Entities are identified by dense ids in state order. All lookups are O(1)
+    (hash lookups) once the index is built.
+    """
+
+    def __init__(self):
+        self.entity_names: List[str] = []  # entity id -> name (distinct names, state order)
+        self._entity_ids: Dict[str, int] = {}
+        self._entity_ids_folded: Dict[str, int] = {}
+        self.duplicate_entity_names: List[str] = []  # Repeated names (exact or up to case)
+        self._attributes: Dict[str, _AttributeSlot] = {}
+        self._primary_keys: Dict[str, Tuple[str, ...]] = {}
+        self.foreign_keys: List[ForeignKeyRecord] = []
+        self._fks_out: Dict[str, List[int]] = {}
+        self._fks_in: Dict[str, List[int]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        entities: Optional[Sequence[Any]] = None,
+        attributes: Optional[Mapping[str, Sequence[Any]]] = None,
+        primary_keys: Optional[Mapping[str, Sequence[str]]] = None,
+        foreign_keys: Optional[Sequence[Any]] = None,
+    ) -> "SchemaIndex":
+        """Build an index from the individual state fields."""
+        index = cls()
+        index._index_entities(entities or [])
+        index._index_attributes(attributes or {})
+        index._primary_keys = {
+            sys.intern(entity_name): tuple(sys.intern(a) for a in (pk or []) if isinstance(a, str))
+            for entity_name, pk in (primary_keys or {}).items()
+        }
+        index._index_foreign_keys(foreign_keys or [])
+        return index
+
+    # Entities
+
+    def has_entity(self, name: str, case_sensitive: bool = True) -> bool:
+        if case_sensitive:
+            return name in self._entity_ids
+        return name.lower() in self._entity_ids_folded
+
+    def entity_id(self, name: str, case_sensitive: bool = True) -> Optional[int]:
+        if case_sensitive:
+            return self._entity_ids.get(name)
+        return self._entity_ids_folded.get(name.lower())
+
+    @property
+    def entity_name_set(self) -> FrozenSet[str]:
+        return frozenset(self._entity_ids)
+
+    # Attributes
+
+    @property
+    def attributed_entities(self) -> List[str]:
+        """Entities with an entry in state["attributes"] (in state order)."""
+        return list(self._attributes)
+
+    def attribute_names(self, entity: str) -> Tuple[str, ...]:
+        """Attribute names of an entity, in state order."""
+        return self._attributes.get(entity, _NO_ATTRIBUTES).names
+
+    def attribute_name_set(self, entity: str, case_sensitive: bool = True) -> FrozenSet[str]:
+        slot = self._attributes.get(entity, _NO_ATTRIBUTES)
+        return slot.exact if case_sensitive else slot.folded
+
+    def has_attribute(self, entity: str, attribute: str, case_sensitive: bool = True) -> bool:
+        slot = self._attributes.get(entity, _NO_ATTRIBUTES)
+        if case_sensitive:
+            return attribute in slot.exact
+        return attribute.lower() in slot.folded
+
+    # Keys
+
+    def primary_key(self, entity: str) -> Tuple[str, ...]:
+        return self._primary_keys.get(entity, _EMPTY)
+
+    def foreign_keys_from(self, entity: str) -> List[ForeignKeyRecord]:
+        return [self.foreign_keys[i] for i in self._fks_out.get(entity, ())]
+
+    def foreign_keys_to(self, entity: str) -> List[ForeignKeyRecord]:
+        return [self.foreign_keys[i] for i in self._fks_in.get(entity, ())]
+
+    # Indexing
+
+    def _index_entities(self, entities: Sequence[Any]):
+        self.entity_names = []
+        self._entity_ids = {}
+        self._entity_ids_folded = {}
+        self.duplicate_entity_names = []
+        for entity in entities:
+            name = item_name(entity)
+            if not name:
+                continue
+            if name in self._entity_ids:
+                self.duplicate_entity_names.append(name)
+                continue
+            name = sys.intern(name)
+            entity_id = len(self.entity_names)
+            self.entity_names.append(name)
+            self._entity_ids[name] = entity_id
+            folded = name.lower()
+            if folded in self._entity_ids_folded:
+                # Same name up to case: case-insensitive lookups resolve to the first one
+                self.duplicate_entity_names.append(name)
+            else:
+                self._entity_ids_folded[folded] = entity_id
+
+    def _index_attributes(self, attributes: Mapping[str, Sequence[Any]]):
+        self._attributes = {
+            sys.intern(entity_name): _AttributeSlot(attrs if isinstance(attrs, (list, tuple)) else ())
+            for entity_name, attrs in attributes.items()
+        }
+
+    def _index_foreign_keys(self, foreign_keys: Sequence[Any]):
+        self.foreign_keys = []
+        self._fks_out = {}
+        self._fks_in = {}
+        for fk in foreign_keys:
+            record = ForeignKeyRecord(
+                from_entity=sys.intern(item_field(fk, "from_entity") or ""),
+                to_entity=sys.intern(item_field(fk, "to_entity") or ""),
+                from_attributes=tuple(item_field(fk, "from_attributes") or item_field(fk, "attributes") or ()),
+                to_attributes=tuple(item_field(fk, "to_attributes") or ()),
+                source=fk,
+            )
+            fk_id = len(self.foreign_keys)
+            self.foreign_keys.append(record)
+            self._fks_out.setdefault(record.from_entity, []).append(fk_id)
+            self._fks_in.setdefault(record.to_entity, []).append(fk_id)
+
+
+def get_schema_index(state: Mapping[str, Any]) -> SchemaIndex:
+    """
+    Indexed schema of a pipeline state.
+
+    Build it once per gate or node and pass it down; the index is a snapshot of
+    the state it was built from and is rebuilt for the next gate or node.
+
+    Args:
+        state: IRGenerationState
+
+    Returns:
+        SchemaIndex reflecting the state's current entities, attributes, keys and FKs
+    """
+    return SchemaIndex.build(
+        entities=state.get("entities"),
+        attributes=state.get("attributes"),
+        primary_keys=state.get("primary_keys"),
+        foreign_keys=state.get("foreign_keys"),
+    )
@@ -0,0 +1,139 @@
+"""Per-entity streaming through consecutive per-entity steps.
+
+Batch steps (e.g. 2.2 Intrinsic Attributes) fan out one LLM call per entity and
+`gather` them, so the next step cannot start for *any* entity until the slowest
+entity finishes. When consecutive steps only need the same entity's results
+(2.1 -> 2.2, 2.7 -> 2.8 -> 2.9), an entity pipeline runs the step chain per entity
+instead: each entity flows into the next step as soon as its own previous step is
+done, and the only barrier is at the end of the chain.
+
+Each stage is an ordinary phase node (the same wrapper used by the graph). It is
+invoked with an entity-scoped view of the state:
+- `entities` holds only that entity (the full list stays available as `all_entities`)
+- entity-keyed channels (e.g. `attributes`, `primary_keys`) hold only that entity
+- everything else is shared read-only context
+
+Per-entity results are merged back at the end: entity-keyed dict channels are
+unioned, and batch outputs stored in `previous_answers` are concatenated (list
+fields) and summed (`total_*` counters).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from ..state import IRGenerationState
+from .common import logger
+
+# Key under which the unscoped entity list is exposed to stage nodes.
+ALL_ENTITIES_KEY = "all_entities"
+
+
+def _entity_name(entity: Any) -> str:
+    if isinstance(entity, dict):
+        return entity.get("name", "")
+    return getattr(entity, "name", "")
+
+
+def _merge_answers(answers: List[Any]) -> Any:
+    """Merge per-entity batch outputs of one step into a single batch output."""
+    answers = [a for a in answers if a is not None]
+    if not answers:
+        return None
+    if all(isinstance(a, BaseModel) for a in answers) and len({type(a) for a in answers}) == 1:
+        merged = _merge_answer_dicts([dict(a) for a in answers])
+        return type(answers[0])(**merged)
+    return _merge_answer_dicts([a.model_dump() if isinstance(a, BaseModel) else a for a in answers])
+
+
+def _merge_answer_dicts(answers: List[Any]) -> Any:
+    if not all(isinstance(a, dict) for a in answers):
+        return answers[-1]
+    merged: Dict[str, Any] = {}
+    for answer in answers:
+        for key, value in answer.items():
+            if key not in merged:
+                merged[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, list) and isinstance(merged[key], list):
+                merged[key].extend(value)
+            elif isinstance(value, dict) and not value:
+                continue  # e.g. {"entity_results": {}} from a skipped entity
+            elif isinstance(merged[key], dict) and not merged[key]:
+                merged[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, dict) and isinstance(merged[key], dict):
+                merged[key] = {**merged[key], **value}
+            elif key.startswith("total_") and isinstance(value, int) and isinstance(merged[key], int):
+                merged[key] += value
+    return merged
+
+
+def create_entity_pipeline_node(
+    name: str,
+    stages: Sequence[Tuple[str, Callable[[IRGenerationState], Any]]],
+    entity_channels: Sequence[str],
+) -> Callable[[IRGenerationState], Any]:
+    """Create a node that streams every entity through a chain of per-entity stages.
+
+    Args:
+        name: Node name (for logging)
+        stages: (answer_key, node_fn) in execution order; answer_key is the
+            `previous_answers` key the stage writes (e.g. "2.2")
+        entity_channels: State channels keyed by entity name that are scoped to the
+            current entity before each stage runs
+
+    Returns:
+        Async LangGraph node returning the merged update
+    """
+    async def _run_entity(state: IRGenerationState, entity: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        entity_name = _entity_name(entity)
+        local: Dict[str, Any] = {
+            **state,
+            "entities": [entity],
+            ALL_ENTITIES_KEY: state.get("entities", []),
+        }
+        for channel in entity_channels:
+            values = state.get(channel) or {}
+            local[channel] = {entity_name: values[entity_name]} if entity_name in values else {}
+
+        answers: Dict[str, Any] = {}
+        written: Dict[str, Any] = {}
+        for answer_key, stage in stages:
+            update = await stage(local) or {}
+            for key, value in update.items():
+                if key == "previous_answers":
+                    local["previous_answers"] = {**local.get("previous_answers", {}), **value}
+                else:
+                    local[key] = value
+                    written[key] = value
+            answers[answer_key] = local.get("previous_answers", {}).get(answer_key)
+        return answers, written
+
+    async def node(state: IRGenerationState) -> Dict[str, Any]:
+        entities = state.get("entities", [])
+        logger.info(
+            f"[LangGraph] {name}: streaming {len(entities)} entities through "
+            f"{' -> '.join(key for key, _ in stages)}"
+        )
+        results = await asyncio.gather(*(_run_entity(state, entity) for entity in entities))
+
+        update: Dict[str, Any] = {
+            "previous_answers": {
+                key: _merge_answers([answers.get(key) for answers, _ in results])
+                for key, _ in stages
+            },
+        }
+        for _, written in results:
+            for key, value in written.items():
+                if isinstance(value, dict):
+                    # Entity-keyed (or "Entity.attr"-keyed) maps: union over entities
+                    base = update.get(key, state.get(key) or {})
+                    update[key] = {**base, **value}
+                else:
+                    update[key] = value
+        return update
+
+    node.__name__ = name
+    return node
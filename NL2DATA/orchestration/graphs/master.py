@@ -6,6 +6,7 @@ from langgraph.checkpoint.memory import MemorySaver
 
 from ..state import IRGenerationState
 from .common import logger
+from .scheduler import build_cross_phase_dag, merge_safe_node
 from .phase1 import create_phase_1_graph
 from .phase2 import create_phase_2_graph
 from .phase3 import create_phase_3_graph  # ER Design
@@ -17,14 +18,41 @@ from .phase8 import create_phase_8_graph  # Functional Dependencies & Constraint
 from .phase9 import create_phase_9_graph  # Generation Strategies
 
 
+def _add_phase_nodes(workflow: StateGraph, phase_executors: Dict[int, Any]) -> None:
+    """Add phase nodes and wire them by the registry's cross-phase dependencies.
+    
+    Phase executors return the full subgraph state; they are wrapped with
+    merge_safe_node so that concurrently running phases only emit what they changed.
+    """
+    dag = build_cross_phase_dag(sorted(phase_executors))
+    has_successor = {parent for parents in dag.values() for parent in parents}
+    
+    for phase_num, executor in phase_executors.items():
+        workflow.add_node(f"phase_{phase_num}", merge_safe_node(executor))
+    
+    for phase_num, parents in dag.items():
+        if not parents:
+            workflow.set_entry_point(f"phase_{phase_num}")
+        elif len(parents) == 1:
+            workflow.add_edge(f"phase_{parents[0]}", f"phase_{phase_num}")
+        else:
+            workflow.add_edge([f"phase_{p}" for p in parents], f"phase_{phase_num}")
+        if phase_num not in has_successor:
+            workflow.add_edge(f"phase_{phase_num}", END)
+
+
 def create_complete_workflow_graph() -> StateGraph:
     """Create LangGraph StateGraph for complete workflow (all phases).
     
-    This master graph connects all phase graphs sequentially:
+    This master graph connects all phase graphs:
     Phase 1 → Phase 2 (includes multivalued/derived detection) → Phase 3 (ER Design) → Phase 4 (Relational Schema) → 
     Phase 5 (Data Types, includes nullability) → Phase 6 (DDL Generation & Schema Creation, old Phase 10) → 
-    Phase 7 (Information Mining, SQL validation only, old Phase 6) → Phase 8 (Functional Dependencies, old Phase 7) → 
-    Phase 9 (Constraints & Generation Strategies, excludes derived and constrained columns, old Phase 8)
+    Phase 7 (Information Mining, SQL validation only, old Phase 6) ∥ 
+    [Phase 8 (Functional Dependencies, old Phase 7) → 
+    Phase 9 (Constraints & Generation Strategies, excludes derived and constrained columns, old Phase 8)]
+    
+    Phase edges come from the step registry's cross-phase dependencies (build_cross_phase_dag):
+    Phase 7 and Phases 8 → 9 only depend on Phase 6, so they run concurrently.
     
     Pipeline ends after Phase 9 with complete metadata (relational schema, constraints, generation strategies).
     
@@ -182,31 +210,19 @@ def create_complete_workflow_graph() -> StateGraph:
             raise
         return {**result, "phase": 9}
     
-    # Add nodes
-    workflow.add_node("phase_1", execute_phase_1)
-    workflow.add_node("phase_2", execute_phase_2)
-    workflow.add_node("phase_3", execute_phase_3)
-    workflow.add_node("phase_4", execute_phase_4)
-    workflow.add_node("phase_5", execute_phase_5)
-    workflow.add_node("phase_6", execute_phase_6)
-    workflow.add_node("phase_7", execute_phase_7)
-    workflow.add_node("phase_8", execute_phase_8)
-    workflow.add_node("phase_9", execute_phase_9)
-    
-    # Set entry point
-    workflow.set_entry_point("phase_1")
-    
-    # Add sequential edges for complete pipeline flow
-    # Phase 1 → Phase 2 → Phase 3 → Phase 4 → Phase 5 → Phase 6 → Phase 7 → Phase 8 → Phase 9 → END
-    workflow.add_edge("phase_1", "phase_2")
-    workflow.add_edge("phase_2", "phase_3")
-    workflow.add_edge("phase_3", "phase_4")
-    workflow.add_edge("phase_4", "phase_5")
-    workflow.add_edge("phase_5", "phase_6")
-    workflow.add_edge("phase_6", "phase_7")
-    workflow.add_edge("phase_7", "phase_8")
-    workflow.add_edge("phase_8", "phase_9")
-    workflow.add_edge("phase_9", END)
+    # Add nodes and dependency edges
+    # Phase 1 → ... → Phase 6 → {Phase 7, Phase 8 → Phase 9} → END
+    _add_phase_nodes(workflow, {
+        1: execute_phase_1,
+        2: execute_phase_2,
+        3: execute_phase_3,
+        4: execute_phase_4,
+        5: execute_phase_5,
+        6: execute_phase_6,
+        7: execute_phase_7,
+        8: execute_phase_8,
+        9: execute_phase_9,
+    })
     
     # Compile with checkpointing
     checkpointer = MemorySaver()
@@ -372,19 +388,10 @@ def create_workflow_up_to_phase(max_phase: int) -> StateGraph:
         9: execute_phase_9,
     }
     
-    # Add nodes for phases up to max_phase
-    for phase_num in range(1, max_phase + 1):
-        workflow.add_node(f"phase_{phase_num}", phase_executors[phase_num])
-    
-    # Set entry point
-    workflow.set_entry_point("phase_1")
-    
-    # Add sequential edges up to max_phase
-    for phase_num in range(1, max_phase):
-        workflow.add_edge(f"phase_{phase_num}", f"phase_{phase_num + 1}")
-    
-    # Add edge from last phase to END
-    workflow.add_edge(f"phase_{max_phase}", END)
+    # Add nodes and dependency edges for phases up to max_phase
+    _add_phase_nodes(workflow, {
+        phase_num: phase_executors[phase_num] for phase_num in range(1, max_phase + 1)
+    })
     
     # Compile with checkpointing
     checkpointer = MemorySaver()
@@ -1,11 +1,11 @@
 """Phase 1: Domain & Entity Discovery Graph."""
 
 from typing import Dict, Any, Literal
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
 
 from ..state import IRGenerationState
 from .common import logger, invoke_step_checked
+from .scheduler import create_registry_phase_graph, LoopBack
 
 
 # Removed _should_infer_domain - step 1.1 now handles both detection and inference
@@ -721,6 +721,8 @@ def create_phase_1_graph() -> StateGraph:
     11. Relation Cardinality (1.11) - parallel per relation
     12. Relation Validation (1.12) - loop if validation fails
     
+    Edges are derived from the step registry's dependency DAG (see graphs/scheduler.py).
+    
     Returns:
         Compiled StateGraph ready for execution
     """
@@ -740,69 +742,33 @@ def create_phase_1_graph() -> StateGraph:
         step_1_12_relation_validation,
     )
     
-    # Create graph
-    workflow = StateGraph(IRGenerationState)
-    
-    # Add nodes (wrapped to work with LangGraph state)
-    workflow.add_node("domain_detection", _wrap_step_1_1(step_1_1_domain_detection))
-    workflow.add_node("entity_mention", _wrap_step_1_2(step_1_2_entity_mention_detection))
-    workflow.add_node("entity_extraction", _wrap_step_1_4(step_1_4_key_entity_extraction))
-    workflow.add_node("relation_mention", _wrap_step_1_5(step_1_5_relation_mention_detection))
-    workflow.add_node("auxiliary_entities", _wrap_step_1_6(step_1_6_auxiliary_entity_suggestion))
-    workflow.add_node("entity_consolidation", _wrap_step_1_7(step_1_7_entity_consolidation))
-    workflow.add_node("entity_attribute_guardrail", _wrap_step_1_76(step_1_76_entity_attribute_guardrail))
-    workflow.add_node("entity_reclassification", _wrap_step_1_75(step_1_75_entity_relation_reclassification))
-    workflow.add_node("entity_cardinality", _wrap_step_1_8(step_1_8_entity_cardinality))
-    workflow.add_node("relation_extraction", _wrap_step_1_9(step_1_9_key_relations_extraction))
-    workflow.add_node("schema_connectivity", _wrap_step_1_10(step_1_10_schema_connectivity))
-    workflow.add_node("relation_cardinality", _wrap_step_1_11(step_1_11_relation_cardinality))
-    workflow.add_node("relation_validation", _wrap_step_1_12(step_1_12_relation_validation))
-    
-    # Set entry point
-    workflow.set_entry_point("domain_detection")
-    
-    # Add edges
-    workflow.add_edge("domain_detection", "entity_mention")
-    workflow.add_edge("entity_mention", "entity_extraction")
-    
-    # Parallel: Relation mention and auxiliary entities (both depend on entity extraction)
-    workflow.add_edge("entity_extraction", "relation_mention")
-    workflow.add_edge("entity_extraction", "auxiliary_entities")
-    
-    # Merge parallel results before consolidation
-    workflow.add_edge("relation_mention", "entity_consolidation")
-    workflow.add_edge("auxiliary_entities", "entity_consolidation")
-    
-    # Insert deterministic guardrail between consolidation and reclassification
-    workflow.add_edge("entity_consolidation", "entity_attribute_guardrail")
-    workflow.add_edge("entity_attribute_guardrail", "entity_reclassification")
-    workflow.add_edge("entity_reclassification", "entity_cardinality")
-    workflow.add_edge("entity_cardinality", "relation_extraction")
-    workflow.add_edge("relation_extraction", "schema_connectivity")
-    
-    # Conditional: Loop back if orphans found
-    workflow.add_conditional_edges(
-        "schema_connectivity",
-        _has_orphans,
-        {
-            "has_orphans": "relation_extraction",  # Loop back
-            "no_orphans": "relation_cardinality"
-        }
+    return create_registry_phase_graph(
+        phase=1,
+        nodes=[
+            ("P1_S1_DOMAIN_DETECTION", "domain_detection", _wrap_step_1_1(step_1_1_domain_detection)),
+            ("P1_S2_ENTITY_MENTION", "entity_mention", _wrap_step_1_2(step_1_2_entity_mention_detection)),
+            ("P1_S4_KEY_ENTITY_EXTRACTION", "entity_extraction", _wrap_step_1_4(step_1_4_key_entity_extraction)),
+            ("P1_S5_RELATION_MENTION", "relation_mention", _wrap_step_1_5(step_1_5_relation_mention_detection)),
+            ("P1_S6_AUXILIARY_ENTITIES", "auxiliary_entities", _wrap_step_1_6(step_1_6_auxiliary_entity_suggestion)),
+            ("P1_S7_ENTITY_CONSOLIDATION", "entity_consolidation", _wrap_step_1_7(step_1_7_entity_consolidation)),
+            ("P1_S7A_ENTITY_ATTRIBUTE_GUARDRAIL", "entity_attribute_guardrail", _wrap_step_1_76(step_1_76_entity_attribute_guardrail)),
+            ("P1_S7B_ENTITY_RECLASSIFICATION", "entity_reclassification", _wrap_step_1_75(step_1_75_entity_relation_reclassification)),
+            ("P1_S8_ENTITY_CARDINALITY", "entity_cardinality", _wrap_step_1_8(step_1_8_entity_cardinality)),
+            ("P1_S9_KEY_RELATIONS", "relation_extraction", _wrap_step_1_9(step_1_9_key_relations_extraction)),
+            ("P1_S10_SCHEMA_CONNECTIVITY", "schema_connectivity", _wrap_step_1_10(step_1_10_schema_connectivity)),
+            ("P1_S11_RELATION_CARDINALITY", "relation_cardinality", _wrap_step_1_11(step_1_11_relation_cardinality)),
+            ("P1_S12_RELATION_VALIDATION", "relation_validation", _wrap_step_1_12(step_1_12_relation_validation)),
+        ],
+        loop_backs={
+            # Loop back if orphans found
+            "P1_S10_SCHEMA_CONNECTIVITY": LoopBack(
+                proceed=lambda state: _has_orphans(state) == "no_orphans",
+                target_step_id="P1_S9_KEY_RELATIONS",
+            ),
+            # Loop back to fix if validation fails
+            "P1_S12_RELATION_VALIDATION": LoopBack(
+                proceed=lambda state: _validation_passed(state) == "passed",
+                target_step_id="P1_S9_KEY_RELATIONS",
+            ),
+        },
     )
-    
-    workflow.add_edge("relation_cardinality", "relation_validation")
-    
-    # Conditional: Loop back if validation fails
-    workflow.add_conditional_edges(
-        "relation_validation",
-        _validation_passed,
-        {
-            "failed": "relation_extraction",  # Loop back to fix
-            "passed": END
-        }
-    )
-    
-    # Compile with checkpointing
-    checkpointer = MemorySaver()
-    return workflow.compile(checkpointer=checkpointer)
-
@@ -13,11 +13,14 @@ Derived attributes and constraint inference are deferred to later phases (post-f
 """
 
 from typing import Dict, Any, List, Literal, Tuple
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
 
+from NL2DATA.ir.schema_index import get_schema_index, item_name
+from NL2DATA.utils.pipeline_config import get_phase2_config
 from ..state import IRGenerationState
 from .common import logger, invoke_step_checked
+from .scheduler import create_registry_phase_graph, LoopBack
+from .entity_pipeline import create_entity_pipeline_node, ALL_ENTITIES_KEY
 
 
 def _naming_validation_passed(state: IRGenerationState) -> Literal["passed", "failed", "max_retries"]:
@@ -44,21 +47,10 @@ def _naming_validation_passed(state: IRGenerationState) -> Literal["passed", "fa
     return "failed"
 
 
-def _attributes_to_name_lists(attributes: Dict[str, Any]) -> Dict[str, List[str]]:
+def _attributes_to_name_lists(state: IRGenerationState) -> Dict[str, List[str]]:
     """Convert state["attributes"] (entity -> list[dict|model]) into entity -> list[str] names."""
-    out: Dict[str, List[str]] = {}
-    for entity_name, attrs in (attributes or {}).items():
-        names: List[str] = []
-        if isinstance(attrs, list):
-            for a in attrs:
-                if isinstance(a, dict):
-                    n = a.get("name", "")
-                else:
-                    n = getattr(a, "name", "")
-                if n:
-                    names.append(n)
-        out[entity_name] = names
-    return out
+    schema = get_schema_index(state)
+    return {entity_name: list(schema.attribute_names(entity_name)) for entity_name in schema.attributed_entities}
 
 
 def _wrap_step_2_1(step_func):
@@ -90,7 +82,8 @@ def _wrap_step_2_2(step_func):
             attribute_count_results=prev_answers.get("2.1"),
             domain=state.get("domain"),
             relations=state.get("relations", []),
-            primary_keys=state.get("primary_keys", {})
+            primary_keys=state.get("primary_keys", {}),
+            all_entity_names=[item_name(e) for e in state.get(ALL_ENTITIES_KEY, state.get("entities", []))],
         )
         
         # Normalize to entity -> attribute_list (not the wrapper payload)
@@ -163,6 +156,34 @@ def _wrap_step_2_2(step_func):
     return node
 
 
+def _create_attribute_discovery_node(step_2_1_node, step_2_2_node):
+    """Steps 2.1 -> 2.2 streamed per entity.
+
+    With Step 2.2 packing enabled (NL2DATA_PHASE2_STEP_2_2_PACKING_ENABLED) the two
+    steps run as batch steps instead: packing needs all entities in one 2.2 call,
+    and per-entity streaming would hand it one entity at a time.
+    """
+    streamed = create_entity_pipeline_node(
+        "attribute_discovery",
+        stages=[("2.1", step_2_1_node), ("2.2", step_2_2_node)],
+        entity_channels=("attributes",),
+    )
+
+    async def node(state: IRGenerationState) -> Dict[str, Any]:
+        if not get_phase2_config().step_2_2_packing_enabled:
+            return await streamed(state)
+        logger.info("[LangGraph] attribute_discovery: Step 2.2 packing enabled, running 2.1 and 2.2 as batch steps")
+        update = await step_2_1_node(state) or {}
+        update_2_2 = await step_2_2_node({**state, **update}) or {}
+        merged = {**update, **update_2_2}
+        if "attributes" in update_2_2:
+            merged["attributes"] = {**(state.get("attributes") or {}), **update_2_2["attributes"]}
+        return merged
+
+    node.__name__ = "attribute_discovery"
+    return node
+
+
 def _wrap_step_2_3(step_func):
     """Wrap Step 2.3 to work as LangGraph node."""
     async def node(state: IRGenerationState) -> Dict[str, Any]:
@@ -238,7 +259,7 @@ def _wrap_step_2_4(step_func):
     async def node(state: IRGenerationState) -> Dict[str, Any]:
         logger.info("[LangGraph] Executing Step 2.4: Composite Attribute Handling")
         prev_answers = state.get("previous_answers", {})
-        attr_name_lists = _attributes_to_name_lists(state.get("attributes", {}))
+        attr_name_lists = _attributes_to_name_lists(state)
         result = await invoke_step_checked(
             step_func,
             entities=state.get("entities", []),
@@ -300,7 +321,7 @@ def _wrap_step_2_5(step_func):
     async def node(state: IRGenerationState) -> Dict[str, Any]:
         logger.info("[LangGraph] Executing Step 2.5: Temporal Attributes Detection")
         prev_answers = state.get("previous_answers", {})
-        attr_name_lists = _attributes_to_name_lists(state.get("attributes", {}))
+        attr_name_lists = _attributes_to_name_lists(state)
         result = await invoke_step_checked(
             step_func,
             entities=state.get("entities", []),
@@ -324,7 +345,7 @@ def _wrap_step_2_6(step_func):
         result = await invoke_step_checked(
             step_func,
             entities=state.get("entities", []),
-            entity_attributes=_attributes_to_name_lists(state.get("attributes", {}))
+            entity_attributes=_attributes_to_name_lists(state)
         )
         
         # Handle Pydantic model result
@@ -371,7 +392,7 @@ def _wrap_step_2_7(step_func):
         result = await invoke_step_checked(
             step_func,
             entities=state.get("entities", []),
-            entity_attributes=_attributes_to_name_lists(state.get("attributes", {}))
+            entity_attributes=_attributes_to_name_lists(state)
         )
         
         # Extract primary keys: entity_results is now a list of EntityPrimaryKeyResult objects
@@ -380,6 +401,7 @@ def _wrap_step_2_7(step_func):
         primary_keys: Dict[str, List[str]] = {}
         attributes = state.get("attributes", {})
         updated_attributes = {**attributes}  # Copy to avoid mutating state directly
+        schema = get_schema_index(state)
         
         # Check if we need to add surrogate keys to attributes
         for pk_result in entity_results_list:
@@ -393,11 +415,8 @@ def _wrap_step_2_7(step_func):
                 primary_keys[entity_name] = pk_list
                 
                 # Check if any PK attributes are missing from attributes state (surrogate keys)
-                entity_attrs = updated_attributes.get(entity_name, [])
-                existing_attr_names = {a.get("name", "").lower() if isinstance(a, dict) else getattr(a, "name", "").lower() for a in entity_attrs}
-                
                 for pk_attr in pk_list:
-                    if pk_attr.lower() not in existing_attr_names:
+                    if not schema.has_attribute(entity_name, pk_attr, case_sensitive=False):
                         # This is a surrogate key that needs to be added
                         logger.info(f"Step 2.7: Adding surrogate key '{pk_attr}' to entity '{entity_name}' attributes")
                         if entity_name not in updated_attributes:
@@ -473,7 +492,7 @@ def _wrap_step_2_8(step_func):
         result = await invoke_step_checked(
             step_func,
             entities=state.get("entities", []),
-            entity_attributes=_attributes_to_name_lists(state.get("attributes", {})),
+            entity_attributes=_attributes_to_name_lists(state),
             primary_keys=state.get("primary_keys", {}),
             nl_description=state["nl_description"],
             domain=state.get("domain"),
@@ -592,17 +611,21 @@ def create_phase_2_graph() -> StateGraph:
     """Create LangGraph StateGraph for Phase 2 (Attribute Discovery & PK/FK foundation).
     
     This graph orchestrates all Phase 2 steps:
-    1. Attribute Count Detection (2.1) - parallel per entity
-    2. Intrinsic Attributes (2.2) - parallel per entity
-    3. Attribute Synonym Detection (2.3) - parallel per entity
-    4. Cross-Entity Attribute Reconciliation (2.16) - parallel per entity
-    5. Composite Attribute Handling (2.4) - parallel per entity
-    6. Temporal Attributes Detection (2.5) - parallel per entity
-    7. Naming Convention Validation (2.6) - loop if validation fails
-    8. Primary Key Identification (2.7) - parallel per entity
-    9. Multivalued/Derived Detection (2.8) - parallel per entity (classifies existing attributes only)
-    10. Derived Attribute Formulas (2.9) - parallel per derived attribute (same-entity dependencies only)
-    11. Relation Intrinsic Attributes (2.15) - parallel per relation
+    1. Attribute Count Detection (2.1) -> Intrinsic Attributes (2.2) - streamed per entity
+    2. Attribute Synonym Detection (2.3) - parallel per entity
+    3. Cross-Entity Attribute Reconciliation (2.16) - parallel per entity
+    4. Naming Convention Validation (2.6) - loop back to 2.3 if validation fails
+    5. After naming validation, independently and concurrently:
+       - Composite Attribute Handling (2.4) - parallel per entity
+       - Temporal Attributes Detection (2.5) - parallel per entity
+       - Relation Intrinsic Attributes (2.15) - parallel per relation
+       - Primary Key Identification (2.7) -> Multivalued/Derived Detection (2.8)
+         -> Derived Attribute Formulas (2.9) - streamed per entity
+    
+    Edges are derived from the step registry's dependency DAG (see graphs/scheduler.py).
+    "Streamed per entity" chains run each entity through the consecutive steps as soon
+    as its own previous step finishes (see graphs/entity_pipeline.py); 2.3, 2.16 and 2.6
+    compare entities against each other and stay barriers.
     
     Note: Foreign keys are created deterministically in Phase 4 from relations and cardinalities.
     
@@ -625,50 +648,42 @@ def create_phase_2_graph() -> StateGraph:
     )
     from NL2DATA.phases.phase2.step_2_15_relation_intrinsic_attributes import step_2_15_relation_intrinsic_attributes_batch
     
-    # Create graph
-    workflow = StateGraph(IRGenerationState)
-    
-    # Add nodes (wrapped to work with LangGraph state)
-    workflow.add_node("attribute_count", _wrap_step_2_1(step_2_1_attribute_count_detection_batch))
-    workflow.add_node("intrinsic_attributes", _wrap_step_2_2(step_2_2_intrinsic_attributes_batch))
-    workflow.add_node("synonym_detection", _wrap_step_2_3(step_2_3_attribute_synonym_detection_batch))
-    workflow.add_node("cross_entity_reconcile", _wrap_step_2_16(step_2_16_cross_entity_attribute_reconciliation_batch))
-    workflow.add_node("composite_handling", _wrap_step_2_4(step_2_4_composite_attribute_handling_batch))
-    workflow.add_node("temporal_attributes", _wrap_step_2_5(step_2_5_temporal_attributes_detection_batch))
-    workflow.add_node("naming_validation", _wrap_step_2_6(step_2_6_naming_convention_validation))
-    workflow.add_node("primary_keys", _wrap_step_2_7(step_2_7_primary_key_identification_batch))
-    workflow.add_node("multivalued_derived", _wrap_step_2_8(step_2_8_multivalued_derived_detection_batch))
-    workflow.add_node("derived_formulas", _wrap_step_2_9(step_2_9_derived_attribute_formulas_batch))
-    workflow.add_node("relation_attributes", _wrap_step_2_15(step_2_15_relation_intrinsic_attributes_batch))
-    
-    # Set entry point
-    workflow.set_entry_point("attribute_count")
-    
-    # Add edges (sequential flow with parallel execution within nodes)
-    workflow.add_edge("attribute_count", "intrinsic_attributes")
-    workflow.add_edge("intrinsic_attributes", "synonym_detection")
-    workflow.add_edge("synonym_detection", "cross_entity_reconcile")
-    workflow.add_edge("cross_entity_reconcile", "composite_handling")
-    workflow.add_edge("composite_handling", "temporal_attributes")
-    workflow.add_edge("temporal_attributes", "naming_validation")
-    
-    # Conditional: Loop back if naming validation fails (with max retry limit)
-    workflow.add_conditional_edges(
-        "naming_validation",
-        _naming_validation_passed,
-        {
-            "passed": "primary_keys",
-            "failed": "synonym_detection",  # Loop back to fix naming issues
-            "max_retries": "primary_keys"  # Continue despite failures after max retries (log error but don't block)
-        }
+    return create_registry_phase_graph(
+        phase=2,
+        nodes=[
+            (
+                ("P2_S1_ATTRIBUTE_COUNT", "P2_S2_INTRINSIC_ATTRIBUTES"),
+                "attribute_discovery",
+                _create_attribute_discovery_node(
+                    _wrap_step_2_1(step_2_1_attribute_count_detection_batch),
+                    _wrap_step_2_2(step_2_2_intrinsic_attributes_batch),
+                ),
+            ),
+            ("P2_S3_ATTRIBUTE_SYNONYM", "synonym_detection", _wrap_step_2_3(step_2_3_attribute_synonym_detection_batch)),
+            ("P2_S16_CROSS_ENTITY_RECONCILIATION", "cross_entity_reconcile", _wrap_step_2_16(step_2_16_cross_entity_attribute_reconciliation_batch)),
+            ("P2_S6_NAMING_VALIDATION", "naming_validation", _wrap_step_2_6(step_2_6_naming_convention_validation)),
+            ("P2_S4_COMPOSITE_ATTRIBUTES", "composite_handling", _wrap_step_2_4(step_2_4_composite_attribute_handling_batch)),
+            ("P2_S5_TEMPORAL_ATTRIBUTES", "temporal_attributes", _wrap_step_2_5(step_2_5_temporal_attributes_detection_batch)),
+            (
+                ("P2_S7_PRIMARY_KEY", "P2_S8_MULTIVALUED_DERIVED", "P2_S9_DERIVED_FORMULAS"),
+                "keys_and_derivations",
+                create_entity_pipeline_node(
+                    "keys_and_derivations",
+                    stages=[
+                        ("2.7", _wrap_step_2_7(step_2_7_primary_key_identification_batch)),
+                        ("2.8", _wrap_step_2_8(step_2_8_multivalued_derived_detection_batch)),
+                        ("2.9", _wrap_step_2_9(step_2_9_derived_attribute_formulas_batch)),
+                    ],
+                    entity_channels=("attributes", "primary_keys", "entity_derived_attributes"),
+                ),
+            ),
+            ("P2_S15_RELATION_INTRINSIC_ATTRIBUTES", "relation_attributes", _wrap_step_2_15(step_2_15_relation_intrinsic_attributes_batch)),
+        ],
+        loop_backs={
+            # Loop back to fix naming issues; continue despite failures after max retries (error is logged)
+            "P2_S6_NAMING_VALIDATION": LoopBack(
+                proceed=lambda state: _naming_validation_passed(state) != "failed",
+                target_step_id="P2_S3_ATTRIBUTE_SYNONYM",
+            ),
+        },
     )
-    
-    workflow.add_edge("primary_keys", "multivalued_derived")
-    workflow.add_edge("multivalued_derived", "derived_formulas")
-    workflow.add_edge("derived_formulas", "relation_attributes")
-    workflow.add_edge("relation_attributes", END)
-    
-    # Compile with checkpointing
-    checkpointer = MemorySaver()
-    return workflow.compile(checkpointer=checkpointer)
-
@@ -9,11 +9,11 @@ This phase compiles entities, relations, and attributes into an ER design.
 
 from typing import Dict, Any
 
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
 
 from ..state import IRGenerationState
 from .common import logger, invoke_step_checked
+from .scheduler import create_registry_phase_graph
 
 
 def _wrap_step_3_1(step_func):
@@ -102,14 +102,11 @@ def create_phase_3_graph() -> StateGraph:
         step_3_2_junction_table_naming,
     )
 
-    workflow = StateGraph(IRGenerationState)
-    workflow.add_node("er_design", _wrap_step_3_1(step_3_1_er_design_compilation))
-    workflow.add_node("junction_naming", _wrap_step_3_2(step_3_2_junction_table_naming))
-
-    workflow.set_entry_point("er_design")
-    workflow.add_edge("er_design", "junction_naming")
-    workflow.add_edge("junction_naming", END)
-
-    checkpointer = MemorySaver()
-    return workflow.compile(checkpointer=checkpointer)
+    return create_registry_phase_graph(
+        phase=3,
+        nodes=[
+            ("P3_S1_ER_COMPILATION", "er_design", _wrap_step_3_1(step_3_1_er_design_compilation)),
+            ("P3_S2_JUNCTION_NAMING", "junction_naming", _wrap_step_3_2(step_3_2_junction_table_naming)),
+        ],
+    )
 
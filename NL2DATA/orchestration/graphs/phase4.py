@@ -8,11 +8,11 @@ This phase compiles the ER design into a canonical relational schema.
 
 from typing import Dict, Any
 
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
 
 from ..state import IRGenerationState
 from .common import logger, invoke_step_checked
+from .scheduler import create_registry_phase_graph
 
 
 def _wrap_step_4_1(step_func):
@@ -69,11 +69,9 @@ def create_phase_4_graph() -> StateGraph:
         step_4_1_relational_schema_compilation,
     )
 
-    workflow = StateGraph(IRGenerationState)
-    workflow.add_node("relational_schema", _wrap_step_4_1(step_4_1_relational_schema_compilation))
-
-    workflow.set_entry_point("relational_schema")
-    workflow.add_edge("relational_schema", END)
-
-    checkpointer = MemorySaver()
-    return workflow.compile(checkpointer=checkpointer)
+    return create_registry_phase_graph(
+        phase=4,
+        nodes=[
+            ("P4_S1_RELATIONAL_SCHEMA", "relational_schema", _wrap_step_4_1(step_4_1_relational_schema_compilation)),
+        ],
+    )
@@ -9,11 +9,11 @@ This phase:
 
 from typing import Dict, Any
 
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
 
 from ..state import IRGenerationState
 from .common import logger, invoke_step_checked
+from .scheduler import create_registry_phase_graph
 
 
 def _wrap_step_5_1(step_func):
@@ -148,6 +148,7 @@ def _wrap_step_5_2(step_func):
             domain=state.get("domain"),
             entity_descriptions=entity_descriptions,
             nl_description=state.get("nl_description"),
+            categorical_attributes=state.get("categorical_attributes") or None,
         )
         
         # Work directly with Pydantic model (IndependentAttributeDataTypesBatchOutput)
@@ -265,6 +266,7 @@ def _wrap_step_5_4(step_func):
             derived_formulas=state.get("derived_formulas", {}),
             domain=state.get("domain"),
             nl_description=state.get("nl_description"),
+            categorical_attributes=state.get("categorical_attributes") or None,
         )
         
         # Work directly with Pydantic model (DependentAttributeDataTypesBatchOutput)
@@ -390,20 +392,14 @@ def create_phase_5_graph() -> StateGraph:
         step_5_5_nullability_detection_batch,
     )
 
-    workflow = StateGraph(IRGenerationState)
-    workflow.add_node("dependency_graph", _wrap_step_5_1(step_5_1_attribute_dependency_graph))
-    workflow.add_node("independent_types", _wrap_step_5_2(step_5_2_independent_attribute_data_types_batch))
-    workflow.add_node("fk_types", _wrap_step_5_3(step_5_3_deterministic_fk_data_types))
-    workflow.add_node("dependent_types", _wrap_step_5_4(step_5_4_dependent_attribute_data_types_batch))
-    workflow.add_node("nullability", _wrap_step_5_5(step_5_5_nullability_detection_batch))
-
-    workflow.set_entry_point("dependency_graph")
-    workflow.add_edge("dependency_graph", "independent_types")
-    workflow.add_edge("independent_types", "fk_types")
-    workflow.add_edge("fk_types", "dependent_types")
-    workflow.add_edge("dependent_types", "nullability")
-    workflow.add_edge("nullability", END)
-
-    checkpointer = MemorySaver()
-    return workflow.compile(checkpointer=checkpointer)
+    return create_registry_phase_graph(
+        phase=5,
+        nodes=[
+            ("P5_S1_DEPENDENCY_GRAPH", "dependency_graph", _wrap_step_5_1(step_5_1_attribute_dependency_graph)),
+            ("P5_S2_INDEPENDENT_TYPES", "independent_types", _wrap_step_5_2(step_5_2_independent_attribute_data_types_batch)),
+            ("P5_S3_FK_TYPES", "fk_types", _wrap_step_5_3(step_5_3_deterministic_fk_data_types)),
+            ("P5_S4_DEPENDENT_TYPES", "dependent_types", _wrap_step_5_4(step_5_4_dependent_attribute_data_types_batch)),
+            ("P5_S5_NULLABILITY", "nullability", _wrap_step_5_5(step_5_5_nullability_detection_batch)),
+        ],
+    )
 
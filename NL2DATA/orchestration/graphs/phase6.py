@@ -6,11 +6,11 @@ All steps are deterministic - no LLM interaction required.
 
 from typing import Dict, Any
 
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
 
 from ..state import IRGenerationState
 from .common import logger, invoke_step_checked
+from .scheduler import create_registry_phase_graph
 
 
 def _wrap_step_6_1(step_func):
@@ -112,15 +112,11 @@ def create_phase_6_graph() -> StateGraph:
         step_6_3_schema_creation,
     )
     
-    workflow = StateGraph(IRGenerationState)
-    workflow.add_node("ddl_compilation", _wrap_step_6_1(step_6_1_ddl_compilation))
-    workflow.add_node("ddl_validation", _wrap_step_6_2(step_6_2_ddl_validation))
-    workflow.add_node("schema_creation", _wrap_step_6_3(step_6_3_schema_creation))
-    
-    workflow.set_entry_point("ddl_compilation")
-    workflow.add_edge("ddl_compilation", "ddl_validation")
-    workflow.add_edge("ddl_validation", "schema_creation")
-    workflow.add_edge("schema_creation", END)
-    
-    checkpointer = MemorySaver()
-    return workflow.compile(checkpointer=checkpointer)
+    return create_registry_phase_graph(
+        phase=6,
+        nodes=[
+            ("P6_S1_DDL_COMPILATION", "ddl_compilation", _wrap_step_6_1(step_6_1_ddl_compilation)),
+            ("P6_S2_DDL_VALIDATION", "ddl_validation", _wrap_step_6_2(step_6_2_ddl_validation)),
+            ("P6_S3_SCHEMA_CREATION", "schema_creation", _wrap_step_6_3(step_6_3_schema_creation)),
+        ],
+    )
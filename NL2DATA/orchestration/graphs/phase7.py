@@ -5,11 +5,11 @@ This phase handles information need identification and SQL validation.
 
 from typing import Dict, Any
 
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
 
 from ..state import IRGenerationState
 from .common import logger, invoke_step_checked
+from .scheduler import create_registry_phase_graph
 
 
 def create_phase_7_graph() -> StateGraph:
@@ -22,8 +22,6 @@ def create_phase_7_graph() -> StateGraph:
         step_7_2_sql_generation_and_validation_batch,
     )
     
-    workflow = StateGraph(IRGenerationState)
-    
     async def information_needs(state: IRGenerationState) -> Dict[str, Any]:
         logger.info("[LangGraph] Executing Step 7.1: Information Need Identification")
         metadata = state.get("metadata", {})
@@ -100,12 +98,10 @@ def create_phase_7_graph() -> StateGraph:
             "current_step": "7.2",
         }
     
-    workflow.add_node("information_needs", information_needs)
-    workflow.add_node("sql_validation", sql_validation)
-    
-    workflow.set_entry_point("information_needs")
-    workflow.add_edge("information_needs", "sql_validation")
-    workflow.add_edge("sql_validation", END)
-    
-    checkpointer = MemorySaver()
-    return workflow.compile(checkpointer=checkpointer)
+    return create_registry_phase_graph(
+        phase=7,
+        nodes=[
+            ("P7_S1_INFORMATION_NEEDS", "information_needs", information_needs),
+            ("P7_S2_SQL_VALIDATION", "sql_validation", sql_validation),
+        ],
+    )
@@ -15,11 +15,11 @@ Execution order:
 
 from typing import Dict, Any
 
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
 
 from ..state import IRGenerationState
 from .common import logger, invoke_step_checked
+from .scheduler import create_registry_phase_graph
 
 
 def create_phase_8_graph() -> StateGraph:
@@ -35,8 +35,6 @@ def create_phase_8_graph() -> StateGraph:
         step_8_8_constraint_compilation,
     )
     
-    workflow = StateGraph(IRGenerationState)
-    
     async def functional_dependencies(state: IRGenerationState) -> Dict[str, Any]:
         logger.info("[LangGraph] Executing Step 8.1: Functional Dependency Analysis")
         
@@ -355,24 +353,16 @@ def create_phase_8_graph() -> StateGraph:
             "current_step": "8.8",
         }
     
-    workflow.add_node("functional_dependencies", functional_dependencies)
-    workflow.add_node("categorical_identification", categorical_identification)
-    workflow.add_node("categorical_value_identification", categorical_value_identification)
-    workflow.add_node("constraint_detection", constraint_detection)
-    workflow.add_node("constraint_scope", constraint_scope)
-    workflow.add_node("constraint_enforcement", constraint_enforcement)
-    workflow.add_node("constraint_conflict", constraint_conflict)
-    workflow.add_node("constraint_compilation", constraint_compilation)
-    
-    workflow.set_entry_point("functional_dependencies")
-    workflow.add_edge("functional_dependencies", "categorical_identification")
-    workflow.add_edge("categorical_identification", "categorical_value_identification")
-    workflow.add_edge("categorical_value_identification", "constraint_detection")
-    workflow.add_edge("constraint_detection", "constraint_scope")
-    workflow.add_edge("constraint_scope", "constraint_enforcement")
-    workflow.add_edge("constraint_enforcement", "constraint_conflict")
-    workflow.add_edge("constraint_conflict", "constraint_compilation")
-    workflow.add_edge("constraint_compilation", END)
-    
-    checkpointer = MemorySaver()
-    return workflow.compile(checkpointer=checkpointer)
+    return create_registry_phase_graph(
+        phase=8,
+        nodes=[
+            ("P8_S1_FUNCTIONAL_DEPENDENCIES", "functional_dependencies", functional_dependencies),
+            ("P8_S2_CATEGORICAL_IDENTIFICATION", "categorical_identification", categorical_identification),
+            ("P8_S3_CATEGORICAL_VALUES", "categorical_value_identification", categorical_value_identification),
+            ("P8_S4_CONSTRAINT_DETECTION", "constraint_detection", constraint_detection),
+            ("P8_S5_CONSTRAINT_SCOPE", "constraint_scope", constraint_scope),
+            ("P8_S6_CONSTRAINT_ENFORCEMENT", "constraint_enforcement", constraint_enforcement),
+            ("P8_S7_CONSTRAINT_CONFLICT", "constraint_conflict", constraint_conflict),
+            ("P8_S8_CONSTRAINT_COMPILATION", "constraint_compilation", constraint_compilation),
+        ],
+    )
@@ -2,22 +2,22 @@
 
 This phase handles generation strategy definition for independent attributes.
 
-Execution order:
-1. Step 9.1: Numerical Range Definition
-2. Step 9.2: Text Generation Strategy
-3. Step 9.3: Boolean Dependency Analysis
-4. Step 9.4: Data Volume Specifications
-5. Step 9.5: Partitioning Strategy
-6. Step 9.6: Distribution Compilation
+Execution order (derived from the step registry dependency DAG):
+1. Concurrently:
+   - Step 9.1: Numerical Range Definition
+   - Step 9.2: Text Generation Strategy
+   - Step 9.3: Boolean Dependency Analysis
+   - Step 9.4: Data Volume Specifications -> Step 9.5: Partitioning Strategy
+2. Step 9.6: Distribution Compilation (joins all of the above)
 """
 
 from typing import Dict, Any, List, Set
 
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
 
 from ..state import IRGenerationState
 from .common import logger, invoke_step_checked
+from .scheduler import create_registry_phase_graph
 
 
 def _extract_independent_attributes(state: IRGenerationState) -> Dict[str, List[Dict[str, Any]]]:
@@ -224,8 +224,6 @@ def create_phase_9_graph() -> StateGraph:
         step_9_6_distribution_compilation,
     )
     
-    workflow = StateGraph(IRGenerationState)
-    
     # Step 9.1: Numerical Range Definition
     async def numerical_range_definition(state: IRGenerationState) -> Dict[str, Any]:
         logger.info("[LangGraph] Executing Step 9.1: Numerical Range Definition")
@@ -577,24 +575,14 @@ def create_phase_9_graph() -> StateGraph:
             }
         }
     
-    # Add nodes
-    workflow.add_node("numerical_range_definition", numerical_range_definition)
-    workflow.add_node("text_generation_strategy", text_generation_strategy)
-    workflow.add_node("boolean_dependency_analysis", boolean_dependency_analysis)
-    workflow.add_node("data_volume_specifications", data_volume_specifications)
-    workflow.add_node("partitioning_strategy", partitioning_strategy)
-    workflow.add_node("distribution_compilation", distribution_compilation)
-    
-    # Set entry point
-    workflow.set_entry_point("numerical_range_definition")
-    
-    # Add sequential edges
-    workflow.add_edge("numerical_range_definition", "text_generation_strategy")
-    workflow.add_edge("text_generation_strategy", "boolean_dependency_analysis")
-    workflow.add_edge("boolean_dependency_analysis", "data_volume_specifications")
-    workflow.add_edge("data_volume_specifications", "partitioning_strategy")
-    workflow.add_edge("partitioning_strategy", "distribution_compilation")
-    workflow.add_edge("distribution_compilation", END)
-    
-    checkpointer = MemorySaver()
-    return workflow.compile(checkpointer=checkpointer)
+    return create_registry_phase_graph(
+        phase=9,
+        nodes=[
+            ("P9_S1_NUMERICAL_RANGE", "numerical_range_definition", numerical_range_definition),
+            ("P9_S2_TEXT_GEN_STRATEGY", "text_generation_strategy", text_generation_strategy),
+            ("P9_S3_BOOLEAN_DEPENDENCY", "boolean_dependency_analysis", boolean_dependency_analysis),
+            ("P9_S4_DATA_VOLUME", "data_volume_specifications", data_volume_specifications),
+            ("P9_S5_PARTITIONING", "partitioning_strategy", partitioning_strategy),
+            ("P9_S6_DISTRIBUTION_COMPILATION", "distribution_compilation", distribution_compilation),
+        ],
+    )
@@ -0,0 +1,292 @@
+"""Registry-driven DAG scheduling for phase graphs.
+
+Instead of wiring every phase as a hand-written `add_edge` chain, phase builders
+declare which registry step each node implements and this module derives the
+edges from `StepDefinition.dependencies`:
+
+- Dependencies on steps outside the phase are ignored (phases run in order).
+- Redundant (transitive) dependencies are dropped.
+- Steps with no in-phase dependencies start immediately; independent steps are
+  scheduled in the same LangGraph superstep and therefore run concurrently.
+- Steps with several dependencies become join nodes (wait for all parents).
+- Leaf steps lead to END.
+
+Loops (e.g. naming validation in Phase 2) are expressed as `LoopBack`s: when the
+step's `proceed` predicate is false, control returns to an earlier step instead
+of continuing to its DAG successors.
+
+A node may implement several consecutive registry steps (e.g. a per-entity
+pipeline, see `entity_pipeline.py`); its dependencies are the union of its
+steps' dependencies on steps outside the node.
+
+Concurrent nodes must not overwrite each other's state. Every node is wrapped so
+that it only returns what it actually changed (see `merge_safe_node`); together
+with the dict-merge reducers on `previous_answers`/`metadata` this makes the
+common `{**state.get("previous_answers", {}), "x.y": result}` idiom safe to run
+in parallel.
+
+The same dependencies also order the phases themselves (`build_cross_phase_dag`),
+so the master graph only waits for the phases a phase actually reads from.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from operator import add, or_
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union, get_type_hints
+import inspect
+
+from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.memory import MemorySaver
+
+from ..state import IRGenerationState
+from ..step_registry import STEP_REGISTRY, get_step_by_id
+from .common import logger
+
+
+def _channels_with_reducer(reducer: Callable[..., Any]) -> Tuple[str, ...]:
+    """State channels annotated with the given reducer (e.g. Annotated[list, add])."""
+    hints = get_type_hints(IRGenerationState, include_extras=True)
+    return tuple(
+        name for name, hint in hints.items()
+        if reducer in getattr(hint, "__metadata__", ())
+    )
+
+
+# State channels whose updates are merged key-by-key (dict union reducer).
+_DICT_MERGE_CHANNELS = _channels_with_reducer(or_)
+# State channels whose updates are appended (list concatenation reducer).
+_APPEND_CHANNELS = _channels_with_reducer(add)
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class LoopBack:
+    """Conditional back-edge out of a step.
+
+    Attributes:
+        proceed: Predicate on state; True continues to the step's DAG successors
+        target_step_id: Registry step_id to re-run when `proceed` is False
+    """
+    proceed: Callable[[IRGenerationState], bool]
+    target_step_id: str
+
+
+def _safe_equals(a: Any, b: Any) -> bool:
+    """Equality that never raises (subgraph outputs may hold copies of unchanged values)."""
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+def merge_safe_node(fn: Callable[..., Any]) -> Callable[[IRGenerationState], Any]:
+    """Wrap a node so it only emits the state it changed.
+
+    - Values returned unchanged (same object as in the input state) are dropped,
+      so `{**state, ...}`-style returns do not clobber channels written by
+      concurrent nodes or re-append accumulated lists.
+    - For dict-merge channels, only new or replaced keys are emitted.
+    - For append channels, a returned list that extends the current one only
+      emits the new tail (so re-returning accumulated lists does not duplicate).
+    """
+    async def node(state: IRGenerationState) -> Dict[str, Any]:
+        update = fn(state)
+        if inspect.isawaitable(update):
+            update = await update
+        if not isinstance(update, dict):
+            return update
+
+        delta: Dict[str, Any] = {}
+        for key, value in update.items():
+            prior = state.get(key, _MISSING)
+            if value is prior:
+                continue
+            if key in _DICT_MERGE_CHANNELS and isinstance(value, dict) and isinstance(prior, dict):
+                value = {k: v for k, v in value.items() if k not in prior or prior[k] is not v}
+                if not value:
+                    continue
+            elif key in _APPEND_CHANNELS and isinstance(value, list) and isinstance(prior, list):
+                if value[:len(prior)] == prior:
+                    value = value[len(prior):]
+                    if not value:
+                        continue
+            elif prior is not _MISSING and _safe_equals(value, prior):
+                continue
+            delta[key] = value
+        return delta
+
+    node.__name__ = getattr(fn, "__name__", "node")
+    node.__qualname__ = getattr(fn, "__qualname__", node.__name__)
+    return node
+
+
+def _transitive_reduction(label: str, deps: Dict[Any, List[Any]]) -> Dict[Any, List[Any]]:
+    """Drop dependencies implied by other dependencies; raise on cycles."""
+    ancestors: Dict[Any, set] = {}
+    visiting: set = set()
+
+    def _ancestors(node: Any) -> set:
+        if node in ancestors:
+            return ancestors[node]
+        if node in visiting:
+            raise ValueError(f"{label}: dependency cycle involving '{node}'")
+        visiting.add(node)
+        result: set = set()
+        for d in deps[node]:
+            result.add(d)
+            result |= _ancestors(d)
+        visiting.discard(node)
+        ancestors[node] = result
+        return result
+
+    for node in deps:
+        _ancestors(node)
+
+    # Drop d if it is already an ancestor of another direct dependency
+    return {
+        node: [d for d in direct if not any(d in ancestors[other] for other in direct if other != d)]
+        for node, direct in deps.items()
+    }
+
+
+def build_phase_dag(phase: int, step_ids: List[str]) -> Dict[str, List[str]]:
+    """Build the in-phase dependency DAG for the given steps.
+
+    Args:
+        phase: Phase number (used for error messages)
+        step_ids: Registry step_ids implemented by the phase graph
+
+    Returns:
+        Mapping step_id -> list of direct (transitively reduced) in-phase dependencies,
+        in the order the steps were given.
+
+    Raises:
+        ValueError: If a step is missing from the registry or the dependencies form a cycle
+    """
+    in_phase = set(step_ids)
+    deps: Dict[str, List[str]] = {}
+    for step_id in step_ids:
+        step = get_step_by_id(step_id)
+        if step is None:
+            raise ValueError(f"Phase {phase}: step '{step_id}' is not defined in the step registry")
+        deps[step_id] = [d for d in step.dependencies if d in in_phase]
+    return _transitive_reduction(f"Phase {phase}", deps)
+
+
+def build_cross_phase_dag(phases: Sequence[int]) -> Dict[int, List[int]]:
+    """Build the phase-level dependency DAG from the registry's cross-phase dependencies.
+
+    Phase P depends on phase Q if any step of P depends on a step of Q.
+
+    Args:
+        phases: Phase numbers included in the workflow
+
+    Returns:
+        Mapping phase -> list of direct (transitively reduced) phase dependencies
+    """
+    included = set(phases)
+    phase_of = {step_id: step.phase for step_id, step in STEP_REGISTRY.items()}
+    deps: Dict[int, List[int]] = {p: [] for p in phases}
+    for step in STEP_REGISTRY.values():
+        if step.phase not in included:
+            continue
+        for d in step.dependencies:
+            q = phase_of.get(d)
+            if q is not None and q != step.phase and q in included and q not in deps[step.phase]:
+                deps[step.phase].append(q)
+    for p in phases:
+        deps[p].sort()
+    return _transitive_reduction("Workflow", deps)
+
+
+def create_registry_phase_graph(
+    phase: int,
+    nodes: List[Tuple[Union[str, Tuple[str, ...]], str, Callable[..., Any]]],
+    loop_backs: Optional[Dict[str, LoopBack]] = None,
+):
+    """Create and compile a phase graph from the step registry's dependency DAG.
+
+    Args:
+        phase: Phase number
+        nodes: (step_id, node_name, node_fn) for every step in the phase; step_id may be a
+            tuple of step_ids for a node that implements several consecutive steps
+        loop_backs: Optional step_id -> LoopBack for steps that may loop to an earlier step
+
+    Returns:
+        Compiled StateGraph ready for execution
+    """
+    loop_backs = loop_backs or {}
+    owner: Dict[str, str] = {}
+    for step_ids_or_id, name, _ in nodes:
+        for step_id in ((step_ids_or_id,) if isinstance(step_ids_or_id, str) else step_ids_or_id):
+            owner[step_id] = name
+    step_dag = build_phase_dag(phase, list(owner))
+
+    # Contract fused steps into their node, then reduce again at node level
+    node_deps: Dict[str, List[str]] = {name: [] for _, name, _ in nodes}
+    for step_id, parents in step_dag.items():
+        for parent in parents:
+            if owner[parent] != owner[step_id] and owner[parent] not in node_deps[owner[step_id]]:
+                node_deps[owner[step_id]].append(owner[parent])
+    dag = _transitive_reduction(f"Phase {phase}", node_deps)
+
+    looping: Dict[str, Tuple[str, LoopBack]] = {}
+    for step_id, loop in loop_backs.items():
+        if step_id not in owner or loop.target_step_id not in owner:
+            raise ValueError(
+                f"Phase {phase}: loop {step_id} -> {loop.target_step_id} references a step not in this phase"
+            )
+        looping[owner[step_id]] = (owner[loop.target_step_id], loop)
+
+    successors: Dict[str, List[str]] = {name: [] for name in dag}
+    for name, parents in dag.items():
+        for parent in parents:
+            successors[parent].append(name)
+
+    workflow = StateGraph(IRGenerationState)
+    for _, name, fn in nodes:
+        workflow.add_node(name, merge_safe_node(fn))
+
+    for name, parents in dag.items():
+        if not parents:
+            workflow.set_entry_point(name)
+            continue
+        conditional_parents = [p for p in parents if p in looping]
+        if conditional_parents and len(parents) > 1:
+            raise ValueError(
+                f"Phase {phase}: node '{name}' joins on looping node(s) {conditional_parents}; "
+                f"a looping node's successors must depend on it alone"
+            )
+        if conditional_parents:
+            continue  # Routed by the parent's conditional edge
+        if len(parents) == 1:
+            workflow.add_edge(parents[0], name)
+        else:
+            workflow.add_edge(parents, name)
+
+    for name in dag:
+        forward = successors[name] or [END]
+        if name not in looping:
+            if not successors[name]:
+                workflow.add_edge(name, END)
+            continue
+
+        target, loop = looping[name]
+
+        def _route(state: IRGenerationState, _loop=loop, _forward=forward, _target=target, _name=name):
+            if _loop.proceed(state):
+                return _forward
+            logger.info(f"[LangGraph] {_name}: looping back to {_target}")
+            return _target
+
+        workflow.add_conditional_edges(name, _route, [*forward, target])
+
+    logger.debug(
+        f"Built Phase {phase} graph from registry DAG: "
+        + ", ".join(f"{name}<-{parents}" for name, parents in dag.items())
+    )
+
+    checkpointer = MemorySaver()
+    return workflow.compile(checkpointer=checkpointer)
@@ -20,6 +20,7 @@ from .validators import (
     validate_constraints_satisfiable,
     validate_generation_strategies_complete,
 )
+from NL2DATA.ir.schema_index import get_schema_index
 from NL2DATA.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -39,15 +40,16 @@ def check_phase_1_gate(state: Dict[str, Any]) -> GateResult:
     
     entities = state.get("entities", [])
     relations = state.get("relations", [])
+    schema = get_schema_index(state)
     
     # Check entity names
     issues.extend(validate_entity_names(entities))
     
     # Check for duplicates
-    issues.extend(validate_no_duplicate_entities(entities))
+    issues.extend(validate_no_duplicate_entities(entities, schema=schema))
     
     # Check relations reference existing entities
-    issues.extend(validate_relations_reference_entities(relations, entities))
+    issues.extend(validate_relations_reference_entities(relations, entities, schema=schema))
     
     # Check connectivity (warnings only - orphans may be intentional)
     metadata = state.get("metadata", {})
@@ -83,15 +85,16 @@ def check_phase_2_gate(state: Dict[str, Any]) -> GateResult:
     attributes = state.get("attributes", {})
     primary_keys = state.get("primary_keys", {})
     foreign_keys = state.get("foreign_keys", [])
+    schema = get_schema_index(state)
     
     # Check all entities have attributes
-    issues.extend(validate_attributes_exist_for_entities(attributes, entities))
+    issues.extend(validate_attributes_exist_for_entities(attributes, entities, schema=schema))
     
     # Check primary keys exist
-    issues.extend(validate_primary_keys_exist(primary_keys, attributes))
+    issues.extend(validate_primary_keys_exist(primary_keys, attributes, schema=schema))
     
     # Check foreign keys reference existing PKs
-    issues.extend(validate_foreign_keys_reference_existing_pks(foreign_keys, primary_keys))
+    issues.extend(validate_foreign_keys_reference_existing_pks(foreign_keys, primary_keys, schema=schema))
     
     passed = len(issues) == 0
     
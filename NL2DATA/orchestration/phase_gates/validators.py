@@ -3,9 +3,10 @@
 Each validator checks a specific aspect of schema integrity.
 """
 
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Optional
 import re
 
+from NL2DATA.ir.schema_index import SchemaIndex, item_field, item_name
 from NL2DATA.utils.dsl.analysis import dsl_identifiers_used
 from NL2DATA.utils.dsl.validator import validate_dsl_expression
 
@@ -23,7 +24,7 @@ def validate_entity_names(entities: List[Dict[str, Any]]) -> List[str]:
     }
     
     for entity in entities:
-        name = entity.get("name", "") if isinstance(entity, dict) else getattr(entity, "name", "")
+        name = item_name(entity)
         if not name:
             issues.append(f"Entity has empty name: {entity}")
             continue
@@ -39,43 +40,29 @@ def validate_entity_names(entities: List[Dict[str, Any]]) -> List[str]:
     return issues
 
 
-def validate_no_duplicate_entities(entities: List[Dict[str, Any]]) -> List[str]:
-    """Check for duplicate entity names."""
-    issues = []
-    seen_names: Set[str] = set()
-    
-    for entity in entities:
-        name = entity.get("name", "") if isinstance(entity, dict) else getattr(entity, "name", "")
-        if not name:
-            continue
-        
-        name_lower = name.lower()
-        if name_lower in seen_names:
-            issues.append(f"Duplicate entity name: '{name}'")
-        seen_names.add(name_lower)
-    
-    return issues
+def validate_no_duplicate_entities(
+    entities: List[Dict[str, Any]],
+    schema: Optional[SchemaIndex] = None
+) -> List[str]:
+    """Check for duplicate entity names (case-insensitive)."""
+    schema = schema or SchemaIndex.build(entities=entities)
+    return [f"Duplicate entity name: '{name}'" for name in schema.duplicate_entity_names]
 
 
 def validate_relations_reference_entities(
     relations: List[Dict[str, Any]],
-    entities: List[Dict[str, Any]]
+    entities: List[Dict[str, Any]],
+    schema: Optional[SchemaIndex] = None
 ) -> List[str]:
     """Verify all relations reference existing entities."""
     issues = []
-    
-    # Get entity names
-    entity_names = set()
-    for entity in entities:
-        name = entity.get("name", "") if isinstance(entity, dict) else getattr(entity, "name", "")
-        if name:
-            entity_names.add(name.lower())
+    schema = schema or SchemaIndex.build(entities=entities)
     
     # Check relations
     for relation in relations:
-        rel_entities = relation.get("entities", []) if isinstance(relation, dict) else getattr(relation, "entities", [])
+        rel_entities = item_field(relation, "entities", [])
         for entity_name in rel_entities:
-            if entity_name.lower() not in entity_names:
+            if not schema.has_entity(entity_name, case_sensitive=False):
                 issues.append(f"Relation references non-existent entity: '{entity_name}'")
     
     return issues
@@ -83,18 +70,14 @@ def validate_relations_reference_entities(
 
 def validate_attributes_exist_for_entities(
     attributes: Dict[str, List[Dict[str, Any]]],
-    entities: List[Dict[str, Any]]
+    entities: List[Dict[str, Any]],
+    schema: Optional[SchemaIndex] = None
 ) -> List[str]:
     """Verify all entities have at least one attribute."""
     issues = []
+    schema = schema or SchemaIndex.build(entities=entities)
     
-    entity_names = set()
-    for entity in entities:
-        name = entity.get("name", "") if isinstance(entity, dict) else getattr(entity, "name", "")
-        if name:
-            entity_names.add(name)
-    
-    for entity_name in entity_names:
+    for entity_name in schema.entity_names:
         if entity_name not in attributes or not attributes[entity_name]:
             issues.append(f"Entity '{entity_name}' has no attributes")
     
@@ -103,10 +86,12 @@ def validate_attributes_exist_for_entities(
 
 def validate_primary_keys_exist(
     primary_keys: Dict[str, List[str]],
-    attributes: Dict[str, List[Dict[str, Any]]]
+    attributes: Dict[str, List[Dict[str, Any]]],
+    schema: Optional[SchemaIndex] = None
 ) -> List[str]:
     """Verify all entities have primary keys and PK attributes exist."""
     issues = []
+    schema = schema or SchemaIndex.build(attributes=attributes)
     
     for entity_name, pk_attrs in primary_keys.items():
         if not pk_attrs:
@@ -114,15 +99,8 @@ def validate_primary_keys_exist(
             continue
         
         # Check PK attributes exist
-        entity_attrs = attributes.get(entity_name, [])
-        attr_names = set()
-        for attr in entity_attrs:
-            name = attr.get("name", "") if isinstance(attr, dict) else getattr(attr, "name", "")
-            if name:
-                attr_names.add(name.lower())
-        
         for pk_attr in pk_attrs:
-            if pk_attr.lower() not in attr_names:
+            if not schema.has_attribute(entity_name, pk_attr, case_sensitive=False):
                 issues.append(f"Primary key attribute '{pk_attr}' does not exist for entity '{entity_name}'")
     
     return issues
@@ -130,15 +108,16 @@ def validate_primary_keys_exist(
 
 def validate_foreign_keys_reference_existing_pks(
     foreign_keys: List[Dict[str, Any]],
-    primary_keys: Dict[str, List[str]]
+    primary_keys: Dict[str, List[str]],
+    schema: Optional[SchemaIndex] = None
 ) -> List[str]:
     """Verify foreign keys reference existing primary keys."""
     issues = []
+    schema = schema or SchemaIndex.build(foreign_keys=foreign_keys)
     
-    for fk in foreign_keys:
-        from_entity = fk.get("from_entity", "") if isinstance(fk, dict) else getattr(fk, "from_entity", "")
-        to_entity = fk.get("to_entity", "") if isinstance(fk, dict) else getattr(fk, "to_entity", "")
-        to_attrs = fk.get("to_attributes", []) if isinstance(fk, dict) else getattr(fk, "to_attributes", [])
+    for fk in schema.foreign_keys:
+        from_entity, to_entity = fk.from_entity, fk.to_entity
+        to_attrs = list(fk.to_attributes)
         
         if to_entity not in primary_keys:
             issues.append(f"Foreign key references entity '{to_entity}' with no primary key")
@@ -157,17 +136,15 @@ def validate_foreign_keys_reference_existing_pks(
 
 def validate_derived_dependencies_exist(
     attributes: Dict[str, List[Dict[str, Any]]],
-    derived_formulas: Dict[str, Dict[str, Any]]
+    derived_formulas: Dict[str, Dict[str, Any]],
+    schema: Optional[SchemaIndex] = None
 ) -> List[str]:
     """Verify derived attribute dependencies exist."""
     issues = []
+    schema = schema or SchemaIndex.build(attributes=attributes)
     
-    for entity_name, attrs in attributes.items():
-        for attr in attrs:
-            attr_name = attr.get("name", "") if isinstance(attr, dict) else getattr(attr, "name", "")
-            if not attr_name:
-                continue
-            
+    for entity_name in schema.attributed_entities:
+        for attr_name in schema.attribute_names(entity_name):
             # Check if this is a derived attribute
             key = f"{entity_name}.{attr_name}"
             formula_info = derived_formulas.get(key, {})
@@ -176,11 +153,9 @@ def validate_derived_dependencies_exist(
             
             # Get dependencies
             dependencies = formula_info.get("dependencies", [])
-            attr_names = {a.get("name", "").lower() if isinstance(a, dict) else getattr(a, "name", "").lower() 
-                         for a in attrs}
             
             for dep in dependencies:
-                if dep.lower() not in attr_names:
+                if not schema.has_attribute(entity_name, dep, case_sensitive=False):
                     issues.append(
                         f"Derived attribute '{entity_name}.{attr_name}' depends on "
                         f"non-existent attribute '{dep}'"
@@ -192,6 +167,7 @@ def validate_derived_dependencies_exist(
 def validate_derived_formula_dependencies_match_formula(
     attributes: Dict[str, List[Dict[str, Any]]],
     derived_formulas: Dict[str, Dict[str, Any]],
+    schema: Optional[SchemaIndex] = None,
 ) -> List[str]:
     """Verify formula identifiers are entity-local and match the declared dependencies list.
 
@@ -201,17 +177,7 @@ def validate_derived_formula_dependencies_match_formula(
       `dependencies` returned by the LLM.
     """
     issues: List[str] = []
-
-    # Build entity -> set(attr_names_lower)
-    entity_attr_names: Dict[str, Set[str]] = {}
-    for entity_name, attrs in (attributes or {}).items():
-        s: Set[str] = set()
-        if isinstance(attrs, list):
-            for a in attrs:
-                n = a.get("name", "") if isinstance(a, dict) else getattr(a, "name", "")
-                if n:
-                    s.add(str(n).lower())
-        entity_attr_names[entity_name] = s
+    schema = schema or SchemaIndex.build(attributes=attributes)
 
     for key, info in (derived_formulas or {}).items():
         if not isinstance(key, str) or "." not in key:
@@ -220,7 +186,7 @@ def validate_derived_formula_dependencies_match_formula(
             continue
 
         entity_name, attr_name = key.split(".", 1)
-        allowed = entity_attr_names.get(entity_name, set())
+        allowed = schema.attribute_name_set(entity_name, case_sensitive=False)
 
         formula = (info.get("formula") or "").strip()
         if not formula:
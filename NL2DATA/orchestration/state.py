@@ -9,6 +9,18 @@ from typing import TypedDict, Annotated, List, Dict, Optional, Any
 from operator import add, or_
 
 
+def _last_value(_current: Any, new: Any) -> Any:
+    """Reducer that keeps the most recent write (allows concurrent writers)."""
+    return new
+
+
+def _max_value(current: Any, new: Any) -> Any:
+    """Reducer that keeps the largest write (e.g. the furthest phase reached)."""
+    if current is None:
+        return new
+    return max(current, new)
+
+
 class IRGenerationState(TypedDict, total=False):
     """Centralized state for IR generation workflow.
     
@@ -23,8 +35,10 @@ class IRGenerationState(TypedDict, total=False):
     nl_description: str  # Original natural language description
     
     # Phase tracking
-    phase: int  # Current phase (1-7)
-    current_step: str  # Current step identifier (e.g., "1.4")
+    # Independent phases (e.g. 7 and 8) may run concurrently; keep the furthest one.
+    phase: Annotated[int, _max_value]  # Current phase (1-9)
+    # Parallel nodes (registry DAG scheduling) may both report their step in the same tick.
+    current_step: Annotated[str, _last_value]  # Current step identifier (e.g., "1.4")
     
     # Phase 1: Domain & Entity Discovery
     domain: Optional[str]  # Detected or inferred domain
@@ -49,6 +63,9 @@ class IRGenerationState(TypedDict, total=False):
     derived_metrics: Dict[str, Dict[str, Any]]
     # Optional composite decomposition DSLs (Phase 2.4)
     composite_decompositions: Dict[str, Any]
+    # Multivalued/derived detection (Phase 2.8), consumed by derived formulas (Phase 2.9)
+    multivalued_derived: Dict[str, Dict[str, Any]]  # entity -> multivalued/derived result
+    entity_derived_attributes: Dict[str, List[str]]  # entity -> derived attribute names
     
     # Phase 3: Query Requirements & Schema Refinement
     information_needs: Annotated[List[Dict[str, Any]], add]  # Accumulated information needs
@@ -73,7 +90,9 @@ class IRGenerationState(TypedDict, total=False):
     # Metadata & Tracking
     errors: Annotated[List[Dict[str, Any]], add]  # Accumulated errors
     warnings: Annotated[List[str], add]  # Accumulated warnings
-    previous_answers: Dict[str, Any]  # Answers from previous steps (for context)
+    # Answers from previous steps (for context), keyed by step number.
+    # Merged with dict union so parallel steps can each add their own answer.
+    previous_answers: Annotated[Dict[str, Any], or_]
     # Flexible metadata storage.
     # IMPORTANT: This must be mergeable because parallel nodes may write to metadata in the same tick.
     # We use dict union (operator.or_) to merge dictionaries.
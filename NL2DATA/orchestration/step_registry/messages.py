@@ -16,6 +16,7 @@ STEP_MESSAGE_TEMPLATES = {
     "P1_S5_RELATION_MENTION": "Identifying explicitly stated relations",
     "P1_S6_AUXILIARY_ENTITIES": "Suggesting auxiliary/supporting entities",
     "P1_S7_ENTITY_CONSOLIDATION": "Consolidating and deduplicating entities",
+    "P1_S7A_ENTITY_ATTRIBUTE_GUARDRAIL": "Filtering attribute-like entity candidates",
     "P1_S7B_ENTITY_RECLASSIFICATION": "Reclassifying entities vs relations",
     "P1_S8_ENTITY_CARDINALITY": "Determining cardinality and table type for {entity}",
     "P1_S9_KEY_RELATIONS": "Extracting key relations among entities",
@@ -38,6 +39,8 @@ STEP_MESSAGE_TEMPLATES = {
     "P2_S12_DEFAULT_VALUES": "Defining default values for {entity}",
     "P2_S13_CHECK_CONSTRAINTS": "Defining check constraints for {entity}",
     "P2_S14_RELATION_REALIZATION": "Realizing relation {relation} as foreign keys",
+    "P2_S15_RELATION_INTRINSIC_ATTRIBUTES": "Identifying intrinsic attributes for relation {relation}",
+    "P2_S16_CROSS_ENTITY_RECONCILIATION": "Reconciling attributes across entities for {entity}",
     
     # Phase 3: Query Requirements & Schema Refinement
     "P3_S1_INFORMATION_NEEDS": "Identifying information needs",
@@ -85,6 +85,18 @@ PHASE_1_STEPS: Dict[str, StepDefinition] = {
         dependencies=["P1_S4_KEY_ENTITY_EXTRACTION", "P1_S5_RELATION_MENTION", "P1_S6_AUXILIARY_ENTITIES"],
         avg_tokens_per_call=2500,
     ),
+    "P1_S7A_ENTITY_ATTRIBUTE_GUARDRAIL": StepDefinition(
+        step_id="P1_S7A_ENTITY_ATTRIBUTE_GUARDRAIL",
+        phase=1,
+        step_number="1.76",
+        name="Entity vs Attribute Guardrail",
+        step_type=StepType.DETERMINISTIC,
+        call_type=CallType.SINGULAR,
+        fanout_unit="",
+        can_parallelize=False,
+        dependencies=["P1_S7_ENTITY_CONSOLIDATION"],
+        avg_tokens_per_call=0,
+    ),
     "P1_S7B_ENTITY_RECLASSIFICATION": StepDefinition(
         step_id="P1_S7B_ENTITY_RECLASSIFICATION",
         phase=1,
@@ -94,7 +106,7 @@ PHASE_1_STEPS: Dict[str, StepDefinition] = {
         call_type=CallType.SINGULAR,
         fanout_unit="",
         can_parallelize=False,
-        dependencies=["P1_S7_ENTITY_CONSOLIDATION"],
+        dependencies=["P1_S7A_ENTITY_ATTRIBUTE_GUARDRAIL"],
         avg_tokens_per_call=2000,
     ),
     "P1_S8_ENTITY_CARDINALITY": StepDefinition(
@@ -142,7 +154,8 @@ PHASE_1_STEPS: Dict[str, StepDefinition] = {
         call_type=CallType.PER_RELATION,
         fanout_unit="relation",
         can_parallelize=True,
-        dependencies=["P1_S9_KEY_RELATIONS"],
+        # After connectivity: Step 1.10 may loop back to 1.9 and replace the relations
+        dependencies=["P1_S9_KEY_RELATIONS", "P1_S10_SCHEMA_CONNECTIVITY"],
         avg_tokens_per_call=2000,
     ),
     "P1_S12_RELATION_VALIDATION": StepDefinition(
@@ -210,7 +223,8 @@ PHASE_2_STEPS: Dict[str, StepDefinition] = {
         call_type=CallType.PER_ENTITY,
         fanout_unit="entity",
         can_parallelize=True,
-        dependencies=["P2_S3_ATTRIBUTE_SYNONYM"],
+        # Reads the validated attribute names only; independent of 2.5/2.7/2.15
+        dependencies=["P2_S6_NAMING_VALIDATION"],
         avg_tokens_per_call=1500,
     ),
     "P2_S5_TEMPORAL_ATTRIBUTES": StepDefinition(
@@ -222,7 +236,7 @@ PHASE_2_STEPS: Dict[str, StepDefinition] = {
         call_type=CallType.PER_ENTITY,
         fanout_unit="entity",
         can_parallelize=True,
-        dependencies=["P2_S4_COMPOSITE_ATTRIBUTES"],
+        dependencies=["P2_S6_NAMING_VALIDATION"],
         avg_tokens_per_call=1200,
     ),
     "P2_S6_NAMING_VALIDATION": StepDefinition(
@@ -234,7 +248,7 @@ PHASE_2_STEPS: Dict[str, StepDefinition] = {
         call_type=CallType.SINGULAR,
         fanout_unit="",
         can_parallelize=False,
-        dependencies=["P2_S5_TEMPORAL_ATTRIBUTES"],
+        dependencies=["P2_S16_CROSS_ENTITY_RECONCILIATION"],
         avg_tokens_per_call=0,
     ),
     "P2_S7_PRIMARY_KEY": StepDefinition(
@@ -246,7 +260,7 @@ PHASE_2_STEPS: Dict[str, StepDefinition] = {
         call_type=CallType.PER_ENTITY,
         fanout_unit="entity",
         can_parallelize=True,
-        dependencies=["P2_S3_ATTRIBUTE_SYNONYM"],
+        dependencies=["P2_S6_NAMING_VALIDATION"],
         avg_tokens_per_call=2000,
     ),
     "P2_S8_MULTIVALUED_DERIVED": StepDefinition(
@@ -258,7 +272,7 @@ PHASE_2_STEPS: Dict[str, StepDefinition] = {
         call_type=CallType.PER_ENTITY,
         fanout_unit="entity",
         can_parallelize=True,
-        dependencies=["P2_S3_ATTRIBUTE_SYNONYM"],
+        dependencies=["P2_S7_PRIMARY_KEY"],
         avg_tokens_per_call=2000,
     ),
     "P2_S9_DERIVED_FORMULAS": StepDefinition(
@@ -333,6 +347,30 @@ PHASE_2_STEPS: Dict[str, StepDefinition] = {
         dependencies=["P2_S7_PRIMARY_KEY", "P1_S11_RELATION_CARDINALITY"],
         avg_tokens_per_call=2500,
     ),
+    "P2_S15_RELATION_INTRINSIC_ATTRIBUTES": StepDefinition(
+        step_id="P2_S15_RELATION_INTRINSIC_ATTRIBUTES",
+        phase=2,
+        step_number="2.15",
+        name="Relation Intrinsic Attributes",
+        step_type=StepType.LLM,
+        call_type=CallType.PER_RELATION,
+        fanout_unit="relation",
+        can_parallelize=True,
+        dependencies=["P2_S6_NAMING_VALIDATION"],
+        avg_tokens_per_call=2000,
+    ),
+    "P2_S16_CROSS_ENTITY_RECONCILIATION": StepDefinition(
+        step_id="P2_S16_CROSS_ENTITY_RECONCILIATION",
+        phase=2,
+        step_number="2.16",
+        name="Cross-Entity Attribute Reconciliation",
+        step_type=StepType.LLM,
+        call_type=CallType.PER_ENTITY,
+        fanout_unit="entity",
+        can_parallelize=True,
+        dependencies=["P2_S3_ATTRIBUTE_SYNONYM"],
+        avg_tokens_per_call=2500,
+    ),
 }
 
 
@@ -668,7 +706,7 @@ PHASE_9_STEPS: Dict[str, StepDefinition] = {
         call_type=CallType.SINGULAR,
         fanout_unit="",
         can_parallelize=False,
-        dependencies=["P9_S1_NUMERICAL_RANGE"],
+        dependencies=["P8_S8_CONSTRAINT_COMPILATION"],
         avg_tokens_per_call=1500,
     ),
     "P9_S3_BOOLEAN_DEPENDENCY": StepDefinition(
@@ -680,7 +718,7 @@ PHASE_9_STEPS: Dict[str, StepDefinition] = {
         call_type=CallType.SINGULAR,
         fanout_unit="",
         can_parallelize=False,
-        dependencies=["P9_S2_TEXT_GEN_STRATEGY"],
+        dependencies=["P8_S8_CONSTRAINT_COMPILATION"],
         avg_tokens_per_call=1500,
     ),
     "P9_S4_DATA_VOLUME": StepDefinition(
@@ -1,7 +1,39 @@
 """Phase 11: Final Table Generation.
 
-This phase will handle the final table generation from the complete metadata.
-Currently empty - to be implemented later.
+Generates the actual table data from the complete metadata: the Phase 4
+relational schema plus the Phase 9 generation specs (column strategies and
+entity volumes). Tables are produced column-wise in NumPy batches, kept
+foreign-key consistent, and written to Parquet, CSV or SQLite.
 """
 
-__all__ = []
+from .column_specs import resolve_column_strategies, sql_kind, strategy_from_column_spec
+from .engine import (
+    ColumnPlan,
+    DataGenerationEngine,
+    ForeignKeyPlan,
+    TablePlan,
+)
+from .parallel import ParallelTableGenerator
+from .writers import (
+    CSVTableWriter,
+    ParquetTableWriter,
+    SQLiteTableWriter,
+    TableWriter,
+    create_table_writer,
+)
+
+__all__ = [
+    "DataGenerationEngine",
+    "TablePlan",
+    "ColumnPlan",
+    "ForeignKeyPlan",
+    "ParallelTableGenerator",
+    "TableWriter",
+    "CSVTableWriter",
+    "SQLiteTableWriter",
+    "ParquetTableWriter",
+    "create_table_writer",
+    "resolve_column_strategies",
+    "strategy_from_column_spec",
+    "sql_kind",
+]
@@ -0,0 +1,142 @@
+"""Resolve Phase 9 column generation specs into generation strategies.
+
+Step 9.6 emits one ColumnGenSpec per column. Its `strategy_data` carries the
+strategy in the shape produced by Steps 9.1-9.3 and 8.3:
+- numerical:   {"distribution": {"type": "normal", "parameters": {...}, "range": {"min": 0, "max": 10}}}
+- text:        {"provider": {"type": "faker.name", "parameters": {...}, "fallback": {...}}}
+- boolean:     {"distribution": {"type": "bernoulli", "parameters": {"p_true": 0.3}}}
+- categorical: {"distribution": {"type": "categorical", "values": [...], "weights": [...]}}
+
+Strategy types map onto the Phase 9 tool catalog ("normal" -> generate_normal,
+"faker.name" -> generate_faker_name), so every strategy in TOOL_TO_STRATEGY_MAP
+can be referenced from a spec.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from NL2DATA.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Value kinds used by the generation engine and writers
+KIND_INTEGER = "integer"
+KIND_FLOAT = "float"
+KIND_BOOLEAN = "boolean"
+KIND_DATE = "date"
+KIND_TIMESTAMP = "timestamp"
+KIND_TIME = "time"
+KIND_TEXT = "text"
+
+
+def sql_kind(sql_type: Optional[str]) -> str:
+    """
+    Classify a SQL type (or Phase 2 type hint) into a value kind.
+
+    Args:
+        sql_type: SQL type such as "VARCHAR(255)", "DECIMAL(12,2)" or a hint such as "integer"
+
+    Returns:
+        One of the KIND_* constants (KIND_TEXT when unknown)
+    """
+    t = (sql_type or "").strip().lower()
+    if t.startswith(("tinyint(1)", "bool", "bit")):
+        return KIND_BOOLEAN
+    if t.startswith(("int", "bigint", "smallint", "tinyint", "mediumint", "serial", "bigserial")):
+        return KIND_INTEGER
+    if t.startswith(("decimal", "numeric", "float", "real", "double", "money", "number")):
+        return KIND_FLOAT
+    if t.startswith(("timestamp", "datetime")):
+        return KIND_TIMESTAMP
+    if t.startswith("date"):
+        return KIND_DATE
+    if t.startswith("time"):
+        return KIND_TIME
+    return KIND_TEXT
+
+
+def _spec_fields(spec: Any) -> Tuple[str, str, str, Dict[str, Any]]:
+    if hasattr(spec, "model_dump"):
+        spec = spec.model_dump()
+    return (
+        spec.get("table", ""),
+        spec.get("column", ""),
+        spec.get("type", ""),
+        spec.get("strategy_data") or {},
+    )
+
+
+def _tool_args(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten {"parameters": {...}, "range": {...}} into strategy constructor arguments."""
+    args = dict(config.get("parameters") or {})
+    value_range = config.get("range") or {}
+    for bound in ("min", "max"):
+        if value_range.get(bound) is not None:
+            args.setdefault(bound, value_range[bound])
+    return args
+
+
+def _categorical_pmf(values: List[Any], weights: Optional[List[float]]) -> Dict[str, float]:
+    if not weights or len(weights) != len(values):
+        weights = [1.0] * len(values)
+    total = float(sum(weights)) or 1.0
+    pmf: Dict[str, float] = {}
+    for value, weight in zip(values, weights):
+        pmf[str(value)] = pmf.get(str(value), 0.0) + weight / total
+    return pmf
+
+
+def strategy_from_column_spec(spec: Any) -> Optional[Any]:
+    """
+    Build the generation strategy for one ColumnGenSpec.
+
+    Args:
+        spec: ColumnGenSpec (model or dict)
+
+    Returns:
+        BaseGenerationStrategy instance, or None if the spec cannot be resolved
+        (the engine then falls back to a type-based default)
+    """
+    # Imported lazily: the strategy modules pull in Faker/Mimesis/rstr
+    from NL2DATA.phases.phase9.strategies.distributions import CategoricalDistribution
+    from NL2DATA.phases.phase9.tools.mapping import create_strategy_from_tool_call
+
+    table, column, spec_type, data = _spec_fields(spec)
+    config = data.get("distribution") or data.get("provider") or {}
+
+    if spec_type == "categorical" or config.get("type") == "categorical":
+        values = config.get("values") or data.get("values") or []
+        if not values:
+            return None
+        return CategoricalDistribution(pmf=_categorical_pmf(values, config.get("weights")))
+
+    candidates = [config, config.get("fallback")] if config else []
+    for candidate in candidates:
+        if not isinstance(candidate, dict) or not candidate.get("type"):
+            continue
+        tool_name = "generate_" + str(candidate["type"]).lower().replace(".", "_")
+        try:
+            return create_strategy_from_tool_call(tool_name, _tool_args(candidate))
+        except ValueError as e:
+            logger.warning(f"Cannot use strategy {candidate['type']!r} for {table}.{column}: {e}")
+    return None
+
+
+def resolve_column_strategies(column_gen_specs: List[Any]) -> Dict[Tuple[str, str], Any]:
+    """
+    Resolve all ColumnGenSpecs into strategies.
+
+    Args:
+        column_gen_specs: Step 9.6 column generation specs (models or dicts)
+
+    Returns:
+        Mapping (table, column) -> strategy, for the specs that could be resolved
+    """
+    strategies: Dict[Tuple[str, str], Any] = {}
+    for spec in column_gen_specs or []:
+        table, column, _, _ = _spec_fields(spec)
+        if not table or not column:
+            continue
+        strategy = strategy_from_column_spec(spec)
+        if strategy is not None:
+            strategies[(table, column)] = strategy
+    return strategies
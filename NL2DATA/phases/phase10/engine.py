@@ -0,0 +1,812 @@
+"""Columnar bulk data generation from Phase 9 generation specs.
+
+`DataGenerationEngine` turns the Phase 4 relational schema plus the Step 9.6
+output (column generation specs and entity volumes) into table data:
+
+- Tables are generated in column batches of NumPy arrays (`batch_size` rows at a
+  time) and streamed to a `TableWriter` (Parquet, CSV or SQLite), so memory is
+  bounded by one batch rather than one table.
+- A single primary key column that is not a foreign key gets surrogate keys 1..N.
+  Keys made only of foreign keys (junction tables) are drawn without replacement
+  from the parents' key combinations. Other keys (e.g. multivalued attribute
+  tables) are generated as values and duplicate keys are dropped.
+- Foreign keys sample parent rows, so every reference points at a generated
+  row. Foreign keys that must be unique (1:1 relationships) are drawn without
+  replacement.
+- Other unique columns (`unique_constraints`, `is_unique`) use their pooled
+  strategy's distinct draws where it has enough combinations (per-value
+  generation otherwise); rows that still repeat a unique value are dropped, and
+  SQLite tables declare the constraints.
+- Derived columns with a Step 2.9 formula are computed from the batch's other
+  columns by the vectorized DSL evaluator (formulas compiled once per table).
+- Every other column uses its ColumnGenSpec strategy, or a type-based default
+  when Phase 9 produced no spec for it (e.g. constrained columns).
+
+Only key columns that other tables reference are kept in memory, and not even
+those for surrogate keys, which are a function of the row index. Deduplicated
+keys cost 8 bytes per kept row (a sorted NumPy array of 64-bit key hashes).
+
+Every batch is seeded from (seed, table, batch index), so ranges of batches can
+be generated independently; `parallel.ParallelTableGenerator` uses this to fan
+tables out across processes with output identical to sequential generation.
+"""
+
+from dataclasses import dataclass, field
+from graphlib import CycleError, TopologicalSorter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import zlib
+
+import numpy as np
+
+from NL2DATA.utils.logging import get_logger
+from NL2DATA.utils.dsl.evaluator import DSLEvaluationError, compile_dsl_expression
+from NL2DATA.utils.dsl.sql_compiler import DIALECT_SQLITE, DSLSQLCompilationError, update_sql
+from NL2DATA.phases.phase10.column_specs import (
+    KIND_BOOLEAN,
+    KIND_DATE,
+    KIND_FLOAT,
+    KIND_INTEGER,
+    KIND_TEXT,
+    KIND_TIME,
+    KIND_TIMESTAMP,
+    resolve_column_strategies,
+    sql_kind,
+)
+from NL2DATA.phases.phase10.writers import TableWriter, create_table_writer
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 100_000
+DEFAULT_ROWS = 1000
+
+# How a table's primary key is produced
+KEY_SURROGATE = "surrogate"  # Single non-FK column: 1..N
+KEY_FOREIGN = "foreign"  # Only FK columns: unique parent combinations
+KEY_NATURAL = "natural"  # Anything else (or no key): generated values, duplicates dropped
+
+# Range for default date/timestamp values
+_DEFAULT_DATE_RANGE = (np.datetime64("2015-01-01"), np.datetime64("2025-01-01"))
+
+
+@dataclass
+class ForeignKeyPlan:
+    """A foreign key to be filled by sampling parent rows."""
+    columns: List[str]
+    parent: str
+    parent_columns: List[str]
+    unique: bool = False
+
+
+@dataclass
+class ColumnPlan:
+    """A non-key column and how its values are produced."""
+    name: str
+    sql_type: str
+    kind: str
+    scale: Optional[int] = None
+    strategy: Optional[Any] = None  # BaseGenerationStrategy; None -> type-based default
+    formula: Optional[Any] = None  # CompiledExpression over the batch; takes precedence over strategy
+    unique: bool = False  # Single-column unique constraint
+
+
+@dataclass
+class TablePlan:
+    """Generation plan for one table."""
+    name: str
+    rows: int
+    columns: List[str]
+    column_kinds: Dict[str, str]
+    primary_key: List[str]
+    key_mode: str
+    foreign_keys: List[ForeignKeyPlan] = field(default_factory=list)
+    value_columns: List[ColumnPlan] = field(default_factory=list)
+    referenced_columns: Set[str] = field(default_factory=set)
+    unique_constraints: List[List[str]] = field(default_factory=list)
+
+
+def _as_dict(obj: Any) -> Any:
+    return obj.model_dump() if hasattr(obj, "model_dump") else obj
+
+
+def _volume_rows(volume: Any) -> Optional[int]:
+    """Row count from a Step 9.4 volume spec (EntityVolumeSpec, dict or int)."""
+    volume = _as_dict(volume)
+    if isinstance(volume, (int, float)):
+        return int(volume)
+    if isinstance(volume, dict):
+        for key in ("expected_rows", "rows", "max_rows", "min_rows"):
+            if volume.get(key) is not None:
+                return int(volume[key])
+    return None
+
+
+def _stable_id(name: str) -> int:
+    return zlib.crc32(name.encode("utf-8"))
+
+
+def _key_hashes(batch: Dict[str, np.ndarray], columns: List[str]) -> np.ndarray:
+    """64-bit key per row: the value itself for one integer-like column, otherwise a hash of the row's values."""
+    values = batch[columns[0]]
+    if len(columns) == 1:
+        if values.dtype.kind in "iub" or np.issubdtype(values.dtype, np.datetime64):
+            return values.astype(np.int64)
+        return np.fromiter((hash(v) for v in values.tolist()), dtype=np.int64, count=len(values))
+    rows = zip(*(batch[c].tolist() for c in columns))
+    return np.fromiter((hash(row) for row in rows), dtype=np.int64, count=len(values))
+
+
+class _KeyHashSet:
+    """
+    Set of 64-bit key hashes held as sorted NumPy runs (8 bytes per key).
+
+    Runs are merged like a binary counter, so there are O(log n) runs and
+    adding n keys costs O(n log n) overall.
+    """
+
+    def __init__(self) -> None:
+        self._runs: List[np.ndarray] = []
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        """Boolean mask of the keys already in the set."""
+        found = np.zeros(len(keys), dtype=bool)
+        for run in self._runs:
+            index = np.minimum(np.searchsorted(run, keys), len(run) - 1)
+            found |= run[index] == keys
+        return found
+
+    def add(self, keys: np.ndarray) -> None:
+        """Add distinct keys that are not in the set yet."""
+        if not len(keys):
+            return
+        run = np.sort(keys)
+        while self._runs and len(self._runs[-1]) <= len(run):
+            run = np.sort(np.concatenate([self._runs.pop(), run]), kind="mergesort")
+        self._runs.append(run)
+
+
+class DataGenerationEngine:
+    """
+    Generate FK-consistent tables from a relational schema and Phase 9 generation specs.
+
+    Usage:
+        engine = DataGenerationEngine(relational_schema, column_gen_specs, entity_volumes, seed=7)
+        row_counts = engine.generate_to("parquet", "out/")
+    """
+
+    def __init__(
+        self,
+        relational_schema: Any,
+        column_gen_specs: Optional[List[Any]] = None,
+        entity_volumes: Optional[Dict[str, Any]] = None,
+        data_types: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+        *,
+        seed: int = 0,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        default_rows: int = DEFAULT_ROWS,
+        row_counts: Optional[Dict[str, int]] = None,
+        derived_formulas: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize the engine and build the generation plan.
+
+        Args:
+            relational_schema: Phase 4 relational schema ({"tables": [...]} or RelationalSchema)
+            column_gen_specs: Step 9.6 column generation specs
+            entity_volumes: Step 9.4 volumes (table -> EntityVolumeSpec/dict/int)
+            data_types: Phase 5 data types (table -> column -> {"type", "size", "precision", "scale"})
+            seed: Seed for all random generation (same seed -> same data)
+            batch_size: Rows per column batch
+            default_rows: Row count for tables without a volume spec
+            row_counts: Optional per-table row count overrides
+            derived_formulas: Step 2.9 formulas ("Table.column" -> {"formula": ...} or formula string)
+
+        Raises:
+            ValueError: If foreign keys form a cycle that cannot be generated
+        """
+        self.seed = seed
+        self.batch_size = max(1, batch_size)
+        self.default_rows = default_rows
+        self._strategies = resolve_column_strategies(column_gen_specs or [])
+        self._formulas = self._resolve_formulas(derived_formulas or {})
+        self.plans: Dict[str, TablePlan] = self._build_plans(
+            relational_schema, entity_volumes or {}, data_types or {}, row_counts or {}
+        )
+        self.order: List[str] = self._generation_order()
+        self._apply_row_caps()
+
+        self._stored_keys: Dict[str, Dict[str, np.ndarray]] = {}
+        self._generated_rows: Dict[str, int] = {}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], **kwargs: Any) -> "DataGenerationEngine":
+        """
+        Create an engine from pipeline state (after Phase 9).
+
+        Args:
+            state: IRGenerationState (uses metadata.relational_schema, metadata.column_gen_specs,
+                metadata.entity_volumes, data_types and derived_formulas)
+            **kwargs: Passed to the constructor (seed, batch_size, ...)
+        """
+        metadata = state.get("metadata", {}) or {}
+        return cls(
+            metadata.get("relational_schema", {}),
+            column_gen_specs=metadata.get("column_gen_specs", []),
+            entity_volumes=metadata.get("entity_volumes", {}),
+            data_types=state.get("data_types", {}),
+            derived_formulas=state.get("derived_formulas", {}),
+            **kwargs,
+        )
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def _build_plans(
+        self,
+        relational_schema: Any,
+        entity_volumes: Dict[str, Any],
+        data_types: Dict[str, Dict[str, Dict[str, Any]]],
+        row_counts: Dict[str, int],
+    ) -> Dict[str, TablePlan]:
+        schema = _as_dict(relational_schema) or {}
+        tables = [_as_dict(t) for t in schema.get("tables", []) if t]
+        table_names = {t.get("name") for t in tables if t.get("name")}
+
+        plans: Dict[str, TablePlan] = {}
+        for table in tables:
+            name = table.get("name")
+            if not name:
+                continue
+            columns = [_as_dict(c) for c in table.get("columns", []) or [] if c]
+            column_info = {c["name"]: c for c in columns if c.get("name")}
+            column_names = list(column_info)
+            primary_key = [c for c in table.get("primary_key", []) or [] if c]
+
+            unique_constraints = [list(u) for u in table.get("unique_constraints", []) or [] if u]
+            unique_constraints += [[c] for c, info in column_info.items()
+                                   if info.get("is_unique") and [c] not in unique_constraints]
+            unique_sets = [set(u) for u in unique_constraints]
+
+            foreign_keys: List[ForeignKeyPlan] = []
+            for fk in table.get("foreign_keys", []) or []:
+                fk = _as_dict(fk)
+                attrs = list(fk.get("attributes") or [])
+                parent = fk.get("references_table")
+                parent_attrs = list(fk.get("referenced_attributes") or [])
+                if not attrs or parent not in table_names or len(attrs) != len(parent_attrs):
+                    logger.warning(f"Skipping unresolvable foreign key on {name}: {fk}")
+                    continue
+                unique = any(u <= set(attrs) for u in unique_sets)
+                foreign_keys.append(ForeignKeyPlan(attrs, parent, parent_attrs, unique))
+                column_names += [a for a in attrs if a not in column_names]
+            column_names += [c for c in primary_key if c not in column_names]
+
+            fk_columns = {c for fk in foreign_keys for c in fk.columns}
+            if len(primary_key) == 1 and primary_key[0] not in fk_columns:
+                key_mode = KEY_SURROGATE
+            elif primary_key and set(primary_key) <= fk_columns:
+                key_mode = KEY_FOREIGN
+            else:
+                key_mode = KEY_NATURAL
+
+            column_kinds: Dict[str, str] = {}
+            value_columns: List[ColumnPlan] = []
+            for column in column_names:
+                type_info = (data_types.get(name) or {}).get(column) or {}
+                info = column_info.get(column, {})
+                sql_type = type_info.get("type") or info.get("data_type") or info.get("type_hint") or ""
+                kind = sql_kind(sql_type)
+                column_kinds[column] = kind
+                if key_mode == KEY_SURROGATE and column == primary_key[0]:
+                    if not sql_type:
+                        column_kinds[column] = KIND_INTEGER  # Untyped surrogate key
+                    continue
+                if column in fk_columns:
+                    continue
+                value_columns.append(ColumnPlan(
+                    name=column,
+                    sql_type=sql_type,
+                    kind=kind,
+                    scale=type_info.get("scale"),
+                    strategy=self._strategies.get((name, column)),
+                    unique={column} in unique_sets,
+                ))
+            value_columns = self._plan_formulas(name, column_names, value_columns)
+
+            rows = row_counts.get(name)
+            if rows is None:
+                rows = _volume_rows(entity_volumes.get(name))
+            rows = max(0, rows if rows is not None else self.default_rows)
+            for column in value_columns:
+                if column.unique and column.strategy is not None:
+                    column.strategy = self._unique_strategy(f"{name}.{column.name}", column.strategy, rows)
+            plans[name] = TablePlan(
+                name=name,
+                rows=rows,
+                columns=column_names,
+                column_kinds=column_kinds,
+                primary_key=primary_key,
+                key_mode=key_mode,
+                foreign_keys=foreign_keys,
+                value_columns=value_columns,
+                unique_constraints=unique_constraints,
+            )
+
+        for plan in plans.values():
+            for fk in plan.foreign_keys:
+                parent = plans[fk.parent]
+                parent.referenced_columns.update(fk.parent_columns)
+                for column, parent_column in zip(fk.columns, fk.parent_columns):
+                    # FK columns hold parent values
+                    plan.column_kinds[column] = parent.column_kinds.get(parent_column, plan.column_kinds[column])
+        return plans
+
+    @staticmethod
+    def _unique_strategy(column: str, strategy: Any, rows: int) -> Any:
+        """
+        Strategy for a unique column: pooled strategies draw distinct pool combinations
+        when there are enough of them and fall back to per-value generation otherwise.
+        """
+        if not getattr(strategy, "pooled", False) or not hasattr(strategy, "combination_count"):
+            return strategy
+        if strategy.combination_count() >= rows:
+            return strategy.model_copy(update={"unique": True})
+        logger.info(f"{column}: pool combinations < {rows} rows; generating unique values per value")
+        return strategy.model_copy(update={"pooled": False})
+
+    @staticmethod
+    def _resolve_formulas(derived_formulas: Dict[str, Any]) -> Dict[Tuple[str, str], str]:
+        """Map (table, column) -> formula from Step 2.9 output."""
+        formulas: Dict[Tuple[str, str], str] = {}
+        for key, info in derived_formulas.items():
+            formula = info.get("formula") if isinstance(info, dict) else info
+            table, _, column = str(key).rpartition(".")
+            if table and column and isinstance(formula, str) and formula.strip():
+                formulas[(table, column)] = formula
+        return formulas
+
+    def _plan_formulas(self, table: str, column_names: List[str], value_columns: List[ColumnPlan]) -> List[ColumnPlan]:
+        """
+        Compile the table's derived formulas and order value columns so every formula
+        column comes after the columns it reads. Formulas that cannot be evaluated
+        (unsupported constructs, unknown columns, cycles) fall back to generated values.
+        """
+        formula_columns: Dict[str, ColumnPlan] = {}
+        dependencies: Dict[str, Set[str]] = {}
+        for column in value_columns:
+            formula = self._formulas.get((table, column.name))
+            if formula is None:
+                continue
+            try:
+                compiled = compile_dsl_expression(formula, table=table)
+            except DSLEvaluationError as e:
+                logger.warning(f"Not evaluating formula for {table}.{column.name}: {e}")
+                continue
+            if compiled.tables:
+                # Batches only see their own table; see derived_update_statements
+                logger.warning(f"Not evaluating formula for {table}.{column.name} per batch: "
+                               f"reads tables {sorted(compiled.tables)}")
+                continue
+            referenced = {c.rsplit(".", 1)[-1] for c in compiled.columns}
+            unknown = referenced - set(column_names)
+            if unknown or column.name in referenced:
+                logger.warning(f"Not evaluating formula for {table}.{column.name}: "
+                               f"references {sorted(unknown or {column.name})}")
+                continue
+            column.formula = compiled
+            formula_columns[column.name] = column
+            dependencies[column.name] = referenced & {c.name for c in value_columns}
+
+        sorter: TopologicalSorter = TopologicalSorter()
+        for name, referenced in dependencies.items():
+            sorter.add(name, *(c for c in referenced if c in formula_columns))
+        try:
+            formula_order = list(sorter.static_order())
+        except CycleError as e:
+            logger.warning(f"Derived formulas of {table} form a cycle {e.args[1]}; generating them as values")
+            for column in formula_columns.values():
+                column.formula = None
+            return value_columns
+        # Generated columns first, then formulas in dependency order
+        return [c for c in value_columns if c.formula is None] + [formula_columns[c] for c in formula_order]
+
+    def _is_surrogate_reference(self, parent: str, parent_columns: List[str]) -> bool:
+        plan = self.plans[parent]
+        return plan.key_mode == KEY_SURROGATE and parent_columns == plan.primary_key
+
+    def _generation_order(self) -> List[str]:
+        """Parents before children; references to surrogate keys may be cyclic."""
+        def _order(only_stored: bool) -> List[str]:
+            sorter: TopologicalSorter = TopologicalSorter()
+            for name, plan in self.plans.items():
+                parents = [
+                    fk.parent for fk in plan.foreign_keys
+                    if fk.parent != name
+                    and not (only_stored and self._is_surrogate_reference(fk.parent, fk.parent_columns))
+                ]
+                sorter.add(name, *parents)
+            return list(sorter.static_order())
+
+        try:
+            return _order(only_stored=False)
+        except CycleError:
+            pass
+        try:
+            return _order(only_stored=True)
+        except CycleError as e:
+            raise ValueError(f"Foreign keys form a cycle through non-surrogate keys: {e.args[1]}") from e
+
+    def _row_cap(self, plan: TablePlan, parent_rows: Callable[[str], int]) -> Optional[int]:
+        """Most rows the table can have where keys must be unique (unique FKs, FK-only primary keys)."""
+        caps: List[int] = []
+        for fk in plan.foreign_keys:
+            if fk.unique:
+                caps.append(parent_rows(fk.parent))
+        if plan.key_mode == KEY_FOREIGN:
+            caps.append(int(np.prod([parent_rows(fk.parent) for fk in self._key_foreign_keys(plan)],
+                                    dtype=np.float64)))
+        return min(caps) if caps else None
+
+    def _apply_row_caps(self) -> None:
+        """Cap planned row counts over the parents' planned row counts."""
+        for name in self.order:
+            plan = self.plans[name]
+            cap = self._row_cap(plan, lambda parent: self.plans[parent].rows)
+            if cap is not None and cap < plan.rows:
+                logger.info(f"Capping {name} at {cap} rows (unique keys over parent rows)")
+                plan.rows = cap
+
+    def cap_rows_to_parents(self, table_name: str) -> int:
+        """
+        Re-cap a table's row count over its parents' generated row counts.
+
+        Natural-key parents can generate fewer rows than planned (duplicate keys
+        are dropped), so a unique-FK or FK-keyed child must be capped again once
+        its parents are generated, before its batches and unique draws are made.
+
+        Returns:
+            The table's row count
+        """
+        plan = self.plans[table_name]
+        cap = self._row_cap(plan, self._parent_rows)
+        if cap is not None and cap < plan.rows:
+            logger.info(f"Capping {table_name} at {cap} rows (unique keys over generated parent rows)")
+            plan.rows = cap
+        return plan.rows
+
+    @staticmethod
+    def _key_foreign_keys(plan: TablePlan) -> List[ForeignKeyPlan]:
+        key = set(plan.primary_key)
+        return [fk for fk in plan.foreign_keys if set(fk.columns) & key]
+
+    @staticmethod
+    def _dedupe_keys(plan: TablePlan) -> List[List[str]]:
+        """Column sets whose repeated values are dropped: natural keys and unique sets not unique by construction."""
+        keys = [plan.primary_key] if plan.key_mode == KEY_NATURAL and plan.primary_key else []
+        for columns in plan.unique_constraints:
+            unique = set(columns)
+            if plan.key_mode in (KEY_SURROGATE, KEY_FOREIGN) and set(plan.primary_key) <= unique:
+                continue
+            if any(fk.unique and set(fk.columns) <= unique for fk in plan.foreign_keys):
+                continue
+            if columns not in keys:
+                keys.append(columns)
+        return keys
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
+
+    def _table_seed(self, name: str) -> np.random.SeedSequence:
+        return np.random.SeedSequence(self.seed, spawn_key=(_stable_id(name),))
+
+    def _table_rng(self, name: str) -> np.random.Generator:
+        """Per-table generator, independent of generation order."""
+        return np.random.default_rng(self._table_seed(name))
+
+    def table_keys(self, table_name: str) -> Tuple[int, Dict[str, np.ndarray]]:
+        """Generated row count and stored referenced key columns of a finished table."""
+        return self._generated_rows[table_name], self._stored_keys.get(table_name, {})
+
+    def set_table_keys(self, table_name: str, rows: int, keys: Dict[str, np.ndarray]) -> None:
+        """Register a table generated elsewhere (e.g. by another process) as a parent."""
+        self._generated_rows[table_name] = rows
+        self._stored_keys[table_name] = keys
+
+    def _batch_rng(self, name: str, batch_index: int) -> np.random.Generator:
+        """Per-batch generator: a batch's draws do not depend on the batches before it."""
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(_stable_id(name), batch_index)))
+
+    def batch_count(self, table_name: str) -> int:
+        """Number of batches the table is generated in."""
+        return -(-self.plans[table_name].rows // self.batch_size)
+
+    def _parent_rows(self, parent: str) -> int:
+        return self._generated_rows.get(parent, self.plans[parent].rows)
+
+    def _surrogate_values(self, plan: TablePlan, row_index: np.ndarray) -> np.ndarray:
+        keys = row_index.astype(np.int64) + 1
+        if plan.column_kinds.get(plan.primary_key[0]) == KIND_TEXT:
+            return keys.astype(str)
+        return keys
+
+    def _parent_values(self, parent: str, parent_column: str, row_index: np.ndarray) -> np.ndarray:
+        plan = self.plans[parent]
+        if plan.key_mode == KEY_SURROGATE and parent_column == plan.primary_key[0]:
+            return self._surrogate_values(plan, row_index)
+        stored = self._stored_keys.get(parent, {}).get(parent_column)
+        if stored is None:
+            raise ValueError(f"Table {parent} must be generated before its key {parent_column} is referenced")
+        return stored[row_index]
+
+    def _unique_draws(self, plan: TablePlan, rng: np.random.Generator) -> Dict[int, np.ndarray]:
+        """Parent row indices for all rows of FKs that must not repeat (keyed by FK position)."""
+        draws: Dict[int, np.ndarray] = {}
+        if plan.key_mode == KEY_FOREIGN:
+            key_fks = self._key_foreign_keys(plan)
+            sizes = [self._parent_rows(fk.parent) for fk in key_fks]
+            combos = rng.choice(int(np.prod(sizes, dtype=np.int64)), size=plan.rows, replace=False)
+            for fk, index in zip(key_fks, np.unravel_index(combos, sizes)):
+                draws[plan.foreign_keys.index(fk)] = index.astype(np.int64)
+        for position, fk in enumerate(plan.foreign_keys):
+            if fk.unique and position not in draws:
+                draws[position] = rng.choice(self._parent_rows(fk.parent), size=plan.rows, replace=False)
+        return draws
+
+    def _default_values(self, column: ColumnPlan, size: int, start: int, rng: np.random.Generator) -> np.ndarray:
+        """Type-based values for columns without a generation spec."""
+        if column.kind == KIND_INTEGER:
+            return rng.integers(0, 1000, size=size, dtype=np.int64)
+        if column.kind == KIND_FLOAT:
+            return np.round(rng.uniform(0.0, 1000.0, size=size), column.scale if column.scale is not None else 2)
+        if column.kind == KIND_BOOLEAN:
+            return rng.random(size) < 0.5
+        if column.kind in (KIND_DATE, KIND_TIMESTAMP):
+            unit = "D" if column.kind == KIND_DATE else "s"
+            low, high = (d.astype(f"datetime64[{unit}]").astype(np.int64) for d in _DEFAULT_DATE_RANGE)
+            return rng.integers(low, high, size=size).astype(f"datetime64[{unit}]")
+        if column.kind == KIND_TIME:
+            seconds = rng.integers(0, 86_400, size=size)
+            parts = [np.char.zfill(v.astype(str), 2) for v in (seconds // 3600, seconds // 60 % 60, seconds % 60)]
+            return np.char.add(np.char.add(np.char.add(parts[0], ":"), np.char.add(parts[1], ":")), parts[2])
+        row_numbers = np.arange(start + 1, start + size + 1).astype(str)
+        return np.char.add(f"{column.name}_", row_numbers)
+
+    def _coerce(self, column: ColumnPlan, values: np.ndarray) -> np.ndarray:
+        """Cast strategy output to the column's kind."""
+        if column.kind == KIND_INTEGER and np.issubdtype(values.dtype, np.floating):
+            return np.rint(values).astype(np.int64)
+        if column.kind == KIND_FLOAT and np.issubdtype(values.dtype, np.number) and column.scale is not None:
+            return np.round(values.astype(np.float64), column.scale)
+        if column.kind == KIND_BOOLEAN and values.dtype != bool and np.issubdtype(values.dtype, np.number):
+            return values.astype(bool)
+        return values
+
+    def _formula_values(self, column: ColumnPlan, batch: Dict[str, np.ndarray], size: int,
+                        rng: np.random.Generator) -> np.ndarray:
+        """Evaluate a derived column over the batch's columns; NULL results become None/NaN."""
+        values, nulls = column.formula.evaluate_with_nulls(batch, size=size, rng=rng)
+        if not nulls.any():
+            return self._coerce(column, values)
+        if column.kind == KIND_FLOAT and values.dtype.kind == "f":
+            return self._coerce(column, values)
+        result = np.empty(size, dtype=object)
+        result[~nulls] = self._coerce(column, values[~nulls])
+        return result
+
+    def _column_values(self, plan: TablePlan, column: ColumnPlan, start: int, rng: np.random.Generator) -> np.ndarray:
+        size = min(self.batch_size, plan.rows - start)
+        if column.strategy is not None:
+            # Chunk-seeded per column: a batch's values do not depend on the batches before it
+            values = column.strategy.generate_chunk(
+                start // self.batch_size, plan.rows, self.batch_size,
+                rng=self._table_seed(plan.name), stream=_stable_id(column.name),
+            )
+            return self._coerce(column, values)
+        return self._default_values(column, size, start, rng)
+
+    def table_unique_draws(self, table_name: str) -> Dict[int, np.ndarray]:
+        """Parent row indices for the table's non-repeating foreign keys (drawn once per table)."""
+        return self._unique_draws(self.plans[table_name], self._table_rng(table_name))
+
+    def iter_raw_batches(
+        self,
+        table_name: str,
+        start_batch: int,
+        stop_batch: int,
+        unique_draws: Dict[int, np.ndarray],
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Generate batches [start_batch, stop_batch) of a table, before duplicate-key removal.
+
+        Every batch is seeded from (seed, table, batch index), so any range of
+        batches can be produced independently (e.g. in another process) and yields
+        exactly what sequential generation would.
+
+        Args:
+            table_name: Table to generate
+            start_batch: First batch index
+            stop_batch: Batch index to stop before
+            unique_draws: Result of `table_unique_draws(table_name)`
+
+        Yields:
+            Dict column name -> NumPy array (all table columns)
+        """
+        plan = self.plans[table_name]
+        for batch_index in range(start_batch, stop_batch):
+            start = batch_index * self.batch_size
+            size = min(self.batch_size, plan.rows - start)
+            rng = self._batch_rng(table_name, batch_index)
+            batch: Dict[str, np.ndarray] = {}
+            if plan.key_mode == KEY_SURROGATE:
+                batch[plan.primary_key[0]] = self._surrogate_values(plan, np.arange(start, start + size))
+            for position, fk in enumerate(plan.foreign_keys):
+                if position in unique_draws:
+                    parent_index = unique_draws[position][start:start + size]
+                else:
+                    parent_index = rng.integers(0, self._parent_rows(fk.parent), size=size)
+                for column, parent_column in zip(fk.columns, fk.parent_columns):
+                    batch[column] = self._parent_values(fk.parent, parent_column, parent_index)
+            for column in plan.value_columns:
+                if column.formula is not None:
+                    batch[column.name] = self._formula_values(column, batch, size, rng)
+                else:
+                    batch[column.name] = self._column_values(plan, column, start, rng)
+            yield batch
+
+    def finish_batches(
+        self, table_name: str, raw_batches: Iterable[Dict[str, np.ndarray]]
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Post-process raw batches in table order: drop rows that repeat a natural key
+        or unique value and keep referenced key columns for child tables.
+
+        Seen keys are kept as 64-bit hashes (the value itself for one integer
+        column) rather than boxed tuples. Two distinct keys with the same hash drop
+        a row that did not repeat; with n rows this has probability about n²/2⁶⁵.
+
+        Args:
+            table_name: Table the batches belong to
+            raw_batches: All raw batches of the table, in batch order
+
+        Yields:
+            Dict column name -> NumPy array, in the table's column order
+        """
+        plan = self.plans[table_name]
+        dedupe_keys = self._dedupe_keys(plan)
+        seen = [_KeyHashSet() for _ in dedupe_keys]
+        stored: Dict[str, List[np.ndarray]] = {
+            c: [] for c in plan.referenced_columns
+            if not self._is_surrogate_reference(table_name, [c])
+        }
+
+        kept = 0
+        for batch in raw_batches:
+            size = len(batch[plan.columns[0]]) if plan.columns else 0
+            if dedupe_keys and size:
+                mask = np.ones(size, dtype=bool)
+                batch_keys = []
+                for key_columns, seen_keys in zip(dedupe_keys, seen):
+                    keys = _key_hashes(batch, key_columns)
+                    first = np.zeros(size, dtype=bool)
+                    first[np.unique(keys, return_index=True)[1]] = True  # First row of each key in the batch
+                    mask &= first & ~seen_keys.contains(keys)
+                    batch_keys.append(keys)
+                for seen_keys, keys in zip(seen, batch_keys):
+                    seen_keys.add(keys[mask])
+                if not mask.all():
+                    batch = {c: v[mask] for c, v in batch.items()}
+                    size = int(mask.sum())
+
+            kept += size
+            for column, chunks in stored.items():
+                chunks.append(batch[column])
+            yield {c: batch[c] for c in plan.columns}
+
+        if kept < plan.rows:
+            logger.info(f"{table_name}: dropped {plan.rows - kept} rows with duplicate keys")
+        self._generated_rows[table_name] = kept
+        self._stored_keys[table_name] = {
+            c: np.concatenate(chunks) if chunks else np.array([]) for c, chunks in stored.items()
+        }
+
+    def iter_table_batches(self, table_name: str) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Generate a table as a stream of column batches.
+
+        Referenced parents (other than surrogate-key parents) must have been generated
+        first; `generate()` takes care of the order.
+
+        Args:
+            table_name: Table to generate
+
+        Yields:
+            Dict column name -> NumPy array, at most `batch_size` rows per batch
+        """
+        self.cap_rows_to_parents(table_name)
+        raw = self.iter_raw_batches(
+            table_name, 0, self.batch_count(table_name), self.table_unique_draws(table_name)
+        )
+        yield from self.finish_batches(table_name, raw)
+
+    def generate_table(self, table_name: str) -> Dict[str, np.ndarray]:
+        """Generate a whole table in memory (concatenated batches); mainly for tests and small tables."""
+        batches = list(self.iter_table_batches(table_name))
+        columns = self.plans[table_name].columns
+        if not batches:
+            return {c: np.array([]) for c in columns}
+        return {c: np.concatenate([b[c] for b in batches]) for c in columns}
+
+    def open_table(self, writer: TableWriter, table_name: str) -> None:
+        """Declare a table (columns, kinds, keys) on a writer."""
+        plan = self.plans[table_name]
+        writer.open_table(
+            table_name,
+            plan.columns,
+            plan.column_kinds,
+            primary_key=plan.primary_key,
+            foreign_keys=[
+                {"attributes": fk.columns, "references_table": fk.parent,
+                 "referenced_attributes": fk.parent_columns}
+                for fk in plan.foreign_keys
+            ],
+            unique_constraints=plan.unique_constraints,
+        )
+
+    def derived_update_statements(self, dialect: str = DIALECT_SQLITE) -> List[str]:
+        """
+        UPDATE statements that recompute the derived columns inside the database.
+
+        Run them after bulk loading (parents first, one statement per column in
+        dependency order) to compute derived attributes set-based in SQLite or
+        PostgreSQL rather than in Python.
+
+        Args:
+            dialect: "sqlite" or "postgresql"
+
+        Returns:
+            UPDATE statements; formulas without a SQL translation are skipped with a warning
+        """
+        statements: List[str] = []
+        for name in self.order:
+            for column in self.plans[name].value_columns:
+                if column.formula is None:
+                    continue
+                try:
+                    statements.append(update_sql(name, {column.name: column.formula.expression}, dialect=dialect))
+                except DSLSQLCompilationError as e:
+                    logger.warning(f"No {dialect} translation for {name}.{column.name}: {e}")
+        return statements
+
+    def generate(self, writer: TableWriter) -> Dict[str, int]:
+        """
+        Generate every table (parents first) and stream it to a writer.
+
+        Args:
+            writer: Destination (see writers.py)
+
+        Returns:
+            Mapping table name -> rows written
+        """
+        for name in self.order:
+            self.open_table(writer, name)
+            for batch in self.iter_table_batches(name):
+                writer.write_batch(name, batch)
+            writer.close_table(name)
+            logger.info(f"Generated {self._generated_rows[name]} rows for {name}")
+        return dict(self._generated_rows)
+
+    def generate_to(self, output_format: str, output_path: Union[str, Path]) -> Dict[str, int]:
+        """
+        Generate every table into Parquet/CSV files or a SQLite database.
+
+        Args:
+            output_format: "parquet", "csv" or "sqlite"
+            output_path: Output directory (parquet/csv) or database file (sqlite)
+
+        Returns:
+            Mapping table name -> rows written
+        """
+        with create_table_writer(output_format, output_path) as writer:
+            return self.generate(writer)
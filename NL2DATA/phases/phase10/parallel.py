@@ -0,0 +1,283 @@
+"""Process-parallel table generation.
+
+Faker, Mimesis and regex generation are pure Python and hold the GIL, so
+`ParallelTableGenerator` fans work out across a `ProcessPoolExecutor`:
+
+- Each table is split into row ranges (partitions) of whole engine batches of at
+  most `rows_per_partition` rows. A Step 9.5 `partition_count` sets the minimum
+  number of partitions; it never makes partitions larger.
+- Workers generate raw batches for one partition and return them to the parent,
+  with at most `max_rows_in_flight` rows submitted or waiting to be written, so
+  parent memory is bounded by rows rather than partitions. Batches are seeded from
+  (seed, table, batch index), so the output does not depend on the number of
+  workers and equals `DataGenerationEngine.generate()`.
+- The parent process is the merge/writer stage: it consumes partitions in row
+  order, drops duplicate natural keys, keeps referenced keys and writes batches.
+- Parent key columns that child tables reference are handed to workers as .npy
+  files (memory-mapped where possible), not pickled with every task.
+
+Tables are generated parents first; partitions of one table run concurrently.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+import copy
+import multiprocessing
+import os
+import tempfile
+
+import numpy as np
+
+from NL2DATA.utils.logging import get_logger
+from NL2DATA.phases.phase10.engine import DataGenerationEngine
+from NL2DATA.phases.phase10.writers import TableWriter, create_table_writer
+
+logger = get_logger(__name__)
+
+DEFAULT_ROWS_PER_PARTITION = 250_000
+
+# Generated rows and {column: .npy path} of a finished table, per parent table name
+KeyFiles = Tuple[int, Dict[str, str]]
+ParentKeyFiles = Dict[str, KeyFiles]
+
+# Engine of the current worker process (set by the pool initializer)
+_worker_engine: Optional[DataGenerationEngine] = None
+_worker_loaded: ParentKeyFiles = {}
+
+
+def _init_worker(engine: DataGenerationEngine) -> None:
+    global _worker_engine
+    _worker_engine = engine
+    _worker_loaded.clear()
+
+
+def _load_keys(path: str) -> np.ndarray:
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        # Object arrays (e.g. strategy-generated strings) cannot be memory-mapped
+        return np.load(path, allow_pickle=True)
+
+
+def _generate_partition(
+    table_name: str,
+    rows: int,
+    start_batch: int,
+    stop_batch: int,
+    parent_keys: ParentKeyFiles,
+    draws_path: Optional[str],
+) -> List[Dict[str, np.ndarray]]:
+    """Worker task: raw batches [start_batch, stop_batch) of a table."""
+    engine = _worker_engine
+    # Row count as (re)capped in the parent process once the table's parents were generated
+    engine.plans[table_name].rows = rows
+    for parent, (rows, files) in parent_keys.items():
+        if _worker_loaded.get(parent) != (rows, files):
+            engine.set_table_keys(parent, rows, {c: _load_keys(path) for c, path in files.items()})
+            _worker_loaded[parent] = (rows, files)
+    unique_draws: Dict[int, np.ndarray] = {}
+    if draws_path:
+        with np.load(draws_path) as data:
+            unique_draws = {int(k): data[k] for k in data.files}
+    return list(engine.iter_raw_batches(table_name, start_batch, stop_batch, unique_draws))
+
+
+def _partition_count(strategy: Any) -> Optional[int]:
+    if hasattr(strategy, "model_dump"):
+        strategy = strategy.model_dump()
+    if not isinstance(strategy, dict) or strategy.get("partitioning_type") in (None, "none"):
+        return None
+    count = strategy.get("partition_count")
+    return int(count) if count else None
+
+
+class ParallelTableGenerator:
+    """
+    Generate all tables of a `DataGenerationEngine` across worker processes.
+
+    Usage:
+        engine = DataGenerationEngine.from_state(state, seed=7)
+        runner = ParallelTableGenerator(engine, partitioning_strategies=metadata["partitioning_strategies"])
+        row_counts = runner.generate_to("parquet", "out/")
+    """
+
+    def __init__(
+        self,
+        engine: DataGenerationEngine,
+        max_workers: Optional[int] = None,
+        rows_per_partition: int = DEFAULT_ROWS_PER_PARTITION,
+        partitioning_strategies: Optional[Dict[str, Any]] = None,
+        mp_context: Optional[Any] = None,
+        max_rows_in_flight: Optional[int] = None,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            engine: Planned generation engine
+            max_workers: Worker processes (defaults to the CPU count)
+            rows_per_partition: Most rows per partition (rounded down to whole batches)
+            partitioning_strategies: Step 9.5 output (table -> {"partitioning_type", "partition_count", ...})
+            mp_context: Optional multiprocessing context (defaults to "spawn", safe with threads)
+            max_rows_in_flight: Most rows of submitted, unwritten partitions (defaults to
+                2 * max_workers * rows_per_partition; one partition is always in flight)
+        """
+        self.engine = engine
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.rows_per_partition = max(1, rows_per_partition)
+        self.partitioning_strategies = partitioning_strategies or {}
+        self.mp_context = mp_context or multiprocessing.get_context("spawn")
+        self.max_rows_in_flight = max_rows_in_flight or 2 * self.max_workers * self.rows_per_partition
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], engine_kwargs: Optional[Dict[str, Any]] = None,
+                   **kwargs: Any) -> "ParallelTableGenerator":
+        """
+        Create a runner from pipeline state (after Phase 9).
+
+        Args:
+            state: IRGenerationState (see `DataGenerationEngine.from_state`; also uses
+                metadata.partitioning_strategies)
+            engine_kwargs: Passed to the engine (seed, batch_size, ...)
+            **kwargs: Passed to the constructor (max_workers, rows_per_partition, ...)
+        """
+        metadata = state.get("metadata", {}) or {}
+        kwargs.setdefault("partitioning_strategies", metadata.get("partitioning_strategies", {}))
+        return cls(DataGenerationEngine.from_state(state, **(engine_kwargs or {})), **kwargs)
+
+    def partitions(self, table_name: str) -> List[Tuple[int, int]]:
+        """
+        Split a table into partitions of whole batches.
+
+        Partitions hold at most `rows_per_partition` rows (at least one batch); a
+        Step 9.5 `partition_count` can only split the table further.
+
+        Returns:
+            List of (start_batch, stop_batch) ranges covering the table in order
+        """
+        batches = self.engine.batch_count(table_name)
+        if batches == 0:
+            return []
+        batches_per_partition = max(1, self.rows_per_partition // self.engine.batch_size)
+        count = -(-batches // batches_per_partition)
+        count = max(count, _partition_count(self.partitioning_strategies.get(table_name)) or 1)
+        count = min(count, batches)
+        bounds = np.linspace(0, batches, count + 1).round().astype(int).tolist()
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _parent_key_files(self, table_name: str, key_dir: Path, saved: ParentKeyFiles) -> ParentKeyFiles:
+        """Save (once) and return the stored key columns of the table's parents."""
+        parent_keys: ParentKeyFiles = {}
+        for fk in self.engine.plans[table_name].foreign_keys:
+            parent = fk.parent
+            if parent == table_name or parent not in self.engine.order[:self.engine.order.index(table_name)]:
+                continue
+            if parent not in saved:
+                rows, keys = self.engine.table_keys(parent)
+                files = {}
+                for position, (column, values) in enumerate(keys.items()):
+                    path = key_dir / f"{self.engine.order.index(parent)}_{position}.npy"
+                    np.save(path, values, allow_pickle=values.dtype == object)
+                    files[column] = str(path)
+                saved[parent] = (rows, files)
+            parent_keys[parent] = saved[parent]
+        return parent_keys
+
+    def _run_table(self, pool: ProcessPoolExecutor, writer: TableWriter, table_name: str,
+                   key_dir: Path, saved: ParentKeyFiles) -> None:
+        engine = self.engine
+        engine.cap_rows_to_parents(table_name)
+        partitions = self.partitions(table_name)
+        engine.open_table(writer, table_name)
+        if len(partitions) <= 1:
+            # Not worth the inter-process transfer
+            batches = engine.iter_table_batches(table_name)
+        else:
+            parent_keys = self._parent_key_files(table_name, key_dir, saved)
+            draws = engine.table_unique_draws(table_name)
+            draws_path = None
+            if draws:
+                draws_path = str(key_dir / f"draws_{engine.order.index(table_name)}.npz")
+                np.savez(draws_path, **{str(k): v for k, v in draws.items()})
+            batches = engine.finish_batches(
+                table_name, self._iter_partitions(pool, table_name, partitions, parent_keys, draws_path)
+            )
+        for batch in batches:
+            writer.write_batch(table_name, batch)
+        writer.close_table(table_name)
+        logger.info(f"Generated {engine.table_keys(table_name)[0]} rows for {table_name} "
+                    f"in {max(1, len(partitions))} partition(s)")
+
+    def _iter_partitions(self, pool: ProcessPoolExecutor, table_name: str, partitions: List[Tuple[int, int]],
+                         parent_keys: ParentKeyFiles, draws_path: Optional[str]) -> Iterator[Dict[str, np.ndarray]]:
+        """Submit partitions (at most `max_rows_in_flight` rows in flight) and yield their batches in row order."""
+        rows = self.engine.plans[table_name].rows
+        batch_size = self.engine.batch_size
+        pending: Deque[Tuple[Future, int]] = deque()
+        remaining = deque(partitions)
+        in_flight = 0
+
+        def _submit() -> None:
+            nonlocal in_flight
+            while remaining:
+                start_batch, stop_batch = remaining[0]
+                partition_rows = min(stop_batch * batch_size, rows) - start_batch * batch_size
+                if pending and in_flight + partition_rows > self.max_rows_in_flight:
+                    return
+                remaining.popleft()
+                pending.append((pool.submit(
+                    _generate_partition, table_name, rows, start_batch, stop_batch, parent_keys, draws_path
+                ), partition_rows))
+                in_flight += partition_rows
+
+        _submit()
+        while pending:
+            future, partition_rows = pending.popleft()
+            batches = future.result()
+            del future
+            # The partition's rows count against the limit until they are written
+            for batch in batches:
+                yield batch
+            del batches
+            in_flight -= partition_rows
+            _submit()
+
+    def generate(self, writer: TableWriter) -> Dict[str, int]:
+        """
+        Generate every table (parents first) across worker processes and stream it to a writer.
+
+        Args:
+            writer: Destination (see writers.py)
+
+        Returns:
+            Mapping table name -> rows written
+        """
+        worker_engine = copy.copy(self.engine)
+        worker_engine._stored_keys = {}
+        worker_engine._generated_rows = {}
+        saved: ParentKeyFiles = {}
+        with tempfile.TemporaryDirectory(prefix="nl2data_keys_") as key_dir, ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self.mp_context,
+            initializer=_init_worker,
+            initargs=(worker_engine,),
+        ) as pool:
+            for name in self.engine.order:
+                self._run_table(pool, writer, name, Path(key_dir), saved)
+        return {name: self.engine.table_keys(name)[0] for name in self.engine.order}
+
+    def generate_to(self, output_format: str, output_path: Union[str, Path]) -> Dict[str, int]:
+        """
+        Generate every table into Parquet/CSV files or a SQLite database.
+
+        Args:
+            output_format: "parquet", "csv" or "sqlite"
+            output_path: Output directory (parquet/csv) or database file (sqlite)
+
+        Returns:
+            Mapping table name -> rows written
+        """
+        with create_table_writer(output_format, output_path) as writer:
+            return self.generate(writer)
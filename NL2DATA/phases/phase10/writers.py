@@ -0,0 +1,217 @@
+"""Table writers for generated data (CSV, SQLite, Parquet).
+
+Writers receive tables as a stream of column batches (`Dict[column, np.ndarray]`)
+and append each batch as it arrives, so a table never has to be materialized in
+full: CSV appends rows, SQLite inserts one transaction per batch and Parquet
+writes one row group per batch.
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Union
+import csv
+import sqlite3
+
+import numpy as np
+
+from NL2DATA.utils.logging import get_logger
+from NL2DATA.phases.phase10.column_specs import KIND_BOOLEAN, KIND_FLOAT, KIND_INTEGER
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+
+def column_to_python(values: np.ndarray) -> List[Any]:
+    """Convert a column batch to Python values (datetimes as ISO strings)."""
+    if np.issubdtype(values.dtype, np.datetime64):
+        return np.datetime_as_string(values).tolist()
+    return values.tolist()
+
+
+class TableWriter(ABC):
+    """Sink for generated tables, written batch by batch."""
+
+    def open_table(self, table_name: str, columns: Sequence[str], column_kinds: Dict[str, str],
+                   primary_key: Sequence[str] = (), foreign_keys: Sequence[Dict[str, Any]] = (),
+                   unique_constraints: Sequence[Sequence[str]] = ()) -> None:
+        """
+        Start a table.
+
+        Args:
+            table_name: Table name
+            columns: Column names in output order
+            column_kinds: Column name -> value kind (see column_specs.KIND_*)
+            primary_key: Primary key columns
+            foreign_keys: Foreign keys ({"attributes", "references_table", "referenced_attributes"})
+            unique_constraints: Column sets whose values are unique
+        """
+
+    @abstractmethod
+    def write_batch(self, table_name: str, batch: Dict[str, np.ndarray]) -> None:
+        """Append one column batch (all arrays have the same length)."""
+
+    def close_table(self, table_name: str) -> None:
+        """Finish a table."""
+
+    def close(self) -> None:
+        """Flush and release all resources."""
+
+    def __enter__(self) -> "TableWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class CSVTableWriter(TableWriter):
+    """Write one `<table>.csv` file per table."""
+
+    def __init__(self, output_dir: Union[str, Path]):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._files: Dict[str, Any] = {}
+        self._writers: Dict[str, Any] = {}
+        self._columns: Dict[str, List[str]] = {}
+
+    def open_table(self, table_name, columns, column_kinds, primary_key=(), foreign_keys=(),
+                   unique_constraints=()) -> None:
+        handle = open(self.output_dir / f"{table_name}.csv", "w", newline="", encoding="utf-8")
+        self._files[table_name] = handle
+        self._writers[table_name] = csv.writer(handle)
+        self._columns[table_name] = list(columns)
+        self._writers[table_name].writerow(columns)
+
+    def write_batch(self, table_name: str, batch: Dict[str, np.ndarray]) -> None:
+        columns = [column_to_python(batch[name]) for name in self._columns[table_name]]
+        self._writers[table_name].writerows(zip(*columns))
+
+    def close_table(self, table_name: str) -> None:
+        handle = self._files.pop(table_name, None)
+        self._writers.pop(table_name, None)
+        if handle is not None:
+            handle.close()
+
+    def close(self) -> None:
+        for table_name in list(self._files):
+            self.close_table(table_name)
+
+
+_SQLITE_TYPES = {KIND_INTEGER: "INTEGER", KIND_BOOLEAN: "INTEGER", KIND_FLOAT: "REAL"}
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class SQLiteTableWriter(TableWriter):
+    """Write all tables into one SQLite database (bulk-load pragmas, one transaction per batch)."""
+
+    def __init__(self, database_path: Union[str, Path]):
+        self.database_path = Path(database_path)
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.database_path))
+        self._conn.execute("PRAGMA journal_mode=MEMORY")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._inserts: Dict[str, str] = {}
+        self._columns: Dict[str, List[str]] = {}
+
+    def open_table(self, table_name, columns, column_kinds, primary_key=(), foreign_keys=(),
+                   unique_constraints=()) -> None:
+        definitions = [f"{_quote(c)} {_SQLITE_TYPES.get(column_kinds.get(c), 'TEXT')}" for c in columns]
+        if primary_key:
+            definitions.append(f"PRIMARY KEY ({', '.join(_quote(c) for c in primary_key)})")
+        for unique in unique_constraints:
+            definitions.append(f"UNIQUE ({', '.join(_quote(c) for c in unique)})")
+        for fk in foreign_keys:
+            definitions.append(
+                f"FOREIGN KEY ({', '.join(_quote(c) for c in fk['attributes'])}) "
+                f"REFERENCES {_quote(fk['references_table'])} "
+                f"({', '.join(_quote(c) for c in fk['referenced_attributes'])})"
+            )
+        self._conn.execute(f"DROP TABLE IF EXISTS {_quote(table_name)}")
+        self._conn.execute(f"CREATE TABLE {_quote(table_name)} ({', '.join(definitions)})")
+        self._columns[table_name] = list(columns)
+        self._inserts[table_name] = (
+            f"INSERT INTO {_quote(table_name)} ({', '.join(_quote(c) for c in columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+
+    def write_batch(self, table_name: str, batch: Dict[str, np.ndarray]) -> None:
+        columns = [column_to_python(batch[name]) for name in self._columns[table_name]]
+        with self._conn:
+            self._conn.executemany(self._inserts[table_name], zip(*columns))
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+
+class ParquetTableWriter(TableWriter):
+    """Write one `<table>.parquet` file per table (one row group per batch). Requires pyarrow."""
+
+    def __init__(self, output_dir: Union[str, Path], compression: str = "snappy"):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow library is not available. Install with: pip install pyarrow")
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self._writers: Dict[str, Any] = {}
+        self._columns: Dict[str, List[str]] = {}
+
+    def open_table(self, table_name, columns, column_kinds, primary_key=(), foreign_keys=(),
+                   unique_constraints=()) -> None:
+        self._columns[table_name] = list(columns)
+
+    def write_batch(self, table_name: str, batch: Dict[str, np.ndarray]) -> None:
+        columns = self._columns[table_name]
+        table = pa.table({name: pa.array(batch[name]) for name in columns})
+        writer = self._writers.get(table_name)
+        if writer is None:
+            writer = pq.ParquetWriter(
+                str(self.output_dir / f"{table_name}.parquet"), table.schema, compression=self.compression
+            )
+            self._writers[table_name] = writer
+        elif table.schema != writer.schema:
+            table = table.cast(writer.schema)
+        writer.write_table(table)
+
+    def close_table(self, table_name: str) -> None:
+        writer = self._writers.pop(table_name, None)
+        if writer is not None:
+            writer.close()
+
+    def close(self) -> None:
+        for table_name in list(self._writers):
+            self.close_table(table_name)
+
+
+def create_table_writer(output_format: str, output_path: Union[str, Path]) -> TableWriter:
+    """
+    Create a writer for the given output format.
+
+    Args:
+        output_format: "parquet", "csv" or "sqlite"
+        output_path: Output directory (parquet/csv) or database file (sqlite)
+
+    Returns:
+        TableWriter instance
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    fmt = (output_format or "").lower()
+    if fmt == "parquet":
+        return ParquetTableWriter(output_path)
+    if fmt == "csv":
+        return CSVTableWriter(output_path)
+    if fmt in ("sqlite", "sqlite3", "db"):
+        return SQLiteTableWriter(output_path)
+    raise ValueError(f"Unknown output format: {output_format!r} (expected 'parquet', 'csv' or 'sqlite')")
@@ -11,6 +11,7 @@ from pydantic import BaseModel, Field
 
 from NL2DATA.phases.phase2.model_router import get_model_for_step
 from NL2DATA.utils.llm import standardized_llm_call
+from NL2DATA.utils.llm.request_packing import packed_output_model, plan_packs, run_packed
 from NL2DATA.utils.observability import traceable_step, get_trace_config
 from NL2DATA.utils.logging import get_logger
 from NL2DATA.ir.models.state import AttributeInfo
@@ -148,54 +149,16 @@ def _detect_intrinsic_attribute_issues(
     return issues
 
 
-@traceable_step("2.2", phase=2, tags=['phase_2_step_2'])
-async def step_2_2_intrinsic_attributes(
+def _build_context_msg(
     entity_name: str,
-    nl_description: str,
     entity_description: Optional[str] = None,
     explicit_attributes: Optional[List[str]] = None,
     domain: Optional[str] = None,
     relations: Optional[List] = None,
     primary_key: Optional[List[str]] = None,
     all_entity_names: Optional[List[str]] = None,
-) -> IntrinsicAttributesOutput:
-    """
-    Step 2.2 (per-entity): Extract attributes that are inherent to the entity.
-    
-    This is designed to be called in parallel for multiple entities.
-    
-    **CRITICAL**: Must explicitly instruct LLM to NOT generate any attributes that relate 
-    entities through relations. Only generate intrinsic attributes that describe the entity itself.
-    
-    Args:
-        entity_name: Name of the entity
-        nl_description: Natural language description of the database requirements (FULL description)
-        entity_description: Optional description of the entity from Step 1.4
-        explicit_attributes: Optional list of explicitly mentioned attributes from Step 2.1
-        domain: Optional domain context from Phase 1 (Steps 1.1-1.3)
-        relations: Optional list of relations this entity participates in (from Steps 1.9, 1.11)
-                  Each relation dict should have: entities, type, description, cardinalities, participations
-        primary_key: Optional current primary key from Step 2.7 (if available)
-        
-    Returns:
-        dict: Intrinsic attributes result with attributes list
-        
-    Example:
-        >>> result = await step_2_2_intrinsic_attributes(
-        ...     "Customer",
-        ...     "Customers have name, email, and address",
-        ...     entity_description="A customer who places orders",
-        ...     domain="e-commerce",
-        ...     relations=[{"entities": ["Customer", "Order"], "type": "one-to-many"}],
-        ...     primary_key=["customer_id"]
-        ... )
-        >>> len(result["attributes"])
-        3
-        >>> result["attributes"][0]["name"]
-        "name"
-    """
-    logger.debug(f"Extracting intrinsic attributes for entity: {entity_name}")
-    
+) -> str:
+    """Enhanced context section of the Step 2.2 prompt for one entity (braces escaped)."""
     # Build enhanced context
     context_parts = []
     
@@ -260,18 +223,22 @@ async def step_2_2_intrinsic_attributes(
         # This is necessary because context_msg might contain dictionary representations or other content with braces
         # We need to escape them so they're treated as literal braces, not format placeholders
         context_msg = context_msg.replace("{", "{{").replace("}", "}}")
-    
+    return context_msg
+
+
+def _build_system_prompt(output_schema: type, closing: str) -> str:
+    """Step 2.2 system prompt: extraction rules, output structure of `output_schema`, closing instruction."""
     # Generate output structure section from Pydantic model
     output_structure_section = generate_output_structure_section_with_custom_requirements(
-        output_schema=IntrinsicAttributesOutput,
+        output_schema=output_schema,
         additional_requirements=[
             'The "reasoning" field is REQUIRED and cannot be empty or omitted'
         ]
     )
-    
+
     # System prompt with explicit instruction and detailed example
     # Note: JSON examples in the prompt use double braces {{ }} to escape them from template parsing
-    system_prompt = """You are a database design assistant. Your task is to extract all intrinsic attributes (properties/columns) that are inherent to an entity.
+    return """You are a database design assistant. Your task is to extract all intrinsic attributes (properties/columns) that are inherent to an entity.
 
 **CRITICAL REQUIREMENT**: You MUST return at least ONE attribute. An empty attributes list is not acceptable and will cause the pipeline to fail. Every entity must have at least one intrinsic attribute, even if minimal (e.g., an identifier attribute like entity_id or id, or at least one descriptive attribute).
 
@@ -399,9 +366,71 @@ Do NOT include:
 - Relationship properties (these are handled separately in Step 2.15)
 - Derived attributes (these are identified in Step 2.8)
 
-""" + output_structure_section + """
+""" + output_structure_section + "\n\n" + closing
 
-Return a comprehensive list of all intrinsic attributes for the entity. REMEMBER: You MUST return at least one attribute. An empty list is not acceptable."""
+
+@traceable_step("2.2", phase=2, tags=['phase_2_step_2'])
+async def step_2_2_intrinsic_attributes(
+    entity_name: str,
+    nl_description: str,
+    entity_description: Optional[str] = None,
+    explicit_attributes: Optional[List[str]] = None,
+    domain: Optional[str] = None,
+    relations: Optional[List] = None,
+    primary_key: Optional[List[str]] = None,
+    all_entity_names: Optional[List[str]] = None,
+) -> IntrinsicAttributesOutput:
+    """
+    Step 2.2 (per-entity): Extract attributes that are inherent to the entity.
+    
+    This is designed to be called in parallel for multiple entities.
+    
+    **CRITICAL**: Must explicitly instruct LLM to NOT generate any attributes that relate 
+    entities through relations. Only generate intrinsic attributes that describe the entity itself.
+    
+    Args:
+        entity_name: Name of the entity
+        nl_description: Natural language description of the database requirements (FULL description)
+        entity_description: Optional description of the entity from Step 1.4
+        explicit_attributes: Optional list of explicitly mentioned attributes from Step 2.1
+        domain: Optional domain context from Phase 1 (Steps 1.1-1.3)
+        relations: Optional list of relations this entity participates in (from Steps 1.9, 1.11)
+                  Each relation dict should have: entities, type, description, cardinalities, participations
+        primary_key: Optional current primary key from Step 2.7 (if available)
+        
+    Returns:
+        dict: Intrinsic attributes result with attributes list
+        
+    Example:
+        >>> result = await step_2_2_intrinsic_attributes(
+        ...     "Customer",
+        ...     "Customers have name, email, and address",
+        ...     entity_description="A customer who places orders",
+        ...     domain="e-commerce",
+        ...     relations=[{"entities": ["Customer", "Order"], "type": "one-to-many"}],
+        ...     primary_key=["customer_id"]
+        ... )
+        >>> len(result["attributes"])
+        3
+        >>> result["attributes"][0]["name"]
+        "name"
+    """
+    logger.debug(f"Extracting intrinsic attributes for entity: {entity_name}")
+    
+    context_msg = _build_context_msg(
+        entity_name=entity_name,
+        entity_description=entity_description,
+        explicit_attributes=explicit_attributes,
+        domain=domain,
+        relations=relations,
+        primary_key=primary_key,
+        all_entity_names=all_entity_names,
+    )
+    
+    system_prompt = _build_system_prompt(
+        IntrinsicAttributesOutput,
+        "Return a comprehensive list of all intrinsic attributes for the entity. REMEMBER: You MUST return at least one attribute. An empty list is not acceptable.",
+    )
     
     # Human prompt template - use single braces for template variable
     # Note: We format entity_name and context_msg here, but nl_description is passed via input_data
@@ -588,6 +617,60 @@ class IntrinsicAttributesBatchOutput(BaseModel):
     total_entities: int = Field(description="Total number of entities processed")
 
 
+async def _step_2_2_packed_call(
+    requests: List[Dict[str, Any]],
+    nl_description: str,
+    domain: Optional[str] = None,
+    all_entity_names: Optional[List[str]] = None,
+) -> Dict[str, IntrinsicAttributesOutput]:
+    """
+    One Step 2.2 request for several entities (packing mode).
+
+    Args:
+        requests: Per-entity arguments of `step_2_2_intrinsic_attributes` (without shared context)
+        nl_description: Natural language description (FULL description)
+        domain: Optional domain context, stated once for all entities
+        all_entity_names: Optional names of all entities, stated once for all entities
+
+    Returns:
+        Intrinsic attributes by entity name (entities the LLM skipped are missing)
+    """
+    packed_schema = packed_output_model(EntityIntrinsicAttributesResult)
+    system_prompt = _build_system_prompt(
+        packed_schema,
+        "You will receive SEVERAL entities, each with its own enhanced context. Extract the intrinsic attributes "
+        "of every entity independently, applying all rules above to each entity. Return exactly one item in "
+        "\"entity_results\" per entity, with \"entity_name\" exactly as given. REMEMBER: every entity MUST have "
+        "at least one attribute.",
+    )
+
+    shared_parts = []
+    if domain:
+        shared_parts.append(f"Domain: {domain}")
+    if all_entity_names:
+        shared_parts.append("All entities in schema: " + ", ".join([n for n in all_entity_names if n]))
+    shared_msg = "".join(f"{part}\n" for part in shared_parts).replace("{", "{{").replace("}", "}}")
+
+    sections = [f"Entity: {kw['entity_name']}{_build_context_msg(**kw)}" for kw in requests]
+    human_prompt = (
+        f"{shared_msg}Entities ({len(requests)}):\n\n" + "\n\n".join(sections)
+        + "\n\nNatural language description:\n{nl_description}"
+    )
+
+    result = await standardized_llm_call(
+        llm=get_model_for_step("2.2"),
+        output_schema=packed_schema,
+        system_prompt=system_prompt,
+        human_prompt_template=human_prompt,
+        input_data={"nl_description": nl_description},
+        config=get_trace_config("2.2", phase=2, tags=["intrinsic_attributes", "packed"]),
+    )
+    return {
+        entity_result.entity_name: IntrinsicAttributesOutput(attributes=entity_result.attributes)
+        for entity_result in result.entity_results
+    }
+
+
 async def step_2_2_intrinsic_attributes_batch(
     entities: List,
     nl_description: str,
@@ -595,6 +678,8 @@ async def step_2_2_intrinsic_attributes_batch(
     domain: Optional[str] = None,
     relations: Optional[List] = None,
     primary_keys: Optional[dict] = None,
+    all_entity_names: Optional[List[str]] = None,
+    packing: Optional[bool] = None,
 ) -> IntrinsicAttributesBatchOutput:
     """
     Step 2.2: Extract intrinsic attributes for all entities (parallel execution).
@@ -607,6 +692,12 @@ async def step_2_2_intrinsic_attributes_batch(
         relations: Optional list of all relations from Phase 1 (Steps 1.9, 1.11)
                    Used to find relations each entity participates in
         primary_keys: Optional dictionary mapping entity names to primary keys from Step 2.7
+        all_entity_names: Optional names of all entities in the schema (defaults to the names
+                          of `entities`; pass it when processing a subset of entities)
+        packing: Pack several entities into one LLM request (see utils.llm.request_packing);
+                 defaults to NL2DATA_PHASE2_STEP_2_2_PACKING_ENABLED. Packing only applies
+                 to calls with several entities; with it enabled, the Phase 2 graph calls
+                 this step once for all entities instead of streaming them one by one
         
     Returns:
         IntrinsicAttributesBatchOutput: Intrinsic attributes results for all entities
@@ -628,13 +719,13 @@ async def step_2_2_intrinsic_attributes_batch(
     # Execute in parallel for all entities
     import asyncio
     
-    all_entity_names = [
-        e.get("name", "") if isinstance(e, dict) else getattr(e, "name", "")
-        for e in entities
-    ]
+    if all_entity_names is None:
+        all_entity_names = [
+            e.get("name", "") if isinstance(e, dict) else getattr(e, "name", "")
+            for e in entities
+        ]
 
-    tasks = []
-    task_metadata = []  # Store entity_name for each task
+    requests = []  # Per-entity arguments of step_2_2_intrinsic_attributes
     for entity in entities:
         entity_name = entity.get("name", "Unknown") if isinstance(entity, dict) else getattr(entity, "name", "Unknown")
         entity_desc = entity.get("description", "") if isinstance(entity, dict) else getattr(entity, "description", "")
@@ -674,28 +765,60 @@ async def step_2_2_intrinsic_attributes_batch(
         if primary_keys and entity_name in primary_keys:
             entity_pk = primary_keys[entity_name]
         
-        task = step_2_2_intrinsic_attributes(
-            entity_name=entity_name,
+        requests.append({
+            "entity_name": entity_name,
+            "entity_description": entity_desc,
+            "explicit_attributes": explicit_attrs,
+            "relations": entity_relations,
+            "primary_key": entity_pk,
+        })
+    
+    cfg = get_phase2_config()
+    if packing is None:
+        packing = bool(cfg.step_2_2_packing_enabled)
+
+    def _single(kw: Dict[str, Any]):
+        return step_2_2_intrinsic_attributes(
             nl_description=nl_description,
-            entity_description=entity_desc,
-            explicit_attributes=explicit_attrs,
             domain=domain,
-            relations=entity_relations,
-            primary_key=entity_pk,
             all_entity_names=all_entity_names,
+            **kw,
+        )
+
+    if packing and len(requests) > 1:
+        packs = plan_packs(
+            requests,
+            "P2_S2_INTRINSIC_ATTRIBUTES",
+            token_budget=cfg.step_2_2_packing_token_budget,
+            max_items=cfg.step_2_2_packing_max_entities,
+            item_tokens=lambda kw: len(_build_context_msg(**kw)) // 4,
+        )
+        logger.info(f"Step 2.2 packing: {len(requests)} entities in {len(packs)} request(s)")
+        # Packed results with deterministic issues go back through the per-entity revision loop
+        results = await run_packed(
+            requests,
+            packs,
+            key=lambda kw: kw["entity_name"],
+            call_pack=lambda pack: _step_2_2_packed_call(
+                pack, nl_description, domain=domain, all_entity_names=all_entity_names
+            ),
+            call_single=_single,
+            accept=lambda kw, result: bool(result.attributes) and not _detect_intrinsic_attribute_issues(
+                entity_name=kw["entity_name"],
+                attributes=result.attributes,
+                all_entity_names=all_entity_names,
+            ),
+        )
+    else:
+        # Wait for all tasks to complete
+        results = await asyncio.gather(
+            *(_single(kw) for kw in requests),
+            return_exceptions=True
         )
-        tasks.append(task)
-        task_metadata.append(entity_name)
-    
-    # Wait for all tasks to complete
-    results = await asyncio.gather(
-        *tasks,
-        return_exceptions=True
-    )
     
     # Process results
     entity_results_list = []
-    for entity_name, result in zip(task_metadata, results):
+    for entity_name, result in zip((kw["entity_name"] for kw in requests), results):
         if isinstance(result, Exception):
             logger.error(f"Error processing entity {entity_name}: {result}")
             entity_results_list.append(
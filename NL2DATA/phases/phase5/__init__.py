@@ -11,11 +11,13 @@ This phase:
 from .step_5_1_attribute_dependency_graph import step_5_1_attribute_dependency_graph
 from .step_5_2_independent_attribute_data_types import (
     step_5_2_independent_attribute_data_types,
+    step_5_2_entity_attribute_data_types,
     step_5_2_independent_attribute_data_types_batch,
 )
 from .step_5_3_deterministic_fk_data_types import step_5_3_deterministic_fk_data_types
 from .step_5_4_dependent_attribute_data_types import (
     step_5_4_dependent_attribute_data_types,
+    step_5_4_entity_dependent_attribute_data_types,
     step_5_4_dependent_attribute_data_types_batch,
 )
 from .step_5_5_nullability_detection import (
@@ -26,9 +28,11 @@ from .step_5_5_nullability_detection import (
 __all__ = [
     "step_5_1_attribute_dependency_graph",
     "step_5_2_independent_attribute_data_types",
+    "step_5_2_entity_attribute_data_types",
     "step_5_2_independent_attribute_data_types_batch",
     "step_5_3_deterministic_fk_data_types",
     "step_5_4_dependent_attribute_data_types",
+    "step_5_4_entity_dependent_attribute_data_types",
     "step_5_4_dependent_attribute_data_types_batch",
     "step_5_5_nullability_detection",
     "step_5_5_nullability_detection_batch",
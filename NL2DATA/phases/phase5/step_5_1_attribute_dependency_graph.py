@@ -4,10 +4,11 @@ Builds a dependency graph of attributes based on PK/FK relationships and derived
 This enables Kahn's algorithm for topological sorting in subsequent steps.
 """
 
-from typing import Dict, Any, List, Set, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
 from collections import defaultdict, deque
 from pydantic import BaseModel, Field, ConfigDict
 
+from NL2DATA.ir.schema_index import SchemaIndex
 from NL2DATA.utils.logging import get_logger
 from NL2DATA.utils.observability import traceable_step, get_trace_config
 
@@ -205,22 +206,13 @@ def step_5_1_attribute_dependency_graph(
     fk_dependencies: Dict[str, Tuple[str, str]] = {}  # "Entity.attr" -> (ref_entity, ref_attr)
     derived_dependencies: Dict[str, List[str]] = {}  # "Entity.attr" -> list of base attrs
     
-    # Get all attribute names per entity
-    entity_attr_names: Dict[str, Set[str]] = {}
-    for entity_name, attrs in attributes.items():
-        attr_names = set()
-        for attr in attrs:
-            attr_name = attr.get("name", "") if isinstance(attr, dict) else getattr(attr, "name", "")
-            if attr_name:
-                attr_names.add(attr_name)
-        entity_attr_names[entity_name] = attr_names
+    # Attribute names per entity and normalized FKs
+    schema = SchemaIndex.build(attributes=attributes, foreign_keys=foreign_keys)
     
     # 1. FK dependencies: FK -> PK
-    for fk in (foreign_keys or []):
-        from_entity = fk.get("from_entity", "") if isinstance(fk, dict) else getattr(fk, "from_entity", "")
-        to_entity = fk.get("to_entity", "") if isinstance(fk, dict) else getattr(fk, "to_entity", "")
-        from_attrs = fk.get("from_attributes", []) if isinstance(fk, dict) else getattr(fk, "from_attributes", [])
-        to_attrs = fk.get("to_attributes", []) if isinstance(fk, dict) else getattr(fk, "to_attributes", [])
+    for fk in schema.foreign_keys:
+        from_entity, to_entity = fk.from_entity, fk.to_entity
+        from_attrs, to_attrs = fk.from_attributes, fk.to_attributes
         
         if not from_entity or not to_entity or not from_attrs or not to_attrs:
             continue
@@ -265,10 +257,10 @@ def step_5_1_attribute_dependency_graph(
     # TODO: Add composite attribute dependency detection if composite_decompositions are available
     
     # Identify independent and dependent attributes
-    all_attributes: Set[Tuple[str, str]] = set()  # (entity, attribute)
-    for entity_name, attr_names in entity_attr_names.items():
-        for attr_name in attr_names:
-            all_attributes.add((entity_name, attr_name))
+    all_attributes: Dict[Tuple[str, str], None] = {}  # (entity, attribute), in state order
+    for entity_name in schema.attributed_entities:
+        for attr_name in schema.attribute_names(entity_name):
+            all_attributes[(entity_name, attr_name)] = None
     
     # Find independent attributes (no incoming edges in dependency graph)
     dependent_keys = set()
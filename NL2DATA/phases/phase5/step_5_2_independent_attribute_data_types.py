@@ -19,6 +19,11 @@ from NL2DATA.utils.data_types.type_assignment import (
     _deterministic_type_assignment,
     _infer_type_from_name_and_hint,
 )
+from NL2DATA.utils.data_types.type_inference import (
+    TypeInferenceEngine,
+    collect_llm_attribute_types,
+    fallback_type_info,
+)
 from NL2DATA.phases.phase1.utils.data_extraction import (
     extract_attribute_name,
     extract_attribute_type_hint,
@@ -26,6 +31,9 @@ from NL2DATA.phases.phase1.utils.data_extraction import (
 
 logger = get_logger(__name__)
 
+# Ambiguous attributes of one entity sent to the LLM per call
+LLM_TYPE_BATCH_SIZE = 20
+
 
 class AttributeTypeAssignment(BaseModel):
     """Single attribute type assignment."""
@@ -456,6 +464,138 @@ The attribute_types dictionary MUST have "{attribute_name}" as a key with a vali
             )
 
 
+@traceable_step("5.2", phase=5, tags=["phase_5_step_2"])
+async def step_5_2_entity_attribute_data_types(
+    entity_name: str,
+    attribute_names: List[str],
+    attributes: Dict[str, List[Dict[str, Any]]],  # All entity attributes
+    primary_keys: Optional[Dict[str, List[str]]] = None,
+    domain: Optional[str] = None,
+    entity_descriptions: Optional[Dict[str, str]] = None,
+    nl_description: Optional[str] = None,
+) -> IndependentAttributeDataTypesOutput:
+    """
+    Step 5.2 (per-entity): Assign SQL data types to several attributes of one entity in one LLM call.
+
+    Used for the attributes the deterministic rules leave ambiguous. Attributes the
+    response does not cover get the deterministic name/type_hint fallback.
+
+    Args:
+        entity_name: Name of the entity
+        attribute_names: Names of the attributes to assign types to
+        attributes: Dictionary mapping entity names to their attribute lists
+        primary_keys: Optional dictionary mapping entity names to primary keys
+        domain: Optional domain context
+        entity_descriptions: Optional dictionary mapping entity names to descriptions
+        nl_description: Optional natural language description
+
+    Returns:
+        IndependentAttributeDataTypesOutput with one assignment per attribute
+    """
+    logger.debug(f"Assigning types to {len(attribute_names)} attributes of {entity_name}")
+
+    entity_attrs = {extract_attribute_name(attr): attr for attr in attributes.get(entity_name, [])}
+    attrs = [entity_attrs.get(name) or {"name": name} for name in attribute_names]
+    pk = primary_keys.get(entity_name, []) if primary_keys else []
+
+    context_parts = []
+    if domain:
+        context_parts.append(f"Domain: {domain}")
+    if entity_descriptions and entity_descriptions.get(entity_name):
+        context_parts.append(f"Entity description: {entity_descriptions[entity_name]}")
+    if pk:
+        context_parts.append(f"Primary key: {', '.join(pk)}")
+
+    attribute_lines = []
+    for attr in attrs:
+        attr_name = extract_attribute_name(attr)
+        attr_desc = attr.get("description", "") if isinstance(attr, dict) else getattr(attr, "description", "")
+        type_hint = extract_attribute_type_hint(attr)
+        line = f"- {attr_name}: {attr_desc or 'No description provided'}"
+        if type_hint:
+            line += f" (type hint: {type_hint})"
+        if attr_name in pk:
+            line += " [primary key]"
+        attribute_lines.append(line)
+
+    names_list = ", ".join(f'"{name}"' for name in attribute_names)
+    output_structure_section = generate_output_structure_section_with_custom_requirements(
+        output_schema=DataTypeAssignmentOutput,
+        additional_requirements=[
+            f"CRITICAL: The \"attribute_types\" dictionary MUST contain exactly one entry for each of these attribute names: {names_list}",
+            "Use the exact attribute names as dictionary keys",
+            "The \"reasoning\" field in each AttributeTypeInfo is REQUIRED and must explain why this type was chosen",
+            "For VARCHAR types, provide a reasonable size (e.g., 255 for names, 50 for codes, 500 for descriptions)",
+            "For DECIMAL types, provide precision and scale (e.g., DECIMAL(12,2) for money, DECIMAL(6,4) for percentages)",
+            "Primary key attributes should typically be BIGINT or VARCHAR",
+        ]
+    )
+
+    system_prompt = """You are a database schema design expert. Your task is to assign appropriate SQL data types to the listed attributes of one entity.
+
+Return a JSON object whose "attribute_types" dictionary has one entry per listed attribute, keyed by the exact attribute name, e.g.:
+{
+  "attribute_types": {
+    "customer_name": {"type": "VARCHAR", "size": 255, "precision": null, "scale": null, "reasoning": "Variable-length person name"},
+    "credit_limit": {"type": "DECIMAL", "size": null, "precision": 12, "scale": 2, "reasoning": "Monetary amount"}
+  }
+}
+
+SQL DATA TYPES:
+- **VARCHAR(n)**: Variable-length strings (names, descriptions, codes). Provide size parameter.
+- **TEXT**: Very long strings (unlimited length descriptions, comments)
+- **INT**: 32-bit integers (quantities, counts, small IDs)
+- **BIGINT**: 64-bit integers (large IDs, timestamps as integers)
+- **DECIMAL(p,s)**: Fixed-point numbers (money, percentages, precise measurements). Provide precision and scale.
+- **DOUBLE**: Floating-point numbers (scientific measurements, approximate values)
+- **BOOLEAN**: True/false values (flags, enabled/disabled)
+- **DATE**: Date only (year-month-day)
+- **TIMESTAMP**: Date and time (year-month-day hour:minute:second)
+- **JSON**: JSON documents (structured data)
+
+Consider each attribute's name, description, type hint and the domain context.
+
+""".replace("{", "{{").replace("}", "}}") + output_structure_section
+
+    context_msg = ""
+    if context_parts:
+        context_msg = "\n\nContext:\n" + "\n".join(f"- {part}" for part in context_parts)
+    human_prompt = f"""Entity: {entity_name}
+Attributes:
+{chr(10).join(attribute_lines)}{context_msg}
+
+Assign an appropriate SQL data type to each of these attributes: {names_list}.""".replace("{", "{{").replace("}", "}}")
+
+    llm = get_model_for_step("5.2")
+    config = get_trace_config("5.2", phase=5, tags=["independent_attribute_types"])
+    try:
+        result: Optional[DataTypeAssignmentOutput] = await standardized_llm_call(
+            llm=llm,
+            output_schema=DataTypeAssignmentOutput,
+            system_prompt=system_prompt,
+            human_prompt_template=human_prompt,
+            input_data={},
+            tools=None,
+            use_agent_executor=False,
+            decouple_tools=False,
+            config=config,
+        )
+    except Exception as e:
+        logger.warning(
+            f"LLM type assignment failed for {len(attribute_names)} attributes of {entity_name}: {e}. "
+            f"Using deterministic fallback"
+        )
+        result = None
+
+    types = collect_llm_attribute_types(result, entity_name, attrs, pk)
+    return IndependentAttributeDataTypesOutput(
+        data_types=[
+            _create_type_assignment(f"{entity_name}.{name}", types[name])
+            for name in attribute_names
+        ]
+    )
+
+
 class IndependentAttributeDataTypesBatchOutput(BaseModel):
     """Batch output structure for independent attribute data type assignment."""
     data_types: List[AttributeTypeAssignment] = Field(
@@ -472,9 +612,15 @@ async def step_5_2_independent_attribute_data_types_batch(
     domain: Optional[str] = None,
     entity_descriptions: Optional[Dict[str, str]] = None,
     nl_description: Optional[str] = None,
+    categorical_attributes: Optional[Dict[str, List[str]]] = None,
 ) -> IndependentAttributeDataTypesBatchOutput:
     """
-    Step 5.2 (batch): Assign SQL data types to all independent attributes (parallel execution).
+    Step 5.2 (batch): Assign SQL data types to all independent attributes.
+
+    Types fixed by an explicit type_hint, a naming convention or a categorical
+    attribute are assigned deterministically (TypeInferenceEngine). The remaining
+    ambiguous attributes are sent to the LLM in one call per entity (at most
+    LLM_TYPE_BATCH_SIZE attributes per call), in parallel.
     
     Args:
         independent_attributes: List of (entity_name, attribute_name) tuples
@@ -483,9 +629,10 @@ async def step_5_2_independent_attribute_data_types_batch(
         domain: Optional domain context
         entity_descriptions: Optional dictionary mapping entity names to descriptions
         nl_description: Optional natural language description
+        categorical_attributes: Optional dictionary mapping entity names to categorical attribute names
         
     Returns:
-        dict: Combined data_types dict mapping "entity.attribute" -> type_info
+        IndependentAttributeDataTypesBatchOutput with one assignment per attribute (input order)
     """
     logger.info(f"Starting Step 5.2: Independent Attribute Data Types for {len(independent_attributes)} attributes")
     
@@ -493,63 +640,58 @@ async def step_5_2_independent_attribute_data_types_batch(
         logger.warning("No independent attributes provided for type assignment")
         return IndependentAttributeDataTypesBatchOutput(data_types=[])
     
-    # Execute in parallel for all independent attributes
-    tasks = []
-    for entity_name, attribute_name in independent_attributes:
-        task = step_5_2_independent_attribute_data_types(
-            entity_name=entity_name,
-            attribute_name=attribute_name,
-            attributes=attributes,
-            primary_keys=primary_keys,
-            domain=domain,
-            entity_descriptions=entity_descriptions,
-            nl_description=nl_description,
-        )
-        tasks.append((entity_name, attribute_name, task))
-    
-    # Wait for all tasks to complete
+    engine = TypeInferenceEngine(
+        attributes,
+        primary_keys=primary_keys,
+        categorical_attributes=categorical_attributes,
+    )
+    types, ambiguous = engine.partition(independent_attributes)
+
+    chunks = [
+        (entity_name, names[i:i + LLM_TYPE_BATCH_SIZE])
+        for entity_name, names in ambiguous.items()
+        for i in range(0, len(names), LLM_TYPE_BATCH_SIZE)
+    ]
+    logger.info(
+        f"Step 5.2: {len(types)} types assigned deterministically, "
+        f"{sum(len(names) for names in ambiguous.values())} ambiguous attributes in {len(chunks)} LLM calls"
+    )
+
     results = await asyncio.gather(
-        *[task for _, _, task in tasks],
+        *[
+            step_5_2_entity_attribute_data_types(
+                entity_name=entity_name,
+                attribute_names=names,
+                attributes=attributes,
+                primary_keys=primary_keys,
+                domain=domain,
+                entity_descriptions=entity_descriptions,
+                nl_description=nl_description,
+            )
+            for entity_name, names in chunks
+        ],
         return_exceptions=True
     )
     
-    # Combine results
-    all_data_types_list = []
-    for i, ((entity_name, attribute_name, _), result) in enumerate(zip(tasks, results)):
+    for (entity_name, names), result in zip(chunks, results):
         if isinstance(result, Exception):
             logger.error(
-                f"Error assigning type to {entity_name}.{attribute_name}: {result}",
+                f"Error assigning types to {len(names)} attributes of {entity_name}: {result}",
                 exc_info=True
             )
-            # Use deterministic fallback
-            entity_attrs = attributes.get(entity_name, [])
-            attr_info = None
-            for attr in entity_attrs:
-                if extract_attribute_name(attr) == attribute_name:
-                    attr_info = attr
-                    break
-            
-            pk = primary_keys.get(entity_name, []) if primary_keys else []
-            fallback_result = _deterministic_type_assignment(
-                entity_name=entity_name,
-                attributes=[attr_info] if attr_info else [{"name": attribute_name}],
-                primary_key=pk,
-            )
-            fallback_types = fallback_result.get("attribute_types", {})
-            if attribute_name in fallback_types:
-                attr_key = f"{entity_name}.{attribute_name}"
-                all_data_types_list.append(_create_type_assignment(attr_key, fallback_types[attribute_name]))
+            for attribute_name in names:
+                types[f"{entity_name}.{attribute_name}"] = fallback_type_info(
+                    entity_name, engine.attribute(entity_name, attribute_name), engine.primary_key(entity_name)
+                )
             continue
-        
-        # Extract data_types from result (now a list)
-        if hasattr(result, 'data_types'):
-            all_data_types_list.extend(result.data_types)
-        elif isinstance(result, dict):
-            # Handle old dict format for backward compatibility
-            result_data_types = result.get("data_types", {})
-            for attr_key, type_info_dict in result_data_types.items():
-                all_data_types_list.append(_create_type_assignment(attr_key, type_info_dict))
-    
+        for assignment in result.data_types:
+            types[assignment.attribute_key] = assignment.type_info.model_dump()
+
+    all_data_types_list = [
+        _create_type_assignment(attr_key, types[attr_key])
+        for attr_key in dict.fromkeys(f"{entity_name}.{attribute_name}" for entity_name, attribute_name in independent_attributes)
+    ]
+
     logger.info(f"Assigned types to {len(all_data_types_list)} independent attributes")
     
     return IndependentAttributeDataTypesBatchOutput(data_types=all_data_types_list)
@@ -22,9 +22,15 @@ from NL2DATA.phases.phase1.utils.data_extraction import (
     extract_attribute_name,
     extract_attribute_type_hint,
 )
+from NL2DATA.utils.data_types.type_inference import (
+    TypeInferenceEngine,
+    collect_llm_attribute_types,
+    fallback_type_info,
+)
 # Import AttributeTypeAssignment from step_5_2
 from NL2DATA.phases.phase5.step_5_2_independent_attribute_data_types import (
     AttributeTypeAssignment,
+    LLM_TYPE_BATCH_SIZE,
     _create_type_assignment
 )
 
@@ -49,6 +55,57 @@ class DependentAttributeDataTypesBatchOutput(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+def _fk_dependencies_to_dict(fk_dependencies) -> Dict[str, Dict[str, str]]:
+    """FK dependencies as "entity.attribute" -> {"entity": ..., "attribute": ...} (dict or list of FkDependencyInfo)."""
+    if hasattr(fk_dependencies, '__iter__') and not isinstance(fk_dependencies, dict):
+        # It's a list of FkDependencyInfo
+        return {
+            dep.attribute_key: {"entity": dep.referenced_entity, "attribute": dep.referenced_attribute}
+            for dep in fk_dependencies
+        }
+    return fk_dependencies or {}
+
+
+def _independent_types_to_dict(independent_types) -> Dict[str, Dict[str, Any]]:
+    """Step 5.2 types as "entity.attribute" -> type_info (dict or IndependentAttributeDataTypesBatchOutput)."""
+    if hasattr(independent_types, 'data_types'):
+        # It's IndependentAttributeDataTypesBatchOutput
+        return {
+            assignment.attribute_key: assignment.type_info.model_dump()
+            for assignment in independent_types.data_types
+        }
+    if hasattr(independent_types, 'model_dump'):
+        independent_types_dict = independent_types.model_dump().get("data_types", {})
+        if isinstance(independent_types_dict, list):
+            independent_types_dict = {
+                assignment.get("attribute_key"): assignment.get("type_info", {})
+                if isinstance(assignment, dict) else assignment.type_info.model_dump()
+                for assignment in independent_types_dict
+            }
+        return independent_types_dict
+    return independent_types or {}
+
+
+def _fk_types_to_dict(fk_types) -> Dict[str, Dict[str, Any]]:
+    """Step 5.3 types as "entity.attribute" -> type_info (dict or FkDataTypesOutput)."""
+    if hasattr(fk_types, 'fk_data_types'):
+        # It's FkDataTypesOutput
+        return {
+            assignment.attribute_key: assignment.type_info.model_dump()
+            for assignment in fk_types.fk_data_types
+        }
+    if hasattr(fk_types, 'model_dump'):
+        fk_types_dict = fk_types.model_dump().get("fk_data_types", {})
+        if isinstance(fk_types_dict, list):
+            fk_types_dict = {
+                assignment.get("attribute_key"): assignment.get("type_info", {})
+                if isinstance(assignment, dict) else assignment.type_info.model_dump()
+                for assignment in fk_types_dict
+            }
+        return fk_types_dict
+    return fk_types or {}
+
+
 @traceable_step("5.4", phase=5, tags=["phase_5_step_4"])
 async def step_5_4_dependent_attribute_data_types(
     entity_name: str,
@@ -133,51 +190,9 @@ async def step_5_4_dependent_attribute_data_types(
     type_hint = extract_attribute_type_hint(attr_info)
     
     # Convert input parameters to dict format for easier handling
-    # Convert fk_dependencies
-    if hasattr(fk_dependencies, '__iter__') and not isinstance(fk_dependencies, dict):
-        # It's a list of FkDependencyInfo
-        fk_dependencies_dict = {
-            dep.attribute_key: {"entity": dep.referenced_entity, "attribute": dep.referenced_attribute}
-            for dep in fk_dependencies
-        }
-    else:
-        fk_dependencies_dict = fk_dependencies
-    
-    # Convert independent_types
-    if hasattr(independent_types, 'data_types'):
-        # It's IndependentAttributeDataTypesBatchOutput
-        independent_types_dict = {
-            assignment.attribute_key: assignment.type_info.model_dump()
-            for assignment in independent_types.data_types
-        }
-    elif hasattr(independent_types, 'model_dump'):
-        independent_types_dict = independent_types.model_dump().get("data_types", {})
-        if isinstance(independent_types_dict, list):
-            independent_types_dict = {
-                assignment.get("attribute_key"): assignment.get("type_info", {})
-                if isinstance(assignment, dict) else assignment.type_info.model_dump()
-                for assignment in independent_types_dict
-            }
-    else:
-        independent_types_dict = independent_types
-    
-    # Convert fk_types
-    if hasattr(fk_types, 'fk_data_types'):
-        # It's FkDataTypesOutput
-        fk_types_dict = {
-            assignment.attribute_key: assignment.type_info.model_dump()
-            for assignment in fk_types.fk_data_types
-        }
-    elif hasattr(fk_types, 'model_dump'):
-        fk_types_dict = fk_types.model_dump().get("fk_data_types", {})
-        if isinstance(fk_types_dict, list):
-            fk_types_dict = {
-                assignment.get("attribute_key"): assignment.get("type_info", {})
-                if isinstance(assignment, dict) else assignment.type_info.model_dump()
-                for assignment in fk_types_dict
-            }
-    else:
-        fk_types_dict = fk_types
+    fk_dependencies_dict = _fk_dependencies_to_dict(fk_dependencies)
+    independent_types_dict = _independent_types_to_dict(independent_types)
+    fk_types_dict = _fk_types_to_dict(fk_types)
     
     # Get dependencies
     attr_key = f"{entity_name}.{attribute_name}"
@@ -598,21 +613,182 @@ Assign an appropriate SQL data type for the dependent attribute "{attribute_name
             )
 
 
+@traceable_step("5.4", phase=5, tags=["phase_5_step_4"])
+async def step_5_4_entity_dependent_attribute_data_types(
+    entity_name: str,
+    attribute_names: List[str],
+    attributes: Dict[str, List[Dict[str, Any]]],  # All entity attributes
+    dependency_graph: Dict[str, List[str]],  # "entity.attribute" -> list of dependency keys
+    known_types: Dict[str, Dict[str, Any]],  # "entity.attribute" -> type_info of typed attributes
+    primary_keys: Optional[Dict[str, List[str]]] = None,
+    derived_formulas: Optional[Dict[str, Dict[str, Any]]] = None,
+    domain: Optional[str] = None,
+    nl_description: Optional[str] = None,
+) -> DependentAttributeDataTypesOutput:
+    """
+    Step 5.4 (per-entity): Assign SQL data types to several dependent attributes of one entity in one LLM call.
+
+    Used for the attributes the deterministic rules leave ambiguous. Attributes the
+    response does not cover get the deterministic name/type_hint fallback.
+
+    Args:
+        entity_name: Name of the entity
+        attribute_names: Names of the attributes to assign types to
+        attributes: Dictionary mapping entity names to their attribute lists
+        dependency_graph: Dependency graph from Step 5.1
+        known_types: Types assigned so far (Steps 5.2/5.3 and deterministic 5.4 assignments)
+        primary_keys: Optional dictionary mapping entity names to primary keys
+        derived_formulas: Optional dictionary mapping "entity.attribute" -> formula info
+        domain: Optional domain context
+        nl_description: Optional natural language description
+
+    Returns:
+        DependentAttributeDataTypesOutput with one assignment per attribute
+    """
+    logger.debug(f"Assigning types to {len(attribute_names)} dependent attributes of {entity_name}")
+
+    entity_attrs = {extract_attribute_name(attr): attr for attr in attributes.get(entity_name, [])}
+    attrs = [entity_attrs.get(name) or {"name": name} for name in attribute_names]
+    pk = primary_keys.get(entity_name, []) if primary_keys else []
+
+    attribute_lines = []
+    for attr in attrs:
+        attr_name = extract_attribute_name(attr)
+        attr_key = f"{entity_name}.{attr_name}"
+        attr_desc = attr.get("description", "") if isinstance(attr, dict) else getattr(attr, "description", "")
+        type_hint = extract_attribute_type_hint(attr)
+        line = f"- {attr_name}: {attr_desc or 'No description provided'}"
+        if type_hint:
+            line += f" (type hint: {type_hint})"
+        if attr_name in pk:
+            line += " [primary key]"
+        formula = (derived_formulas or {}).get(attr_key, {}).get("formula")
+        if formula:
+            line += f"\n  Formula: {formula}"
+        dep_types = [
+            f"{dep_key}: {known_types[dep_key].get('type', 'UNKNOWN')}"
+            for dep_key in dependency_graph.get(attr_key, [])
+            if dep_key in known_types
+        ]
+        if dep_types:
+            line += f"\n  Dependencies: {', '.join(dep_types)}"
+        attribute_lines.append(line)
+
+    context_parts = []
+    if domain:
+        context_parts.append(f"Domain: {domain}")
+    if pk:
+        context_parts.append(f"Primary key: {', '.join(pk)}")
+
+    names_list = ", ".join(f'"{name}"' for name in attribute_names)
+    output_structure_section = generate_output_structure_section_with_custom_requirements(
+        output_schema=DataTypeAssignmentOutput,
+        additional_requirements=[
+            f"CRITICAL: The \"attribute_types\" dictionary MUST contain exactly one entry for each of these attribute names: {names_list}",
+            "Use the exact attribute names as dictionary keys",
+            "The \"reasoning\" field in each AttributeTypeInfo is REQUIRED and must explain why this type was chosen",
+            "For derived attributes, consider the formula and dependency types when choosing the result type",
+            "For VARCHAR types, provide a reasonable size (e.g., 255 for names, 50 for codes, 500 for descriptions)",
+            "For DECIMAL types, provide precision and scale (e.g., DECIMAL(12,2) for money, DECIMAL(6,4) for percentages)",
+        ]
+    )
+
+    system_prompt = """You are a database schema design expert. Your task is to assign appropriate SQL data types to the listed dependent attributes of one entity.
+
+Return a JSON object whose "attribute_types" dictionary has one entry per listed attribute, keyed by the exact attribute name, e.g.:
+{
+  "attribute_types": {
+    "total_amount": {"type": "DECIMAL", "size": null, "precision": 12, "scale": 2, "reasoning": "Monetary amount derived from price * quantity"},
+    "display_label": {"type": "VARCHAR", "size": 255, "precision": null, "scale": null, "reasoning": "Concatenation of name fields"}
+  }
+}
+
+SQL DATA TYPES:
+- **VARCHAR(n)**: Variable-length strings (names, descriptions, codes). Provide size parameter.
+- **TEXT**: Very long strings (unlimited length descriptions, comments)
+- **INT**: 32-bit integers (quantities, counts, small IDs)
+- **BIGINT**: 64-bit integers (large IDs, timestamps as integers)
+- **DECIMAL(p,s)**: Fixed-point numbers (money, percentages, precise measurements). Provide precision and scale.
+- **DOUBLE**: Floating-point numbers (scientific measurements, approximate values)
+- **BOOLEAN**: True/false values (flags, enabled/disabled)
+- **DATE**: Date only (year-month-day)
+- **TIMESTAMP**: Date and time (year-month-day hour:minute:second)
+- **JSON**: JSON documents (structured data)
+
+TYPE SELECTION GUIDELINES:
+1. **Derived attributes**: The result type should match the formula's output type
+   - Sum/product of numbers -> DECIMAL or DOUBLE
+   - Concatenation of strings -> VARCHAR or TEXT
+   - Date arithmetic -> DATE or TIMESTAMP
+   - Boolean operations -> BOOLEAN
+2. **Regular dependent attributes**: Follow the same guidelines as independent attributes
+3. Consider dependency types, the attribute name, description and type hint when choosing the type
+
+""".replace("{", "{{").replace("}", "}}") + output_structure_section
+
+    context_msg = ""
+    if context_parts:
+        context_msg = "\n\nContext:\n" + "\n".join(f"- {part}" for part in context_parts)
+    human_prompt = f"""Entity: {entity_name}
+Dependent attributes:
+{chr(10).join(attribute_lines)}{context_msg}
+
+Assign an appropriate SQL data type to each of these dependent attributes: {names_list}.""".replace("{", "{{").replace("}", "}}")
+
+    llm = get_model_for_step("5.4")
+    config = get_trace_config("5.4", phase=5, tags=["dependent_attribute_types"])
+    try:
+        result: Optional[DataTypeAssignmentOutput] = await standardized_llm_call(
+            llm=llm,
+            output_schema=DataTypeAssignmentOutput,
+            system_prompt=system_prompt,
+            human_prompt_template=human_prompt,
+            input_data={},
+            tools=None,
+            use_agent_executor=False,
+            decouple_tools=False,
+            config=config,
+        )
+    except Exception as e:
+        logger.warning(
+            f"LLM type assignment failed for {len(attribute_names)} dependent attributes of {entity_name}: {e}. "
+            f"Using deterministic fallback"
+        )
+        result = None
+
+    types = collect_llm_attribute_types(result, entity_name, attrs, pk)
+    return DependentAttributeDataTypesOutput(
+        data_types=[
+            _create_type_assignment(f"{entity_name}.{name}", types[name])
+            for name in attribute_names
+        ]
+    )
+
+
 async def step_5_4_dependent_attribute_data_types_batch(
     dependent_attributes: List[Tuple[str, str]],  # List of (entity_name, attribute_name) tuples
     attributes: Dict[str, List[Dict[str, Any]]],  # All entity attributes
-        dependency_graph: Dict[str, List[str]],  # Dependency graph from Step 5.1
-        fk_dependencies: Dict[str, Dict[str, str]],  # FK dependency mapping
-        derived_dependencies: Dict[str, List[str]],  # Derived attribute dependency mapping
-        independent_types: Dict[str, Dict[str, Any]],  # Type assignments from Step 5.2
-        fk_types: Dict[str, Dict[str, Any]],  # Type assignments from Step 5.3
+    dependency_graph: Dict[str, List[str]],  # Dependency graph from Step 5.1
+    fk_dependencies: Dict[str, Dict[str, str]],  # FK dependency mapping
+    derived_dependencies: Dict[str, List[str]],  # Derived attribute dependency mapping
+    independent_types: Dict[str, Dict[str, Any]],  # Type assignments from Step 5.2
+    fk_types: Dict[str, Dict[str, Any]],  # Type assignments from Step 5.3
     primary_keys: Optional[Dict[str, List[str]]] = None,
     derived_formulas: Optional[Dict[str, Dict[str, Any]]] = None,
     domain: Optional[str] = None,
     nl_description: Optional[str] = None,
-) -> Dict[str, Any]:
+    categorical_attributes: Optional[Dict[str, List[str]]] = None,
+) -> DependentAttributeDataTypesBatchOutput:
     """
-    Step 5.4 (batch): Assign SQL data types to all dependent attributes (parallel execution).
+    Step 5.4 (batch): Assign SQL data types to all dependent attributes.
+
+    Most dependent attributes are FKs or simple derivations, so types are resolved
+    deterministically first (TypeInferenceEngine): FKs copy the referenced type,
+    derived attributes take their formula's result type once their inputs are typed,
+    then explicit type_hints, naming conventions and categorical attributes. The
+    remaining ambiguous non-derived attributes are sent to the LLM in one call per
+    entity (in parallel); derived attributes whose inputs were among them are then
+    typed from their formula using the LLM results.
     
     Args:
         dependent_attributes: List of (entity_name, attribute_name) tuples
@@ -626,9 +802,10 @@ async def step_5_4_dependent_attribute_data_types_batch(
         derived_formulas: Optional dictionary mapping "entity.attribute" -> formula info
         domain: Optional domain context
         nl_description: Optional natural language description
+        categorical_attributes: Optional dictionary mapping entity names to categorical attribute names
         
     Returns:
-        dict: Combined data_types dict mapping "entity.attribute" -> type_info
+        DependentAttributeDataTypesBatchOutput with one assignment per attribute (input order)
     """
     logger.info(f"Starting Step 5.4: Dependent Attribute Data Types for {len(dependent_attributes)} attributes")
     
@@ -636,68 +813,85 @@ async def step_5_4_dependent_attribute_data_types_batch(
         logger.warning("No dependent attributes provided for type assignment")
         return DependentAttributeDataTypesBatchOutput(data_types=[])
     
-    # Execute in parallel for all dependent attributes
-    tasks = []
-    for entity_name, attribute_name in dependent_attributes:
-        task = step_5_4_dependent_attribute_data_types(
-            entity_name=entity_name,
-            attribute_name=attribute_name,
-            attributes=attributes,
-            dependency_graph=dependency_graph,
-            fk_dependencies=fk_dependencies,
-            derived_dependencies=derived_dependencies,
-            independent_types=independent_types,
-            fk_types=fk_types,
-            primary_keys=primary_keys,
-            derived_formulas=derived_formulas,
-            domain=domain,
-            nl_description=nl_description,
-        )
-        tasks.append((entity_name, attribute_name, task))
-    
-    # Wait for all tasks to complete
+    fk_dependencies_dict = _fk_dependencies_to_dict(fk_dependencies)
+    engine = TypeInferenceEngine(
+        attributes,
+        primary_keys=primary_keys,
+        known_types={**_independent_types_to_dict(independent_types), **_fk_types_to_dict(fk_types)},
+        fk_references={
+            attr_key: f"{dep.get('entity', '')}.{dep.get('attribute', '')}"
+            for attr_key, dep in fk_dependencies_dict.items()
+        },
+        derived_formulas=derived_formulas,
+        categorical_attributes=categorical_attributes,
+    )
+    types, ambiguous = engine.partition(dependent_attributes)
+
+    # Derived attributes are typed from their formula once their inputs have types
+    llm_attributes: Dict[str, List[str]] = {}
+    deferred_derived = set()
+    for entity_name, names in ambiguous.items():
+        for attribute_name in names:
+            if engine.is_derived(entity_name, attribute_name):
+                deferred_derived.add((entity_name, attribute_name))
+            else:
+                llm_attributes.setdefault(entity_name, []).append(attribute_name)
+    chunks = [
+        (entity_name, names[i:i + LLM_TYPE_BATCH_SIZE])
+        for entity_name, names in llm_attributes.items()
+        for i in range(0, len(names), LLM_TYPE_BATCH_SIZE)
+    ]
+    logger.info(
+        f"Step 5.4: {len(types)} types assigned deterministically, "
+        f"{sum(len(names) for _, names in chunks)} ambiguous attributes in {len(chunks)} LLM calls"
+    )
+
     results = await asyncio.gather(
-        *[task for _, _, task in tasks],
+        *[
+            step_5_4_entity_dependent_attribute_data_types(
+                entity_name=entity_name,
+                attribute_names=names,
+                attributes=attributes,
+                dependency_graph=dependency_graph,
+                known_types=engine.known_types,
+                primary_keys=primary_keys,
+                derived_formulas=derived_formulas,
+                domain=domain,
+                nl_description=nl_description,
+            )
+            for entity_name, names in chunks
+        ],
         return_exceptions=True
     )
     
-    # Combine results
-    all_data_types_list = []
-    for i, ((entity_name, attribute_name, _), result) in enumerate(zip(tasks, results)):
+    for (entity_name, names), result in zip(chunks, results):
         if isinstance(result, Exception):
             logger.error(
-                f"Error assigning type to {entity_name}.{attribute_name}: {result}",
+                f"Error assigning types to {len(names)} dependent attributes of {entity_name}: {result}",
                 exc_info=True
             )
-            # Use deterministic fallback
-            entity_attrs = attributes.get(entity_name, [])
-            attr_info = None
-            for attr in entity_attrs:
-                if extract_attribute_name(attr) == attribute_name:
-                    attr_info = attr
-                    break
-            
-            pk = primary_keys.get(entity_name, []) if primary_keys else []
-            fallback_result = _deterministic_type_assignment(
-                entity_name=entity_name,
-                attributes=[attr_info] if attr_info else [{"name": attribute_name}],
-                primary_key=pk,
-            )
-            fallback_types = fallback_result.get("attribute_types", {})
-            if attribute_name in fallback_types:
-                attr_key = f"{entity_name}.{attribute_name}"
-                all_data_types_list.append(_create_type_assignment(attr_key, fallback_types[attribute_name]))
+            for attribute_name in names:
+                types[f"{entity_name}.{attribute_name}"] = fallback_type_info(
+                    entity_name, engine.attribute(entity_name, attribute_name), engine.primary_key(entity_name)
+                )
+        else:
+            for assignment in result.data_types:
+                types[assignment.attribute_key] = assignment.type_info.model_dump()
+        for attribute_name in names:
+            engine.known_types[f"{entity_name}.{attribute_name}"] = types[f"{entity_name}.{attribute_name}"]
+
+    for entity_name, attribute_name in dependent_attributes:
+        if (entity_name, attribute_name) not in deferred_derived:
             continue
-        
-        # Extract data_types from result (now a list)
-        if hasattr(result, 'data_types'):
-            all_data_types_list.extend(result.data_types)
-        elif isinstance(result, dict):
-            # Handle old dict format for backward compatibility
-            result_data_types = result.get("data_types", {})
-            for attr_key, type_info_dict in result_data_types.items():
-                all_data_types_list.append(_create_type_assignment(attr_key, type_info_dict))
-    
+        attr_key = f"{entity_name}.{attribute_name}"
+        types[attr_key] = engine.derived_type(entity_name, attribute_name, require_typed_inputs=False)
+        engine.known_types[attr_key] = types[attr_key]
+
+    all_data_types_list = [
+        _create_type_assignment(attr_key, types[attr_key])
+        for attr_key in dict.fromkeys(f"{entity_name}.{attribute_name}" for entity_name, attribute_name in dependent_attributes)
+    ]
+
     logger.info(f"Assigned types to {len(all_data_types_list)} dependent attributes")
     
     return DependentAttributeDataTypesBatchOutput(data_types=all_data_types_list)
@@ -18,6 +18,10 @@ class PartitioningStrategy(BaseModel):
         default=None,
         description="Partition key column name (if applicable)"
     )
+    partition_count: Optional[int] = Field(
+        default=None,
+        description="Number of partitions (if applicable); also used to split parallel table generation"
+    )
 
     model_config = ConfigDict(extra="forbid")
 
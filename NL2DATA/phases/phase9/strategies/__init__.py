@@ -1,6 +1,6 @@
 """Generation strategy implementations with Pydantic models and generate methods."""
 
-from NL2DATA.phases.phase9.strategies.base import BaseGenerationStrategy
+from NL2DATA.phases.phase9.strategies.base import BaseGenerationStrategy, RandomSource, make_rng, seed_sequence
 from NL2DATA.phases.phase9.strategies.distributions import (
     NormalDistribution,
     LognormalDistribution,
@@ -29,9 +29,16 @@ from NL2DATA.phases.phase9.strategies.mimesis_strategies import (
     MimesisCountryStrategy,
 )
 from NL2DATA.phases.phase9.strategies.regex_strategy import RegexStrategy
+from NL2DATA.phases.phase9.strategies.value_pools import PooledStrategy, clear_value_pools, value_pool
 
 __all__ = [
     "BaseGenerationStrategy",
+    "RandomSource",
+    "make_rng",
+    "seed_sequence",
+    "PooledStrategy",
+    "value_pool",
+    "clear_value_pools",
     "NormalDistribution",
     "LognormalDistribution",
     "UniformDistribution",
@@ -1,38 +1,218 @@
-"""Base generation strategy with Pydantic model and generate method."""
+"""Base generation strategy with Pydantic model and generate methods.
+
+Strategies draw from an explicit `numpy.random.Generator` and produce NumPy
+arrays, so generation is reproducible (same seed/stream -> same values), safe to
+run in parallel (no shared global random state), and does not box every value
+into a Python object:
+
+- `generate_array(size, rng)` returns a NumPy array
+- `generate_into(buffer, rng)` fills a preallocated array in place
+- `generate(size, rng)` returns a list (kept for callers that need Python values)
+- `iter_generate(total, chunk_size, rng)` streams a column in fixed-size chunks
+
+`rng` may be a Generator, a seed (int or sequence of ints), a SeedSequence or
+None (fresh OS entropy); `stream` selects an independent stream of that seed,
+e.g. one per column or per partition.
+
+Chunked generation seeds every chunk from (seed, stream, chunk index) alone, so
+memory stays bounded by the chunk size and any chunk can be regenerated on its
+own, in any order or process (`generate_chunk`), e.g. to resume a job.
+"""
 
 from abc import ABC, abstractmethod
-from typing import List, Any, Dict, Optional
+from typing import Iterator, List, Any, Dict, Optional, Sequence, Union
 from pydantic import BaseModel, Field, ConfigDict
+import numpy as np
+
+RandomSource = Union[None, int, Sequence[int], np.random.SeedSequence, np.random.Generator]
+
+# Default rows per chunk for iter_generate
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def seed_sequence(rng: RandomSource = None, stream: Optional[int] = None) -> np.random.SeedSequence:
+    """
+    Resolve a random source into a SeedSequence.
+
+    Args:
+        rng: Seed, SeedSequence, Generator (a seed is drawn from it) or None (OS entropy)
+        stream: Optional stream id; derives an independent child sequence
+
+    Returns:
+        numpy.random.SeedSequence
+    """
+    if isinstance(rng, np.random.Generator):
+        rng = int(rng.integers(0, 2**63 - 1))
+    seed_seq = rng if isinstance(rng, np.random.SeedSequence) else np.random.SeedSequence(rng)
+    if stream is not None:
+        seed_seq = np.random.SeedSequence(seed_seq.entropy, spawn_key=(*seed_seq.spawn_key, stream))
+    return seed_seq
+
+
+def make_rng(rng: RandomSource = None, stream: Optional[int] = None) -> np.random.Generator:
+    """
+    Resolve a random source into a numpy Generator.
+
+    Args:
+        rng: Generator (returned as is), seed, SeedSequence or None (OS entropy)
+        stream: Optional stream id; derives an independent child stream of the seed
+
+    Returns:
+        numpy.random.Generator
+    """
+    if isinstance(rng, np.random.Generator) and stream is None:
+        return rng
+    return np.random.default_rng(seed_sequence(rng, stream))
 
 
 class BaseGenerationStrategy(BaseModel, ABC):
     """Base class for all generation strategies with embedded generate method."""
-    
+
     name: str = Field(description="Strategy name (stable identifier)")
     kind: str = Field(description="Strategy kind: 'distribution', 'string', 'location', 'datetime'")
     description: str = Field(description="Human-readable description of what this strategy does")
-    
+
     model_config = ConfigDict(extra="forbid")
-    
+
     @abstractmethod
-    def generate(self, size: int) -> List[Any]:
+    def _generate(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Generate `size` values from `rng`.
+
+        Args:
+            size: Number of values to generate
+            rng: Random generator to draw from
+
+        Returns:
+            NumPy array of generated values (dtype depends on strategy)
+        """
+        pass
+
+    def _fill(self, out: np.ndarray, rng: np.random.Generator) -> None:
+        """Write len(out) values into out (strategies override this to avoid a temporary)."""
+        out[...] = self._generate(len(out), rng)
+
+    def generate_array(self, size: int, rng: RandomSource = None, stream: Optional[int] = None) -> np.ndarray:
+        """
+        Generate values as a NumPy array.
+
+        Args:
+            size: Number of values to generate
+            rng: Generator, seed or SeedSequence (None: OS entropy)
+            stream: Optional stream id of the seed
+
+        Returns:
+            NumPy array of generated values
+        """
+        return self._generate(size, make_rng(rng, stream))
+
+    def generate_into(self, buffer: np.ndarray, rng: RandomSource = None, stream: Optional[int] = None) -> np.ndarray:
+        """
+        Fill a preallocated buffer (or a slice of one) with generated values.
+
+        Args:
+            buffer: 1-D array to fill; its dtype must hold the strategy's values
+            rng: Generator, seed or SeedSequence (None: OS entropy)
+            stream: Optional stream id of the seed
+
+        Returns:
+            The filled buffer
+        """
+        self._fill(buffer, make_rng(rng, stream))
+        return buffer
+
+    def generate(self, size: int, rng: RandomSource = None, stream: Optional[int] = None) -> List[Any]:
         """
         Generate a list of values using this strategy.
-        
+
         Args:
             size: Number of values to generate
-            
+            rng: Generator, seed or SeedSequence (None: OS entropy)
+            stream: Optional stream id of the seed
+
         Returns:
             List of generated values (type depends on strategy)
         """
-        pass
-    
+        return self.generate_array(size, rng, stream).tolist()
+
+    def generate_chunk(
+        self,
+        chunk_index: int,
+        total: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        rng: RandomSource = None,
+        stream: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Generate one chunk of a chunked column, independently of all other chunks.
+
+        Args:
+            chunk_index: Chunk number (rows chunk_index * chunk_size onwards)
+            total: Total number of values in the column
+            chunk_size: Values per chunk (the last chunk may be shorter)
+            rng: Seed or SeedSequence shared by all chunks (a Generator or None
+                makes the chunk non-reproducible on its own)
+            stream: Optional stream id of the seed
+
+        Returns:
+            NumPy array with the chunk's values
+
+        Raises:
+            ValueError: If chunk_index is out of range
+        """
+        start = chunk_index * chunk_size
+        if chunk_index < 0 or start >= max(total, 1):
+            raise ValueError(f"Chunk {chunk_index} out of range for {total} values in chunks of {chunk_size}")
+        size = min(chunk_size, total - start)
+        return self._generate(size, make_rng(seed_sequence(rng, stream), stream=chunk_index))
+
+    def iter_generate(
+        self,
+        total: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        rng: RandomSource = None,
+        stream: Optional[int] = None,
+        start_chunk: int = 0,
+    ) -> Iterator[np.ndarray]:
+        """
+        Generate `total` values as a stream of chunks (memory bounded by chunk_size).
+
+        Chunk i equals `generate_chunk(i, total, chunk_size, rng, stream)`, so a job
+        can resume from any chunk or split chunks across workers.
+
+        Args:
+            total: Total number of values
+            chunk_size: Values per chunk (the last chunk may be shorter)
+            rng: Seed or SeedSequence (a Generator or None is drawn from once)
+            stream: Optional stream id of the seed
+            start_chunk: First chunk to produce (resume point)
+
+        Yields:
+            NumPy arrays of at most chunk_size values
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be > 0")
+        root = seed_sequence(rng, stream)
+        for chunk_index in range(start_chunk, -(-total // chunk_size)):
+            yield self.generate_chunk(chunk_index, total, chunk_size, root)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert strategy to dictionary representation."""
         return self.model_dump()
-    
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "BaseGenerationStrategy":
         """Create strategy instance from dictionary."""
         return cls(**data)
 
+
+def seed_from_rng(rng: np.random.Generator) -> int:
+    """Draw a 32-bit seed for libraries with their own random state (Faker, Mimesis, rstr)."""
+    return int(rng.integers(0, 2**32 - 1))
+
+
+def object_array(values: List[Any]) -> np.ndarray:
+    """1-D object array of Python values (avoids NumPy splitting nested values)."""
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
@@ -1,12 +1,29 @@
-"""Numerical and categorical distribution strategies."""
+"""Numerical and categorical distribution strategies.
 
-from typing import List, Dict, Any, Optional
+Normal, log-normal, uniform and exponential sample straight into float64 buffers
+via the Generator's `out=` parameter and then scale, shift and clamp in place, so
+`generate_into` allocates nothing and draws the same values as `generate_array`.
+"""
+
+from typing import Dict, Optional
 from pydantic import Field, field_validator
 import numpy as np
 
 from NL2DATA.phases.phase9.strategies.base import BaseGenerationStrategy
 
 
+def _fills_in_place(out: np.ndarray) -> bool:
+    """True if out can be passed as `out=` to the Generator's float samplers."""
+    return out.dtype == np.float64 and out.flags.c_contiguous
+
+
+def _clamp(values: np.ndarray, low: Optional[float], high: Optional[float]) -> np.ndarray:
+    """Clamp values in place (None bounds are open)."""
+    if low is not None or high is not None:
+        np.clip(values, low, high, out=values)
+    return values
+
+
 class NormalDistribution(BaseGenerationStrategy):
     """Normal (Gaussian) distribution strategy."""
     
@@ -29,14 +46,19 @@ class NormalDistribution(BaseGenerationStrategy):
             raise ValueError("sigma must be > 0")
         return v
     
-    def generate(self, size: int) -> List[float]:
+    def _generate(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate normal distribution values."""
-        values = np.random.normal(self.mu, self.sigma, size)
-        if self.min is not None:
-            values = np.clip(values, self.min, None)
-        if self.max is not None:
-            values = np.clip(values, None, self.max)
-        return values.tolist()
+        values = np.empty(size, dtype=np.float64)
+        self._fill(values, rng)
+        return values
+
+    def _fill(self, out: np.ndarray, rng: np.random.Generator) -> None:
+        if not _fills_in_place(out):
+            return super()._fill(out, rng)
+        rng.standard_normal(out=out)
+        out *= self.sigma
+        out += self.mu
+        _clamp(out, self.min, self.max)
 
 
 class LognormalDistribution(BaseGenerationStrategy):
@@ -68,14 +90,20 @@ class LognormalDistribution(BaseGenerationStrategy):
             raise ValueError("min must be >= 0")
         return v
     
-    def generate(self, size: int) -> List[float]:
+    def _generate(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate log-normal distribution values."""
-        values = np.random.lognormal(self.mu, self.sigma, size)
-        if self.min > 0:
-            values = np.clip(values, self.min, None)
-        if self.max is not None:
-            values = np.clip(values, None, self.max)
-        return values.tolist()
+        values = np.empty(size, dtype=np.float64)
+        self._fill(values, rng)
+        return values
+
+    def _fill(self, out: np.ndarray, rng: np.random.Generator) -> None:
+        if not _fills_in_place(out):
+            return super()._fill(out, rng)
+        rng.standard_normal(out=out)
+        out *= self.sigma
+        out += self.mu
+        np.exp(out, out=out)
+        _clamp(out, self.min if self.min > 0 else None, self.max)
 
 
 class UniformDistribution(BaseGenerationStrategy):
@@ -98,10 +126,18 @@ class UniformDistribution(BaseGenerationStrategy):
             raise ValueError("max must be > min")
         return v
     
-    def generate(self, size: int) -> List[float]:
+    def _generate(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate uniform distribution values."""
-        values = np.random.uniform(self.min, self.max, size)
-        return values.tolist()
+        values = np.empty(size, dtype=np.float64)
+        self._fill(values, rng)
+        return values
+
+    def _fill(self, out: np.ndarray, rng: np.random.Generator) -> None:
+        if not _fills_in_place(out):
+            return super()._fill(out, rng)
+        rng.random(out=out)
+        out *= self.max - self.min
+        out += self.min
 
 
 class ParetoDistribution(BaseGenerationStrategy):
@@ -132,12 +168,11 @@ class ParetoDistribution(BaseGenerationStrategy):
             raise ValueError("scale must be > 0")
         return v
     
-    def generate(self, size: int) -> List[float]:
+    def _generate(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Pareto distribution values."""
-        values = np.random.pareto(self.alpha, size) * self.scale
-        if self.max is not None:
-            values = np.clip(values, None, self.max)
-        return values.tolist()
+        values = rng.pareto(self.alpha, size)
+        values *= self.scale
+        return _clamp(values, None, self.max)
 
 
 class ZipfDistribution(BaseGenerationStrategy):
@@ -167,13 +202,12 @@ class ZipfDistribution(BaseGenerationStrategy):
             raise ValueError("s must be > 0")
         return v
     
-    def generate(self, size: int) -> List[int]:
+    def _generate(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Zipfian distribution values."""
-        ranks = np.arange(1, self.n + 1)
-        probs = 1.0 / (ranks ** self.s)
+        ranks = np.arange(1, self.n + 1, dtype=np.int64)
+        probs = 1.0 / (ranks.astype(np.float64) ** self.s)
         probs = probs / probs.sum()
-        values = np.random.choice(ranks, size=size, p=probs)
-        return values.tolist()
+        return rng.choice(ranks, size=size, p=probs)
 
 
 class ExponentialDistribution(BaseGenerationStrategy):
@@ -197,14 +231,20 @@ class ExponentialDistribution(BaseGenerationStrategy):
             raise ValueError("lambda must be > 0")
         return v
     
-    def generate(self, size: int) -> List[float]:
+    def _generate(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate exponential distribution values."""
-        values = np.random.exponential(1.0 / self.lambda_, size)
+        values = np.empty(size, dtype=np.float64)
+        self._fill(values, rng)
+        return values
+
+    def _fill(self, out: np.ndarray, rng: np.random.Generator) -> None:
+        if not _fills_in_place(out):
+            return super()._fill(out, rng)
+        rng.standard_exponential(out=out)
+        out /= self.lambda_
         if self.min > 0:
-            values = values + self.min
-        if self.max is not None:
-            values = np.clip(values, None, self.max)
-        return values.tolist()
+            out += self.min
+        _clamp(out, None, self.max)
 
 
 class CategoricalDistribution(BaseGenerationStrategy):
@@ -229,14 +269,12 @@ class CategoricalDistribution(BaseGenerationStrategy):
             raise ValueError(f"pmf probabilities must sum to ~1.0, got {total}")
         return v
     
-    def generate(self, size: int) -> List[str]:
+    def _generate(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate categorical distribution values."""
-        values = list(self.pmf.keys())
-        probs = list(self.pmf.values())
-        probs = np.array(probs)
+        values = np.array(list(self.pmf.keys()), dtype=object)
+        probs = np.array(list(self.pmf.values()), dtype=np.float64)
         probs = probs / probs.sum()  # Normalize
-        samples = np.random.choice(values, size=size, p=probs)
-        return samples.tolist()
+        return values[rng.choice(len(values), size=size, p=probs)]
 
 
 class BernoulliDistribution(BaseGenerationStrategy):
@@ -258,8 +296,7 @@ class BernoulliDistribution(BaseGenerationStrategy):
             raise ValueError("p_true must be between 0.0 and 1.0")
         return v
     
-    def generate(self, size: int) -> List[bool]:
+    def _generate(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Bernoulli distribution values."""
-        values = np.random.binomial(1, self.p_true, size).astype(bool)
-        return values.tolist()
+        return rng.random(size) < self.p_true
 
@@ -1,13 +1,38 @@
-"""Faker-based string generation strategies."""
+"""Faker-based string generation strategies.
+
+Name and email values are sampled from cached Faker value pools by default (see
+value_pools.py); `pooled=False` calls Faker once per value. Address, company,
+text, URL and phone strategies call Faker per value by default: a single pool
+caps the number of distinct values at about pool_size, and pooled URLs take the
+fixed form "https://www.<domain>/".
+"""
 
 from typing import List, Optional
 from pydantic import Field, field_validator
 from faker import Faker
+import numpy as np
+
+from NL2DATA.phases.phase9.strategies.base import object_array, seed_from_rng
+from NL2DATA.phases.phase9.strategies.value_pools import EMAIL_SUFFIXES, PooledStrategy, value_pool
+
+
+def _seeded_faker(locale: str, rng: np.random.Generator) -> Faker:
+    """Faker instance with its own random state, seeded from rng (reproducible, thread-safe)."""
+    fake = Faker(locale)
+    fake.seed_instance(seed_from_rng(rng))
+    return fake
+
 
-from NL2DATA.phases.phase9.strategies.base import BaseGenerationStrategy
+class _FakerPooled(PooledStrategy):
+    """Pooled-mode helper for Faker strategies."""
 
+    locale: str = Field(default="en_US", description="Faker locale")
 
-class FakerNameStrategy(BaseGenerationStrategy):
+    def _pool(self, method: str, **kwargs) -> np.ndarray:
+        return value_pool("faker", self.locale, method, self.pool_size, **kwargs)
+
+
+class FakerNameStrategy(_FakerPooled):
     """Faker name generation strategy."""
     
     name: str = Field(default="faker_name", frozen=True)
@@ -27,18 +52,28 @@ class FakerNameStrategy(BaseGenerationStrategy):
             raise ValueError("name_type must be 'full', 'first', or 'last'")
         return v
     
-    def generate(self, size: int) -> List[str]:
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Faker names."""
-        fake = Faker(self.locale)
+        fake = _seeded_faker(self.locale, rng)
         if self.name_type == "first":
-            return [fake.first_name() for _ in range(size)]
+            return object_array([fake.first_name() for _ in range(size)])
         elif self.name_type == "last":
-            return [fake.last_name() for _ in range(size)]
+            return object_array([fake.last_name() for _ in range(size)])
         else:
-            return [fake.name() for _ in range(size)]
+            return object_array([fake.name() for _ in range(size)])
+
+    def _pools(self) -> List[np.ndarray]:
+        if self.name_type == "first":
+            return [self._pool("first_name")]
+        elif self.name_type == "last":
+            return [self._pool("last_name")]
+        return [self._pool("first_name"), self._pool("last_name")]
+
+    def _compose(self, parts: List[np.ndarray]) -> np.ndarray:
+        return parts[0] if len(parts) == 1 else parts[0] + " " + parts[1]
 
 
-class FakerEmailStrategy(BaseGenerationStrategy):
+class FakerEmailStrategy(_FakerPooled):
     """Faker email generation strategy."""
     
     name: str = Field(default="faker_email", frozen=True)
@@ -51,15 +86,22 @@ class FakerEmailStrategy(BaseGenerationStrategy):
     locale: str = Field(default="en_US", description="Locale for email generation")
     domain: Optional[str] = Field(default=None, description="Optional fixed domain (e.g., 'example.com')")
     
-    def generate(self, size: int) -> List[str]:
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Faker emails."""
-        fake = Faker(self.locale)
+        fake = _seeded_faker(self.locale, rng)
         if self.domain:
-            return [fake.email(domain=self.domain) for _ in range(size)]
-        return [fake.email() for _ in range(size)]
+            return object_array([fake.email(domain=self.domain) for _ in range(size)])
+        return object_array([fake.email() for _ in range(size)])
+
+    def _pools(self) -> List[np.ndarray]:
+        domains = object_array([self.domain]) if self.domain else self._pool("free_email_domain")
+        return [self._pool("user_name"), EMAIL_SUFFIXES, domains]
 
+    def _compose(self, parts: List[np.ndarray]) -> np.ndarray:
+        return parts[0] + parts[1] + "@" + parts[2]
 
-class FakerAddressStrategy(BaseGenerationStrategy):
+
+class FakerAddressStrategy(_FakerPooled):
     """Faker address generation strategy."""
     
     name: str = Field(default="faker_address", frozen=True)
@@ -71,6 +113,8 @@ class FakerAddressStrategy(BaseGenerationStrategy):
     
     locale: str = Field(default="en_US", description="Locale for address generation")
     component: str = Field(default="full", description="Which component: 'full' (default), 'street', 'city', 'state', 'zipcode', 'country'")
+    # Per-value by default: a pool would cap the number of distinct addresses at pool_size
+    pooled: bool = Field(default=False, description="Sample from a cached value pool instead of calling Faker per value")
     
     @field_validator("component")
     @classmethod
@@ -80,24 +124,28 @@ class FakerAddressStrategy(BaseGenerationStrategy):
             raise ValueError(f"component must be one of {allowed}")
         return v
     
-    def generate(self, size: int) -> List[str]:
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Faker addresses."""
-        fake = Faker(self.locale)
+        fake = _seeded_faker(self.locale, rng)
         if self.component == "street":
-            return [fake.street_address() for _ in range(size)]
+            return object_array([fake.street_address() for _ in range(size)])
         elif self.component == "city":
-            return [fake.city() for _ in range(size)]
+            return object_array([fake.city() for _ in range(size)])
         elif self.component == "state":
-            return [fake.state() for _ in range(size)]
+            return object_array([fake.state() for _ in range(size)])
         elif self.component == "zipcode":
-            return [fake.zipcode() for _ in range(size)]
+            return object_array([fake.zipcode() for _ in range(size)])
         elif self.component == "country":
-            return [fake.country() for _ in range(size)]
+            return object_array([fake.country() for _ in range(size)])
         else:
-            return [fake.address() for _ in range(size)]
+            return object_array([fake.address() for _ in range(size)])
+
+    def _pools(self) -> List[np.ndarray]:
+        methods = {"street": "street_address", "zipcode": "zipcode", "full": "address"}
+        return [self._pool(methods.get(self.component, self.component))]
 
 
-class FakerCompanyStrategy(BaseGenerationStrategy):
+class FakerCompanyStrategy(_FakerPooled):
     """Faker company name generation strategy."""
     
     name: str = Field(default="faker_company", frozen=True)
@@ -108,14 +156,19 @@ class FakerCompanyStrategy(BaseGenerationStrategy):
     )
     
     locale: str = Field(default="en_US", description="Locale for company name generation")
+    # Per-value by default: a pool would cap the number of distinct company names at pool_size
+    pooled: bool = Field(default=False, description="Sample from a cached value pool instead of calling Faker per value")
     
-    def generate(self, size: int) -> List[str]:
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Faker company names."""
-        fake = Faker(self.locale)
-        return [fake.company() for _ in range(size)]
+        fake = _seeded_faker(self.locale, rng)
+        return object_array([fake.company() for _ in range(size)])
 
+    def _pools(self) -> List[np.ndarray]:
+        return [self._pool("company")]
 
-class FakerTextStrategy(BaseGenerationStrategy):
+
+class FakerTextStrategy(_FakerPooled):
     """Faker text generation strategy."""
     
     name: str = Field(default="faker_text", frozen=True)
@@ -128,6 +181,8 @@ class FakerTextStrategy(BaseGenerationStrategy):
     locale: str = Field(default="en_US", description="Locale for text generation")
     text_type: str = Field(default="sentence", description="Type: 'word', 'sentence', 'paragraph', or 'text' (multiple paragraphs)")
     max_nb_chars: Optional[int] = Field(default=None, description="Maximum characters (for paragraph/text)")
+    # Per-value by default: a pool would cap the number of distinct texts at pool_size
+    pooled: bool = Field(default=False, description="Sample from a cached value pool instead of calling Faker per value")
     
     @field_validator("text_type")
     @classmethod
@@ -136,24 +191,29 @@ class FakerTextStrategy(BaseGenerationStrategy):
             raise ValueError("text_type must be 'word', 'sentence', 'paragraph', or 'text'")
         return v
     
-    def generate(self, size: int) -> List[str]:
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Faker text."""
-        fake = Faker(self.locale)
+        fake = _seeded_faker(self.locale, rng)
         if self.text_type == "word":
-            return [fake.word() for _ in range(size)]
+            return object_array([fake.word() for _ in range(size)])
         elif self.text_type == "sentence":
-            return [fake.sentence() for _ in range(size)]
+            return object_array([fake.sentence() for _ in range(size)])
         elif self.text_type == "paragraph":
             if self.max_nb_chars:
-                return [fake.paragraph(max_nb_chars=self.max_nb_chars) for _ in range(size)]
-            return [fake.paragraph() for _ in range(size)]
+                return object_array([fake.paragraph(max_nb_chars=self.max_nb_chars) for _ in range(size)])
+            return object_array([fake.paragraph() for _ in range(size)])
         else:  # text
             if self.max_nb_chars:
-                return [fake.text(max_nb_chars=self.max_nb_chars) for _ in range(size)]
-            return [fake.text() for _ in range(size)]
+                return object_array([fake.text(max_nb_chars=self.max_nb_chars) for _ in range(size)])
+            return object_array([fake.text() for _ in range(size)])
+
+    def _pools(self) -> List[np.ndarray]:
+        if self.max_nb_chars and self.text_type in ("paragraph", "text"):
+            return [self._pool(self.text_type, max_nb_chars=self.max_nb_chars)]
+        return [self._pool(self.text_type)]
 
 
-class FakerURLStrategy(BaseGenerationStrategy):
+class FakerURLStrategy(_FakerPooled):
     """Faker URL generation strategy."""
     
     name: str = Field(default="faker_url", frozen=True)
@@ -165,6 +225,8 @@ class FakerURLStrategy(BaseGenerationStrategy):
     
     locale: str = Field(default="en_US", description="Locale for URL generation")
     url_type: str = Field(default="url", description="Type: 'url' (full URL), 'domain' (domain only), 'uri' (path only)")
+    # Per-value by default: a pool would cap the number of distinct URLs (pooled URLs are "https://www.<domain>/") at pool_size
+    pooled: bool = Field(default=False, description="Sample from a cached value pool instead of calling Faker per value")
     
     @field_validator("url_type")
     @classmethod
@@ -173,18 +235,28 @@ class FakerURLStrategy(BaseGenerationStrategy):
             raise ValueError("url_type must be 'url', 'domain', or 'uri'")
         return v
     
-    def generate(self, size: int) -> List[str]:
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Faker URLs."""
-        fake = Faker(self.locale)
+        fake = _seeded_faker(self.locale, rng)
         if self.url_type == "domain":
-            return [fake.domain_name() for _ in range(size)]
+            return object_array([fake.domain_name() for _ in range(size)])
         elif self.url_type == "uri":
-            return [fake.uri_path() for _ in range(size)]
+            return object_array([fake.uri_path() for _ in range(size)])
         else:
-            return [fake.url() for _ in range(size)]
+            return object_array([fake.url() for _ in range(size)])
+
+    def _pools(self) -> List[np.ndarray]:
+        if self.url_type == "uri":
+            return [self._pool("uri_path")]
+        return [self._pool("domain_name")]
+
+    def _compose(self, parts: List[np.ndarray]) -> np.ndarray:
+        if self.url_type == "url":
+            return "https://www." + parts[0] + "/"
+        return parts[0]
 
 
-class FakerPhoneStrategy(BaseGenerationStrategy):
+class FakerPhoneStrategy(_FakerPooled):
     """Faker phone number generation strategy."""
     
     name: str = Field(default="faker_phone", frozen=True)
@@ -195,9 +267,13 @@ class FakerPhoneStrategy(BaseGenerationStrategy):
     )
     
     locale: str = Field(default="en_US", description="Locale for phone number generation")
+    # Per-value by default: a pool would cap the number of distinct phone numbers at pool_size
+    pooled: bool = Field(default=False, description="Sample from a cached value pool instead of calling Faker per value")
     
-    def generate(self, size: int) -> List[str]:
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Faker phone numbers."""
-        fake = Faker(self.locale)
-        return [fake.phone_number() for _ in range(size)]
+        fake = _seeded_faker(self.locale, rng)
+        return object_array([fake.phone_number() for _ in range(size)])
 
+    def _pools(self) -> List[np.ndarray]:
+        return [self._pool("phone_number")]
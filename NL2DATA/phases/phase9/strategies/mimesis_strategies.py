@@ -1,13 +1,30 @@
-"""Mimesis-based string and location generation strategies."""
+"""Mimesis-based string and location generation strategies.
+
+String strategies sample from cached Mimesis value pools by default (see
+value_pools.py); `pooled=False` calls Mimesis once per value. The address
+strategy calls Mimesis per value by default, since a pool would cap the number of
+distinct addresses at about pool_size.
+"""
 
 from typing import List, Optional
 from pydantic import Field, field_validator
 from mimesis import Person, Address, Text, Datetime
+import numpy as np
+
+from NL2DATA.phases.phase9.strategies.base import BaseGenerationStrategy, object_array, seed_from_rng
+from NL2DATA.phases.phase9.strategies.value_pools import EMAIL_SUFFIXES, PooledStrategy, value_pool
+
+
+class _MimesisPooled(PooledStrategy):
+    """Pooled-mode helper for Mimesis strategies."""
+
+    locale: str = Field(default="en", description="Mimesis locale")
 
-from NL2DATA.phases.phase9.strategies.base import BaseGenerationStrategy
+    def _pool(self, method: str, **kwargs) -> np.ndarray:
+        return value_pool("mimesis", self.locale, method, self.pool_size, **kwargs)
 
 
-class MimesisNameStrategy(BaseGenerationStrategy):
+class MimesisNameStrategy(_MimesisPooled):
     """Mimesis name generation strategy."""
     
     name: str = Field(default="mimesis_name", frozen=True)
@@ -27,18 +44,28 @@ class MimesisNameStrategy(BaseGenerationStrategy):
             raise ValueError("name_type must be 'full', 'first', or 'last'")
         return v
     
-    def generate(self, size: int) -> List[str]:
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Mimesis names."""
-        person = Person(self.locale)
+        person = Person(self.locale, seed=seed_from_rng(rng))
         if self.name_type == "first":
-            return [person.first_name() for _ in range(size)]
+            return object_array([person.first_name() for _ in range(size)])
         elif self.name_type == "last":
-            return [person.last_name() for _ in range(size)]
+            return object_array([person.last_name() for _ in range(size)])
         else:
-            return [person.full_name() for _ in range(size)]
+            return object_array([person.full_name() for _ in range(size)])
 
+    def _pools(self) -> List[np.ndarray]:
+        if self.name_type == "first":
+            return [self._pool("person.first_name")]
+        elif self.name_type == "last":
+            return [self._pool("person.last_name")]
+        return [self._pool("person.first_name"), self._pool("person.last_name")]
+
+    def _compose(self, parts: List[np.ndarray]) -> np.ndarray:
+        return parts[0] if len(parts) == 1 else parts[0] + " " + parts[1]
 
-class MimesisEmailStrategy(BaseGenerationStrategy):
+
+class MimesisEmailStrategy(_MimesisPooled):
     """Mimesis email generation strategy."""
     
     name: str = Field(default="mimesis_email", frozen=True)
@@ -51,15 +78,26 @@ class MimesisEmailStrategy(BaseGenerationStrategy):
     locale: str = Field(default="en", description="Locale code")
     domains: Optional[List[str]] = Field(default=None, description="Optional list of allowed domains (array of strings)")
     
-    def generate(self, size: int) -> List[str]:
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Mimesis emails."""
-        person = Person(self.locale)
+        person = Person(self.locale, seed=seed_from_rng(rng))
         if self.domains:
-            return [person.email(domains=self.domains) for _ in range(size)]
-        return [person.email() for _ in range(size)]
+            return object_array([person.email(domains=self.domains) for _ in range(size)])
+        return object_array([person.email() for _ in range(size)])
+
+    def _pools(self) -> List[np.ndarray]:
+        if self.domains:
+            domains = object_array(list(dict.fromkeys(d.lstrip("@") for d in self.domains)))
+        else:
+            emails = self._pool("person.email")
+            domains = object_array(list(dict.fromkeys(e.rsplit("@", 1)[-1] for e in emails)))
+        return [self._pool("person.username"), EMAIL_SUFFIXES, domains]
+
+    def _compose(self, parts: List[np.ndarray]) -> np.ndarray:
+        return parts[0] + parts[1] + "@" + parts[2]
 
 
-class MimesisTextStrategy(BaseGenerationStrategy):
+class MimesisTextStrategy(_MimesisPooled):
     """Mimesis text generation strategy."""
     
     name: str = Field(default="mimesis_text", frozen=True)
@@ -79,18 +117,21 @@ class MimesisTextStrategy(BaseGenerationStrategy):
             raise ValueError("text_type must be 'word', 'sentence', or 'title'")
         return v
     
-    def generate(self, size: int) -> List[str]:
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Mimesis text."""
-        text = Text(self.locale)
+        text = Text(self.locale, seed=seed_from_rng(rng))
         if self.text_type == "word":
-            return [text.word() for _ in range(size)]
+            return object_array([text.word() for _ in range(size)])
         elif self.text_type == "title":
-            return [text.title() for _ in range(size)]
+            return object_array([text.title() for _ in range(size)])
         else:
-            return [text.sentence() for _ in range(size)]
+            return object_array([text.sentence() for _ in range(size)])
 
+    def _pools(self) -> List[np.ndarray]:
+        return [self._pool(f"text.{self.text_type}")]
 
-class MimesisAddressStrategy(BaseGenerationStrategy):
+
+class MimesisAddressStrategy(_MimesisPooled):
     """Mimesis address generation strategy."""
     
     name: str = Field(default="mimesis_address", frozen=True)
@@ -102,6 +143,8 @@ class MimesisAddressStrategy(BaseGenerationStrategy):
     
     locale: str = Field(default="en", description="Locale code")
     component: str = Field(default="full", description="Which component: 'full' (default), 'street', 'city', 'state', 'postal_code', 'country'")
+    # Per-value by default: a pool would cap the number of distinct addresses at pool_size
+    pooled: bool = Field(default=False, description="Sample from a cached value pool instead of calling Mimesis per value")
     
     @field_validator("component")
     @classmethod
@@ -111,21 +154,25 @@ class MimesisAddressStrategy(BaseGenerationStrategy):
             raise ValueError(f"component must be one of {allowed}")
         return v
     
-    def generate(self, size: int) -> List[str]:
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Mimesis addresses."""
-        address = Address(self.locale)
+        address = Address(self.locale, seed=seed_from_rng(rng))
         if self.component == "street":
-            return [address.street_address() for _ in range(size)]
+            return object_array([address.street_address() for _ in range(size)])
         elif self.component == "city":
-            return [address.city() for _ in range(size)]
+            return object_array([address.city() for _ in range(size)])
         elif self.component == "state":
-            return [address.state() for _ in range(size)]
+            return object_array([address.state() for _ in range(size)])
         elif self.component == "postal_code":
-            return [address.postal_code() for _ in range(size)]
+            return object_array([address.postal_code() for _ in range(size)])
         elif self.component == "country":
-            return [address.country() for _ in range(size)]
+            return object_array([address.country() for _ in range(size)])
         else:
-            return [address.address() for _ in range(size)]
+            return object_array([address.address() for _ in range(size)])
+
+    def _pools(self) -> List[np.ndarray]:
+        methods = {"street": "street_address", "full": "address"}
+        return [self._pool(f"address.{methods.get(self.component, self.component)}")]
 
 
 class MimesisCoordinatesStrategy(BaseGenerationStrategy):
@@ -143,28 +190,18 @@ class MimesisCoordinatesStrategy(BaseGenerationStrategy):
     min_lon: Optional[float] = Field(default=None, description="Minimum longitude (default: -180)")
     max_lon: Optional[float] = Field(default=None, description="Maximum longitude (default: 180)")
     
-    def generate(self, size: int) -> List[dict]:
-        """Generate Mimesis coordinates."""
-        address = Address()
-        coords = []
-        for _ in range(size):
-            lat = address.latitude()
-            lon = address.longitude()
-            
-            if self.min_lat is not None:
-                lat = max(lat, self.min_lat)
-            if self.max_lat is not None:
-                lat = min(lat, self.max_lat)
-            if self.min_lon is not None:
-                lon = max(lon, self.min_lon)
-            if self.max_lon is not None:
-                lon = min(lon, self.max_lon)
-            
-            coords.append({"lat": lat, "lon": lon})
-        return coords
-
-
-class MimesisCountryStrategy(BaseGenerationStrategy):
+    def _generate(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Generate coordinates uniformly within the configured bounds."""
+        min_lat = -90.0 if self.min_lat is None else self.min_lat
+        max_lat = 90.0 if self.max_lat is None else self.max_lat
+        min_lon = -180.0 if self.min_lon is None else self.min_lon
+        max_lon = 180.0 if self.max_lon is None else self.max_lon
+        lats = rng.uniform(min_lat, max_lat, size).round(6).tolist()
+        lons = rng.uniform(min_lon, max_lon, size).round(6).tolist()
+        return object_array([{"lat": lat, "lon": lon} for lat, lon in zip(lats, lons)])
+
+
+class MimesisCountryStrategy(_MimesisPooled):
     """Mimesis country generation strategy."""
     
     name: str = Field(default="mimesis_country", frozen=True)
@@ -184,13 +221,19 @@ class MimesisCountryStrategy(BaseGenerationStrategy):
             raise ValueError("code_type must be 'name', 'code', 'alpha2', or 'alpha3'")
         return v
     
-    def generate(self, size: int) -> List[str]:
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate Mimesis countries."""
-        address = Address(self.locale)
+        address = Address(self.locale, seed=seed_from_rng(rng))
         if self.code_type in ["code", "alpha2"]:
-            return [address.country_code() for _ in range(size)]
+            return object_array([address.country_code() for _ in range(size)])
         elif self.code_type == "alpha3":
-            return [address.country_code(alpha_3=True) for _ in range(size)]
+            return object_array([address.country_code(alpha_3=True) for _ in range(size)])
         else:
-            return [address.country() for _ in range(size)]
+            return object_array([address.country() for _ in range(size)])
 
+    def _pools(self) -> List[np.ndarray]:
+        if self.code_type in ["code", "alpha2"]:
+            return [self._pool("address.country_code")]
+        elif self.code_type == "alpha3":
+            return [self._pool("address.country_code", alpha_3=True)]
+        return [self._pool("address.country")]
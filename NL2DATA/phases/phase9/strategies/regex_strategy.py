@@ -1,17 +1,19 @@
 """Regex-based string generation strategy with validation, sanitization, and deduplication."""
 
-from typing import List, Dict, Optional
+from typing import Dict, Optional
 from pydantic import Field, field_validator
+import random
 import re
 import hashlib
+import numpy as np
 
 try:
-    from rstr import xeger
+    from rstr import Rstr
     RSTR_AVAILABLE = True
 except ImportError:
     RSTR_AVAILABLE = False
 
-from NL2DATA.phases.phase9.strategies.base import BaseGenerationStrategy
+from NL2DATA.phases.phase9.strategies.base import BaseGenerationStrategy, object_array, seed_from_rng
 
 
 class RegexStrategy(BaseGenerationStrategy):
@@ -29,7 +31,7 @@ class RegexStrategy(BaseGenerationStrategy):
         default_factory=lambda: {"star": 16, "plus": 16, "dot": 16},
         description="Explosion control: max repetitions for *, +, .*, .+ (prevents infinite loops)"
     )
-    unique: bool = Field(default=True, description="If true, deduplicate generated values using hash-based deduplication")
+    unique: bool = Field(default=True, description="If true, deduplicate generated values using hash-based deduplication (within one generate call, i.e. per chunk when chunked)")
     max_attempts_per_value: Optional[int] = Field(default=None, description="If set, fail fast when regex language seems exhausted")
     
     @field_validator("pattern")
@@ -69,7 +71,7 @@ class RegexStrategy(BaseGenerationStrategy):
         sanitized = re.sub(r"\.\*", f".{{0,{self.bounds['dot']}}}", sanitized)
         return sanitized
     
-    def generate(self, size: int) -> List[str]:
+    def _generate(self, size: int, rng: np.random.Generator) -> np.ndarray:
         """Generate regex-matching strings with validation, sanitization, and deduplication."""
         if not RSTR_AVAILABLE:
             raise RuntimeError("rstr library is not available. Install with: pip install rstr")
@@ -77,6 +79,9 @@ class RegexStrategy(BaseGenerationStrategy):
         # Sanitize pattern
         sanitized_pattern = self._sanitize_pattern()
         
+        # Private random state seeded from rng (rstr's module-level xeger shares one global Random)
+        xeger = Rstr(random.Random(seed_from_rng(rng))).xeger
+
         # Generate with deduplication
         seen_hashes = set()
         output = []
@@ -84,7 +89,6 @@ class RegexStrategy(BaseGenerationStrategy):
         
         while len(output) < size:
             try:
-                # xeger() is a function, not a method
                 s = xeger(sanitized_pattern)
                 h = hashlib.blake2b(s.encode('utf-8'), digest_size=8).hexdigest()
                 
@@ -102,5 +106,5 @@ class RegexStrategy(BaseGenerationStrategy):
             except Exception as e:
                 raise RuntimeError(f"Regex generation failed: {e}")
         
-        return output
+        return object_array(output)
 
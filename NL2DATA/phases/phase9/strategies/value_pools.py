@@ -0,0 +1,231 @@
+"""Cached per-locale value pools for vectorized Faker/Mimesis generation.
+
+Calling a Faker/Mimesis provider once per value is pure-Python work (tens of
+microseconds per value). In pooled mode a strategy instead:
+
+1. builds a pool of distinct values per (library, locale, provider method) once,
+   by calling the provider `pool_size` times with a fixed seed, and caches it for
+   the process (pools are independent of the generation seed);
+2. draws indices into the pools with the strategy's numpy Generator;
+3. composes multi-part values (e.g. first + " " + last) with vectorized
+   object-array concatenation.
+
+Drawing with `unique=True` samples pool combinations without replacement, so the
+values of one generate call are distinct. Chunked generation (`generate_chunk`)
+gives each chunk a disjoint range of combinations, so values are distinct across
+all chunks of a column too.
+"""
+
+from abc import abstractmethod
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple
+import math
+
+from pydantic import Field, field_validator
+import numpy as np
+
+from NL2DATA.phases.phase9.strategies.base import (
+    DEFAULT_CHUNK_SIZE,
+    BaseGenerationStrategy,
+    RandomSource,
+    make_rng,
+    object_array,
+    seed_sequence,
+)
+
+DEFAULT_POOL_SIZE = 2000
+
+# Pools are built with a fixed seed so they are identical in every process
+_POOL_SEED = 0
+
+# Stream id (beyond any chunk index) of the combination shuffle shared by all chunks
+_SHUFFLE_STREAM = 2**32
+
+_MIMESIS_PROVIDERS = ("person", "address", "text")
+
+
+def _freeze(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _thaw(value: Any) -> Any:
+    return list(value) if isinstance(value, tuple) else value
+
+
+@lru_cache(maxsize=256)
+def _cached_pool(library: str, locale: str, method: str, kwargs: Tuple[Tuple[str, Any], ...], pool_size: int) -> np.ndarray:
+    call_kwargs = {key: _thaw(value) for key, value in kwargs}
+    if library == "faker":
+        from faker import Faker
+
+        fake = Faker(locale)
+        fake.seed_instance(_POOL_SEED)
+        provider = getattr(fake, method)
+    elif library == "mimesis":
+        import mimesis
+
+        provider_name, _, method = method.partition(".")
+        if provider_name not in _MIMESIS_PROVIDERS:
+            raise ValueError(f"Unknown Mimesis provider: {provider_name}")
+        provider_cls = getattr(mimesis, provider_name.capitalize())
+        provider = getattr(provider_cls(locale, seed=_POOL_SEED), method)
+    else:
+        raise ValueError(f"Unknown value pool library: {library}")
+
+    # Deduplicate (keeping first-seen order) so pool indices map to distinct values
+    values = list(dict.fromkeys(provider(**call_kwargs) for _ in range(pool_size)))
+    pool = object_array(values)
+    pool.flags.writeable = False
+    return pool
+
+
+def value_pool(library: str, locale: str, method: str, pool_size: int = DEFAULT_POOL_SIZE, **kwargs: Any) -> np.ndarray:
+    """
+    Get (building once per process) the pool of distinct values of a provider method.
+
+    Args:
+        library: "faker" or "mimesis"
+        locale: Provider locale
+        method: Provider method ("first_name" for Faker, "person.first_name" for Mimesis)
+        pool_size: Provider calls used to build the pool (the pool may be smaller after deduplication)
+        **kwargs: Arguments for the provider method
+
+    Returns:
+        Read-only object array of distinct values
+    """
+    frozen = tuple(sorted((key, _freeze(value)) for key, value in kwargs.items()))
+    return _cached_pool(library, locale, method, frozen, pool_size)
+
+
+def clear_value_pools() -> None:
+    """Drop all cached value pools."""
+    _cached_pool.cache_clear()
+
+
+def sample_pools(pools: Sequence[np.ndarray], size: int, rng: np.random.Generator, unique: bool = False) -> List[np.ndarray]:
+    """
+    Draw `size` values from each pool (one combination per row).
+
+    Args:
+        pools: Value pools
+        size: Number of rows
+        rng: Random generator
+        unique: Draw distinct combinations (without replacement)
+
+    Returns:
+        One array per pool, aligned by row
+
+    Raises:
+        ValueError: If unique and there are fewer than size combinations
+    """
+    sizes = [len(pool) for pool in pools]
+    if unique:
+        space = math.prod(sizes)
+        if size > space:
+            raise ValueError(
+                f"Cannot draw {size} unique values from {space} pool combinations; increase pool_size"
+            )
+        flat = rng.choice(space, size=size, replace=False)
+        indices = _unravel(flat, sizes)
+    else:
+        indices = tuple(rng.integers(0, n, size=size) for n in sizes)
+    return [pool[index] for pool, index in zip(pools, indices)]
+
+
+def _unravel(flat: np.ndarray, sizes: Sequence[int]) -> Tuple[np.ndarray, ...]:
+    return np.unravel_index(flat, sizes) if len(sizes) > 1 else (flat,)
+
+
+def _shuffle_combinations(flat: np.ndarray, space: int, rng: np.random.Generator) -> np.ndarray:
+    """Fixed bijection of [0, space) (x -> a*x + b mod space) that spreads contiguous ranges over all pools."""
+    a = int(rng.integers(1, space)) if space > 1 else 1
+    while math.gcd(a, space) != 1:
+        a = a % (space - 1) + 1
+    b = int(rng.integers(0, space))
+    if space < 2**31:
+        return (flat * a + b) % space
+    return ((flat.astype(object) * a + b) % space).astype(np.int64)  # a*x may overflow int64
+
+
+# Pool of optional numeric suffixes for user names ("", "1", ..., "99")
+EMAIL_SUFFIXES = object_array([""] + [str(n) for n in range(1, 100)])
+EMAIL_SUFFIXES.flags.writeable = False
+
+
+class PooledStrategy(BaseGenerationStrategy):
+    """Base for provider-backed string strategies with a vectorized pooled mode."""
+
+    pooled: bool = Field(default=True, description="Sample from cached per-locale value pools (vectorized) instead of calling the provider per value")
+    pool_size: int = Field(default=DEFAULT_POOL_SIZE, description="Provider calls used to build each value pool")
+    unique: bool = Field(default=False, description="Pooled mode: draw distinct values (within one generate call, and across the chunks of generate_chunk)")
+
+    @field_validator("pool_size")
+    @classmethod
+    def validate_pool_size(cls, v: int) -> int:
+        if v <= 0:
+            raise ValueError("pool_size must be > 0")
+        return v
+
+    @abstractmethod
+    def _generate_values(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Generate values with one provider call per value."""
+        pass
+
+    @abstractmethod
+    def _pools(self) -> List[np.ndarray]:
+        """Value pools this strategy composes (see `value_pool`)."""
+        pass
+
+    def _compose(self, parts: List[np.ndarray]) -> np.ndarray:
+        """Combine the sampled pool values into output values (default: single pool)."""
+        return parts[0]
+
+    def combination_count(self) -> int:
+        """Number of pool combinations, i.e. the most distinct values pooled mode can draw."""
+        return math.prod(len(pool) for pool in self._pools())
+
+    def _generate(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        if not self.pooled:
+            return self._generate_values(size, rng)
+        return self._compose(sample_pools(self._pools(), size, rng, unique=self.unique))
+
+    def generate_chunk(
+        self,
+        chunk_index: int,
+        total: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        rng: RandomSource = None,
+        stream: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Generate one chunk of a chunked column (see `BaseGenerationStrategy.generate_chunk`).
+
+        With pooled unique draws, the combination space is split into one range per
+        chunk, proportional to the chunk's rows; each chunk samples its range without
+        replacement and all chunks map combinations through the same shuffle, so the
+        column's values are distinct across chunks.
+
+        Raises:
+            ValueError: If chunk_index is out of range, or unique and there are fewer
+                than total combinations
+        """
+        if not (self.pooled and self.unique):
+            return super().generate_chunk(chunk_index, total, chunk_size, rng, stream)
+        start = chunk_index * chunk_size
+        if chunk_index < 0 or start >= max(total, 1):
+            raise ValueError(f"Chunk {chunk_index} out of range for {total} values in chunks of {chunk_size}")
+        size = min(chunk_size, total - start)
+
+        pools = self._pools()
+        sizes = [len(pool) for pool in pools]
+        space = math.prod(sizes)
+        if total > space:
+            raise ValueError(
+                f"Cannot draw {total} unique values from {space} pool combinations; increase pool_size"
+            )
+        # Range [start * space // total, stop * space // total) holds at least `size` combinations
+        low, high = start * space // total, (start + size) * space // total
+        root = seed_sequence(rng, stream)
+        flat = make_rng(root, stream=chunk_index).choice(high - low, size=size, replace=False) + low
+        flat = _shuffle_combinations(flat, space, make_rng(root, stream=_SHUFFLE_STREAM))
+        return self._compose([pool[index] for pool, index in zip(pools, _unravel(flat, sizes))])
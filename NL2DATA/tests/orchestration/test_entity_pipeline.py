@@ -0,0 +1,112 @@
+import asyncio
+from typing import List
+
+from pydantic import BaseModel
+
+from NL2DATA.orchestration.graphs.entity_pipeline import (
+    ALL_ENTITIES_KEY,
+    create_entity_pipeline_node,
+)
+
+
+class _EntityResult(BaseModel):
+    entity_name: str
+    value: int
+
+
+class _BatchOutput(BaseModel):
+    entity_results: List[_EntityResult]
+    total_entities: int
+
+
+def _stage(answer_key, trace, delays):
+    """Stage in the repo's wrapper style: batch over state["entities"], entity-keyed output."""
+    async def node(state):
+        names = [e["name"] for e in state["entities"]]
+        assert len(names) == 1
+        name = names[0]
+        trace.append(f"start:{answer_key}:{name}")
+        await asyncio.sleep(delays.get(name, 0.0))
+        trace.append(f"end:{answer_key}:{name}")
+        prior = state.get("attributes", {}).get(name, [])
+        result = _BatchOutput(entity_results=[_EntityResult(entity_name=name, value=len(prior))], total_entities=1)
+        return {
+            "attributes": {**state.get("attributes", {}), name: [*prior, answer_key]},
+            "current_step": answer_key,
+            "previous_answers": {**state.get("previous_answers", {}), answer_key: result},
+            "seen_entities": len(state[ALL_ENTITIES_KEY]),
+        }
+    return node
+
+
+def test_entities_stream_through_stages_without_barrier():
+    trace = []
+    delays = {"Slow": 0.1}
+    node = create_entity_pipeline_node(
+        "pipeline",
+        stages=[("2.1", _stage("2.1", trace, delays)), ("2.2", _stage("2.2", trace, delays))],
+        entity_channels=("attributes",),
+    )
+    state = {
+        "entities": [{"name": "Slow"}, {"name": "Fast"}],
+        "attributes": {"Slow": ["seed"]},
+        "previous_answers": {"1.12": "kept"},
+    }
+    update = asyncio.run(node(state))
+
+    # Fast entity finishes its second stage before the slow entity finishes its first
+    assert trace.index("end:2.2:Fast") < trace.index("end:2.1:Slow")
+
+    # Entity-keyed channels are unioned; each entity only saw its own slice
+    assert update["attributes"] == {"Slow": ["seed", "2.1", "2.2"], "Fast": ["2.1", "2.2"]}
+
+    # Batch outputs are merged across entities
+    merged = update["previous_answers"]["2.2"]
+    assert isinstance(merged, _BatchOutput)
+    assert merged.total_entities == 2
+    assert {r.entity_name: r.value for r in merged.entity_results} == {"Slow": 2, "Fast": 1}
+    assert "1.12" not in update["previous_answers"]
+
+    # Stages still see the full entity list
+    assert update["seen_entities"] == 2
+
+
+def test_dict_answers_from_skipped_entities_merge_with_results():
+    async def stage(state):
+        name = state["entities"][0]["name"]
+        answer = {"entity_results": {}} if name == "A" else {"entity_results": [{"entity_name": name}], "total_derived_attributes": 1}
+        return {"previous_answers": {**state.get("previous_answers", {}), "2.9": answer}}
+
+    node = create_entity_pipeline_node("pipeline", stages=[("2.9", stage)], entity_channels=())
+    update = asyncio.run(node({"entities": [{"name": "A"}, {"name": "B"}, {"name": "C"}]}))
+    merged = update["previous_answers"]["2.9"]
+    assert merged["entity_results"] == [{"entity_name": "B"}, {"entity_name": "C"}]
+    assert merged["total_derived_attributes"] == 2
+
+
+def test_attribute_discovery_runs_batch_steps_when_packing_enabled(monkeypatch):
+    from NL2DATA.orchestration.graphs import phase2
+    from NL2DATA.utils.pipeline_config import Phase2Config
+
+    calls = []
+
+    def batch_stage(answer_key):
+        async def node(state):
+            names = [e["name"] for e in state["entities"]]
+            calls.append((answer_key, names))
+            return {
+                "attributes": {name: [answer_key] for name in names} if answer_key == "2.2" else {},
+                "current_step": answer_key,
+                "previous_answers": {**state.get("previous_answers", {}), answer_key: len(names)},
+            }
+        return node
+
+    monkeypatch.setattr(phase2, "get_phase2_config", lambda: Phase2Config(step_2_2_packing_enabled=1))
+    node = phase2._create_attribute_discovery_node(batch_stage("2.1"), batch_stage("2.2"))
+    state = {"entities": [{"name": "A"}, {"name": "B"}], "attributes": {"C": ["kept"]}}
+    update = asyncio.run(node(state))
+
+    # One 2.2 call over all entities, so it can pack them
+    assert calls == [("2.1", ["A", "B"]), ("2.2", ["A", "B"])]
+    assert update["attributes"] == {"C": ["kept"], "A": ["2.2"], "B": ["2.2"]}
+    assert update["previous_answers"] == {"2.1": 2, "2.2": 2}
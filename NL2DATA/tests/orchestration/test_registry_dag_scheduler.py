@@ -0,0 +1,150 @@
+import asyncio
+import uuid
+
+import pytest
+
+from NL2DATA.orchestration.graphs.scheduler import (
+    LoopBack,
+    build_cross_phase_dag,
+    build_phase_dag,
+    create_registry_phase_graph,
+    merge_safe_node,
+)
+
+_PHASE_9_STEPS = [
+    "P9_S1_NUMERICAL_RANGE",
+    "P9_S2_TEXT_GEN_STRATEGY",
+    "P9_S3_BOOLEAN_DEPENDENCY",
+    "P9_S4_DATA_VOLUME",
+    "P9_S5_PARTITIONING",
+    "P9_S6_DISTRIBUTION_COMPILATION",
+]
+
+
+def _run(graph, state):
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    return asyncio.run(graph.ainvoke(state, config=config))
+
+
+def _recording_node(step_key, trace, delay=0.0):
+    """Node in the repo's `{**state.get(...), key: value}` style that records start/end order."""
+    async def node(state):
+        trace.append(f"start:{step_key}")
+        await asyncio.sleep(delay)
+        trace.append(f"end:{step_key}")
+        return {
+            "previous_answers": {**state.get("previous_answers", {}), step_key: True},
+            "metadata": {**state.get("metadata", {}), f"m{step_key}": True},
+            "current_step": step_key,
+        }
+    return node
+
+
+def test_build_phase_dag_drops_cross_phase_and_transitive_dependencies():
+    dag = build_phase_dag(9, _PHASE_9_STEPS)
+    assert dag["P9_S1_NUMERICAL_RANGE"] == []
+    assert dag["P9_S4_DATA_VOLUME"] == []
+    assert dag["P9_S5_PARTITIONING"] == ["P9_S4_DATA_VOLUME"]
+    assert sorted(dag["P9_S6_DISTRIBUTION_COMPILATION"]) == [
+        "P9_S1_NUMERICAL_RANGE",
+        "P9_S2_TEXT_GEN_STRATEGY",
+        "P9_S3_BOOLEAN_DEPENDENCY",
+        "P9_S5_PARTITIONING",
+    ]
+
+    # P1_S11 depends on both 1.9 and 1.10, but 1.10 already depends on 1.9
+    dag = build_phase_dag(1, ["P1_S9_KEY_RELATIONS", "P1_S10_SCHEMA_CONNECTIVITY", "P1_S11_RELATION_CARDINALITY"])
+    assert dag["P1_S11_RELATION_CARDINALITY"] == ["P1_S10_SCHEMA_CONNECTIVITY"]
+
+
+def test_build_phase_dag_rejects_unknown_step():
+    with pytest.raises(ValueError):
+        build_phase_dag(9, ["P9_S1_NUMERICAL_RANGE", "P9_S99_UNKNOWN"])
+
+
+def test_independent_steps_run_concurrently_and_merge_state():
+    trace = []
+    nodes = [
+        (step_id, step_id.lower(), _recording_node(step_id[:5], trace, delay=0.05 if i < 4 else 0.0))
+        for i, step_id in enumerate(_PHASE_9_STEPS)
+    ]
+    graph = create_registry_phase_graph(phase=9, nodes=nodes)
+    result = _run(graph, {"previous_answers": {"8.8": True}, "metadata": {"keep": 1}})
+
+    # All roots start before any of them finishes
+    roots = {"P9_S1", "P9_S2", "P9_S3", "P9_S4"}
+    first_end = next(i for i, e in enumerate(trace) if e.startswith("end:"))
+    assert {e.split(":")[1] for e in trace[:first_end]} == roots
+
+    # Join node runs last
+    assert trace[-2:] == ["start:P9_S6", "end:P9_S6"]
+
+    # Concurrent `{**prev, key: value}` updates do not clobber each other
+    assert set(result["previous_answers"]) == {"8.8", "P9_S1", "P9_S2", "P9_S3", "P9_S4", "P9_S5", "P9_S6"}
+    assert result["metadata"]["keep"] == 1
+    assert all(result["metadata"][f"mP9_S{i}"] for i in range(1, 7))
+    assert result["current_step"] == "P9_S6"
+
+
+def test_loop_back_reruns_from_target_until_predicate_passes():
+    runs = []
+
+    def counting_node(name):
+        async def node(state):
+            runs.append(name)
+            attempts = state.get("metadata", {}).get("attempts", 0)
+            if name == "naming_validation":
+                return {"metadata": {**state.get("metadata", {}), "attempts": attempts + 1}}
+            return {"current_step": name}
+        return node
+
+    nodes = [
+        ("P2_S3_ATTRIBUTE_SYNONYM", "synonym_detection", counting_node("synonym_detection")),
+        ("P2_S16_CROSS_ENTITY_RECONCILIATION", "cross_entity_reconcile", counting_node("cross_entity_reconcile")),
+        ("P2_S6_NAMING_VALIDATION", "naming_validation", counting_node("naming_validation")),
+        ("P2_S7_PRIMARY_KEY", "primary_keys", counting_node("primary_keys")),
+        ("P2_S15_RELATION_INTRINSIC_ATTRIBUTES", "relation_attributes", counting_node("relation_attributes")),
+    ]
+    graph = create_registry_phase_graph(
+        phase=2,
+        nodes=nodes,
+        loop_backs={
+            "P2_S6_NAMING_VALIDATION": LoopBack(
+                proceed=lambda state: state["metadata"]["attempts"] >= 2,
+                target_step_id="P2_S3_ATTRIBUTE_SYNONYM",
+            ),
+        },
+    )
+    _run(graph, {"metadata": {}})
+
+    assert runs.count("synonym_detection") == 2
+    assert runs.count("naming_validation") == 2
+    assert runs.count("primary_keys") == 1
+    assert runs.count("relation_attributes") == 1
+
+
+def test_fused_node_contracts_registry_steps():
+    trace = []
+    nodes = [
+        (("P9_S1_NUMERICAL_RANGE", "P9_S4_DATA_VOLUME", "P9_S5_PARTITIONING"), "fused", _recording_node("fused", trace)),
+        ("P9_S6_DISTRIBUTION_COMPILATION", "distribution", _recording_node("P9_S6", trace)),
+    ]
+    graph = create_registry_phase_graph(phase=9, nodes=nodes)
+    _run(graph, {})
+    assert trace == ["start:fused", "end:fused", "start:P9_S6", "end:P9_S6"]
+
+
+def test_cross_phase_dag_runs_independent_phases_concurrently():
+    dag = build_cross_phase_dag(range(1, 10))
+    assert dag[2] == [1]
+    assert dag[7] == [6]
+    assert dag[8] == [6]
+    assert dag[9] == [8]
+
+
+def test_merge_safe_node_emits_only_appended_items():
+    async def node(state):
+        return {**state, "warnings": [*state["warnings"], "new"], "phase": 7}
+
+    delta = asyncio.run(merge_safe_node(node)({"warnings": ["old"], "phase": 6, "entities": [{"name": "A"}]}))
+    assert delta == {"warnings": ["new"], "phase": 7}
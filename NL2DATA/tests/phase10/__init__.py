@@ -0,0 +1 @@
+"""Phase 10 test scripts."""
@@ -0,0 +1,280 @@
+"""Unit tests for the Phase 10 table generation engine."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from NL2DATA.phases.phase10 import DataGenerationEngine, ParallelTableGenerator
+
+
+def _schema():
+    return {
+        "tables": [
+            {
+                "name": "Customer",
+                "columns": [
+                    {"name": "customer_id", "type_hint": "integer"},
+                    {"name": "name"},
+                    {"name": "signup_date", "type_hint": "date"},
+                    {"name": "balance", "type_hint": "decimal"},
+                ],
+                "primary_key": ["customer_id"],
+            },
+            {
+                "name": "Product",
+                "columns": [{"name": "sku"}, {"name": "price", "type_hint": "decimal"}],
+                "primary_key": ["sku"],
+            },
+            {
+                "name": "Order",
+                "columns": [{"name": "order_id"}, {"name": "customer_id", "is_foreign_key": True}],
+                "primary_key": ["order_id"],
+                "foreign_keys": [
+                    {"attributes": ["customer_id"], "references_table": "Customer", "referenced_attributes": ["customer_id"]},
+                ],
+            },
+            {
+                "name": "OrderLine",
+                "columns": [{"name": "order_id"}, {"name": "sku"}, {"name": "quantity", "type_hint": "integer"}],
+                "primary_key": ["order_id", "sku"],
+                "foreign_keys": [
+                    {"attributes": ["order_id"], "references_table": "Order", "referenced_attributes": ["order_id"]},
+                    {"attributes": ["sku"], "references_table": "Product", "referenced_attributes": ["sku"]},
+                ],
+            },
+            {
+                "name": "LoyaltyCard",
+                "columns": [{"name": "card_id"}, {"name": "customer_id"}],
+                "primary_key": ["card_id"],
+                "foreign_keys": [
+                    {"attributes": ["customer_id"], "references_table": "Customer", "referenced_attributes": ["customer_id"]},
+                ],
+                "unique_constraints": [["customer_id"]],
+            },
+        ]
+    }
+
+
+def test_generated_tables_are_fk_consistent():
+    """Every FK points at a generated parent row; FK-only keys and 1:1 FKs are unique."""
+    engine = DataGenerationEngine(
+        _schema(),
+        entity_volumes={"Customer": {"min_rows": 10, "max_rows": 100, "expected_rows": 50}},
+        row_counts={"Product": 20, "Order": 300, "OrderLine": 1000, "LoyaltyCard": 80},
+        batch_size=64,
+    )
+    assert engine.order.index("Order") > engine.order.index("Customer")
+    tables = {name: engine.generate_table(name) for name in engine.order}
+
+    assert len(tables["Customer"]["customer_id"]) == 50
+    assert set(tables["Order"]["customer_id"]) <= set(tables["Customer"]["customer_id"])
+    assert set(tables["OrderLine"]["order_id"]) <= set(tables["Order"]["order_id"])
+    assert set(tables["OrderLine"]["sku"]) <= set(tables["Product"]["sku"])
+
+    lines = set(zip(tables["OrderLine"]["order_id"].tolist(), tables["OrderLine"]["sku"].tolist()))
+    assert len(lines) == 1000
+
+    # 1:1 FK is unique, so the table is capped at the parent's row count
+    cards = tables["LoyaltyCard"]["customer_id"]
+    assert len(cards) == 50 and len(set(cards.tolist())) == 50
+
+    assert tables["Customer"]["signup_date"].dtype == np.dtype("datetime64[D]")
+    assert tables["OrderLine"]["quantity"].dtype == np.int64
+
+
+def test_same_seed_generates_same_data():
+    def _orders(seed):
+        engine = DataGenerationEngine(_schema(), default_rows=200, seed=seed, batch_size=50)
+        engine.generate_table("Customer")
+        return engine.generate_table("Order")["customer_id"]
+
+    assert np.array_equal(_orders(1), _orders(1))
+    assert not np.array_equal(_orders(1), _orders(2))
+
+
+def test_generate_to_sqlite(tmp_path):
+    engine = DataGenerationEngine(_schema(), default_rows=120, batch_size=32)
+    database = tmp_path / "data.db"
+    row_counts = engine.generate_to("sqlite", database)
+    assert row_counts["Customer"] == 120
+
+    conn = sqlite3.connect(str(database))
+    try:
+        count = conn.execute("SELECT COUNT(*) FROM OrderLine").fetchone()[0]
+        orphans = conn.execute(
+            'SELECT COUNT(*) FROM OrderLine l LEFT JOIN "Order" o ON l.order_id = o.order_id WHERE o.order_id IS NULL'
+        ).fetchone()[0]
+        signup = conn.execute("SELECT signup_date FROM Customer LIMIT 1").fetchone()[0]
+    finally:
+        conn.close()
+    assert count == row_counts["OrderLine"]
+    assert orphans == 0
+    assert len(signup) == 10  # ISO date
+
+
+def test_generate_to_csv(tmp_path):
+    engine = DataGenerationEngine(_schema(), default_rows=10)
+    engine.generate_to("csv", tmp_path)
+    lines = (tmp_path / "Order.csv").read_text().splitlines()
+    assert lines[0] == "order_id,customer_id"
+    assert len(lines) == 11
+
+
+def test_parallel_generation_matches_sequential(tmp_path):
+    """Partitions run in worker processes; output equals sequential generation."""
+    kwargs = dict(row_counts={"Customer": 500, "Order": 2000, "OrderLine": 3000}, default_rows=300,
+                  batch_size=100, seed=3)
+    runner = ParallelTableGenerator(
+        DataGenerationEngine(_schema(), **kwargs),
+        max_workers=2,
+        rows_per_partition=400,
+        partitioning_strategies={
+            "Order": {"partitioning_type": "range", "partition_count": 6},
+            "OrderLine": {"partitioning_type": "range", "partition_count": 2},
+        },
+        max_rows_in_flight=800,
+    )
+    assert runner.partitions("Order") == [(0, 3), (3, 7), (7, 10), (10, 13), (13, 17), (17, 20)]
+    # A smaller partition_count does not make partitions larger than rows_per_partition
+    assert len(runner.partitions("OrderLine")) == 8
+
+    parallel_counts = runner.generate_to("csv", tmp_path / "parallel")
+    sequential_counts = DataGenerationEngine(_schema(), **kwargs).generate_to("csv", tmp_path / "sequential")
+    assert parallel_counts == sequential_counts
+    for name in sequential_counts:
+        assert (tmp_path / "parallel" / f"{name}.csv").read_text() == (tmp_path / "sequential" / f"{name}.csv").read_text()
+
+
+def _natural_key_parent_schema():
+    # (is_active, code) has 2000 possible values, so 1500 planned rows produce duplicate keys
+    key_columns = [{"name": "is_active", "type_hint": "boolean"}, {"name": "code", "type_hint": "integer"}]
+    key_fk = {"attributes": ["is_active", "code"], "references_table": "Warehouse",
+              "referenced_attributes": ["is_active", "code"]}
+    return {
+        "tables": [
+            {"name": "Warehouse", "columns": list(key_columns), "primary_key": ["is_active", "code"]},
+            {"name": "Manager", "columns": [{"name": "manager_id"}, *key_columns], "primary_key": ["manager_id"],
+             "foreign_keys": [key_fk], "unique_constraints": [["is_active", "code"]]},
+            {"name": "WarehouseProfile", "columns": list(key_columns), "primary_key": ["is_active", "code"],
+             "foreign_keys": [key_fk]},
+        ]
+    }
+
+
+def test_unique_children_are_capped_at_generated_parent_rows(tmp_path):
+    """A natural-key parent that drops duplicates caps its unique-FK and FK-keyed children."""
+    engine = DataGenerationEngine(_natural_key_parent_schema(), default_rows=1500, batch_size=256, seed=5)
+    tables = {name: engine.generate_table(name) for name in engine.order}
+
+    warehouses = len(tables["Warehouse"]["code"])
+    assert warehouses < 1500
+    for name in ("Manager", "WarehouseProfile"):
+        keys = set(zip(tables[name]["is_active"].tolist(), tables[name]["code"].tolist()))
+        assert len(tables[name]["code"]) == len(keys) == warehouses
+
+    runner = ParallelTableGenerator(
+        DataGenerationEngine(_natural_key_parent_schema(), default_rows=1500, batch_size=256, seed=5),
+        max_workers=2,
+        rows_per_partition=512,
+    )
+    assert runner.generate_to("csv", tmp_path)["Manager"] == warehouses
+
+
+def test_derived_formulas_are_evaluated_per_batch():
+    schema = {
+        "tables": [{
+            "name": "Line",
+            "columns": [
+                {"name": "line_id"},
+                {"name": "quantity", "type_hint": "integer"},
+                {"name": "unit_price", "type_hint": "decimal"},
+                {"name": "total", "type_hint": "decimal"},
+                {"name": "size_band"},
+            ],
+            "primary_key": ["line_id"],
+        }]
+    }
+    engine = DataGenerationEngine(
+        schema,
+        default_rows=250,
+        batch_size=64,
+        derived_formulas={
+            "Line.size_band": {"formula": "CASE WHEN Line.total > 100000 THEN 'large' ELSE 'small' END"},
+            "Line.total": {"formula": "quantity * unit_price"},
+        },
+    )
+    plan = engine.plans["Line"]
+    assert [c.name for c in plan.value_columns][-2:] == ["total", "size_band"]
+
+    table = engine.generate_table("Line")
+    assert np.allclose(table["total"], table["quantity"] * table["unit_price"])
+    assert np.array_equal(table["size_band"] == "large", table["total"] > 100000)
+
+
+def test_derived_update_statements_recompute_in_database(tmp_path):
+    schema = {
+        "tables": [{
+            "name": "Line",
+            "columns": [
+                {"name": "line_id"},
+                {"name": "quantity", "type_hint": "integer"},
+                {"name": "unit_price", "type_hint": "decimal"},
+                {"name": "total", "type_hint": "decimal"},
+            ],
+            "primary_key": ["line_id"],
+        }]
+    }
+    engine = DataGenerationEngine(schema, default_rows=50, derived_formulas={"Line.total": "quantity * unit_price"})
+    database = tmp_path / "data.db"
+    engine.generate_to("sqlite", database)
+
+    statements = engine.derived_update_statements("sqlite")
+    assert statements == ['UPDATE "Line" SET "total" = ("quantity" * "unit_price")']
+    conn = sqlite3.connect(str(database))
+    try:
+        conn.execute('UPDATE "Line" SET total = NULL')
+        for statement in statements:
+            conn.execute(statement)
+        mismatches = conn.execute('SELECT COUNT(*) FROM "Line" WHERE ABS(total - quantity * unit_price) > 1e-6').fetchone()[0]
+    finally:
+        conn.close()
+    assert mismatches == 0
+
+
+def test_unique_value_columns_are_deduplicated(tmp_path):
+    """Non-key unique columns never repeat and are declared UNIQUE in SQLite."""
+    schema = {
+        "tables": [{
+            "name": "Badge",
+            "columns": [
+                {"name": "badge_id"},
+                {"name": "number", "type_hint": "integer", "is_unique": True},
+                {"name": "site", "type_hint": "integer"},
+                {"name": "slot", "type_hint": "integer"},
+            ],
+            "primary_key": ["badge_id"],
+            "unique_constraints": [["site", "slot"]],
+        }]
+    }
+    # Default integers are drawn from 0..999, so 1500 rows repeat numbers
+    engine = DataGenerationEngine(schema, default_rows=1500, batch_size=256, seed=2)
+    table = engine.generate_table("Badge")
+    rows = len(table["number"])
+    assert rows < 1500
+    assert len(set(table["number"].tolist())) == rows
+    assert len(set(zip(table["site"].tolist(), table["slot"].tolist()))) == rows
+
+    database = tmp_path / "badges.db"
+    DataGenerationEngine(schema, default_rows=1500, batch_size=256, seed=2).generate_to("sqlite", database)
+    conn = sqlite3.connect(str(database))
+    try:
+        ddl = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'Badge'").fetchone()[0]
+        count = conn.execute("SELECT COUNT(*) FROM Badge").fetchone()[0]
+    finally:
+        conn.close()
+    assert 'UNIQUE ("number")' in ddl and 'UNIQUE ("site", "slot")' in ddl
+    assert count == rows
@@ -164,6 +164,49 @@ class TestDistributionStrategies:
         with pytest.raises(ValidationError):
             BernoulliDistribution(p_true=1.5)  # p_true must be <= 1.0
 
+    def test_seeded_generation_is_reproducible(self):
+        """Same seed and stream give the same array; different streams differ."""
+        strategy = NormalDistribution(mu=50.0, sigma=10.0)
+        first = strategy.generate_array(1000, rng=42, stream=1)
+        assert isinstance(first, np.ndarray) and first.dtype == np.float64
+        np.testing.assert_array_equal(first, strategy.generate_array(1000, rng=42, stream=1))
+        assert not np.array_equal(first, strategy.generate_array(1000, rng=42, stream=2))
+
+        rng = np.random.default_rng(7)
+        values = ZipfDistribution(n=10, s=1.5).generate_array(100, rng)
+        assert values.dtype == np.int64
+        np.testing.assert_array_equal(values, ZipfDistribution(n=10, s=1.5).generate_array(100, 7))
+
+    def test_generate_into_fills_buffer(self):
+        """generate_into writes into a preallocated buffer (including slices)."""
+        buffer = np.zeros(200)
+        strategy = UniformDistribution(min=10.0, max=20.0)
+        assert strategy.generate_into(buffer[100:], rng=3) is not None
+        assert np.all(buffer[:100] == 0.0)
+        assert np.all((buffer[100:] >= 10.0) & (buffer[100:] <= 20.0))
+
+        clipped = np.empty(500)
+        NormalDistribution(mu=0.0, sigma=5.0, min=-1.0, max=1.0).generate_into(clipped, rng=3)
+        assert clipped.min() >= -1.0 and clipped.max() <= 1.0
+
+        labels = np.empty(50, dtype=object)
+        CategoricalDistribution(pmf={"A": 0.5, "B": 0.5}).generate_into(labels, rng=3)
+        assert set(labels) <= {"A", "B"}
+
+    def test_iter_generate_chunks_are_independent(self):
+        """Chunks are bounded, reproducible, and can be regenerated out of order."""
+        strategy = LognormalDistribution(mu=3.0, sigma=1.0, min=0.01)
+        chunks = list(strategy.iter_generate(1050, chunk_size=100, rng=11))
+        assert [len(c) for c in chunks] == [100] * 10 + [50]
+
+        np.testing.assert_array_equal(chunks[7], strategy.generate_chunk(7, 1050, 100, rng=11))
+        resumed = list(strategy.iter_generate(1050, chunk_size=100, rng=11, start_chunk=10))
+        np.testing.assert_array_equal(resumed[0], chunks[10])
+        assert not np.array_equal(chunks[0], chunks[1])
+
+        with pytest.raises(ValueError):
+            strategy.generate_chunk(11, 1050, 100, rng=11)
+
 
 class TestFakerStrategies:
     """Test Faker-based string generation strategies."""
@@ -197,7 +240,29 @@ class TestFakerStrategies:
         strategy_domain = FakerEmailStrategy(locale="en_US", domain="example.com")
         values_domain = strategy_domain.generate(10)
         assert all("@example.com" in v for v in values_domain)
-    
+
+    def test_faker_pooled_mode(self):
+        """Pooled mode samples cached pools; unique draws distinct values."""
+        strategy = FakerNameStrategy(locale="en_US", pool_size=200)
+        assert strategy.pooled
+        values = strategy.generate_array(5000, rng=1)
+        assert values.dtype == object and len(values) == 5000
+        assert all(len(v.split(" ")) >= 2 for v in values[:100])
+        np.testing.assert_array_equal(values, strategy.generate_array(5000, rng=1))
+
+        unique = FakerNameStrategy(locale="en_US", pool_size=200, unique=True).generate(2000, rng=1)
+        assert len(set(unique)) == 2000
+
+        # Unique draws are distinct across the chunks of a column, not just within one chunk
+        unique_strategy = FakerNameStrategy(locale="en_US", pool_size=200, unique=True)
+        chunks = [unique_strategy.generate_chunk(i, 2500, 300, rng=4, stream=9) for i in range(9)]
+        assert sum(len(c) for c in chunks) == 2500
+        assert len(set(np.concatenate(chunks).tolist())) == 2500
+        np.testing.assert_array_equal(chunks[3], unique_strategy.generate_chunk(3, 2500, 300, rng=4, stream=9))
+
+        per_value = FakerNameStrategy(locale="en_US", pooled=False).generate(10, rng=1)
+        assert per_value == FakerNameStrategy(locale="en_US", pooled=False).generate(10, rng=1)
+
     def test_faker_address_strategy(self):
         """Test FakerAddressStrategy."""
         strategy = FakerAddressStrategy(locale="en_US", component="city")
@@ -0,0 +1,150 @@
+"""Execute phases 1-N for many NL descriptions in offline batch mode.
+
+All selected descriptions run concurrently; their LLM requests are collected per
+step into JSONL files and submitted through the OpenAI Batch API (see
+NL2DATA/utils/llm/batch_mode.py). Higher latency, but far higher throughput and
+lower cost than per-request calls, which suits nightly corpus regeneration.
+
+Outputs (under NL2DATA/runs/corpus_batch_<ts>/ unless --output-dir is given):
+- batches/: JSONL request files (and local output files)
+- desc_XXX/state.json: Final state per description
+- summary.txt: Per-description status
+- run.log
+
+Command-line arguments:
+- --start / --end: 1-based inclusive description range from nl_descriptions.txt (default: all)
+- --max-phase: Maximum phase to execute (1-9, default: 9 for all phases)
+- --output-dir: Override output directory (optional)
+- --idle-sec: Submit a batch once no new request arrived for this long (default: 5)
+- --poll-interval: Seconds between batch status polls (default: 60)
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+try:
+    from dotenv import load_dotenv
+
+    _repo_root = Path(__file__).parent.parent.parent
+    load_dotenv(_repo_root / ".env")
+except Exception:
+    # Fail-open: pipeline should still run without dotenv.
+    pass
+
+from NL2DATA.orchestration.graphs.master import create_complete_workflow_graph, create_workflow_up_to_phase
+from NL2DATA.orchestration.state import create_initial_state
+from NL2DATA.utils.logging import get_logger, setup_logging
+from NL2DATA.config import get_config
+from NL2DATA.utils.llm.batch_mode import OpenAIBatchBackend, run_offline_batch
+from NL2DATA.tests.run_all_phases import read_nl_descriptions
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Run NL2DATA pipeline (phases 1-N) for a range of NL descriptions in offline batch mode",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--start", type=int, default=1, help="First 1-based description index (default: 1)")
+    parser.add_argument("--end", type=int, default=0, help="Last 1-based description index (default: last)")
+    parser.add_argument("--max-phase", type=int, default=9, help="Maximum phase to execute (1-9, default: 9)")
+    parser.add_argument("--output-dir", type=str, default=None, help="Output directory (optional)")
+    parser.add_argument("--idle-sec", type=float, default=5.0, help="Batch submission idle window in seconds")
+    parser.add_argument("--poll-interval", type=float, default=60.0, help="Batch status poll interval in seconds")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    """Main execution function."""
+    args = parse_args()
+
+    repo_root = Path(__file__).parent.parent.parent
+    descriptions_file = repo_root / "nl_descriptions.txt"
+    if not descriptions_file.exists():
+        print(f"Error: nl_descriptions.txt not found at {descriptions_file}")
+        sys.exit(1)
+
+    descriptions = read_nl_descriptions(str(descriptions_file))
+    start = max(1, args.start)
+    end = min(len(descriptions), args.end) if args.end > 0 else len(descriptions)
+    if start > end:
+        print(f"Error: Empty description range {start}-{end}. Available: 1-{len(descriptions)}")
+        sys.exit(1)
+    selected = list(range(start, end + 1))
+    max_phase = max(1, min(9, args.max_phase))
+
+    if args.output_dir:
+        run_dir = Path(args.output_dir)
+    else:
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        run_dir = repo_root / "NL2DATA" / "runs" / f"corpus_batch_{ts}"
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    log_config = get_config('logging')
+    setup_logging(
+        level=log_config['level'],
+        format_type=log_config['format'],
+        log_to_file=True,
+        log_file=str(run_dir / "run.log"),
+        clear_existing=True,
+    )
+    logger = get_logger(__name__)
+    logger.info(f"Offline batch run: descriptions {start}-{end}, phases 1-{max_phase}")
+
+    workflow = create_complete_workflow_graph() if max_phase == 9 else create_workflow_up_to_phase(max_phase)
+
+    async def run_one(desc_index_1b: int):
+        config = {
+            "configurable": {"thread_id": f"corpus_batch_desc_{desc_index_1b:03d}"},
+            "recursion_limit": 200,
+        }
+        final_state = await workflow.ainvoke(create_initial_state(descriptions[desc_index_1b - 1]), config=config)
+        desc_dir = run_dir / f"desc_{desc_index_1b:03d}"
+        desc_dir.mkdir(parents=True, exist_ok=True)
+        with open(desc_dir / "state.json", "w", encoding="utf-8") as f:
+            json.dump(final_state, f, indent=2, ensure_ascii=True, default=str)
+        return final_state
+
+    print(f"Running {len(selected)} description(s) in offline batch mode. Output: {run_dir}")
+    start_time = datetime.now()
+    results = await run_offline_batch(
+        selected,
+        run_one,
+        OpenAIBatchBackend(),
+        run_dir / "batches",
+        idle_sec=args.idle_sec,
+        poll_interval_sec=args.poll_interval,
+    )
+    duration = (datetime.now() - start_time).total_seconds()
+
+    failures = 0
+    with open(run_dir / "summary.txt", "w", encoding="utf-8") as f:
+        f.write(f"NL2DATA Offline Batch Run (Phases 1-{max_phase})\n")
+        f.write("=" * 80 + "\n\n")
+        f.write(f"Descriptions: {start}-{end}\n")
+        f.write(f"Execution Duration: {duration:.2f} seconds\n\n")
+        for desc_index_1b, result in zip(selected, results):
+            if isinstance(result, Exception):
+                failures += 1
+                logger.error(f"Description {desc_index_1b} failed: {result}")
+                f.write(f"desc_{desc_index_1b:03d}: FAILED ({result})\n")
+            else:
+                f.write(
+                    f"desc_{desc_index_1b:03d}: OK (phase {result.get('phase', 'Unknown')}, "
+                    f"{len(result.get('entities', []))} entities)\n"
+                )
+
+    print(f"Completed in {duration:.2f} seconds: {len(selected) - failures} succeeded, {failures} failed")
+    print(f"Run directory: {run_dir}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
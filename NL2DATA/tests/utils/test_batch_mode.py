@@ -0,0 +1,136 @@
+"""Unit tests for offline batch submission mode."""
+
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from NL2DATA.utils.llm.batch_mode import (
+    BatchCollector,
+    BatchRequestError,
+    LocalFileBatchBackend,
+    get_batch_collector,
+    run_offline_batch,
+)
+from NL2DATA.utils.llm.standardized_calls import standardized_llm_call
+from NL2DATA.utils.loops.loop_executor import LoopConfig, SafeLoopExecutor
+
+
+class _Output(BaseModel):
+    result: str
+
+
+@pytest.fixture
+def llm():
+    # Non-zero temperature: keeps the persistent response cache out of these tests
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0.3, api_key="test-key")
+
+
+def _echo_responder(body):
+    """Answers with the last user message, upper-cased."""
+    text = body["messages"][-1]["content"].strip()
+    return json.dumps({"result": text.upper()})
+
+
+async def _step(llm, text):
+    return await standardized_llm_call(
+        llm=llm,
+        output_schema=_Output,
+        system_prompt="You are a helper. Return JSON.",
+        human_prompt_template="{text}",
+        input_data={"text": text},
+    )
+
+
+class TestOfflineBatch:
+    """Test that pipeline runs are driven one step at a time through batch files."""
+
+    def test_runs_share_one_batch_per_step(self, llm):
+        async def pipeline(desc):
+            first = await _step(llm, f"{desc} step one")
+            fanout = await asyncio.gather(*(_step(llm, f"{desc} entity {i}") for i in range(3)))
+            return [first.result] + [r.result for r in fanout]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = LocalFileBatchBackend(_echo_responder)
+            results = asyncio.run(
+                run_offline_batch(["a", "b", "c"], pipeline, backend, Path(tmp), idle_sec=0.05, poll_interval_sec=0)
+            )
+            batch_files = sorted(p.name for p in Path(tmp).glob("batch_*.jsonl") if "output" not in p.name)
+            first_lines = (Path(tmp) / "batch_0001.jsonl").read_text().splitlines()
+
+        assert results[0] == ["A STEP ONE", "A ENTITY 0", "A ENTITY 1", "A ENTITY 2"]
+        assert results[2][0] == "C STEP ONE"
+        # Step 1 of all three descriptions, then the fan-out step of all three
+        assert batch_files == ["batch_0001.jsonl", "batch_0002.jsonl"]
+        assert len(first_lines) == 3
+        request = json.loads(first_lines[0])
+        assert request["url"] == "/v1/chat/completions"
+        assert request["body"]["model"] == "gpt-4o-mini"
+        assert request["body"]["response_format"]["json_schema"]["name"] == "_Output"
+
+    def test_collector_is_scoped_to_the_run(self, llm):
+        seen = []
+
+        async def pipeline(desc):
+            seen.append(get_batch_collector() is not None)
+            return desc
+
+        with tempfile.TemporaryDirectory() as tmp:
+            asyncio.run(run_offline_batch(["a"], pipeline, LocalFileBatchBackend(_echo_responder), Path(tmp)))
+        assert seen == [True]
+        assert get_batch_collector() is None
+
+    def test_loops_are_not_cut_off_by_wall_clock_limit(self, llm):
+        async def slow_responder(body):
+            await asyncio.sleep(1.2)  # Longer than the loop's wall-clock limit
+            return _echo_responder(body)
+
+        async def pipeline(desc):
+            async def iteration(previous_result=None):
+                return await _step(llm, f"{desc} round {0 if previous_result is None else 1}")
+
+            return await SafeLoopExecutor().run_loop(
+                iteration,
+                lambda result: result.result.endswith("ROUND 1"),
+                LoopConfig(max_iterations=3, max_wall_time_sec=1, name="test_batch_loop"),
+            )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = LocalFileBatchBackend(slow_responder)
+            results = asyncio.run(
+                run_offline_batch(["a", "b"], pipeline, backend, Path(tmp), idle_sec=0.05, poll_interval_sec=0)
+            )
+
+        assert [r["terminated_by"] for r in results] == ["condition_met", "condition_met"]
+        assert results[0]["result"].result == "A ROUND 1"
+        assert results[0]["iterations"] == 2
+
+
+class TestBatchCollector:
+    """Test request/response matching and error handling."""
+
+    def test_failed_requests_raise(self):
+        def responder(body):
+            if body["messages"][0]["content"] == "bad":
+                raise RuntimeError("rejected")
+            return "ok"
+
+        async def run(tmp):
+            collector = BatchCollector(LocalFileBatchBackend(responder), Path(tmp), idle_sec=0.01, poll_interval_sec=0)
+            good = collector.request({"messages": [{"role": "user", "content": "good"}]})
+            bad = collector.request({"messages": [{"role": "user", "content": "bad"}]})
+            return await asyncio.gather(good, bad, return_exceptions=True), collector.stats
+
+        with tempfile.TemporaryDirectory() as tmp:
+            (good, bad), stats = asyncio.run(run(tmp))
+        assert good == "ok"
+        assert isinstance(bad, BatchRequestError)
+        assert stats == {"requests": 2, "batches": 1, "failed_requests": 1}
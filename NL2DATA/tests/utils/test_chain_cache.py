@@ -0,0 +1,54 @@
+"""Unit tests for the compiled chain cache."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from NL2DATA.utils.llm.chain_cache import chain_cache_stats, clear_chain_cache
+from NL2DATA.utils.llm.standardized_calls import StandardizedLLMCall
+
+
+class _Output(BaseModel):
+    result: str
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_chain_cache()
+    yield
+    clear_chain_cache()
+
+
+@pytest.fixture
+def llm():
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key="test-key")
+
+
+def _call(llm, human_prompt_template="Entity: {entity}"):
+    return StandardizedLLMCall(
+        llm=llm,
+        output_schema=_Output,
+        system_prompt="You are a helper.",
+        human_prompt_template=human_prompt_template,
+    )
+
+
+class TestChainCache:
+    """Test that identical calls share one compiled chain."""
+
+    def test_fan_out_builds_chain_once(self, llm):
+        chains = {id(_call(llm).chain) for _ in range(40)}
+        assert len(chains) == 1
+        assert chain_cache_stats()["misses"] == 1
+        assert chain_cache_stats()["hits"] == 39
+
+    def test_different_configuration_builds_new_chain(self, llm):
+        first = _call(llm).chain
+        assert _call(llm, "Relation: {relation}").chain is not first
+        other_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key="test-key")
+        assert _call(other_llm).chain is not first
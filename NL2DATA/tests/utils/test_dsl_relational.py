@@ -0,0 +1,75 @@
+"""Tests for hash-join execution of relational DSL functions."""
+
+import numpy as np
+import pytest
+
+from NL2DATA.utils.dsl.evaluator import DSLEvaluationError, compile_dsl_expression
+
+
+@pytest.fixture
+def orders():
+    return {"id": np.array([1, 2, 3, 4]), "min_qty": np.array([1, 5, 1, 1])}
+
+
+@pytest.fixture
+def tables():
+    return {
+        "LineItem": {
+            "order_id": np.array([1, 1, 2, 2, 2, 3, 9]),
+            "qty": np.array([2, 3, 1, 6, 7, 4, 1]),
+            "price": np.array([1.5, 2.0, np.nan, 3.0, 1.0, 2.0, 1.0]),
+            "status": np.array(["open", "paid", "open", "open", "paid", "open", "open"]),
+        }
+    }
+
+
+def _evaluate(expression, orders, tables):
+    return compile_dsl_expression(expression, table="Order").evaluate(orders, tables=tables)
+
+
+def test_equi_join_aggregates(orders, tables):
+    join = "LineItem.order_id = this.id"
+    assert _evaluate(f"EXISTS(LineItem WHERE {join})", orders, tables).tolist() == [True, True, True, False]
+    assert _evaluate(f"COUNT_WHERE(LineItem WHERE {join})", orders, tables).tolist() == [2, 3, 1, 0]
+    assert _evaluate(f"SUM_WHERE(LineItem, qty WHERE {join})", orders, tables).tolist() == [5, 14, 4, None]
+    # NULL values are skipped; no rows gives NULL
+    assert _evaluate(f"SUM_WHERE(LineItem, price WHERE {join})", orders, tables)[:3].tolist() == [3.5, 4.0, 2.0]
+    assert _evaluate(f"MIN_WHERE(LineItem, qty WHERE {join})", orders, tables).tolist() == [2, 1, 4, None]
+    assert _evaluate(f"MAX_WHERE(LineItem, status WHERE {join})", orders, tables).tolist() == ["paid", "paid", "open", None]
+    # First matching row in table order
+    lookup = _evaluate(f"LOOKUP(LineItem, price WHERE {join})", orders, tables)
+    assert lookup[0] == 1.5 and np.isnan(lookup[1]) and np.isnan(lookup[3])
+
+
+def test_filters_and_residual_conjuncts(orders, tables):
+    assert _evaluate(
+        "AVG_WHERE(LineItem, qty WHERE order_id = this.id AND status = 'open')", orders, tables
+    )[:3].tolist() == [2.0, 3.5, 4.0]
+    assert _evaluate(
+        "COUNT_WHERE(LineItem WHERE order_id = this.id AND qty >= this.min_qty)", orders, tables
+    ).tolist() == [2, 2, 1, 0]
+    # No join key: every line item is a candidate
+    assert _evaluate("COUNT_WHERE(LineItem WHERE qty > this.min_qty)", orders, tables).tolist() == [5, 2, 5, 5]
+    assert _evaluate(
+        "EXISTS (SELECT 1 FROM LineItem WHERE LineItem.order_id = this.id AND this.id > 1)", orders, tables
+    ).tolist() == [False, True, True, False]
+    assert _evaluate("IN_RANGE(id, 2, 3)", orders, tables).tolist() == [False, True, True, False]
+
+
+def test_index_is_reused_across_batches(orders, tables):
+    expr = compile_dsl_expression("COUNT_WHERE(LineItem WHERE LineItem.order_id = this.id)")
+    assert expr.tables == {"LineItem"}
+    expr.evaluate(orders, tables=tables)
+    (index,) = expr._indexes.values()
+    assert expr.evaluate({"id": np.array([2, 9])}, tables=tables).tolist() == [3, 1]
+    assert next(iter(expr._indexes.values())) is index
+
+    changed = {"LineItem": {**tables["LineItem"], "order_id": np.zeros(7, dtype=int)}}
+    assert expr.evaluate({"id": np.array([0])}, tables=changed).tolist() == [7]
+
+
+def test_relational_errors(orders, tables):
+    with pytest.raises(DSLEvaluationError):
+        _evaluate("COUNT_WHERE(Missing WHERE Missing.order_id = this.id)", orders, tables)
+    with pytest.raises(DSLEvaluationError):
+        compile_dsl_expression("EXISTS(LineItem WHERE COUNT_WHERE(Other WHERE Other.x = this.id) > 0)")
@@ -0,0 +1,93 @@
+"""Tests for the DSL-to-SQL compiler."""
+
+import sqlite3
+
+import pytest
+
+from NL2DATA.utils.dsl.schema_context import DSLSchemaContext, DSLTableSchema
+from NL2DATA.utils.dsl.sql_compiler import (
+    DSLSQLCompilationError,
+    check_constraint_sql,
+    compile_dsl_to_sql,
+    generated_column_sql,
+    update_sql,
+)
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute('CREATE TABLE "Line" (id INTEGER, qty INTEGER, price REAL, name TEXT, shipped DATE, total REAL)')
+    conn.execute('CREATE TABLE "Payment" (line_id INTEGER, amount REAL)')
+    conn.executemany('INSERT INTO "Line" VALUES (?, ?, ?, ?, ?, NULL)', [
+        (1, 1, 10.0, "Ann", "2024-01-31"),
+        (2, 20, 2.0, " bob ", "2024-03-15"),
+        (3, 5, None, None, "2023-12-31"),
+    ])
+    conn.executemany('INSERT INTO "Payment" VALUES (?, ?)', [(1, 5.0), (1, 7.0), (2, 1.0)])
+    yield conn
+    conn.close()
+
+
+def _select(conn, expression):
+    sql = compile_dsl_to_sql(expression, table="Line").sql
+    return [row[0] for row in conn.execute(f'SELECT {sql} FROM "Line" ORDER BY id')]
+
+
+def test_row_level_expressions_match_evaluator_semantics(conn):
+    assert _select(conn, "CASE WHEN qty > 10 THEN price * 0.9 ELSE price END") == [10.0, 1.8, None]
+    assert _select(conn, "qty / 0") == [None, None, None]
+    assert _select(conn, "qty / 2") == [0.5, 10.0, 2.5]
+    assert _select(conn, "UPPER(TRIM(name))") == ["ANN", "BOB", None]
+    assert _select(conn, "CONCAT(name, '-', qty)") == ["Ann-1", " bob -20", "-5"]
+    assert _select(conn, "this.qty IN [1, 5]") == [1, 0, 1]
+
+
+def test_datetime_functions_in_sqlite(conn):
+    # Without a schema the column type is unknown, so DATEADD returns timestamps
+    assert _select(conn, "DATEADD('day', qty, shipped)") == [
+        "2024-02-01 00:00:00", "2024-04-04 00:00:00", "2024-01-05 00:00:00"
+    ]
+    assert _select(conn, "DATEDIFF('day', shipped, '2024-03-16')") == [45, 1, 76]
+    assert _select(conn, "DATE_TRUNC('quarter', shipped)")[2] == "2023-10-01 00:00:00"
+    assert _select(conn, "EXTRACT(year, shipped)") == [2024, 2024, 2023]
+
+
+def test_update_with_relational_function(conn):
+    conn.execute(update_sql("Line", {"total": "SUM_WHERE(Payment, Payment.amount WHERE Payment.line_id = this.id)"}))
+    assert [r[0] for r in conn.execute('SELECT total FROM "Line" ORDER BY id')] == [12.0, 1.0, None]
+
+
+def test_generated_column_and_check_constraint(conn):
+    column = generated_column_sql("total", "REAL", "qty * price", table="Line")
+    check = check_constraint_sql("qty > 0 AND price >= 0", name="chk_line")
+    conn.execute(f'CREATE TABLE "Line2" (qty INTEGER, price REAL, {column}, {check})')
+    conn.execute('INSERT INTO "Line2" (qty, price) VALUES (3, 2.5)')
+    assert conn.execute('SELECT total FROM "Line2"').fetchone()[0] == 7.5
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute('INSERT INTO "Line2" (qty, price) VALUES (0, 1.0)')
+
+
+def test_postgresql_dialect():
+    assert compile_dsl_to_sql("ROUND(price, 2)", dialect="postgresql").sql == 'ROUND(CAST("price" AS NUMERIC), 2)'
+    assert compile_dsl_to_sql("qty % 3", dialect="postgresql").sql == 'MOD("qty", NULLIF(3, 0))'
+    assert (compile_dsl_to_sql("SPLIT_PART(name, '-', 1)", dialect="postgresql").sql
+            == "SPLIT_PART(\"name\", '-', 1)")
+    with pytest.raises(DSLSQLCompilationError):
+        compile_dsl_to_sql("SPLIT_PART(name, '-', 1)", dialect="sqlite")
+
+
+def test_schema_validation_and_typing():
+    schema = DSLSchemaContext(tables={"Line": DSLTableSchema(columns={"qty": "number", "shipped": "date"})})
+    assert compile_dsl_to_sql("DATEADD('month', qty, shipped)", dialect="postgresql", table="Line",
+                              schema=schema).sql == "CAST((\"shipped\" + \"qty\" * INTERVAL '1 month') AS DATE)"
+    with pytest.raises(DSLSQLCompilationError):
+        compile_dsl_to_sql("Line.missing + 1", table="Line", schema=schema)
+
+
+def test_rejected_constructs():
+    for expression in ("NORMAL(0, 1)", "amount ~ UNIFORM(1, 2)", "SUM(qty)", "Payment.amount + 1"):
+        with pytest.raises(DSLSQLCompilationError):
+            compile_dsl_to_sql(expression, table="Line")
+    with pytest.raises(DSLSQLCompilationError):
+        check_constraint_sql("EXISTS(Payment WHERE Payment.line_id = this.id)", table="Line")
@@ -0,0 +1,44 @@
+"""Tests for the DSL parse/validation caches."""
+
+import pytest
+
+from NL2DATA.utils.dsl.cache import PARSE_CACHE, VALIDATION_CACHE, clear_dsl_caches, schema_fingerprint
+from NL2DATA.utils.dsl.pipeline import validate_dsl_pipeline
+from NL2DATA.utils.dsl.schema_context import DSLSchemaContext, DSLTableSchema
+from NL2DATA.utils.dsl.validator import validate_dsl_expression, validate_dsl_expression_with_schema
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    clear_dsl_caches()
+    yield
+    clear_dsl_caches()
+
+
+def _schema(amount_type="number"):
+    return DSLSchemaContext(tables={"Order": DSLTableSchema(columns={"amount": amount_type, "qty": "number"})})
+
+
+def test_repeated_validation_is_cached():
+    first = validate_dsl_expression_with_schema("Order.amount * 2", _schema())
+    assert first == {"valid": True, "error": None}
+    first["valid"] = False  # callers get copies
+    assert validate_dsl_expression_with_schema("Order.amount * 2", _schema()) == {"valid": True, "error": None}
+    assert VALIDATION_CACHE.hits == 1
+
+    # A different schema is a different key
+    assert not validate_dsl_expression_with_schema("Order.amount * 2", _schema("string"))["valid"]
+    assert schema_fingerprint(_schema()) != schema_fingerprint(_schema("string"))
+
+
+def test_expression_is_parsed_once():
+    result = validate_dsl_pipeline("Order.amount + Order.qty", _schema())
+    assert result.overall_success
+    assert PARSE_CACHE.misses == 1
+    validate_dsl_expression("Order.amount + Order.qty")
+    assert PARSE_CACHE.misses == 1
+
+    # Parse failures are cached too
+    error = validate_dsl_expression("amount +")["error"]
+    assert validate_dsl_expression_with_schema("amount +", _schema())["error"] == error
+    assert PARSE_CACHE.misses == 2
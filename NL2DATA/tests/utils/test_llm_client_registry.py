@@ -0,0 +1,76 @@
+"""Unit tests for the pooled LLM client registry."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from langchain_openai import ChatOpenAI
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from NL2DATA.utils.llm.client_registry import (
+    clear_llm_clients,
+    get_chat_model,
+    get_chat_model_like,
+    llm_client_stats,
+)
+
+_SETTINGS = {"model": "gpt-4o-mini", "temperature": 0, "max_tokens": 4000, "timeout": 120, "api_key": "test-key"}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    clear_llm_clients()
+    yield
+    clear_llm_clients()
+
+
+class TestClientRegistry:
+    """Test model reuse and connection pool sharing."""
+
+    def test_same_settings_share_one_model(self):
+        async def _check():
+            first = get_chat_model(ChatOpenAI, **_SETTINGS)
+            assert get_chat_model(ChatOpenAI, **_SETTINGS) is first
+            other = get_chat_model(ChatOpenAI, **{**_SETTINGS, "max_tokens": 8000})
+            assert other is not first
+            # One HTTP connection pool for all models
+            assert other.http_client is first.http_client
+            assert other.http_async_client is first.http_async_client
+            assert llm_client_stats() == {"models": 2, "hits": 1, "misses": 2}
+
+        asyncio.run(_check())
+
+    def test_no_retry_variant_keeps_settings(self):
+        async def _check():
+            llm = get_chat_model(ChatOpenAI, **_SETTINGS)
+            no_retry = get_chat_model_like(llm, max_retries=0)
+            assert no_retry.max_retries == 0
+            assert no_retry.max_tokens == 4000
+            assert no_retry.openai_api_key.get_secret_value() == "test-key"
+            assert get_chat_model_like(llm, max_retries=0) is no_retry
+
+        asyncio.run(_check())
+
+    def test_models_outside_a_loop_are_not_cached(self):
+        """A model built outside a running loop must not pin an async client to any loop."""
+        first = get_chat_model(ChatOpenAI, **_SETTINGS)
+        second = get_chat_model(ChatOpenAI, **_SETTINGS)
+        assert second is not first
+        assert first.http_async_client is None
+        assert second.http_client is first.http_client
+        assert llm_client_stats()["models"] == 0
+
+    def test_async_pools_are_per_event_loop(self):
+        async def _model():
+            return get_chat_model(ChatOpenAI, **_SETTINGS)
+
+        loop = asyncio.new_event_loop()
+        try:
+            first = loop.run_until_complete(_model())
+            assert loop.run_until_complete(_model()) is first
+        finally:
+            loop.close()
+        second = asyncio.run(_model())
+        assert second.http_async_client is not first.http_async_client
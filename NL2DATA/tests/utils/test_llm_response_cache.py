@@ -0,0 +1,109 @@
+"""Unit tests for the persistent LLM response cache."""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from pydantic import BaseModel
+from langchain_core.messages import HumanMessage, SystemMessage
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from NL2DATA.utils.llm.response_cache import LLMResponseCache, make_cache_key
+
+
+class _Output(BaseModel):
+    result: str
+
+
+class _OtherOutput(BaseModel):
+    value: int
+
+
+def _messages(text: str):
+    return [SystemMessage(content="You are a helper."), HumanMessage(content=text)]
+
+
+class TestMakeCacheKey:
+    """Test cache key construction."""
+
+    def test_key_is_stable(self):
+        k1 = make_cache_key(model="gpt-4o-mini", temperature=0, max_tokens=100, output_schema=_Output, messages=_messages("a"))
+        k2 = make_cache_key(model="gpt-4o-mini", temperature=0, max_tokens=100, output_schema=_Output, messages=_messages("a"))
+        assert k1 == k2
+
+    def test_key_depends_on_all_inputs(self):
+        base = dict(model="gpt-4o-mini", temperature=0, max_tokens=100, output_schema=_Output, messages=_messages("a"))
+        k = make_cache_key(**base)
+        assert k != make_cache_key(**{**base, "model": "gpt-4o"})
+        assert k != make_cache_key(**{**base, "temperature": 0.5})
+        assert k != make_cache_key(**{**base, "output_schema": _OtherOutput})
+        assert k != make_cache_key(**{**base, "messages": _messages("b")})
+
+
+class TestLLMResponseCache:
+    """Test LLMResponseCache class."""
+
+    def test_put_get_roundtrip_and_counters(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = LLMResponseCache(Path(tmp) / "cache.sqlite3")
+            assert cache.get("k1", _Output) is None
+            cache.put("k1", _Output(result="hello"))
+            cached = cache.get("k1", _Output)
+            assert isinstance(cached, _Output)
+            assert cached.result == "hello"
+            stats = cache.stats()
+            assert stats["hits"] == 1
+            assert stats["misses"] == 1
+            assert stats["entries"] == 1
+            cache.close()
+
+    def test_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cache.sqlite3"
+            cache = LLMResponseCache(path)
+            cache.put("k1", _Output(result="persisted"))
+            cache.close()
+
+            reopened = LLMResponseCache(path)
+            assert reopened.get("k1", _Output).result == "persisted"
+            reopened.close()
+
+    def test_lru_eviction_by_entry_count(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = LLMResponseCache(Path(tmp) / "cache.sqlite3", max_entries=2)
+            cache.put("k1", _Output(result="1"))
+            cache.put("k2", _Output(result="2"))
+            # Touch k1 so k2 becomes least recently used
+            assert cache.get("k1", _Output) is not None
+            cache.put("k3", _Output(result="3"))
+            assert cache.get("k2", _Output) is None
+            assert cache.get("k1", _Output) is not None
+            assert cache.get("k3", _Output) is not None
+            assert cache.stats()["evictions"] == 1
+            cache.close()
+
+    def test_lru_eviction_by_bytes_tracks_totals(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cache.sqlite3"
+            size = len(_Output(result="x" * 10).model_dump_json())
+            cache = LLMResponseCache(path, max_bytes=3 * size)
+            for i in range(5):
+                cache.put(f"k{i}", _Output(result=str(i) * 10))
+            cache.put("k4", _Output(result="4" * 10))  # Replacing an entry does not grow the cache
+            assert cache.stats()["entries"] == 3 and cache.stats()["bytes"] == 3 * size
+            assert cache.get("k1", _Output) is None
+            assert cache.get("k2", _Output) is not None
+            cache.close()
+
+            reopened = LLMResponseCache(path, max_bytes=3 * size)
+            assert reopened.stats()["entries"] == 3 and reopened.stats()["bytes"] == 3 * size
+            reopened.close()
+
+    def test_schema_mismatch_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = LLMResponseCache(Path(tmp) / "cache.sqlite3")
+            cache.put("k1", _Output(result="x"))
+            assert cache.get("k1", _OtherOutput) is None
+            assert cache.stats()["entries"] == 0
+            cache.close()
@@ -6,7 +6,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from NL2DATA.utils.loops import SafeLoopExecutor, LoopConfig
+from NL2DATA.utils.loops import SafeLoopExecutor, LoopConfig, fingerprint_state, get_loop_metrics
 
 
 class TestSafeLoopExecutor:
@@ -156,6 +156,62 @@ class TestSafeLoopExecutor:
         )
         
         assert len(previous_results) >= 1  # Should have received previous results
+    
+    async def test_iteration_timing_metrics(self):
+        """Test that per-iteration times are returned and exported as metrics."""
+        executor = SafeLoopExecutor()
+        
+        async def step_func(previous_result=None):
+            return {"done": previous_result is not None}
+        
+        config = LoopConfig(
+            max_iterations=5,
+            max_wall_time_sec=30,
+            name="test_timing_loop"
+        )
+        
+        result = await executor.run_loop(
+            step_func=step_func,
+            termination_check=lambda r: r["done"],
+            config=config
+        )
+        
+        assert len(result["iteration_seconds"]) == result["iterations"] == 2
+        assert get_loop_metrics().snapshot()["test_timing_loop"]["iterations"] >= 2
+        text = get_loop_metrics().metrics_text()
+        assert 'nl2data_loop_iteration_seconds_count{loop="test_timing_loop"}' in text
+        assert 'terminated_by="condition_met"' in text
+
+
+class TestStateFingerprint:
+    """Test structural state fingerprints used for cycle detection."""
+    
+    def test_order_and_formatting_insensitive(self):
+        """Test that key/list order, case, whitespace and None fields do not matter."""
+        a = {"entities": [{"name": "Customer", "note": None}, {"name": "Order"}], "reasoning": "Looks  good"}
+        b = {"reasoning": "looks good", "entities": [{"name": "order"}, {"name": " CUSTOMER "}]}
+        assert fingerprint_state(a) == fingerprint_state(b)
+    
+    def test_content_changes_are_detected(self):
+        """Test that different values, multiplicities and types hash differently."""
+        base = {"items": [{"name": "a"}, {"name": "b"}], "count": 1}
+        assert fingerprint_state(base) != fingerprint_state({"items": [{"name": "a"}], "count": 1})
+        assert fingerprint_state(base) != fingerprint_state({"items": [{"name": "a"}, {"name": "a"}], "count": 1})
+        assert fingerprint_state({"flag": True}) != fingerprint_state({"flag": 1})
+    
+    def test_stable_ids_compared_exactly(self):
+        """Test that *_id values are not case-folded."""
+        assert fingerprint_state({"entity_id": "E1"}) != fingerprint_state({"entity_id": "e1"})
+    
+    def test_pydantic_models_match_equivalent_dicts(self):
+        """Test that a model hashes like a dict of its fields."""
+        from pydantic import BaseModel
+        
+        class Result(BaseModel):
+            names: list
+            done: bool = False
+        
+        assert fingerprint_state(Result(names=["B", "a"])) == fingerprint_state({"done": False, "names": ["a", "b"]})
 
 
 async def run_all_tests():
@@ -164,26 +220,28 @@ async def run_all_tests():
     print("Testing Loop Executor")
     print("=" * 80)
     
-    test_class = TestSafeLoopExecutor
-    print(f"\n{test_class.__name__}:")
-    print("-" * 80)
-    
-    test_methods = [m for m in dir(test_class) if m.startswith("test_")]
-    
     total_tests = 0
     passed_tests = 0
     
-    for method_name in test_methods:
-        total_tests += 1
-        test_method = getattr(test_class(), method_name)
-        try:
-            await test_method()
-            print(f"  [PASS] {method_name}")
-            passed_tests += 1
-        except AssertionError as e:
-            print(f"  [FAIL] {method_name}: {e}")
-        except Exception as e:
-            print(f"  [ERROR] {method_name}: {e}")
+    for test_class in (TestSafeLoopExecutor, TestStateFingerprint):
+        print(f"\n{test_class.__name__}:")
+        print("-" * 80)
+        
+        test_methods = [m for m in dir(test_class) if m.startswith("test_")]
+        
+        for method_name in test_methods:
+            total_tests += 1
+            test_method = getattr(test_class(), method_name)
+            try:
+                outcome = test_method()
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+                print(f"  [PASS] {method_name}")
+                passed_tests += 1
+            except AssertionError as e:
+                print(f"  [FAIL] {method_name}: {e}")
+            except Exception as e:
+                print(f"  [ERROR] {method_name}: {e}")
     
     print("\n" + "=" * 80)
     print(f"Test Results: {passed_tests}/{total_tests} passed")
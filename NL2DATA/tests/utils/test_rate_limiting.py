@@ -1,13 +1,20 @@
 """Unit tests for rate limiting utilities."""
 
 import sys
+import time
 import asyncio
 from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from NL2DATA.utils.rate_limiting import RateLimiter, get_rate_limiter
+from NL2DATA.utils.rate_limiting import (
+    ERROR_THROTTLED,
+    AdaptiveConcurrencyLimit,
+    RateLimiter,
+    get_rate_limiter,
+    report_llm_error,
+)
 
 
 class TestRateLimiter:
@@ -98,7 +105,167 @@ class TestRateLimiter:
         assert all(r == "done" for r in results)
         # Should have taken some time due to rate limiting
         assert elapsed >= 0  # At least some time passed
+    
+    async def test_gcra_paces_after_burst_in_fifo_order(self):
+        """Test requests beyond the burst are paced one emission interval apart, first come first served."""
+        limiter = RateLimiter(
+            requests_per_minute=600,  # One request every 0.1s
+            tokens_per_minute=100000,
+            max_concurrent=10,
+            request_burst=1
+        )
+        
+        order = []
+        
+        async def task(task_id):
+            async with limiter.acquire():
+                order.append(task_id)
+        
+        start = time.monotonic()
+        await asyncio.gather(*(task(i) for i in range(4)))
+        elapsed = time.monotonic() - start
+        
+        assert order == [0, 1, 2, 3]
+        assert 0.25 <= elapsed < 1.0
+    
+    async def test_waiting_does_not_block_other_acquirers(self):
+        """Test a waiter queued on the token bucket does not hold up the bookkeeping of others."""
+        limiter = RateLimiter(
+            requests_per_minute=1000,
+            tokens_per_minute=60000,  # 1000 tokens/s
+            max_concurrent=10
+        )
+        
+        # Drain the bucket; the next reservation has to wait ~0.2s
+        async with limiter.acquire(estimated_tokens=60000):
+            pass
+        waiter = asyncio.create_task(self._acquire_once(limiter, 200))
+        await asyncio.sleep(0.01)
+        
+        # Token-free requests are admitted immediately even though a waiter is sleeping
+        start = time.monotonic()
+        async with limiter.acquire():
+            pass
+        assert time.monotonic() - start < 0.05
+        assert limiter.stats()["waiting"] == 1
+        
+        wait_seconds = await waiter
+        assert 0.15 <= wait_seconds < 0.5
+    
+    async def _acquire_once(self, limiter, tokens):
+        async with limiter.acquire(estimated_tokens=tokens) as permit:
+            return permit.wait_seconds
+    
+    async def test_record_usage_calibrates_estimates(self):
+        """Test actual token usage corrects the bucket and scales later estimates."""
+        limiter = RateLimiter(
+            requests_per_minute=1000,
+            tokens_per_minute=100000,
+            max_concurrent=10
+        )
+        
+        async with limiter.acquire(step_type="per-entity", estimated_tokens=100) as permit:
+            assert permit.reserved_tokens == 100
+            permit.record_usage(300)
+        
+        async with limiter.acquire(step_type="per-entity", estimated_tokens=100) as permit:
+            # Estimates are scaled by the observed actual/estimated ratio
+            assert permit.reserved_tokens == 300
+        
+        async with limiter.acquire(step_type="per-entity") as permit:
+            # Without an estimate, the observed average is reserved
+            assert permit.reserved_tokens == 300
+        
+        stats = limiter.stats()
+        assert stats["tokens_actual_total"] == 300
+        assert stats["estimate_ratio"]["per-entity"] == 3.0
+    
+    async def test_metrics_text_exposes_wait_histogram(self):
+        """Test Prometheus-style metrics output."""
+        limiter = RateLimiter(
+            requests_per_minute=1000,
+            tokens_per_minute=100000,
+            max_concurrent=10
+        )
+        
+        async with limiter.acquire(step_type="per-entity"):
+            pass
+        
+        text = limiter.metrics_text()
+        assert "# TYPE nl2data_llm_rate_limit_wait_seconds histogram" in text
+        assert 'nl2data_llm_rate_limit_wait_seconds_count{step_type="per-entity"} 1' in text
+        assert 'nl2data_llm_requests_total{step_type="per-entity"} 1' in text
+
+    
+    async def test_adaptive_limit_backs_off_on_throttling(self):
+        """Test 429s shrink the step type's limit once per episode and healthy calls grow it."""
+        limiter = RateLimiter(
+            requests_per_minute=10000,
+            tokens_per_minute=1000000,
+            max_concurrent=10,
+            max_concurrency_per_step_type={"per-entity": 8},
+            adaptive_concurrency=True,
+            backoff_factor=0.5,
+        )
+        
+        async def throttled_call():
+            async with limiter.acquire(step_type="per-entity"):
+                await asyncio.sleep(0.01)
+                report_llm_error(ERROR_THROTTLED)
+        
+        # Simultaneous 429s are one congestion episode: a single halving
+        await asyncio.gather(*(throttled_call() for _ in range(4)))
+        assert limiter.concurrency_limits()["per-entity"] == 4
+        
+        # A full window of healthy calls adds one slot
+        for _ in range(4):
+            async with limiter.acquire(step_type="per-entity"):
+                pass
+        assert limiter.concurrency_limits()["per-entity"] == 5
+        
+        text = limiter.metrics_text()
+        assert 'nl2data_llm_concurrency_limit{step_type="per-entity"} 5' in text
+        assert 'nl2data_llm_errors_total{step_type="per-entity",kind="throttled"} 4' in text
+    
+    async def test_adaptive_limit_enforces_current_limit(self):
+        """Test waiters are admitted FIFO up to the current (resized) limit."""
+        limit = AdaptiveConcurrencyLimit("per-relation", initial_limit=2, max_limit=3)
+        active = 0
+        peak = 0
+        
+        async def call():
+            nonlocal active, peak
+            epoch = await limit.acquire()
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            limit.release()
+            limit.on_success(0.01, epoch)
+        
+        await asyncio.gather(*(call() for _ in range(6)))
+        # Two slots until the first window of healthy calls completes, then three (the cap)
+        assert peak == 3
+        assert limit.current_limit == 3
+        assert limit.in_flight == 0
 
+    
+    async def test_mixed_latencies_do_not_shrink_limit_by_default(self):
+        """Test short and long calls of one step type are not treated as congestion unless opted in."""
+        latencies = [0.2, 0.2, 0.2, 3.0, 0.2, 4.0, 0.2, 0.2, 5.0, 0.2] * 3
+        
+        def run(limit):
+            for latency in latencies:
+                limit.on_success(latency, limit._epoch)
+        
+        limit = AdaptiveConcurrencyLimit("per-entity", initial_limit=5, max_limit=10)
+        run(limit)
+        assert limit.decreases == 0
+        assert limit.current_limit > 5
+        
+        opted_in = AdaptiveConcurrencyLimit("per-entity", initial_limit=5, max_limit=10, latency_tolerance=2.0)
+        run(opted_in)
+        assert opted_in.decreases > 0
 
 class TestGetRateLimiter:
     """Test get_rate_limiter singleton."""
@@ -0,0 +1,112 @@
+"""Unit tests for multi-entity request packing."""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import List
+
+from pydantic import BaseModel
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from NL2DATA.utils.llm.request_packing import packed_output_model, plan_packs, run_packed
+
+
+class _EntityResult(BaseModel):
+    entity_name: str
+    columns: List[str]
+
+
+def _names(count):
+    return [f"Entity{i}" for i in range(count)]
+
+
+class TestPlanPacks:
+    """Test pack sizing from step registry token estimates."""
+
+    def test_packs_respect_max_items_and_order(self):
+        packs = plan_packs(_names(7), "P2_S2_INTRINSIC_ATTRIBUTES", token_budget=100000, max_items=3)
+        assert [len(p) for p in packs] == [3, 3, 1]
+        assert [name for pack in packs for name in pack] == _names(7)
+
+    def test_token_budget_limits_pack_size(self):
+        # avg_tokens_per_call=2500: 1875 shared + 625 per entity
+        packs = plan_packs(_names(6), "P2_S2_INTRINSIC_ATTRIBUTES", token_budget=3200, max_items=10)
+        assert [len(p) for p in packs] == [2, 2, 2]
+
+    def test_large_items_get_own_pack(self):
+        packs = plan_packs(
+            ["small", "huge", "small2"],
+            "P2_S2_INTRINSIC_ATTRIBUTES",
+            token_budget=5000,
+            max_items=10,
+            item_tokens=lambda name: 5000 if name == "huge" else 0,
+        )
+        assert packs == [["small"], ["huge"], ["small2"]]
+
+
+class TestPackedOutputModel:
+    """Test the list-shaped packed output schema."""
+
+    def test_model_is_cached_and_list_shaped(self):
+        model = packed_output_model(_EntityResult)
+        assert model is packed_output_model(_EntityResult)
+        parsed = model(entity_results=[{"entity_name": "A", "columns": ["id"]}])
+        assert parsed.entity_results[0].entity_name == "A"
+
+
+class TestRunPacked:
+    """Test packed execution with splitting and per-entity fallback."""
+
+    def _run(self, names, packs, call_pack, accept=None):
+        singles = []
+
+        async def call_single(name):
+            singles.append(name)
+            if name == "Broken":
+                raise ValueError("boom")
+            return f"single:{name}"
+
+        results = asyncio.run(
+            run_packed(names, packs, key=lambda n: n, call_pack=call_pack, call_single=call_single, accept=accept)
+        )
+        return results, singles
+
+    def test_packed_results_are_used(self):
+        packed_calls = []
+
+        async def call_pack(pack):
+            packed_calls.append(list(pack))
+            return {name: f"packed:{name}" for name in pack}
+
+        results, singles = self._run(_names(4), [_names(4)], call_pack)
+        assert results == [f"packed:{n}" for n in _names(4)]
+        assert packed_calls == [_names(4)] and singles == []
+
+    def test_failed_pack_is_split_down_to_single_calls(self):
+        async def call_pack(pack):
+            if len(pack) > 2:
+                raise RuntimeError("context length exceeded")
+            return {name: f"packed:{name}" for name in pack}
+
+        results, singles = self._run(_names(4), [_names(4)], call_pack)
+        assert results == [f"packed:{n}" for n in _names(4)]
+        assert singles == []
+
+    def test_missing_and_rejected_entities_are_retried(self):
+        async def call_pack(pack):
+            # Drops the last entity; "Bad" comes back invalid
+            return {name: ("invalid" if name == "Bad" else f"packed:{name}") for name in pack[:-1]}
+
+        names = ["A", "Bad", "C"]
+        results, singles = self._run(names, [names], call_pack, accept=lambda n, r: r != "invalid")
+        assert results == ["packed:A", "single:Bad", "single:C"]
+        assert sorted(singles) == ["Bad", "C"]
+
+    def test_single_call_errors_are_returned(self):
+        async def call_pack(pack):
+            raise RuntimeError("invalid output")
+
+        results, _ = self._run(["A", "Broken"], [["A", "Broken"]], call_pack)
+        assert results[0] == "single:A"
+        assert isinstance(results[1], ValueError)
@@ -0,0 +1,73 @@
+"""Unit tests for the indexed schema view of pipeline state."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from NL2DATA.ir.schema_index import SchemaIndex, get_schema_index
+
+
+def _state():
+    return {
+        "nl_description": "test_schema_index",
+        "entities": [{"name": "Customer"}, {"name": "Order"}],
+        "attributes": {
+            "Customer": [{"name": "customer_id"}, {"name": "Email"}],
+            "Order": [{"name": "order_id"}, {"name": "customer_id"}],
+        },
+        "primary_keys": {"Customer": ["customer_id"], "Order": ["order_id"]},
+        "foreign_keys": [
+            {
+                "from_entity": "Order",
+                "to_entity": "Customer",
+                "from_attributes": ["customer_id"],
+                "to_attributes": ["customer_id"],
+            }
+        ],
+    }
+
+
+class TestSchemaIndex:
+    """Test SchemaIndex lookups."""
+
+    def test_lookups(self):
+        """Test entity, attribute, key and FK adjacency lookups."""
+        schema = get_schema_index(_state())
+
+        assert schema.entity_names == ["Customer", "Order"]
+        assert schema.entity_id("Order") == 1
+        assert schema.has_entity("customer", case_sensitive=False)
+        assert not schema.has_entity("customer")
+        assert schema.attribute_names("Customer") == ("customer_id", "Email")
+        assert schema.has_attribute("Customer", "email", case_sensitive=False)
+        assert not schema.has_attribute("Customer", "email")
+        assert schema.primary_key("Order") == ("order_id",)
+        assert [fk.from_entity for fk in schema.foreign_keys_to("Customer")] == ["Order"]
+        assert schema.foreign_keys_from("Customer") == []
+
+    def test_duplicate_entities(self):
+        """Test that repeated names (exact or up to case) are recorded."""
+        schema = SchemaIndex.build(entities=[{"name": "Customer"}, {"name": "customer"}, {"name": "Customer"}])
+
+        assert schema.duplicate_entity_names == ["customer", "Customer"]
+        assert schema.entity_names == ["Customer", "customer"]
+
+    def test_get_schema_index_tracks_state(self):
+        """Test that the index reflects the state it is given."""
+        state = _state()
+        assert get_schema_index(state).has_entity("Order")
+
+        state = {**state, "entities": [{"name": "Customer"}]}
+        assert not get_schema_index(state).has_entity("Order")
+
+    def test_get_schema_index_is_not_shared_between_runs(self):
+        """Test that states with the same description get independent indexes."""
+        first = {**_state(), "nl_description": "shop"}
+        second = {**_state(), "nl_description": "shop", "entities": [{"name": "Customer"}]}
+
+        first_index = get_schema_index(first)
+        second_index = get_schema_index(second)
+        assert first_index is not second_index
+        assert first_index.has_entity("Order")
+        assert not second_index.has_entity("Order")
@@ -0,0 +1,105 @@
+"""Unit tests for deterministic-first data type inference (Steps 5.2/5.4)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from NL2DATA.utils.data_types.type_assignment import DataTypeAssignmentOutput, AttributeTypeInfo
+from NL2DATA.utils.data_types.type_inference import (
+    TypeInferenceEngine,
+    collect_llm_attribute_types,
+    infer_type_from_naming_convention,
+)
+
+
+ATTRIBUTES = {
+    "Order": [
+        {"name": "order_id"},
+        {"name": "customer_id"},
+        {"name": "status"},
+        {"name": "unit_price"},
+        {"name": "quantity"},
+        {"name": "line_total"},
+        {"name": "priority", "type_hint": "integer"},
+        {"name": "shipping_notes"},
+        {"name": "vibe"},
+    ],
+}
+
+
+class TestTypeInferenceEngine:
+    """Test which attributes are resolved without the LLM."""
+
+    def test_naming_convention_is_strict(self):
+        """Test that only exact name tokens imply a type."""
+        assert infer_type_from_naming_convention("is_active")[0] == "BOOLEAN"
+        assert infer_type_from_naming_convention("created_at")[0] == "TIMESTAMP"
+        assert infer_type_from_naming_convention("unit_price")[:4] == ("DECIMAL", None, 12, 2)
+        # Substring matches are left to the LLM
+        assert infer_type_from_naming_convention("timezone") is None
+        assert infer_type_from_naming_convention("total_guests") is None
+
+    def test_partition(self):
+        """Test FK copy, derived, type_hint, naming and categorical rules; the rest is ambiguous."""
+        engine = TypeInferenceEngine(
+            ATTRIBUTES,
+            primary_keys={"Order": ["order_id"]},
+            known_types={"Customer.customer_id": {"type": "VARCHAR", "size": 12}},
+            fk_references={"Order.customer_id": "Customer.customer_id"},
+            derived_formulas={
+                "Order.line_total": {
+                    "formula": "unit_price * quantity",
+                    "dependencies": ["Order.unit_price", "Order.quantity"],
+                },
+            },
+            categorical_attributes={"Order": ["status"]},
+        )
+        resolved, ambiguous = engine.partition(
+            ("Order", name) for name in [
+                "order_id", "customer_id", "status", "unit_price", "quantity",
+                "line_total", "priority", "shipping_notes", "vibe",
+            ]
+        )
+
+        assert ambiguous == {"Order": ["vibe"]}
+        assert resolved["Order.order_id"]["type"] == "BIGINT"
+        assert resolved["Order.customer_id"]["size"] == 12
+        assert (resolved["Order.status"]["type"], resolved["Order.status"]["size"]) == ("VARCHAR", 50)
+        assert resolved["Order.priority"]["type"] == "BIGINT"
+        assert resolved["Order.shipping_notes"]["type"] == "TEXT"
+        # Inputs typed earlier in the same partition feed the formula
+        assert resolved["Order.line_total"]["type"] == "DECIMAL"
+
+    def test_derived_with_untyped_inputs_is_ambiguous(self):
+        """Test that a derived attribute waits until its inputs are typed."""
+        engine = TypeInferenceEngine(
+            {"Order": [{"name": "score"}]},
+            derived_formulas={"Order.score": {"formula": "a + b", "dependencies": ["Order.a", "Order.b"]}},
+        )
+        _, ambiguous = engine.partition([("Order", "score")])
+        assert ambiguous == {"Order": ["score"]}
+
+        engine.known_types.update({"Order.a": {"type": "INT"}, "Order.b": {"type": "INT"}})
+        assert engine.resolve("Order", "score")["type"] == "BIGINT"
+
+
+class TestCollectLLMAttributeTypes:
+    """Test mapping a batched LLM response back to attributes."""
+
+    def test_missing_and_miscased_keys(self):
+        """Test case-insensitive key matching and fallback for attributes the response omits."""
+        result = DataTypeAssignmentOutput(attribute_types={
+            "Vibe": AttributeTypeInfo(type="VARCHAR", size=30, reasoning="Short label"),
+        })
+        types = collect_llm_attribute_types(
+            result, "Order", [{"name": "vibe"}, {"name": "mood"}], primary_key=["order_id"],
+        )
+
+        assert types["vibe"]["size"] == 30
+        assert types["mood"]["reasoning"].startswith("Deterministic fallback")
+
+    def test_failed_call(self):
+        """Test that every attribute gets a fallback type when the call failed."""
+        types = collect_llm_attribute_types(None, "Order", [{"name": "created_at"}])
+        assert types["created_at"]["type"] == "TIMESTAMP"
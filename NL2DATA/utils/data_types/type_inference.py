@@ -0,0 +1,319 @@
+"""Deterministic-first SQL type inference for Phase 5 type assignment.
+
+Most attributes do not need an LLM to be typed:
+- FK attributes copy the type of the referenced attribute
+- derived attributes whose inputs are already typed get the formula's result type
+- an explicit, recognized type_hint or a strict naming convention (`*_id`, `is_*`, `*_at`, `*_date`, ...) fixes the type
+- categorical attributes are short codes/labels (VARCHAR)
+
+`TypeInferenceEngine.partition()` resolves those and returns only the remaining
+ambiguous attributes, grouped by entity, so steps 5.2/5.4 can send them to the LLM
+in one batched call per entity.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from NL2DATA.phases.phase1.utils.data_extraction import (
+    extract_attribute_name,
+    extract_attribute_type_hint,
+)
+from NL2DATA.utils.logging import get_logger
+from NL2DATA.utils.data_types.type_assignment import (
+    DataTypeAssignmentOutput,
+    _deterministic_type_assignment,
+    _infer_type_from_name_and_hint,
+)
+from NL2DATA.utils.data_types.derived_type_inference import infer_derived_attribute_type
+
+logger = get_logger(__name__)
+
+SqlType = Tuple[str, Optional[int], Optional[int], Optional[int]]
+
+_DEFAULT_TYPE: SqlType = ("VARCHAR", 255, None, None)
+_CATEGORICAL_TYPE: SqlType = ("VARCHAR", 50, None, None)
+_CATEGORICAL_HINTS = ("categorical", "category", "enum")
+_PK_TYPES = {"INT", "BIGINT", "UUID", "VARCHAR"}
+
+# Last name token -> type (strict conventions only; anything looser is left to the LLM)
+_SUFFIX_TYPES: Dict[str, SqlType] = {
+    "id": ("BIGINT", None, None, None),
+    "flag": ("BOOLEAN", None, None, None),
+    "enabled": ("BOOLEAN", None, None, None),
+    "at": ("TIMESTAMP", None, None, None),
+    "timestamp": ("TIMESTAMP", None, None, None),
+    "datetime": ("TIMESTAMP", None, None, None),
+    "date": ("DATE", None, None, None),
+    "price": ("DECIMAL", None, 12, 2),
+    "amount": ("DECIMAL", None, 12, 2),
+    "cost": ("DECIMAL", None, 12, 2),
+    "fee": ("DECIMAL", None, 12, 2),
+    "subtotal": ("DECIMAL", None, 12, 2),
+    "pct": ("DECIMAL", None, 6, 4),
+    "percent": ("DECIMAL", None, 6, 4),
+    "percentage": ("DECIMAL", None, 6, 4),
+    "count": ("INT", None, None, None),
+    "quantity": ("INT", None, None, None),
+    "qty": ("INT", None, None, None),
+    "email": ("VARCHAR", 255, None, None),
+    "url": ("VARCHAR", 500, None, None),
+    "description": ("TEXT", None, None, None),
+    "notes": ("TEXT", None, None, None),
+}
+# First name token -> type
+_PREFIX_TYPES: Dict[str, SqlType] = {
+    "is": ("BOOLEAN", None, None, None),
+    "has": ("BOOLEAN", None, None, None),
+    "num": ("INT", None, None, None),
+}
+
+
+def infer_type_from_naming_convention(attr_name: str) -> Optional[SqlType]:
+    """
+    Type implied by a strict snake_case naming convention.
+
+    Args:
+        attr_name: Attribute name
+
+    Returns:
+        (sql_type, size, precision, scale), or None if the name follows no convention
+    """
+    tokens = [t for t in (attr_name or "").strip().lower().split("_") if t]
+    if not tokens:
+        return None
+    if len(tokens) > 1 and tokens[0] in _PREFIX_TYPES:
+        return _PREFIX_TYPES[tokens[0]]
+    return _SUFFIX_TYPES.get(tokens[-1])
+
+
+def infer_type_from_type_hint(type_hint: Optional[str]) -> Optional[SqlType]:
+    """Type implied by an explicit type_hint, or None if the hint is missing or not recognized."""
+    if not (type_hint or "").strip():
+        return None
+    inferred = _infer_type_from_name_and_hint("", type_hint)
+    return None if inferred == _DEFAULT_TYPE else inferred
+
+
+def type_info_dict(sql_type: SqlType, reasoning: str) -> Dict[str, Any]:
+    """Type info dict (as stored in state["data_types"]) for a (sql_type, size, precision, scale) tuple."""
+    type_name, size, precision, scale = sql_type
+    return {
+        "type": type_name,
+        "size": size,
+        "precision": precision,
+        "scale": scale,
+        "reasoning": reasoning,
+    }
+
+
+def fallback_type_info(entity_name: str, attr: Any, primary_key: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Name/type_hint heuristic type for an attribute the LLM failed to type."""
+    attribute_name = extract_attribute_name(attr)
+    fallback_types = _deterministic_type_assignment(
+        entity_name=entity_name,
+        attributes=[attr],
+        primary_key=primary_key,
+    ).get("attribute_types", {})
+    if attribute_name in fallback_types:
+        return fallback_types[attribute_name]
+    return type_info_dict(_DEFAULT_TYPE, "Deterministic fallback: default VARCHAR(255)")
+
+
+def collect_llm_attribute_types(
+    result: Optional[DataTypeAssignmentOutput],
+    entity_name: str,
+    attrs: Sequence[Any],
+    primary_key: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Type info per attribute from a batched LLM response, with fallbacks for gaps.
+
+    Keys are matched exactly, then case-insensitively; a single-attribute request
+    accepts a single entry under a wrong key. Attributes the response does not
+    cover get `fallback_type_info`.
+
+    Args:
+        result: LLM output (None if the call failed)
+        entity_name: Entity name
+        attrs: Attribute items that were sent to the LLM
+        primary_key: Entity primary key
+
+    Returns:
+        Attribute name -> type info dict
+    """
+    returned = dict(result.attribute_types) if result is not None and result.attribute_types else {}
+    returned_folded = {key.lower(): value for key, value in returned.items()}
+    if len(attrs) == 1 and len(returned) == 1:
+        returned_folded.setdefault(extract_attribute_name(attrs[0]).lower(), next(iter(returned.values())))
+
+    types: Dict[str, Dict[str, Any]] = {}
+    for attr in attrs:
+        attribute_name = extract_attribute_name(attr)
+        type_info = returned.get(attribute_name) or returned_folded.get(attribute_name.lower())
+        if type_info is None:
+            logger.warning(
+                f"LLM did not return a type for {entity_name}.{attribute_name}, using deterministic fallback"
+            )
+            types[attribute_name] = fallback_type_info(entity_name, attr, primary_key)
+            continue
+        types[attribute_name] = {
+            "type": type_info.type,
+            "size": type_info.size,
+            "precision": type_info.precision,
+            "scale": type_info.scale,
+            "reasoning": type_info.reasoning,
+        }
+    return types
+
+
+class TypeInferenceEngine:
+    """
+    Resolves attribute types without the LLM where the schema already determines them.
+
+    Rules are tried in order: FK copy, derived formula over typed inputs, explicit
+    type_hint, naming convention, categorical. Attributes no rule covers are ambiguous.
+    """
+
+    def __init__(
+        self,
+        attributes: Mapping[str, Sequence[Any]],
+        primary_keys: Optional[Mapping[str, Sequence[str]]] = None,
+        known_types: Optional[Mapping[str, Dict[str, Any]]] = None,
+        fk_references: Optional[Mapping[str, str]] = None,
+        derived_formulas: Optional[Mapping[str, Dict[str, Any]]] = None,
+        categorical_attributes: Optional[Mapping[str, Iterable[Any]]] = None,
+    ):
+        """
+        Args:
+            attributes: Entity name -> attribute list
+            primary_keys: Entity name -> primary key attribute names
+            known_types: "Entity.attribute" -> type info of already typed attributes
+            fk_references: FK "Entity.attribute" -> referenced "Entity.attribute"
+            derived_formulas: "Entity.attribute" -> {"formula": ..., "dependencies": [...]}
+            categorical_attributes: Entity name -> categorical attribute names (or dicts with "name")
+        """
+        self._attributes: Dict[str, Dict[str, Any]] = {
+            entity_name: {extract_attribute_name(attr): attr for attr in attrs or []}
+            for entity_name, attrs in attributes.items()
+        }
+        self._primary_keys = primary_keys or {}
+        self.known_types: Dict[str, Dict[str, Any]] = dict(known_types or {})
+        self._fk_references = fk_references or {}
+        self._derived_formulas = derived_formulas or {}
+        self._categorical: Dict[str, set] = {
+            entity_name: {
+                item if isinstance(item, str) else extract_attribute_name(item)
+                for item in items or []
+            }
+            for entity_name, items in (categorical_attributes or {}).items()
+        }
+
+    def attribute(self, entity_name: str, attribute_name: str) -> Any:
+        """Attribute item by name (a bare {"name": ...} dict if it is not in the attributes)."""
+        attr = self._attributes.get(entity_name, {}).get(attribute_name)
+        return attr if attr is not None else {"name": attribute_name}
+
+    def primary_key(self, entity_name: str) -> List[str]:
+        return list(self._primary_keys.get(entity_name) or [])
+
+    def is_derived(self, entity_name: str, attribute_name: str) -> bool:
+        return bool(self._derived_formulas.get(f"{entity_name}.{attribute_name}"))
+
+    def derived_type(
+        self, entity_name: str, attribute_name: str, require_typed_inputs: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Result type of a derived attribute's formula.
+
+        Args:
+            entity_name: Entity name
+            attribute_name: Attribute name
+            require_typed_inputs: Return None unless every formula dependency is already typed
+
+        Returns:
+            Type info dict, or None if the attribute is not derived (or its inputs are untyped)
+        """
+        formula_info = self._derived_formulas.get(f"{entity_name}.{attribute_name}")
+        if not formula_info:
+            return None
+        dependencies = list(formula_info.get("dependencies") or [])
+        if require_typed_inputs and not all(dep in self.known_types for dep in dependencies):
+            return None
+        return infer_derived_attribute_type(
+            entity_name=entity_name,
+            attribute_name=attribute_name,
+            formula=formula_info.get("formula", ""),
+            dependencies=dependencies,
+            all_data_types=self.known_types,
+        )
+
+    def resolve(self, entity_name: str, attribute_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Type info for an attribute if a deterministic rule covers it.
+
+        Args:
+            entity_name: Entity name
+            attribute_name: Attribute name
+
+        Returns:
+            Type info dict, or None if the attribute is ambiguous
+        """
+        attr_key = f"{entity_name}.{attribute_name}"
+
+        ref_key = self._fk_references.get(attr_key)
+        if ref_key and ref_key in self.known_types:
+            return {**self.known_types[ref_key], "reasoning": f"Copied from referenced attribute {ref_key}"}
+
+        derived_type = self.derived_type(entity_name, attribute_name)
+        if derived_type is not None:
+            return derived_type
+
+        attr = self.attribute(entity_name, attribute_name)
+        type_hint = extract_attribute_type_hint(attr)
+        sql_type = infer_type_from_type_hint(type_hint)
+        if sql_type is not None:
+            reasoning = f"Deterministic: type_hint '{type_hint}'"
+        else:
+            sql_type = infer_type_from_naming_convention(attribute_name)
+            reasoning = f"Deterministic: naming convention of '{attribute_name}'"
+        if sql_type is None and (
+            attribute_name in self._categorical.get(entity_name, ())
+            or any(hint in (type_hint or "").lower() for hint in _CATEGORICAL_HINTS)
+        ):
+            sql_type = _CATEGORICAL_TYPE
+            reasoning = f"Deterministic: '{attribute_name}' is categorical"
+        if sql_type is None:
+            return None
+
+        if attribute_name in self.primary_key(entity_name) and sql_type[0] not in _PK_TYPES:
+            sql_type = ("BIGINT", None, None, None)
+            reasoning += " (primary key)"
+        return type_info_dict(sql_type, reasoning)
+
+    def partition(
+        self, attribute_pairs: Iterable[Tuple[str, str]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[str]]]:
+        """
+        Split attributes into deterministically resolved and ambiguous ones.
+
+        Attributes are resolved in the given order and resolved types become known,
+        so a derived attribute can build on one resolved earlier in the same call.
+
+        Args:
+            attribute_pairs: (entity_name, attribute_name) tuples
+
+        Returns:
+            ("Entity.attribute" -> type info, entity name -> ambiguous attribute names)
+        """
+        resolved: Dict[str, Dict[str, Any]] = {}
+        ambiguous: Dict[str, List[str]] = {}
+        for entity_name, attribute_name in attribute_pairs:
+            type_info = self.resolve(entity_name, attribute_name)
+            if type_info is None:
+                ambiguous.setdefault(entity_name, []).append(attribute_name)
+                continue
+            attr_key = f"{entity_name}.{attribute_name}"
+            resolved[attr_key] = type_info
+            self.known_types[attr_key] = type_info
+        return resolved, ambiguous
@@ -7,6 +7,10 @@ This package provides:
 - A validator (deterministic) - semantic analysis
 - Pydantic models for structured intermediate results
 - Complete validation pipeline
+- Bounded LRU caches of parse trees and validation results
+- A vectorized NumPy evaluator (compile once, evaluate whole column batches;
+  relational functions run as hash joins over the referenced tables)
+- A SQL compiler (SQLite/PostgreSQL expressions, generated columns, CHECK, UPDATE)
 
 Architecture:
 - Lexer: tokenize_dsl() - converts DSL string → tokens
@@ -33,6 +37,16 @@ from .models import (
     DSLKind,
 )
 from .pipeline import validate_dsl_pipeline
+from .cache import clear_dsl_caches, dsl_cache_stats, schema_fingerprint
+from .evaluator import DSLEvaluationError, CompiledExpression, compile_dsl_expression, evaluate_dsl_expression
+from .sql_compiler import (
+    DSLSQLCompilationError,
+    SQLExpression,
+    compile_dsl_to_sql,
+    generated_column_sql,
+    check_constraint_sql,
+    update_sql,
+)
 from .errors import LexicalError, SyntaxError, SemanticErrorDetail, create_lexical_error, create_syntax_error
 
 __all__ = [
@@ -59,6 +73,22 @@ __all__ = [
     "DSLKind",  # DSL kind enum (CONSTRAINT, DERIVED, DISTRIBUTION)
     # Pipeline function
     "validate_dsl_pipeline",
+    # Parse/validation caches
+    "clear_dsl_caches",
+    "dsl_cache_stats",
+    "schema_fingerprint",
+    # Vectorized evaluation
+    "DSLEvaluationError",
+    "CompiledExpression",
+    "compile_dsl_expression",
+    "evaluate_dsl_expression",
+    # SQL compilation
+    "DSLSQLCompilationError",
+    "SQLExpression",
+    "compile_dsl_to_sql",
+    "generated_column_sql",
+    "check_constraint_sql",
+    "update_sql",
     # Error classes
     "LexicalError",
     "SyntaxError",
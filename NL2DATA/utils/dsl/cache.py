@@ -0,0 +1,190 @@
+"""Bounded in-memory LRU caches for DSL parsing and validation.
+
+Agent loops revalidate the same formula many times: Steps 2.4, 2.9 and 8.x and
+the `validate_dsl_expression` tool all run the validator, and retries resubmit
+unchanged expressions. Two process-wide caches make repeats cheap:
+
+- `PARSE_CACHE`: parse trees (or the parse error) keyed by
+  (expression, grammar profile), see `parse_dsl_cached`;
+- `VALIDATION_CACHE`: validation results keyed by expression, grammar, options
+  and a fingerprint of the `DSLSchemaContext`, see `memoize_validation`.
+
+Cached parse trees are shared between callers and must be treated as read-only.
+Cached validation results are copied on every hit.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import threading
+
+from lark import Tree
+
+from .grammar_profile import DSLGrammarProfile
+from .schema_context import DSLSchemaContext
+
+DEFAULT_MAX_ENTRIES = 1024
+
+_MISSING = object()
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class DSLCache:
+    """Thread-safe LRU mapping with hit/miss counters."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum number of entries (least recently used are evicted)
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value (marking it recently used), or `default` on miss."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting least recently used entries if over budget."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+PARSE_CACHE = DSLCache()
+VALIDATION_CACHE = DSLCache()
+
+
+def schema_fingerprint(schema: Optional[DSLSchemaContext]) -> Optional[str]:
+    """
+    Stable digest of a schema context (tables, columns and column types).
+
+    Returns:
+        SHA-256 hex digest, or None when no schema is given
+    """
+    if schema is None:
+        return None
+    material = {
+        table: sorted((str(column), str(dsl_type)) for column, dsl_type in table_schema.columns.items())
+        for table, table_schema in schema.tables.items()
+    }
+    raw = json.dumps(material, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def parse_dsl_cached(dsl: str, profile: Optional[DSLGrammarProfile] = None) -> Tree:
+    """
+    Parse an expression (tokenize + parse), reusing the tree of an earlier identical call.
+
+    Args:
+        dsl: DSL expression string
+        profile: Optional grammar profile
+
+    Returns:
+        Lark parse tree (shared; do not mutate)
+
+    Raises:
+        DSLParseError / DSLLexerError: As `parse_dsl_expression` (failures are cached too)
+    """
+    from .parser import parse_dsl_expression
+
+    key = (dsl, profile)
+    cached = PARSE_CACHE.get(key, _MISSING)
+    if cached is _MISSING:
+        try:
+            cached = parse_dsl_expression(dsl, profile=profile)
+        except Exception as e:
+            cached = e
+        PARSE_CACHE.put(key, cached)
+    if isinstance(cached, Exception):
+        raise cached
+    return cached
+
+
+def _key_part(value: Any) -> Hashable:
+    if isinstance(value, DSLSchemaContext):
+        return ("schema", schema_fingerprint(value))
+    hash(value)
+    return value
+
+
+def memoize_validation(func: F) -> F:
+    """
+    Cache a validation function's results in `VALIDATION_CACHE`.
+
+    The key is the function and its bound arguments, with schema contexts replaced
+    by their fingerprint; a `tree` argument (a pre-parsed expression) is not part
+    of the key. Calls with unhashable arguments are not cached.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        try:
+            key = (func.__qualname__,) + tuple(
+                (name, _key_part(value)) for name, value in bound.arguments.items() if name != "tree"
+            )
+        except TypeError:
+            return func(*args, **kwargs)
+        result = VALIDATION_CACHE.get(key, _MISSING)
+        if result is _MISSING:
+            result = func(*args, **kwargs)
+            VALIDATION_CACHE.put(key, result)
+        return copy.deepcopy(result)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def clear_dsl_caches() -> None:
+    """Drop all cached parse trees and validation results."""
+    PARSE_CACHE.clear()
+    VALIDATION_CACHE.clear()
+
+
+def dsl_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Counters of the parse and validation caches."""
+    return {"parse": PARSE_CACHE.stats(), "validation": VALIDATION_CACHE.stats()}
@@ -0,0 +1,1269 @@
+"""Vectorized NumPy evaluator for NL2DATA DSL expressions.
+
+`compile_dsl_expression` parses an expression once and compiles the tree into a
+plan of closures over column arrays. Evaluating the plan computes a whole batch
+of rows with NumPy operations instead of walking the tree once per row:
+
+    expr = compile_dsl_expression("CASE WHEN qty > 10 THEN price * 0.9 ELSE price END")
+    discounted = expr.evaluate({"qty": qty, "price": price})
+
+NULL handling follows SQL. Every intermediate value carries a null mask;
+arithmetic, comparisons and functions propagate NULL, AND/OR/NOT use
+three-valued logic and CASE/IF treat a NULL condition as false. In results, NULL
+rows hold NaN (floats), NaT (datetimes) or None (other types). In input columns,
+None, NaN and NaT are read as NULL.
+
+Supported: literals, column identifiers, arithmetic, comparisons (including
+LIKE, IN, BETWEEN and IS [NOT] NULL), boolean logic, CASE/IF, the string,
+numeric, cast and datetime functions of the function registry, and distribution
+calls (sampled with the caller's generator). Relational functions (EXISTS,
+LOOKUP, COUNT_WHERE, SUM_WHERE, ..., IN_RANGE) read other tables passed as
+`tables`; they are executed with hash-join indexes (see relational_executor.py).
+Aggregates, window functions and scalar subqueries raise `DSLEvaluationError`.
+
+Handlers are looked up by tree node name (`_NODE_COMPILERS`) and function name
+(`_FUNCTIONS`), so further constructs plug in without touching the dispatcher.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
+import datetime as _dt
+import re
+
+import numpy as np
+from lark import Token, Tree
+
+from .parser import parse_dsl_expression
+from .function_registry import get_distribution_registry
+
+# A value (array or 0-d constant) and its null mask (None: no NULLs)
+Vec = Tuple[np.ndarray, Optional[np.ndarray]]
+RandomSource = Union[None, int, np.random.Generator]
+
+
+class DSLEvaluationError(ValueError):
+    """Raised when an expression cannot be compiled or evaluated."""
+
+
+@dataclass
+class _Context:
+    """Inputs of one evaluation."""
+    columns: Mapping[str, Any]
+    size: int
+    rng: Optional[np.random.Generator]
+    tables: Mapping[str, Mapping[str, Any]] = field(default_factory=dict)
+    # Relational indexes of the compiled expression (kept across evaluations)
+    indexes: Dict[Any, Any] = field(default_factory=dict)
+    _normalized: Dict[str, Vec] = field(default_factory=dict)
+
+    def column(self, name: str) -> Vec:
+        if name not in self._normalized:
+            key = name
+            if key not in self.columns:
+                # "Order.total" / "this.total" -> "total"
+                key = name.rsplit(".", 1)[-1]
+                if key not in self.columns:
+                    raise DSLEvaluationError(f"Unknown column: {name}")
+            values = np.asarray(self.columns[key])
+            if values.ndim != 1 or len(values) != self.size:
+                raise DSLEvaluationError(f"Column {name} has shape {values.shape}, expected ({self.size},)")
+            self._normalized[name] = _normalize(values)
+        return self._normalized[name]
+
+    def ref_column(self, name: str) -> Vec:
+        """Column of the table a relational function scans (see relational_executor.py)."""
+        raise DSLEvaluationError(f"Column {name} of a referenced table is used outside a relational function")
+
+    def table(self, name: str) -> Mapping[str, Any]:
+        if name not in self.tables:
+            matches = [t for t in self.tables if t.lower() == name.lower()]
+            if len(matches) != 1:
+                raise DSLEvaluationError(f"Unknown table: {name} (pass its columns in `tables`)")
+            name = matches[0]
+        return self.tables[name]
+
+    def generator(self) -> np.random.Generator:
+        if self.rng is None:
+            self.rng = np.random.default_rng()
+        return self.rng
+
+
+Plan = Callable[[_Context], Vec]
+
+
+# ----------------------------------------------------------------------
+# Value helpers
+# ----------------------------------------------------------------------
+
+_NULL_VALUE = np.asarray(None, dtype=object)
+
+
+def _const(value: Any) -> Vec:
+    return np.asarray(value), None
+
+
+def _null() -> Vec:
+    return _NULL_VALUE, np.asarray(True)
+
+
+def _is_null_literal(vec: Vec) -> bool:
+    return vec[0] is _NULL_VALUE
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _normalize(values: np.ndarray) -> Vec:
+    """Split an input column into typed values and a null mask."""
+    kind = values.dtype.kind
+    if kind == "f":
+        mask = np.isnan(values)
+    elif kind in "mM":
+        mask = np.isnat(values)
+    elif kind == "O":
+        mask = np.frompyfunc(_is_missing, 1, 1)(values).astype(bool)
+        present = values[~mask].tolist()
+        typed = np.array(present) if present else np.array([], dtype=object)
+        if typed.dtype.kind == "O" and present and all(isinstance(v, _dt.date) for v in present):
+            typed = typed.astype("datetime64[s]" if isinstance(present[0], _dt.datetime) else "datetime64[D]")
+        if typed.dtype.kind in "biufUM" and len(typed) == len(values):
+            values = typed
+        elif typed.dtype.kind in "biufUM":
+            filled = np.zeros(len(values), dtype=typed.dtype)
+            filled[~mask] = typed
+            values = filled
+    else:
+        return values, None
+    return values, (mask if mask.any() else None)
+
+
+def _or_masks(*masks: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    present = [m for m in masks if m is not None]
+    if not present:
+        return None
+    result = present[0]
+    for mask in present[1:]:
+        result = result | mask
+    return result
+
+
+def _is_text(values: np.ndarray) -> bool:
+    return values.dtype.kind in "UO"
+
+
+def _as_text(values: np.ndarray) -> np.ndarray:
+    if values.dtype.kind == "U":
+        return values
+    if values.dtype.kind == "O":
+        return values.astype(str)
+    if values.dtype.kind == "M":
+        return np.datetime_as_string(values)
+    if values.dtype.kind == "b":
+        return np.where(values, "true", "false")
+    return values.astype(str)
+
+
+def _as_datetime(values: np.ndarray) -> np.ndarray:
+    if values.dtype.kind == "M":
+        return values
+    try:
+        return values.astype("datetime64")
+    except (TypeError, ValueError) as e:
+        raise DSLEvaluationError(f"Cannot convert {values.dtype} values to datetime: {e}") from e
+
+
+def _as_bool(vec: Vec) -> Vec:
+    values, mask = vec
+    if values.dtype.kind == "b":
+        return values, mask
+    if values.dtype.kind in "iuf":
+        return values != 0, mask
+    if _is_null_literal(vec):
+        return np.asarray(False), mask
+    raise DSLEvaluationError(f"Expected a boolean condition, got {values.dtype} values")
+
+
+def _truthy(vec: Vec) -> np.ndarray:
+    """Condition as a plain boolean array (NULL -> false)."""
+    values, mask = _as_bool(vec)
+    return values if mask is None else values & ~mask
+
+
+def _common_dtype(vecs: Sequence[Vec]) -> np.dtype:
+    dtypes = [v.dtype for v, _ in vecs if v is not _NULL_VALUE]
+    if not dtypes:
+        return np.dtype(object)
+    try:
+        return np.result_type(*dtypes)
+    except TypeError:
+        if all(d.kind in "UM" for d in dtypes):
+            return np.result_type(*[d for d in dtypes if d.kind == "M"])
+        return np.dtype(object)
+
+
+def _cast(vec: Vec, dtype: np.dtype) -> np.ndarray:
+    values, _ = vec
+    if values is _NULL_VALUE:
+        return np.zeros((), dtype=dtype) if dtype.kind != "O" else values
+    if dtype.kind == "M" and values.dtype.kind != "M":
+        return _as_datetime(values).astype(dtype)
+    return values.astype(dtype, copy=False)
+
+
+def _unify(vecs: Sequence[Vec]) -> List[Vec]:
+    """Cast values to one dtype (CASE branches, COALESCE arguments)."""
+    dtype = _common_dtype(vecs)
+    return [(_cast(vec, dtype), vec[1]) for vec in vecs]
+
+
+def _align(left: Vec, right: Vec) -> Tuple[np.ndarray, np.ndarray]:
+    """Operand values for a comparison, coercing text to datetimes when compared with datetimes."""
+    a, b = left[0], right[0]
+    if a.dtype.kind == "M" and b.dtype.kind != "M":
+        b = _as_datetime(b)
+    elif b.dtype.kind == "M" and a.dtype.kind != "M":
+        a = _as_datetime(a)
+    return a, b
+
+
+def _finalize(vec: Vec, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Broadcast to `size` rows and fill NULL rows (NaN / NaT / None)."""
+    values, mask = vec
+    values = np.array(np.broadcast_to(values, (size,)))
+    mask = np.zeros(size, dtype=bool) if mask is None else np.array(np.broadcast_to(mask, (size,)))
+    if mask.any():
+        if values.dtype.kind == "f":
+            values[mask] = np.nan
+        elif values.dtype.kind in "mM":
+            values[mask] = np.datetime64("NaT")
+        else:
+            values = values.astype(object)
+            values[mask] = None
+    return values, mask
+
+
+def _map_values(func: Callable[..., Any], *arrays: np.ndarray) -> np.ndarray:
+    """Apply a Python function element-wise (over distinct values for single-array calls)."""
+    ufunc = np.frompyfunc(func, len(arrays), 1)
+    if len(arrays) == 1 and arrays[0].ndim == 1 and arrays[0].dtype.kind in "UO":
+        try:
+            uniques, inverse = np.unique(arrays[0], return_inverse=True)
+        except TypeError:
+            uniques = None
+        if uniques is not None and len(uniques) < len(arrays[0]):
+            return _typed(ufunc(uniques))[inverse]
+    return _typed(ufunc(*arrays))
+
+
+def _typed(values: Any) -> np.ndarray:
+    """Infer a concrete dtype for the object output of a Python-level map."""
+    values = np.asarray(values)
+    if values.dtype.kind != "O" or values.size == 0:
+        return values
+    items = values.ravel().tolist()
+    if any(v is None for v in items):
+        return values
+    typed = np.array(items)
+    return typed.reshape(values.shape) if typed.dtype.kind in "biufU" else values
+
+
+def _null_where_none(values: np.ndarray, mask: Optional[np.ndarray]) -> Vec:
+    """Turn None results of a Python-level map into NULLs."""
+    if values.dtype.kind != "O":
+        return values, mask
+    none = np.frompyfunc(lambda v: v is None, 1, 1)(values).astype(bool)
+    if not none.any():
+        return _typed(values), mask
+    present = values[~none].tolist() if values.ndim else []
+    typed = np.array(present)
+    if typed.dtype.kind in "biufU":
+        filled = np.zeros(values.shape, dtype=typed.dtype)
+        filled[~none] = typed
+        values = filled
+    return values, _or_masks(mask, none)
+
+
+# ----------------------------------------------------------------------
+# Tree helpers
+# ----------------------------------------------------------------------
+
+def _subtrees(node: Tree) -> List[Tree]:
+    return [c for c in node.children if isinstance(c, Tree)]
+
+
+def _tokens(node: Tree) -> List[str]:
+    return [c.value.upper() for c in node.children if isinstance(c, Token)]
+
+
+def _identifier_name(node: Tree) -> str:
+    return ".".join(str(c) for c in node.children)
+
+
+def _call_parts(node: Tree) -> Tuple[str, List[Tree]]:
+    """Function name and argument trees of a func_call / dist_call."""
+    trees = _subtrees(node)
+    name = _identifier_name(trees[0]).upper()
+    args = _subtrees(trees[1]) if len(trees) > 1 and trees[1].data == "arg_list" else []
+    return name, args
+
+
+def _literal_text(node: Tree, what: str) -> str:
+    """Text of a string literal or bare identifier (e.g. a DATEADD unit)."""
+    if node.data == "string":
+        return _string_value(node.children[0])
+    if node.data == "identifier":
+        return _identifier_name(node)
+    raise DSLEvaluationError(f"{what} must be a literal")
+
+
+def _string_value(token: Token) -> str:
+    return re.sub(r"\\(.)", r"\1", str(token)[1:-1])
+
+
+# ----------------------------------------------------------------------
+# Compiler
+# ----------------------------------------------------------------------
+
+class _Compiler:
+    """Compile a parse tree into a plan; records referenced columns and tables."""
+
+    def __init__(self, table: Optional[str] = None) -> None:
+        self.table = table
+        self.columns: Set[str] = set()
+        self.tables: Set[str] = set()
+        # Tables scanned by the enclosing relational functions (innermost last)
+        self.scopes: List[str] = []
+        # Sides ("anchor" / "ref") referenced by the subtree being compiled
+        self.sides: Set[str] = set()
+
+    def compile_side(self, node: Any) -> Tuple[Plan, Set[str]]:
+        """Compile a subtree and return the sides it references."""
+        outer, self.sides = self.sides, set()
+        try:
+            plan = self.compile(node)
+            return plan, self.sides
+        finally:
+            self.sides = outer | self.sides
+
+    def compile(self, node: Any) -> Plan:
+        if isinstance(node, Token):
+            raise DSLEvaluationError(f"Unsupported token in expression: {node!r}")
+        handler = _NODE_COMPILERS.get(node.data)
+        if handler is None:
+            raise DSLEvaluationError(f"Unsupported DSL construct for vectorized evaluation: {node.data}")
+        return handler(self, node)
+
+
+NodeCompiler = Callable[[_Compiler, Tree], Plan]
+FunctionCompiler = Callable[[_Compiler, str, List[Tree]], Plan]
+
+
+def _compile_number(compiler: _Compiler, node: Tree) -> Plan:
+    text = str(node.children[0])
+    value = _const(int(text) if re.fullmatch(r"[+-]?\d+", text) else float(text))
+    return lambda ctx: value
+
+
+def _compile_string(compiler: _Compiler, node: Tree) -> Plan:
+    value = _const(_string_value(node.children[0]))
+    return lambda ctx: value
+
+
+def _compile_bool(value: bool) -> NodeCompiler:
+    def _compile(compiler: _Compiler, node: Tree) -> Plan:
+        vec = _const(value)
+        return lambda ctx: vec
+    return _compile
+
+
+def _compile_null(compiler: _Compiler, node: Tree) -> Plan:
+    return lambda ctx: _null()
+
+
+def _compile_identifier(compiler: _Compiler, node: Tree) -> Plan:
+    name = _identifier_name(node)
+    if compiler.scopes:
+        # Inside a relational function, bare and scope-qualified names are columns
+        # of the scanned table; "this." and other qualifiers refer to the outer row
+        qualifier, _, column = name.rpartition(".")
+        if not qualifier or qualifier.lower() == compiler.scopes[-1].lower():
+            compiler.sides.add("ref")
+            return lambda ctx: ctx.ref_column(column)
+    compiler.sides.add("anchor")
+    compiler.columns.add(name)
+    return lambda ctx: ctx.column(name)
+
+
+def _compile_group(compiler: _Compiler, node: Tree) -> Plan:
+    trees = _subtrees(node)
+    if len(trees) != 1:
+        raise DSLEvaluationError(f"Unsupported DSL construct for vectorized evaluation: {node.data}")
+    return compiler.compile(trees[0])
+
+
+def _arithmetic(op: str, left: Vec, right: Vec) -> Vec:
+    if _is_null_literal(left) or _is_null_literal(right):
+        return np.asarray(np.nan), np.asarray(True)
+    a, b = left[0], right[0]
+    mask = _or_masks(left[1], right[1])
+    if op == "+" and _is_text(a) and _is_text(b):
+        return np.char.add(_as_text(a), _as_text(b)), mask
+    if a.dtype.kind == "b":
+        a = a.astype(np.int64)
+    if b.dtype.kind == "b":
+        b = b.astype(np.int64)
+    try:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if op == "+":
+                return np.add(a, b), mask
+            if op == "-":
+                return np.subtract(a, b), mask
+            if op == "*":
+                return np.multiply(a, b), mask
+            zero = b == 0
+            if op == "/":
+                result = np.true_divide(a, np.where(zero, 1, b))
+            else:
+                result = np.fmod(a, np.where(zero, 1, b))
+    except TypeError as e:
+        raise DSLEvaluationError(f"Cannot apply '{op}' to {a.dtype} and {b.dtype} values: {e}") from e
+    # Division by zero is NULL (as in SQL engines that do not raise)
+    return result, (_or_masks(mask, zero) if np.any(zero) else mask)
+
+
+def _compile_chain(compiler: _Compiler, node: Tree) -> Plan:
+    """sum_expr / term: operands interleaved with operator tokens."""
+    operands = [compiler.compile(c) for c in node.children if isinstance(c, Tree)]
+    ops = [str(c) for c in node.children if isinstance(c, Token)]
+
+    def plan(ctx: _Context) -> Vec:
+        result = operands[0](ctx)
+        for op, operand in zip(ops, operands[1:]):
+            result = _arithmetic(op, result, operand(ctx))
+        return result
+    return plan
+
+
+def _compile_unary(compiler: _Compiler, node: Tree) -> Plan:
+    op = str(node.children[0])
+    operand = compiler.compile(node.children[1])
+
+    def plan(ctx: _Context) -> Vec:
+        values, mask = operand(ctx)
+        if op == "-":
+            if values.dtype.kind == "b":
+                values = values.astype(np.int64)
+            return np.negative(values), mask
+        return values, mask
+    return plan
+
+
+@lru_cache(maxsize=256)
+def _like_regex(pattern: str) -> "re.Pattern[str]":
+    parts = [".*" if ch == "%" else "." if ch == "_" else re.escape(ch) for ch in pattern]
+    return re.compile("".join(parts), re.DOTALL)
+
+
+def _compare(op: str, left: Vec, right: Vec) -> Vec:
+    if _is_null_literal(left) or _is_null_literal(right):
+        return np.asarray(False), np.asarray(True)
+    mask = _or_masks(left[1], right[1])
+    if op == "LIKE":
+        text = _as_text(left[0])
+        patterns = _as_text(right[0])
+        if patterns.ndim == 0:
+            regex = _like_regex(str(patterns))
+            return _map_values(lambda s: regex.fullmatch(s) is not None, text).astype(bool), mask
+        matched = _map_values(lambda s, p: _like_regex(p).fullmatch(s) is not None, text, patterns)
+        return matched.astype(bool), mask
+    a, b = _align(left, right)
+    try:
+        if op == "=":
+            result = a == b
+        elif op in ("!=", "<>"):
+            result = a != b
+        elif op == "<":
+            result = a < b
+        elif op == "<=":
+            result = a <= b
+        elif op == ">":
+            result = a > b
+        else:
+            result = a >= b
+    except TypeError as e:
+        raise DSLEvaluationError(f"Cannot compare {a.dtype} and {b.dtype} values with '{op}': {e}") from e
+    return np.asarray(result, dtype=bool), mask
+
+
+def _and(left: Vec, right: Vec) -> Vec:
+    a, a_null = _as_bool(left)
+    b, b_null = _as_bool(right)
+    a_false = ~a if a_null is None else ~a & ~a_null
+    b_false = ~b if b_null is None else ~b & ~b_null
+    false = a_false | b_false
+    null = _or_masks(a_null, b_null)
+    return ~false, (None if null is None else null & ~false)
+
+
+def _or(left: Vec, right: Vec) -> Vec:
+    a, a_null = _as_bool(left)
+    b, b_null = _as_bool(right)
+    a_true = a if a_null is None else a & ~a_null
+    b_true = b if b_null is None else b & ~b_null
+    true = a_true | b_true
+    null = _or_masks(a_null, b_null)
+    return true, (None if null is None else null & ~true)
+
+
+def _compile_comparison(compiler: _Compiler, node: Tree) -> Plan:
+    """comparison: operand followed by cmp_tail nodes (chained with AND)."""
+    trees = _subtrees(node)
+    first = compiler.compile(trees[0])
+    tails: List[Tuple[str, List[Plan]]] = []
+    for tail in trees[1:]:
+        keywords = _tokens(tail)
+        operands = _subtrees(tail)
+        if keywords[0] == "IN":
+            items = _subtrees(operands[0])
+            items = _subtrees(items[0]) if items else []
+            tails.append(("IN", [compiler.compile(item) for item in items]))
+        elif keywords[0] == "BETWEEN":
+            tails.append(("BETWEEN", [compiler.compile(o) for o in operands]))
+        elif keywords[0] == "IS":
+            tails.append(("IS NOT NULL" if "NOT" in keywords else "IS NULL", []))
+        else:
+            tails.append((keywords[0], [compiler.compile(operands[0])]))
+
+    def plan(ctx: _Context) -> Vec:
+        left = first(ctx)
+        result: Optional[Vec] = None
+        for op, plans in tails:
+            right = None
+            if op in ("IS NULL", "IS NOT NULL"):
+                null = np.asarray(False) if left[1] is None else left[1]
+                current: Vec = (null if op == "IS NULL" else ~null, None)
+            elif op == "IN":
+                current = _in_list(left, [p(ctx) for p in plans])
+            elif op == "BETWEEN":
+                low, high = plans[0](ctx), plans[1](ctx)
+                current = _and(_compare(">=", left, low), _compare("<=", left, high))
+            else:
+                right = plans[0](ctx)
+                current = _compare(op, left, right)
+            result = current if result is None else _and(result, current)
+            if right is not None:
+                left = right
+        return result
+    return plan
+
+
+def _in_list(left: Vec, items: List[Vec]) -> Vec:
+    items = [item for item in items if not _is_null_literal(item)]
+    if not items:
+        return np.asarray(False), left[1]
+    if all(item[0].ndim == 0 and item[1] is None for item in items) and left[0].dtype.kind != "M":
+        choices = np.array([item[0].item() for item in items])
+        try:
+            return np.isin(left[0], choices), left[1]
+        except TypeError:
+            pass
+    result = _compare("=", left, items[0])
+    for item in items[1:]:
+        result = _or(result, _compare("=", left, item))
+    return result
+
+
+def _compile_logic(combine: Callable[[Vec, Vec], Vec]) -> NodeCompiler:
+    def _compile(compiler: _Compiler, node: Tree) -> Plan:
+        operands = [compiler.compile(c) for c in _subtrees(node)]
+
+        def plan(ctx: _Context) -> Vec:
+            result = operands[0](ctx)
+            for operand in operands[1:]:
+                result = combine(result, operand(ctx))
+            return result
+        return plan
+    return _compile
+
+
+def _compile_not(compiler: _Compiler, node: Tree) -> Plan:
+    operand = compiler.compile(_subtrees(node)[0])
+
+    def plan(ctx: _Context) -> Vec:
+        values, mask = _as_bool(operand(ctx))
+        return ~values, mask
+    return plan
+
+
+def _select(conditions: List[np.ndarray], choices: List[Vec], default: Vec) -> Vec:
+    unified = _unify(choices + [default])
+    arrays = np.broadcast_arrays(*conditions, *[v for v, _ in unified])
+    conditions, values = list(arrays[:len(conditions)]), arrays[len(conditions):]
+    result = np.select(conditions, values[:-1], default=values[-1])
+    masks = [np.asarray(False) if m is None else m for _, m in unified]
+    if not any(m.any() for m in masks):
+        return result, None
+    mask_arrays = np.broadcast_arrays(*conditions, *masks)[len(conditions):]
+    return result, np.select(conditions, mask_arrays[:-1], default=mask_arrays[-1])
+
+
+def _compile_case(compiler: _Compiler, node: Tree) -> Plan:
+    branches = []
+    default: Plan = lambda ctx: _null()
+    for child in _subtrees(node):
+        if child.data == "when_clause":
+            condition, value = _subtrees(child)
+            branches.append((compiler.compile(condition), compiler.compile(value)))
+        else:
+            default = compiler.compile(child)
+
+    def plan(ctx: _Context) -> Vec:
+        conditions = [_truthy(condition(ctx)) for condition, _ in branches]
+        return _select(conditions, [value(ctx) for _, value in branches], default(ctx))
+    return plan
+
+
+def _compile_if(compiler: _Compiler, node: Tree) -> Plan:
+    condition, then, otherwise = (compiler.compile(c) for c in _subtrees(node))
+    return lambda ctx: _select([_truthy(condition(ctx))], [then(ctx)], otherwise(ctx))
+
+
+def _compile_func_call(compiler: _Compiler, node: Tree) -> Plan:
+    name, args = _call_parts(node)
+    return _compile_function(compiler, name, args)
+
+
+def _compile_aggregate_call(compiler: _Compiler, node: Tree) -> Plan:
+    """Single-argument calls (LOWER(x), ABS(x)) parse as aggregate_func_call."""
+    trees = _subtrees(node)
+    name = _identifier_name(trees[0]).upper()
+    if name in _AGGREGATES or len(trees) != 2 or "DISTINCT" in _tokens(node) or "OVER" in _tokens(node):
+        raise DSLEvaluationError(f"Aggregate/window function {name} cannot be evaluated row-wise")
+    return _compile_function(compiler, name, trees[1:])
+
+
+def _compile_distribution_expr(compiler: _Compiler, node: Tree) -> Plan:
+    """`target ~ DIST(...)`: sample the distribution (the target is the column being defined)."""
+    name, args = _call_parts(_subtrees(node)[-1])
+    return _compile_function(compiler, name, args)
+
+
+def _compile_function(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+    handler = _FUNCTIONS.get(name)
+    if handler is None:
+        raise DSLEvaluationError(f"Function {name} is not supported by the vectorized evaluator")
+    return handler(compiler, name, args)
+
+
+def _unsupported(compiler: _Compiler, node: Tree) -> Plan:
+    raise DSLEvaluationError(f"{node.data} cannot be evaluated row-wise over column arrays")
+
+
+# ----------------------------------------------------------------------
+# Functions
+# ----------------------------------------------------------------------
+
+_AGGREGATES = {"COUNT", "SUM", "AVG", "MIN", "MAX"}
+
+
+def _arity(name: str, args: List[Tree], low: int, high: int) -> None:
+    if not low <= len(args) <= high:
+        expected = str(low) if low == high else f"{low}-{high}"
+        raise DSLEvaluationError(f"{name} expects {expected} arguments, got {len(args)}")
+
+
+def _unary_function(low: int, func: Callable[[np.ndarray], np.ndarray]) -> FunctionCompiler:
+    """Function of one (nullable) value argument."""
+    def _compile(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+        _arity(name, args, low, 1)
+        operand = compiler.compile(args[0])
+
+        def plan(ctx: _Context) -> Vec:
+            vec = operand(ctx)
+            if _is_null_literal(vec):
+                return vec
+            return func(vec[0]), vec[1]
+        return plan
+    return _compile
+
+
+def _text_function(func: Callable[..., np.ndarray], arity: Tuple[int, int]) -> FunctionCompiler:
+    """String function: text first argument, remaining arguments passed as arrays."""
+    def _compile(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+        _arity(name, args, *arity)
+        operands = [compiler.compile(a) for a in args]
+
+        def plan(ctx: _Context) -> Vec:
+            vecs = [operand(ctx) for operand in operands]
+            if any(_is_null_literal(v) for v in vecs):
+                return _null()
+            values = [_as_text(vecs[0][0])] + [v for v, _ in vecs[1:]]
+            return _null_where_none(np.asarray(func(*values)), _or_masks(*[m for _, m in vecs]))
+        return plan
+    return _compile
+
+
+def _replace(text: np.ndarray, old: np.ndarray, new: np.ndarray) -> np.ndarray:
+    old, new = _as_text(old), _as_text(new)
+    if old.ndim == 0 and new.ndim == 0:
+        return np.char.replace(text, str(old), str(new))
+    return _map_values(lambda s, o, n: s.replace(o, n), text, old, new)
+
+
+def _substr(text: np.ndarray, start: np.ndarray, length: Optional[np.ndarray] = None) -> np.ndarray:
+    def _one(s: str, begin: Any, count: Any = None) -> str:
+        # SQL positions are 1-based; a start below 1 shortens the result
+        begin = int(begin)
+        end = None if count is None else begin + int(count) - 1
+        begin = max(begin, 1)
+        return s[begin - 1:end] if end is None else s[begin - 1:max(end, begin - 1)]
+    if length is None:
+        return _map_values(_one, text, start)
+    return _map_values(_one, text, start, length)
+
+
+def _split_part(text: np.ndarray, delimiter: np.ndarray, index: np.ndarray) -> np.ndarray:
+    def _one(s: str, delim: str, position: Any) -> str:
+        parts = s.split(str(delim))
+        position = int(position)
+        return parts[position - 1] if 1 <= position <= len(parts) else ""
+    return _map_values(_one, text, _as_text(delimiter), index)
+
+
+def _regexp_extract(text: np.ndarray, pattern: np.ndarray, group: Optional[np.ndarray] = None) -> np.ndarray:
+    def _one(s: str, p: str, g: Any = 0) -> Optional[str]:
+        match = re.compile(p).search(s)
+        return None if match is None else match.group(int(g))
+    if group is None:
+        return _map_values(_one, text, _as_text(pattern))
+    return _map_values(_one, text, _as_text(pattern), group)
+
+
+def _regexp_replace(text: np.ndarray, pattern: np.ndarray, replacement: np.ndarray) -> np.ndarray:
+    pattern, replacement = _as_text(pattern), _as_text(replacement)
+    if pattern.ndim == 0 and replacement.ndim == 0:
+        regex, repl = re.compile(str(pattern)), str(replacement)
+        return _map_values(lambda s: regex.sub(repl, s), text)
+    return _map_values(lambda s, p, r: re.sub(p, r, s), text, pattern, replacement)
+
+
+def _compile_concat(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+    _arity(name, args, 1, 1_000_000)
+    operands = [compiler.compile(a) for a in args]
+
+    def plan(ctx: _Context) -> Vec:
+        result = np.asarray("")
+        for operand in operands:
+            values, mask = operand(ctx)
+            if values is _NULL_VALUE:
+                continue
+            text = _as_text(values)
+            if mask is not None:
+                # CONCAT skips NULL arguments
+                text = np.where(mask, "", text)
+            result = np.char.add(result, text)
+        return result, None
+    return plan
+
+
+def _compile_coalesce(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+    _arity(name, args, 1, 1_000_000)
+    operands = [compiler.compile(a) for a in args]
+
+    def plan(ctx: _Context) -> Vec:
+        vecs = _unify([operand(ctx) for operand in operands])
+        values, mask = vecs[0]
+        for next_values, next_mask in vecs[1:]:
+            if mask is None:
+                break
+            values = np.where(mask, next_values, values)
+            mask = None if next_mask is None else mask & next_mask
+        if values is _NULL_VALUE:
+            return _null()
+        return values, mask
+    return plan
+
+
+def _compile_nullif(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+    _arity(name, args, 2, 2)
+    first, second = (compiler.compile(a) for a in args)
+
+    def plan(ctx: _Context) -> Vec:
+        left = first(ctx)
+        equal, equal_null = _compare("=", left, second(ctx))
+        equal = equal if equal_null is None else equal & ~equal_null
+        return left[0], _or_masks(left[1], equal)
+    return plan
+
+
+def _round(values: np.ndarray, digits: Optional[np.ndarray] = None) -> np.ndarray:
+    if digits is None:
+        return np.round(values)
+    if digits.ndim != 0:
+        raise DSLEvaluationError("ROUND digits must be a constant")
+    return np.round(values, int(digits))
+
+
+def _compile_round(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+    _arity(name, args, 1, 2)
+    operands = [compiler.compile(a) for a in args]
+
+    def plan(ctx: _Context) -> Vec:
+        vecs = [operand(ctx) for operand in operands]
+        if any(_is_null_literal(v) for v in vecs):
+            return _null()
+        return _round(*[v for v, _ in vecs]), _or_masks(*[m for _, m in vecs])
+    return plan
+
+
+def _integral(func: Callable[[np.ndarray], np.ndarray]) -> Callable[[np.ndarray], np.ndarray]:
+    return lambda values: values if values.dtype.kind in "iub" else func(values)
+
+
+# CAST type names -> NumPy dtype
+_CAST_TYPES = {
+    "INT": "int64", "INTEGER": "int64", "BIGINT": "int64", "SMALLINT": "int64", "TINYINT": "int64",
+    "FLOAT": "float64", "DOUBLE": "float64", "REAL": "float64", "DECIMAL": "float64", "NUMERIC": "float64",
+    "TEXT": "str", "VARCHAR": "str", "CHAR": "str", "STRING": "str",
+    "BOOL": "bool", "BOOLEAN": "bool",
+    "DATE": "datetime64[D]", "TIMESTAMP": "datetime64[s]", "DATETIME": "datetime64[s]",
+}
+
+
+def _compile_cast(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+    _arity(name, args, 2, 2)
+    operand = compiler.compile(args[0])
+    type_name = _literal_text(args[1], "CAST type").strip().upper()
+    match = re.fullmatch(r"(\w+(?: PRECISION)?)\s*(?:\(\s*\d+\s*(?:,\s*(\d+)\s*)?\))?", type_name)
+    base = match.group(1).split()[0] if match else type_name
+    if base not in _CAST_TYPES:
+        raise DSLEvaluationError(f"Unsupported CAST type: {type_name}")
+    target = _CAST_TYPES[base]
+    scale = int(match.group(2)) if match and match.group(2) else None
+
+    def plan(ctx: _Context) -> Vec:
+        vec = operand(ctx)
+        if _is_null_literal(vec):
+            return vec
+        values, mask = vec
+        if mask is not None and target != "str":
+            # NULL rows may hold placeholders ('' for text) that do not convert
+            values = np.where(mask, np.zeros((), dtype=values.dtype) if values.dtype.kind != "U" else "0", values)
+        try:
+            if target == "str":
+                return _as_text(values), mask
+            if target.startswith("datetime64"):
+                return _as_datetime(values).astype(target), mask
+            if target == "int64" and values.dtype.kind in "UO":
+                return np.trunc(values.astype(np.float64)).astype(np.int64), mask
+            if target == "int64" and values.dtype.kind == "f":
+                return np.trunc(values).astype(np.int64), mask
+            if target == "bool" and values.dtype.kind in "UO":
+                return np.isin(np.char.lower(_as_text(values)), ["true", "t", "1", "yes", "y"]), mask
+            result = values.astype(target)
+            return (np.round(result, scale) if scale is not None else result), mask
+        except (TypeError, ValueError) as e:
+            raise DSLEvaluationError(f"Cannot CAST {values.dtype} values to {type_name}: {e}") from e
+    return plan
+
+
+# Datetime units: name -> NumPy unit code for fixed-length units
+_FIXED_UNITS = {"WEEK": "W", "DAY": "D", "HOUR": "h", "MINUTE": "m", "SECOND": "s"}
+_MONTH_UNITS = {"YEAR": 12, "QUARTER": 3, "MONTH": 1}
+
+
+def _unit(node: Tree, function: str) -> str:
+    unit = _literal_text(node, f"{function} unit").upper()
+    unit = unit[:-1] if unit.endswith("S") and unit[:-1] in {**_FIXED_UNITS, **_MONTH_UNITS} else unit
+    return {"YY": "YEAR", "YYYY": "YEAR", "MM": "MONTH", "DD": "DAY", "HH": "HOUR", "MI": "MINUTE", "SS": "SECOND"}.get(unit, unit)
+
+
+def _add_months(ts: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Add whole months, clamping the day to the end of the target month."""
+    start_month = ts.astype("datetime64[M]")
+    target = start_month + months.astype(np.int64)
+    day_offset = ts.astype("datetime64[D]") - start_month.astype("datetime64[D]")
+    month_days = (target + 1).astype("datetime64[D]") - target.astype("datetime64[D]")
+    day = target.astype("datetime64[D]") + np.minimum(day_offset, month_days - np.timedelta64(1, "D"))
+    if np.datetime_data(ts.dtype)[0] in ("Y", "M", "W", "D"):
+        return day
+    return day.astype(ts.dtype) + (ts - ts.astype("datetime64[D]").astype(ts.dtype))
+
+
+def _compile_dateadd(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+    _arity(name, args, 3, 3)
+    unit = _unit(args[0], name)
+    if unit not in _FIXED_UNITS and unit not in _MONTH_UNITS:
+        raise DSLEvaluationError(f"Unsupported DATEADD unit: {unit}")
+    amount, timestamp = compiler.compile(args[1]), compiler.compile(args[2])
+
+    def plan(ctx: _Context) -> Vec:
+        n, ts = amount(ctx), timestamp(ctx)
+        if _is_null_literal(n) or _is_null_literal(ts):
+            return _null()
+        mask = _or_masks(n[1], ts[1])
+        values, count = _as_datetime(ts[0]), n[0]
+        if unit in _MONTH_UNITS:
+            return _add_months(values, np.trunc(count).astype(np.int64) * _MONTH_UNITS[unit]), mask
+        code = _FIXED_UNITS[unit]
+        if count.dtype.kind in "iub":
+            return values + count.astype(np.int64).astype(f"timedelta64[{code}]"), mask
+        seconds = np.rint(count * (np.timedelta64(1, code) / np.timedelta64(1, "s"))).astype(np.int64)
+        return values + seconds.astype("timedelta64[s]"), mask
+    return plan
+
+
+def _compile_datediff(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+    _arity(name, args, 3, 3)
+    unit = _unit(args[0], name)
+    if unit not in _FIXED_UNITS and unit not in _MONTH_UNITS:
+        raise DSLEvaluationError(f"Unsupported DATEDIFF unit: {unit}")
+    first, second = compiler.compile(args[1]), compiler.compile(args[2])
+
+    def plan(ctx: _Context) -> Vec:
+        start, end = first(ctx), second(ctx)
+        if _is_null_literal(start) or _is_null_literal(end):
+            return _null()
+        a, b = _as_datetime(start[0]), _as_datetime(end[0])
+        mask = _or_masks(start[1], end[1])
+        # Number of unit boundaries crossed between start and end
+        if unit in _MONTH_UNITS:
+            months_a = a.astype("datetime64[M]").astype(np.int64)
+            months_b = b.astype("datetime64[M]").astype(np.int64)
+            step = _MONTH_UNITS[unit]
+            return months_b // step - months_a // step, mask
+        if unit == "WEEK":
+            days = b.astype("datetime64[D]") - a.astype("datetime64[D]")
+            return days.astype(np.int64) // 7, mask
+        code = _FIXED_UNITS[unit]
+        return (b.astype(f"datetime64[{code}]") - a.astype(f"datetime64[{code}]")).astype(np.int64), mask
+    return plan
+
+
+def _truncate(values: np.ndarray, unit: str) -> np.ndarray:
+    if unit == "QUARTER":
+        months = values.astype("datetime64[M]").astype(np.int64)
+        return (months - months % 3).astype("datetime64[M]")
+    if unit == "WEEK":
+        days = values.astype("datetime64[D]").astype(np.int64)
+        # 1970-01-01 was a Thursday; weeks start on Monday
+        return (days - (days + 3) % 7).astype("datetime64[D]")
+    if unit in _MONTH_UNITS:
+        return values.astype("datetime64[Y]" if unit == "YEAR" else "datetime64[M]")
+    return values.astype(f"datetime64[{_FIXED_UNITS[unit]}]")
+
+
+def _compile_date_trunc(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+    _arity(name, args, 2, 2)
+    unit = _unit(args[0], name)
+    if unit not in _FIXED_UNITS and unit not in _MONTH_UNITS:
+        raise DSLEvaluationError(f"Unsupported DATE_TRUNC unit: {unit}")
+    timestamp = compiler.compile(args[1])
+
+    def plan(ctx: _Context) -> Vec:
+        vec = timestamp(ctx)
+        if _is_null_literal(vec):
+            return vec
+        values = _as_datetime(vec[0])
+        # Keep the input resolution (a truncated date stays a date)
+        return _truncate(values, unit).astype(values.dtype), vec[1]
+    return plan
+
+
+def _extract(values: np.ndarray, part: str) -> np.ndarray:
+    days = values.astype("datetime64[D]")
+    if part == "YEAR":
+        return values.astype("datetime64[Y]").astype(np.int64) + 1970
+    if part == "QUARTER":
+        return values.astype("datetime64[M]").astype(np.int64) % 12 // 3 + 1
+    if part == "MONTH":
+        return values.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    if part == "DAY":
+        return (days - values.astype("datetime64[M]").astype("datetime64[D]")).astype(np.int64) + 1
+    if part in ("DOW", "DAYOFWEEK"):
+        # 0 = Sunday (1970-01-01 was a Thursday)
+        return (days.astype(np.int64) + 4) % 7
+    if part in ("DOY", "DAYOFYEAR"):
+        return (days - values.astype("datetime64[Y]").astype("datetime64[D]")).astype(np.int64) + 1
+    if part == "WEEK":
+        # ISO week: the week of the Thursday in the same Monday-based week
+        thursday = days.astype(np.int64) - (days.astype(np.int64) + 3) % 7 + 3
+        thursday = thursday.astype("datetime64[D]")
+        return (thursday - thursday.astype("datetime64[Y]").astype("datetime64[D]")).astype(np.int64) // 7 + 1
+    if part == "EPOCH":
+        return values.astype("datetime64[s]").astype(np.int64)
+    if part in ("HOUR", "MINUTE", "SECOND"):
+        seconds = (values.astype("datetime64[s]") - days).astype(np.int64)
+        return {"HOUR": seconds // 3600, "MINUTE": seconds // 60 % 60, "SECOND": seconds % 60}[part]
+    raise DSLEvaluationError(f"Unsupported EXTRACT part: {part}")
+
+
+def _compile_extract(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+    _arity(name, args, 2, 2)
+    part = _unit(args[0], name)
+    _extract(np.asarray([0], dtype="datetime64[s]"), part)  # Fail at compile time on unknown parts
+    timestamp = compiler.compile(args[1])
+
+    def plan(ctx: _Context) -> Vec:
+        vec = timestamp(ctx)
+        if _is_null_literal(vec):
+            return vec
+        return _extract(_as_datetime(vec[0]), part), vec[1]
+    return plan
+
+
+# Distribution samplers: (generator, parameters, size) -> values
+def _zipf(rng: np.random.Generator, s: np.ndarray, n: np.ndarray, size: int) -> np.ndarray:
+    if s.ndim or n.ndim:
+        raise DSLEvaluationError("ZIPF parameters must be constants")
+    ranks = np.arange(1, int(n) + 1)
+    weights = ranks.astype(np.float64) ** -float(s)
+    return rng.choice(ranks, size=size, p=weights / weights.sum())
+
+
+_SAMPLERS: Dict[str, Callable[..., np.ndarray]] = {
+    "UNIFORM": lambda rng, low, high, size: rng.uniform(low, high, size),
+    "NORMAL": lambda rng, mean, std, size: rng.normal(mean, std, size),
+    "LOGNORMAL": lambda rng, mu, sigma, size: rng.lognormal(mu, sigma, size),
+    "BETA": lambda rng, a, b, size: rng.beta(a, b, size),
+    "GAMMA": lambda rng, shape, scale, size: rng.gamma(shape, scale, size),
+    "EXPONENTIAL": lambda rng, lam, size: rng.exponential(1.0 / lam, size),
+    "TRIANGULAR": lambda rng, low, high, mode, size: rng.triangular(low, mode, high, size),
+    "WEIBULL": lambda rng, shape, scale, size: scale * rng.weibull(shape, size),
+    "POISSON": lambda rng, lam, size: rng.poisson(lam, size),
+    "ZIPF": _zipf,
+    "PARETO": lambda rng, alpha, scale, size: scale * (1.0 + rng.pareto(alpha, size)),
+    "BERNOULLI": lambda rng, p, size: rng.random(size) < p,
+}
+
+
+def _compile_distribution(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+    spec = get_distribution_registry()[name]
+    _arity(name, args, *spec.arity)
+    operands = [compiler.compile(a) for a in args]
+    sampler = _SAMPLERS[name]
+
+    def plan(ctx: _Context) -> Vec:
+        vecs = [operand(ctx) for operand in operands]
+        if any(_is_null_literal(v) for v in vecs):
+            return _null()
+        params = [v.astype(np.float64) if v.dtype.kind in "iub" else v for v, _ in vecs]
+        try:
+            values = sampler(ctx.generator(), *params, ctx.size)
+        except ValueError as e:
+            raise DSLEvaluationError(f"Invalid {name} parameters: {e}") from e
+        return values, _or_masks(*[m for _, m in vecs])
+    return plan
+
+
+def _compile_categorical(compiler: _Compiler, name: str, args: List[Tree]) -> Plan:
+    _arity(name, args, 1, 1_000_000)
+    labels, weights = [], []
+    for arg in args:
+        if arg.data != "pair":
+            raise DSLEvaluationError("CATEGORICAL expects (value, weight) pairs")
+        value, weight = _subtrees(arg)
+        if value.data == "identifier":
+            labels.append(_identifier_name(value))  # Bare category labels
+        elif value.data == "string":
+            labels.append(_string_value(value.children[0]))
+        elif value.data == "number":
+            labels.append(_compile_number(compiler, value)(None)[0].item())
+        else:
+            raise DSLEvaluationError("CATEGORICAL values must be literals")
+        if weight.data != "number":
+            raise DSLEvaluationError("CATEGORICAL weights must be numbers")
+        weights.append(float(str(weight.children[0])))
+    choices = np.array(labels)
+    p = np.asarray(weights, dtype=np.float64)
+    if (p < 0).any() or p.sum() <= 0:
+        raise DSLEvaluationError("CATEGORICAL weights must be non-negative with a positive sum")
+    p = p / p.sum()
+    return lambda ctx: (ctx.generator().choice(choices, size=ctx.size, p=p), None)
+
+
+_NODE_COMPILERS: Dict[str, NodeCompiler] = {
+    "number": _compile_number,
+    "string": _compile_string,
+    "true": _compile_bool(True),
+    "false": _compile_bool(False),
+    "null": _compile_null,
+    "identifier": _compile_identifier,
+    "atom": _compile_group,
+    "sum_expr": _compile_chain,
+    "term": _compile_chain,
+    "unary": _compile_unary,
+    "comparison": _compile_comparison,
+    "and_expr": _compile_logic(_and),
+    "or_expr": _compile_logic(_or),
+    "not_expr": _compile_not,
+    "case_expr": _compile_case,
+    "if_expr": _compile_if,
+    "func_call": _compile_func_call,
+    "aggregate_func_call": _compile_aggregate_call,
+    "distribution_expr": _compile_distribution_expr,
+    "window_func_call": _unsupported,
+    "scalar_subquery": _unsupported,
+}
+
+_FUNCTIONS: Dict[str, FunctionCompiler] = {
+    "LOWER": _text_function(np.char.lower, (1, 1)),
+    "UPPER": _text_function(np.char.upper, (1, 1)),
+    "TRIM": _text_function(np.char.strip, (1, 1)),
+    "LTRIM": _text_function(np.char.lstrip, (1, 1)),
+    "RTRIM": _text_function(np.char.rstrip, (1, 1)),
+    "LENGTH": _text_function(np.char.str_len, (1, 1)),
+    "REPLACE": _text_function(_replace, (3, 3)),
+    "SUBSTR": _text_function(_substr, (2, 3)),
+    "SUBSTRING": _text_function(_substr, (2, 3)),
+    "SPLIT_PART": _text_function(_split_part, (3, 3)),
+    "REGEXP_EXTRACT": _text_function(_regexp_extract, (2, 3)),
+    "REGEXP_REPLACE": _text_function(_regexp_replace, (3, 3)),
+    "CONCAT": _compile_concat,
+    "COALESCE": _compile_coalesce,
+    "NULLIF": _compile_nullif,
+    "CAST": _compile_cast,
+    "ABS": _unary_function(1, np.abs),
+    "ROUND": _compile_round,
+    "FLOOR": _unary_function(1, _integral(np.floor)),
+    "CEIL": _unary_function(1, _integral(np.ceil)),
+    "CEILING": _unary_function(1, _integral(np.ceil)),
+    "DATEADD": _compile_dateadd,
+    "DATEDIFF": _compile_datediff,
+    "DATE_TRUNC": _compile_date_trunc,
+    "EXTRACT": _compile_extract,
+    "CATEGORICAL": _compile_categorical,
+    **{name: _compile_distribution for name in _SAMPLERS},
+}
+
+
+# ----------------------------------------------------------------------
+# Public API
+# ----------------------------------------------------------------------
+
+class CompiledExpression:
+    """
+    A DSL expression compiled once into a vectorized plan.
+
+    Attributes:
+        expression: Source expression (or parse tree)
+        table: Table the expression is evaluated over (the `this` row), if given
+        columns: Column identifiers the expression references (as written)
+        tables: Tables read by relational functions
+    """
+
+    def __init__(self, expression: Union[str, Tree], table: Optional[str] = None):
+        """
+        Compile an expression.
+
+        Args:
+            expression: DSL expression string or a parse tree from `parse_dsl_expression`
+            table: Optional name of the table the expression is evaluated over
+
+        Raises:
+            DSLEvaluationError: If the expression does not parse or uses unsupported constructs
+        """
+        self.expression = expression
+        self.table = table
+        tree = expression
+        if isinstance(expression, str):
+            try:
+                tree = parse_dsl_expression(expression)
+            except Exception as e:
+                raise DSLEvaluationError(f"Cannot parse DSL expression {expression!r}: {e}") from e
+        compiler = _Compiler(table)
+        self._plan = compiler.compile(tree)
+        self.columns: Set[str] = compiler.columns
+        self.tables: Set[str] = compiler.tables
+        self._indexes: Dict[Any, Any] = {}
+
+    def evaluate_with_nulls(
+        self,
+        columns: Optional[Mapping[str, Any]] = None,
+        size: Optional[int] = None,
+        rng: RandomSource = None,
+        tables: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate over a batch of rows.
+
+        Args:
+            columns: Column name -> 1-D array (None/NaN/NaT entries are NULL). Qualified
+                identifiers ("Order.total", "this.total") fall back to the bare column name.
+            size: Number of rows (defaults to the length of the columns, or 1)
+            rng: Generator or seed for distribution calls
+            tables: Table name -> columns of the tables read by relational functions.
+                Indexes over a table are built once and reused while its arrays are unchanged.
+
+        Returns:
+            (values, null mask), both of length `size`
+
+        Raises:
+            DSLEvaluationError: If a column is missing or values have incompatible types
+        """
+        columns = columns or {}
+        if size is None:
+            size = len(next(iter(columns.values()))) if columns else 1
+        generator = rng if isinstance(rng, np.random.Generator) or rng is None else np.random.default_rng(rng)
+        ctx = _Context(columns, size, generator, tables or {}, self._indexes)
+        return _finalize(self._plan(ctx), size)
+
+    def evaluate(
+        self,
+        columns: Optional[Mapping[str, Any]] = None,
+        size: Optional[int] = None,
+        rng: RandomSource = None,
+        tables: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    ) -> np.ndarray:
+        """Evaluate over a batch of rows; NULL rows hold NaN, NaT or None (see `evaluate_with_nulls`)."""
+        return self.evaluate_with_nulls(columns, size, rng, tables)[0]
+
+    __call__ = evaluate
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        # Plans are closures; recompile from source (e.g. in worker processes)
+        return CompiledExpression, (self.expression, self.table)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.expression!r})"
+
+
+def compile_dsl_expression(expression: Union[str, Tree], table: Optional[str] = None) -> CompiledExpression:
+    """
+    Compile a DSL expression into a vectorized plan.
+
+    Args:
+        expression: DSL expression string or parse tree
+        table: Optional name of the table the expression is evaluated over
+
+    Returns:
+        CompiledExpression
+
+    Raises:
+        DSLEvaluationError: If the expression does not parse or uses unsupported constructs
+    """
+    return CompiledExpression(expression, table)
+
+
+def evaluate_dsl_expression(
+    expression: Union[str, Tree],
+    columns: Optional[Mapping[str, Any]] = None,
+    size: Optional[int] = None,
+    rng: RandomSource = None,
+    tables: Optional[Mapping[str, Mapping[str, Any]]] = None,
+) -> np.ndarray:
+    """
+    Compile and evaluate a DSL expression over a batch of rows (see `CompiledExpression.evaluate`).
+
+    Compile once with `compile_dsl_expression` when evaluating the same expression repeatedly;
+    relational indexes are kept on the compiled expression.
+    """
+    return compile_dsl_expression(expression).evaluate(columns, size=size, rng=rng, tables=tables)
+
+
+# Relational functions register their node compilers
+from . import relational_executor  # noqa: E402,F401
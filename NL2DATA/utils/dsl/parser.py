@@ -88,6 +88,26 @@ def _get_parser(profile: Optional[DSLGrammarProfile] = None) -> Lark:
     return parser
 
 
+def tree_stats(tree: Tree) -> Tuple[Optional[int], Optional[int]]:
+    """Return (depth, node count) of a parse tree, or (None, None) if they cannot be computed."""
+    def count_nodes(node, depth=0):
+        if isinstance(node, Tree):
+            max_depth = depth
+            node_count = 1
+            for child in node.children:
+                child_depth, child_count = count_nodes(child, depth + 1)
+                max_depth = max(max_depth, child_depth)
+                node_count += child_count
+            return max_depth, node_count
+        return depth, 0
+
+    try:
+        return count_nodes(tree)
+    except Exception:
+        # If counting fails, just return None for metadata
+        return None, None
+
+
 def parse_tokens(
     tokens: Union[List[DSLToken], List[Token]],
     original_text: Optional[str] = None,
@@ -171,24 +191,7 @@ def parse_tokens(
         tree = parser.parse(reconstructed_text)
         
         if return_model:
-            # Try to compute tree depth and node count
-            def count_nodes(node, depth=0):
-                if isinstance(node, Tree):
-                    max_depth = depth
-                    node_count = 1
-                    for child in node.children:
-                        child_depth, child_count = count_nodes(child, depth + 1)
-                        max_depth = max(max_depth, child_depth)
-                        node_count += child_count
-                    return max_depth, node_count
-                return depth, 0
-            
-            try:
-                tree_depth, node_count = count_nodes(tree)
-            except Exception:
-                # If counting fails, just return None for metadata
-                tree_depth, node_count = None, None
-            
+            tree_depth, node_count = tree_stats(tree)
             return ParseResult.from_success(reconstructed_text, tree_depth=tree_depth, node_count=node_count)
         return tree
     except UnexpectedInput as e:
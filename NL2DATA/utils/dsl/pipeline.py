@@ -7,6 +7,10 @@ This module provides a complete validation pipeline that:
 
 All intermediate results are stored in Pydantic models for type safety,
 serialization, and structured error reporting.
+
+The expression is parsed once: the parse tree (from the parse cache) is handed
+straight to semantic analysis. Pipeline results are cached by expression, schema
+fingerprint and grammar profile (see cache.py).
 """
 
 from __future__ import annotations
@@ -14,8 +18,9 @@ from __future__ import annotations
 from typing import Optional
 
 from .grammar_profile import DSLGrammarProfile, FEATURE_RELATIONAL_CONSTRAINTS
+from .cache import memoize_validation, parse_dsl_cached
 from .lexer import tokenize_dsl
-from .parser import parse_tokens
+from .parser import DSLParseError, parse_dsl_expression, tree_stats
 from .validator import validate_dsl_expression_with_schema
 from .schema_context import DSLSchemaContext
 from .models import (
@@ -26,6 +31,7 @@ from .models import (
 )
 
 
+@memoize_validation
 def validate_dsl_pipeline(
     dsl: str,
     schema: Optional[DSLSchemaContext] = None,
@@ -86,21 +92,15 @@ def validate_dsl_pipeline(
                 feats = frozenset(parts[1:])
                 profile = DSLGrammarProfile(version=version, features=feats)
     
-    # Get tokens from tokenization result
+    tree = None
     if tokenization_result.success and tokenization_result.tokens:
-        # Convert DSLTokenModel back to DSLToken for parsing
-        from .lexer import DSLToken
-        tokens = [
-            DSLToken(
-                type=token.type,
-                value=token.value,
-                category=token.category,
-                line=token.line,
-                column=token.column,
-            )
-            for token in tokenization_result.tokens
-        ]
-        parse_result = parse_tokens(tokens, original_text=dsl, profile=profile, return_model=True)
+        try:
+            tree = parse_dsl_cached(dsl, profile)
+            tree_depth, node_count = tree_stats(tree)
+            parse_result = ParseResult.from_success(dsl, tree_depth=tree_depth, node_count=node_count)
+        except DSLParseError:
+            # Re-parse for the detailed error model (suggestions, expected tokens)
+            parse_result = parse_dsl_expression(dsl, profile=profile, return_model=True)
     else:
         # If tokenization failed, create a failed parse result
         parse_result = ParseResult.from_error(
@@ -132,6 +132,7 @@ def validate_dsl_pipeline(
             schema,
             grammar=grammar,
             return_model=True,
+            tree=tree,
         )
     else:
         # Without schema, we can't do full semantic validation
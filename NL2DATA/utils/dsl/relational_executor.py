@@ -0,0 +1,394 @@
+"""Hash-join execution of relational DSL functions for the vectorized evaluator.
+
+EXISTS(T WHERE p), LOOKUP(T, v WHERE p) and COUNT_WHERE / SUM_WHERE / AVG_WHERE /
+MIN_WHERE / MAX_WHERE(T[, v] WHERE p) test a predicate on every pair of an outer
+row and a row of T. Evaluated naively that is a nested scan (outer rows x rows
+of T). Instead, the predicate is split on its top-level ANDs:
+
+- conjuncts over T only (`LineItem.status = 'shipped'`) filter T once;
+- conjuncts over the outer row only (`this.active`) filter outer rows;
+- equalities between a T expression and an outer-row expression
+  (`LineItem.order_id = this.id`) become join keys;
+- anything else is a residual, evaluated on the candidate pairs only.
+
+The filtered rows of T are factorized on the join keys into groups (rows sorted
+by group). Without residuals, the result of every group is aggregated once with
+bincount / sorted reductions, and each outer row reads its group's result after
+a binary search of its key codes. The index is built the first time an
+expression sees a table and reused while the table's arrays are the same
+objects, so a batch of outer rows costs O(rows * log(groups)) instead of
+O(rows * rows of T).
+
+Inside a relational function, bare column names and names qualified with T
+refer to columns of T; `this.` (or any other qualifier) refers to the outer row.
+EXISTS (SELECT ... FROM T WHERE p) runs like EXISTS(T WHERE p), and
+IN_RANGE(x, lo, hi) is `x BETWEEN lo AND hi`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, List, Mapping, Optional, Tuple
+
+import numpy as np
+from lark import Token, Tree
+
+from .evaluator import (
+    DSLEvaluationError,
+    Plan,
+    Vec,
+    _Compiler,
+    _Context,
+    _NODE_COMPILERS,
+    _align,
+    _and,
+    _compare,
+    _identifier_name,
+    _subtrees,
+    _tokens,
+    _truthy,
+)
+
+# Candidate (outer row, table row) pairs one evaluation may expand for residual conjuncts
+MAX_CANDIDATE_PAIRS = 20_000_000
+
+
+@dataclass
+class _RefContext(_Context):
+    """Rows of the table a relational function scans."""
+
+    def column(self, name: str) -> Vec:
+        raise DSLEvaluationError(f"{name} refers to the outer row where only table columns can be read")
+
+    def ref_column(self, name: str) -> Vec:
+        return super().column(name)
+
+
+@dataclass
+class _PairContext(_Context):
+    """Candidate pairs: outer row `anchor_rows[i]` with table row `ref_rows[i]`."""
+    anchor: Optional[_Context] = None
+    ref: Optional[_RefContext] = None
+    anchor_rows: Optional[np.ndarray] = None
+    ref_rows: Optional[np.ndarray] = None
+
+    def column(self, name: str) -> Vec:
+        return _take(self.anchor.column(name), self.anchor_rows)
+
+    def ref_column(self, name: str) -> Vec:
+        return _take(self.ref.ref_column(name), self.ref_rows)
+
+
+@dataclass
+class _Relational:
+    """A compiled relational function."""
+    kind: str  # EXISTS, LOOKUP, COUNT, SUM, AVG, MIN, MAX
+    table: str
+    value: Optional[Plan] = None
+    value_reads_anchor: bool = False
+    ref_filters: List[Plan] = field(default_factory=list)
+    anchor_filters: List[Plan] = field(default_factory=list)
+    keys: List[Tuple[Plan, Plan]] = field(default_factory=list)  # (table side, outer side)
+    residuals: List[Plan] = field(default_factory=list)
+
+
+def _take(vec: Vec, rows: np.ndarray) -> Vec:
+    values, mask = vec
+    return values[rows], (None if mask is None else mask[rows])
+
+
+def _rows(vec: Vec, size: int) -> Vec:
+    """Broadcast a value (possibly a 0-d constant) to `size` rows."""
+    values, mask = vec
+    return np.broadcast_to(values, (size,)), (None if mask is None else np.broadcast_to(mask, (size,)))
+
+
+def _condition(plan: Plan, ctx: _Context) -> np.ndarray:
+    return np.broadcast_to(_truthy(plan(ctx)), (ctx.size,))
+
+
+def _factorize(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    try:
+        uniques, inverse = np.unique(values, return_inverse=True)
+    except TypeError as e:
+        raise DSLEvaluationError(f"Join key values cannot be ordered: {e}") from e
+    return uniques, inverse.reshape(-1).astype(np.int64)
+
+
+def _search(uniques: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions of `values` in sorted `uniques` and whether each was found."""
+    uniques, values = _align((uniques, None), (values, None))
+    try:
+        positions = np.searchsorted(uniques, values)
+    except TypeError as e:
+        raise DSLEvaluationError(f"Cannot join {uniques.dtype} keys with {values.dtype} values: {e}") from e
+    positions = np.minimum(positions, len(uniques) - 1)
+    return positions, uniques[positions] == values
+
+
+class _Index:
+    """Filtered rows of a table grouped by join key, with per-group results."""
+
+    def __init__(self, spec: _Relational, table: Mapping[str, Any], ctx: _Context):
+        self.arrays = tuple(table.values())
+        size = len(self.arrays[0]) if self.arrays else 0
+        self.ref = _RefContext(table, size, ctx.rng, ctx.tables, ctx.indexes)
+
+        keep = np.ones(size, dtype=bool)
+        for plan in spec.ref_filters:
+            keep &= _condition(plan, self.ref)
+        keys = [_rows(ref_plan(self.ref), size) for ref_plan, _ in spec.keys]
+        for _, mask in keys:
+            if mask is not None:
+                keep &= ~mask  # NULL never equals anything
+        positions = np.flatnonzero(keep)
+
+        # Factorize key by key, re-densifying the combined codes after each step
+        codes = np.zeros(len(positions), dtype=np.int64)
+        self.key_uniques: List[np.ndarray] = []
+        self.key_steps: List[np.ndarray] = []
+        for values, _ in keys:
+            uniques, inverse = _factorize(values[positions])
+            steps, codes = np.unique(codes * len(uniques) + inverse, return_inverse=True)
+            codes = codes.reshape(-1)
+            self.key_uniques.append(uniques)
+            self.key_steps.append(steps)
+        self.groups = len(self.key_steps[-1]) if keys else 1
+
+        order = np.argsort(codes, kind="stable")  # table order within a group
+        self.rows = positions[order]
+        self.codes = codes[order]
+        self.counts = np.bincount(codes, minlength=self.groups)
+        self.starts = np.cumsum(self.counts) - self.counts
+        self._value: Optional[Vec] = None
+        self.results: Optional[Vec] = None
+
+    def probe(self, spec: _Relational, ctx: _Context) -> np.ndarray:
+        """Group of every outer row (-1: no candidate rows)."""
+        found = np.ones(ctx.size, dtype=bool)
+        for plan in spec.anchor_filters:
+            found &= _condition(plan, ctx)
+        groups = np.zeros(ctx.size, dtype=np.int64)
+        for (_, anchor_plan), uniques, steps in zip(spec.keys, self.key_uniques, self.key_steps):
+            values, mask = _rows(anchor_plan(ctx), ctx.size)
+            if mask is not None:
+                found &= ~mask
+            if len(uniques) == 0:
+                found[:] = False
+                break
+            positions, hit = _search(uniques, values)
+            steps_at, step_hit = _search(steps, groups * len(uniques) + positions)
+            found &= hit & step_hit
+            groups = steps_at
+        return np.where(found, groups, -1)
+
+    def value(self, spec: _Relational) -> Vec:
+        """Value expression over the whole table (evaluated once)."""
+        if self._value is None:
+            self._value = _rows(spec.value(self.ref), self.ref.size)
+        return self._value
+
+
+def _scatter(values: np.ndarray, present: np.ndarray, size: int, mask: Optional[np.ndarray] = None) -> Vec:
+    if values.dtype.kind == "O":
+        out = np.full(size, None, dtype=object)
+    else:
+        out = np.zeros(size, dtype=values.dtype)
+    out[present] = values
+    out_mask = np.ones(size, dtype=bool)
+    out_mask[present] = False if mask is None else mask
+    return out, (out_mask if out_mask.any() else None)
+
+
+def _reduce(kind: str, codes: np.ndarray, size: int, values: Optional[np.ndarray], mask: Optional[np.ndarray]) -> Vec:
+    """Aggregate rows into `size` groups by code; groups without rows give NULL (0 / false for COUNT / EXISTS)."""
+    if kind == "EXISTS":
+        return np.bincount(codes, minlength=size) > 0, None
+    if kind == "LOOKUP":
+        # First candidate row in table order, even if its value is NULL
+        present, first = np.unique(codes, return_index=True)
+        return _scatter(values[first], present, size, None if mask is None else mask[first])
+    if values is not None and mask is not None:
+        codes, values = codes[~mask], values[~mask]
+    if kind == "COUNT":
+        return np.bincount(codes, minlength=size), None
+
+    counts = np.bincount(codes, minlength=size)
+    empty = counts == 0
+    if kind in ("SUM", "AVG"):
+        if values.dtype.kind == "b":
+            values = values.astype(np.int64)
+        if values.dtype.kind not in "iuf":
+            raise DSLEvaluationError(f"{kind}_WHERE needs numeric values, got {values.dtype}")
+        if kind == "AVG" or values.dtype.kind == "f":
+            totals = np.bincount(codes, weights=values.astype(float), minlength=size)
+            if kind == "AVG":
+                totals = totals / np.maximum(counts, 1)
+        else:
+            totals = np.zeros(size, dtype=np.int64)
+            np.add.at(totals, codes, values.astype(np.int64))
+        return totals, (empty if empty.any() else None)
+
+    # MIN / MAX: sort by value, then (stably) by group
+    order = np.argsort(values, kind="stable")
+    order = order[np.argsort(codes[order], kind="stable")]
+    if kind == "MAX":
+        order = order[::-1]
+    present, first = np.unique(codes[order], return_index=True)
+    return _scatter(values[order[first]], present, size)
+
+
+def _index(spec: _Relational, slot: object, ctx: _Context) -> _Index:
+    """Index of the table for this call site, rebuilt only when the table's arrays change."""
+    table = ctx.table(spec.table)
+    index = ctx.indexes.get(slot)
+    arrays = tuple(table.values())
+    if index is None or len(index.arrays) != len(arrays) or any(a is not b for a, b in zip(index.arrays, arrays)):
+        index = _Index(spec, table, ctx)
+        ctx.indexes[slot] = index
+    return index
+
+
+def _execute(spec: _Relational, slot: object, ctx: _Context) -> Vec:
+    index = _index(spec, slot, ctx)
+    groups = index.probe(spec, ctx)
+    if not spec.residuals and not spec.value_reads_anchor:
+        if index.results is None:
+            # One result per group, plus an empty group that row -1 indexes
+            values, mask = index.value(spec) if spec.value is not None else (None, None)
+            if values is not None:
+                values, mask = values[index.rows], (None if mask is None else mask[index.rows])
+            index.results = _reduce(spec.kind, index.codes, index.groups + 1, values, mask)
+        values, mask = index.results
+        return values[groups], (None if mask is None else mask[groups])
+
+    # Residual conjuncts: expand the candidate pairs of each outer row
+    anchor_rows = np.flatnonzero(groups >= 0)
+    matched = groups[anchor_rows]
+    counts = index.counts[matched]
+    total = int(counts.sum())
+    if total > MAX_CANDIDATE_PAIRS:
+        raise DSLEvaluationError(
+            f"{spec.kind} over {spec.table} expands {total} candidate row pairs; "
+            f"add an equality between a {spec.table} column and a this. column to the predicate"
+        )
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    pair_anchor = np.repeat(anchor_rows, counts)
+    pair_ref = index.rows[np.repeat(index.starts[matched], counts) + offsets]
+    pairs = _PairContext({}, total, ctx.rng, ctx.tables, ctx.indexes,
+                         anchor=ctx, ref=index.ref, anchor_rows=pair_anchor, ref_rows=pair_ref)
+    keep = np.ones(total, dtype=bool)
+    for plan in spec.residuals:
+        keep &= _condition(plan, pairs)
+
+    values = mask = None
+    if spec.value is not None:
+        if spec.value_reads_anchor:
+            values, mask = _rows(spec.value(pairs), total)
+            values, mask = values[keep], (None if mask is None else mask[keep])
+        else:
+            values, mask = _take(index.value(spec), pair_ref[keep])
+    return _reduce(spec.kind, pair_anchor[keep], ctx.size, values, mask)
+
+
+# ----------------------------------------------------------------------
+# Compilation
+# ----------------------------------------------------------------------
+
+def _conjuncts(node: Tree) -> List[Tree]:
+    if node.data == "and_expr":
+        return [c for child in _subtrees(node) for c in _conjuncts(child)]
+    trees = _subtrees(node)
+    if node.data == "atom" and len(trees) == 1:
+        return _conjuncts(trees[0])
+    return [node]
+
+
+def _classify(compiler: _Compiler, spec: _Relational, node: Tree) -> None:
+    if node.data == "comparison":
+        trees = _subtrees(node)
+        if len(trees) == 2 and _tokens(trees[1]) == ["="]:
+            left, left_sides = compiler.compile_side(trees[0])
+            right, right_sides = compiler.compile_side(_subtrees(trees[1])[0])
+            if left_sides == {"ref"} and right_sides == {"anchor"}:
+                spec.keys.append((left, right))
+                return
+            if left_sides == {"anchor"} and right_sides == {"ref"}:
+                spec.keys.append((right, left))
+                return
+    plan, sides = compiler.compile_side(node)
+    if "anchor" not in sides:
+        spec.ref_filters.append(plan)
+    elif "ref" not in sides:
+        spec.anchor_filters.append(plan)
+    else:
+        spec.residuals.append(plan)
+
+
+def _compile_relational(compiler: _Compiler, kind: str, table_node: Tree,
+                        value_node: Optional[Tree], predicate: Optional[Tree]) -> Plan:
+    if compiler.scopes:
+        raise DSLEvaluationError("Nested relational functions are not supported by the vectorized evaluator")
+    table = _identifier_name(table_node)
+    compiler.tables.add(table)
+    spec = _Relational(kind, table)
+    compiler.scopes.append(table)
+    try:
+        if value_node is not None:
+            spec.value, sides = compiler.compile_side(value_node)
+            spec.value_reads_anchor = "anchor" in sides
+        for conjunct in _conjuncts(predicate) if predicate is not None else []:
+            _classify(compiler, spec, conjunct)
+    finally:
+        compiler.scopes.pop()
+    slot = object()  # index cache key of this call site
+    return lambda ctx: _execute(spec, slot, ctx)
+
+
+def _compile_relational_exists(compiler: _Compiler, node: Tree) -> Plan:
+    table, predicate = _subtrees(node)
+    return _compile_relational(compiler, "EXISTS", table, None, predicate)
+
+
+def _compile_relational_lookup(compiler: _Compiler, node: Tree) -> Plan:
+    table, value, predicate = _subtrees(node)
+    return _compile_relational(compiler, "LOOKUP", table, value, predicate)
+
+
+def _compile_relational_agg(compiler: _Compiler, node: Tree) -> Plan:
+    kind = _tokens(node)[0][:-len("_WHERE")]
+    trees = _subtrees(node)
+    value = trees[1] if len(trees) == 3 else None
+    return _compile_relational(compiler, kind, trees[0], value, trees[-1])
+
+
+def _compile_exists_select(compiler: _Compiler, node: Tree) -> Plan:
+    """EXISTS (SELECT ... FROM T [WHERE p]): the selected expression does not matter."""
+    table = predicate = None
+    keyword = None
+    for child in node.children:
+        if isinstance(child, Token):
+            keyword = child.value.upper()
+        elif keyword == "FROM" and table is None:
+            table = child
+        elif keyword == "WHERE":
+            predicate = child
+    return _compile_relational(compiler, "EXISTS", table, None, predicate)
+
+
+def _compile_in_range(compiler: _Compiler, node: Tree) -> Plan:
+    value, low, high = (compiler.compile(t) for t in _subtrees(node))
+
+    def plan(ctx: _Context) -> Vec:
+        x = value(ctx)
+        return _and(_compare(">=", x, low(ctx)), _compare("<=", x, high(ctx)))
+    return plan
+
+
+_NODE_COMPILERS.update({
+    "relational_exists": _compile_relational_exists,
+    "relational_lookup": _compile_relational_lookup,
+    "relational_agg": _compile_relational_agg,
+    "exists_expr": _compile_exists_select,
+    "in_range_call": _compile_in_range,
+})
@@ -0,0 +1,821 @@
+"""Compile NL2DATA DSL expressions to SQLite / PostgreSQL SQL.
+
+The in-process evaluator (evaluator.py) computes expressions over NumPy
+batches. This module is the database backend: it turns a DSL expression into a
+SQL expression, so derived attributes and row-level constraints can be computed
+set-based inside the database after bulk load instead of round-tripping rows
+through Python:
+
+    expr = compile_dsl_to_sql("quantity * unit_price", dialect="postgresql", table="OrderLine")
+    update_sql("OrderLine", {"total": "quantity * unit_price"}, dialect="postgresql")
+    # UPDATE "OrderLine" SET "total" = ("quantity" * "unit_price")
+
+Statement builders:
+- `generated_column_sql`: column definition with GENERATED ALWAYS AS (...) STORED
+- `check_constraint_sql`: CONSTRAINT ... CHECK (...)
+- `update_sql`: UPDATE ... SET col = (...), ...
+
+Semantics follow the evaluator: `/` is true division and division/modulo by
+zero yields NULL, CONCAT skips NULLs, DATEDIFF counts unit boundaries. Row-level
+identifiers ("col", "Table.col", "this.col") become bare column names.
+Relational functions (EXISTS, LOOKUP, COUNT_WHERE, ...) become correlated
+subqueries, which UPDATE statements accept but generated columns and CHECK
+constraints do not. Distribution calls are non-deterministic and are rejected.
+
+When a schema is given, the expression is first validated with
+`validate_dsl_expression_with_schema` and column types (from the schema) pick
+type-specific SQL (string `+` becomes `||`, DATEADD on dates stays a date).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple, Union
+import re
+
+from lark import Token, Tree
+
+from .parser import parse_dsl_expression
+from .schema_context import DSLSchemaContext
+from .function_registry import get_distribution_registry
+
+DIALECT_SQLITE = "sqlite"
+DIALECT_POSTGRESQL = "postgresql"
+SUPPORTED_DIALECTS = (DIALECT_SQLITE, DIALECT_POSTGRESQL)
+
+# SQL text and its coarse DSL type ("number", "string", "boolean", "date", "datetime", "time", "unknown")
+Fragment = Tuple[str, str]
+
+
+class DSLSQLCompilationError(ValueError):
+    """Raised when an expression cannot be expressed in the target SQL dialect."""
+
+
+@dataclass(frozen=True)
+class SQLExpression:
+    """
+    A DSL expression compiled to SQL.
+
+    Attributes:
+        sql: SQL expression text
+        dialect: Target dialect
+        columns: Anchor-table columns the expression reads
+        row_level: False if the expression contains subqueries (relational functions)
+    """
+    sql: str
+    dialect: str
+    columns: FrozenSet[str] = frozenset()
+    row_level: bool = True
+
+
+def quote_identifier(name: str) -> str:
+    """Quote an SQL identifier (same rules in SQLite and PostgreSQL)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quote_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _string_value(token: Token) -> str:
+    return re.sub(r"\\(.)", r"\1", str(token)[1:-1])
+
+
+def _subtrees(node: Tree) -> List[Tree]:
+    return [c for c in node.children if isinstance(c, Tree)]
+
+
+def _tokens(node: Tree) -> List[str]:
+    return [c.value.upper() for c in node.children if isinstance(c, Token)]
+
+
+def _identifier_parts(node: Tree) -> List[str]:
+    return [str(c) for c in node.children]
+
+
+def _is_temporal(dsl_type: str) -> bool:
+    return dsl_type in ("date", "datetime", "time")
+
+
+_AGGREGATES = {"COUNT", "SUM", "AVG", "MIN", "MAX"}
+_RELATIONAL_AGGREGATES = {"COUNT_WHERE": "COUNT", "SUM_WHERE": "SUM", "AVG_WHERE": "AVG",
+                          "MIN_WHERE": "MIN", "MAX_WHERE": "MAX"}
+
+# Functions with the same name and argument order in both dialects -> result type
+_PASSTHROUGH = {
+    "LOWER": "string", "UPPER": "string", "TRIM": "string", "LTRIM": "string", "RTRIM": "string",
+    "REPLACE": "string", "LENGTH": "number", "ABS": "number", "FLOOR": "number",
+    "CEIL": "number", "CEILING": "number", "NULLIF": None, "COALESCE": None,
+}
+
+# CAST type name -> (SQLite type, PostgreSQL type, DSL type)
+_CAST_TYPES = {
+    "INT": ("INTEGER", "BIGINT", "number"), "INTEGER": ("INTEGER", "BIGINT", "number"),
+    "BIGINT": ("INTEGER", "BIGINT", "number"), "SMALLINT": ("INTEGER", "SMALLINT", "number"),
+    "TINYINT": ("INTEGER", "SMALLINT", "number"),
+    "FLOAT": ("REAL", "DOUBLE PRECISION", "number"), "DOUBLE": ("REAL", "DOUBLE PRECISION", "number"),
+    "REAL": ("REAL", "REAL", "number"), "DECIMAL": ("NUMERIC", "NUMERIC", "number"),
+    "NUMERIC": ("NUMERIC", "NUMERIC", "number"),
+    "TEXT": ("TEXT", "TEXT", "string"), "VARCHAR": ("TEXT", "VARCHAR", "string"),
+    "CHAR": ("TEXT", "CHAR", "string"), "STRING": ("TEXT", "TEXT", "string"),
+    "BOOL": ("INTEGER", "BOOLEAN", "boolean"), "BOOLEAN": ("INTEGER", "BOOLEAN", "boolean"),
+    "DATE": ("DATE", "DATE", "date"), "TIMESTAMP": ("TIMESTAMP", "TIMESTAMP", "datetime"),
+    "DATETIME": ("TIMESTAMP", "TIMESTAMP", "datetime"),
+}
+
+_UNIT_ALIASES = {"YY": "YEAR", "YYYY": "YEAR", "MM": "MONTH", "DD": "DAY", "HH": "HOUR", "MI": "MINUTE", "SS": "SECOND"}
+_UNITS = ("YEAR", "QUARTER", "MONTH", "WEEK", "DAY", "HOUR", "MINUTE", "SECOND")
+_SECONDS = {"HOUR": 3600, "MINUTE": 60, "SECOND": 1}
+
+# EXTRACT part -> SQLite strftime format
+_SQLITE_PARTS = {"YEAR": "%Y", "MONTH": "%m", "DAY": "%d", "HOUR": "%H", "MINUTE": "%M", "SECOND": "%S",
+                 "DOW": "%w", "DAYOFWEEK": "%w", "DOY": "%j", "DAYOFYEAR": "%j", "EPOCH": "%s"}
+_POSTGRES_PARTS = {"YEAR": "YEAR", "QUARTER": "QUARTER", "MONTH": "MONTH", "DAY": "DAY", "HOUR": "HOUR",
+                   "MINUTE": "MINUTE", "SECOND": "SECOND", "DOW": "DOW", "DAYOFWEEK": "DOW", "DOY": "DOY",
+                   "DAYOFYEAR": "DOY", "WEEK": "WEEK", "EPOCH": "EPOCH"}
+
+
+@dataclass
+class _Scope:
+    """Table whose rows an identifier refers to (None: the anchor row)."""
+    table: Optional[str] = None
+    alias: Optional[str] = None
+
+
+class _SQLCompiler:
+    """Translate a parse tree into SQL text for one dialect."""
+
+    def __init__(self, dialect: str, table: Optional[str], schema: Optional[DSLSchemaContext]):
+        if dialect not in SUPPORTED_DIALECTS:
+            raise DSLSQLCompilationError(f"Unsupported SQL dialect: {dialect} (expected one of {SUPPORTED_DIALECTS})")
+        self.dialect = dialect
+        self.table = table
+        self.schema = schema
+        self.columns: Set[str] = set()
+        self.row_level = True
+        self._scopes: List[_Scope] = [_Scope()]
+        self._aliases = 0
+
+    @property
+    def postgres(self) -> bool:
+        return self.dialect == DIALECT_POSTGRESQL
+
+    def compile(self, node: Union[Tree, Token]) -> Fragment:
+        if isinstance(node, Token):
+            raise DSLSQLCompilationError(f"Unsupported token in expression: {node!r}")
+        handler = _NODE_HANDLERS.get(node.data)
+        if handler is None:
+            raise DSLSQLCompilationError(f"Unsupported DSL construct for SQL compilation: {node.data}")
+        return handler(self, node)
+
+    # ------------------------------------------------------------------
+    # Identifiers and literals
+    # ------------------------------------------------------------------
+
+    def _column_type(self, table: Optional[str], column: str) -> str:
+        if self.schema is None:
+            return "unknown"
+        _, _, dsl_type, error = self.schema.resolve_identifier(
+            f"{table}.{column}" if table else column, anchor_table=self.table
+        )
+        return "unknown" if error or not dsl_type else dsl_type
+
+    def identifier(self, node: Tree) -> Fragment:
+        parts = _identifier_parts(node)
+        if len(parts) > 2:
+            raise DSLSQLCompilationError(f"Unsupported identifier path: {'.'.join(parts)}")
+        column = parts[-1]
+        qualifier = parts[0] if len(parts) == 2 else None
+        scope = self._scopes[-1]
+        is_anchor = qualifier is None or qualifier.lower() == "this" or qualifier == self.table
+
+        if scope.table is None:
+            # Row-level context: columns of the anchor table
+            if not is_anchor:
+                raise DSLSQLCompilationError(
+                    f"{'.'.join(parts)} refers to another table; use a relational function (EXISTS, LOOKUP, ...)"
+                )
+            self.columns.add(column)
+            return quote_identifier(column), self._column_type(self.table, column)
+
+        if qualifier is None or qualifier == scope.table:
+            # Subquery context: columns of the subquery table
+            return f"{quote_identifier(scope.alias)}.{quote_identifier(column)}", self._column_type(scope.table, column)
+        if is_anchor:
+            if not self.table:
+                raise DSLSQLCompilationError("Correlated references need the anchor table name (table=...)")
+            self.columns.add(column)
+            return f"{quote_identifier(self.table)}.{quote_identifier(column)}", self._column_type(self.table, column)
+        raise DSLSQLCompilationError(f"{'.'.join(parts)} is neither the subquery table nor the anchor table")
+
+    def literal_text(self, node: Tree, what: str) -> str:
+        """Text of a string literal or bare identifier (units, type names)."""
+        if node.data == "string":
+            return _string_value(node.children[0])
+        if node.data == "identifier":
+            return ".".join(_identifier_parts(node))
+        raise DSLSQLCompilationError(f"{what} must be a literal")
+
+    def unit(self, node: Tree, function: str) -> str:
+        unit = self.literal_text(node, f"{function} unit").upper()
+        unit = unit[:-1] if unit.endswith("S") and unit[:-1] in _UNITS else unit
+        return _UNIT_ALIASES.get(unit, unit)
+
+    def temporal(self, fragment: Fragment) -> str:
+        """A datetime operand (PostgreSQL needs string literals cast)."""
+        sql, dsl_type = fragment
+        if self.postgres and not _is_temporal(dsl_type):
+            return f"CAST({sql} AS TIMESTAMP)"
+        return sql
+
+    # ------------------------------------------------------------------
+    # Subqueries (relational functions)
+    # ------------------------------------------------------------------
+
+    def subquery(self, table_node: Tree, select: Callable[[], str], predicate: Tree) -> str:
+        table = ".".join(_identifier_parts(table_node))
+        if self.schema is not None and table not in self.schema.tables:
+            raise DSLSQLCompilationError(f"Unknown table '{table}'")
+        self._aliases += 1
+        scope = _Scope(table, f"_{table.lower()}_{self._aliases}")
+        self._scopes.append(scope)
+        try:
+            selected = select()
+            condition = self.compile(predicate)[0]
+        finally:
+            self._scopes.pop()
+        self.row_level = False
+        return (f"SELECT {selected} FROM {quote_identifier(table)} AS {quote_identifier(scope.alias)} "
+                f"WHERE {condition}")
+
+
+NodeHandler = Callable[[_SQLCompiler, Tree], Fragment]
+FunctionHandler = Callable[[_SQLCompiler, str, List[Tree]], Fragment]
+
+
+def _number(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    return str(node.children[0]), "number"
+
+
+def _string(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    return _quote_string(_string_value(node.children[0])), "string"
+
+
+def _true(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    return "TRUE", "boolean"
+
+
+def _false(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    return "FALSE", "boolean"
+
+
+def _null(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    return "NULL", "null"
+
+
+def _identifier(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    return compiler.identifier(node)
+
+
+def _group(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    trees = _subtrees(node)
+    if len(trees) != 1:
+        raise DSLSQLCompilationError(f"Unsupported DSL construct for SQL compilation: {node.data}")
+    return compiler.compile(trees[0])
+
+
+def _binary(compiler: _SQLCompiler, op: str, left: Fragment, right: Fragment) -> Fragment:
+    (a, a_type), (b, b_type) = left, right
+    if op == "+" and "string" in (a_type, b_type):
+        return f"({a} || {b})", "string"
+    if op == "/":
+        # True division; division by zero is NULL (PostgreSQL would raise)
+        return f"({a} * 1.0 / NULLIF({b}, 0))", "number"
+    if op == "%":
+        if compiler.postgres:
+            return f"MOD({a}, NULLIF({b}, 0))", "number"
+        return f"({a} % NULLIF({b}, 0))", "number"
+    return f"({a} {op} {b})", "number"
+
+
+def _chain(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    operands = [compiler.compile(c) for c in node.children if isinstance(c, Tree)]
+    ops = [str(c) for c in node.children if isinstance(c, Token)]
+    result = operands[0]
+    for op, operand in zip(ops, operands[1:]):
+        result = _binary(compiler, op, result, operand)
+    return result
+
+
+def _unary(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    sql, dsl_type = compiler.compile(node.children[1])
+    return (f"(-{sql})" if str(node.children[0]) == "-" else sql), dsl_type
+
+
+def _comparison(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    trees = _subtrees(node)
+    left = compiler.compile(trees[0])
+    parts: List[str] = []
+    for tail in trees[1:]:
+        keywords = _tokens(tail)
+        operands = _subtrees(tail)
+        if keywords[0] == "IN":
+            items = _subtrees(operands[0])
+            items = _subtrees(items[0]) if items else []
+            values = ", ".join(compiler.compile(item)[0] for item in items)
+            parts.append(f"{left[0]} IN ({values})" if values else "FALSE")
+        elif keywords[0] == "BETWEEN":
+            low, high = (compiler.compile(o)[0] for o in operands)
+            parts.append(f"{left[0]} BETWEEN {low} AND {high}")
+        elif keywords[0] == "IS":
+            parts.append(f"{left[0]} IS NOT NULL" if "NOT" in keywords else f"{left[0]} IS NULL")
+        else:
+            op = "<>" if keywords[0] == "!=" else keywords[0]
+            right = compiler.compile(operands[0])
+            parts.append(f"{left[0]} {op} {right[0]}")
+            left = right
+    sql = parts[0] if len(parts) == 1 else " AND ".join(f"({p})" for p in parts)
+    return f"({sql})", "boolean"
+
+
+def _logic(keyword: str) -> NodeHandler:
+    def _handler(compiler: _SQLCompiler, node: Tree) -> Fragment:
+        operands = [compiler.compile(c)[0] for c in _subtrees(node)]
+        return "(" + f" {keyword} ".join(operands) + ")", "boolean"
+    return _handler
+
+
+def _not(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    return f"(NOT {compiler.compile(_subtrees(node)[0])[0]})", "boolean"
+
+
+def _branch_type(types: List[str]) -> str:
+    known = {t for t in types if t not in ("null", "unknown")}
+    return known.pop() if len(known) == 1 else "unknown"
+
+
+def _case(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    parts, types = ["CASE"], []
+    for child in _subtrees(node):
+        if child.data == "when_clause":
+            condition, value = _subtrees(child)
+            then = compiler.compile(value)
+            parts.append(f"WHEN {compiler.compile(condition)[0]} THEN {then[0]}")
+            types.append(then[1])
+        else:
+            otherwise = compiler.compile(child)
+            parts.append(f"ELSE {otherwise[0]}")
+            types.append(otherwise[1])
+    parts.append("END")
+    return " ".join(parts), _branch_type(types)
+
+
+def _if(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    condition, then, otherwise = (compiler.compile(c) for c in _subtrees(node))
+    return f"CASE WHEN {condition[0]} THEN {then[0]} ELSE {otherwise[0]} END", _branch_type([then[1], otherwise[1]])
+
+
+def _func_call(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    trees = _subtrees(node)
+    name = ".".join(_identifier_parts(trees[0])).upper()
+    args = _subtrees(trees[1]) if len(trees) > 1 and trees[1].data == "arg_list" else []
+    return _function(compiler, name, args)
+
+
+def _aggregate_call(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    """Single-argument calls (LOWER(x), ABS(x)) parse as aggregate_func_call."""
+    trees = _subtrees(node)
+    name = ".".join(_identifier_parts(trees[0])).upper()
+    if name in _AGGREGATES or len(trees) != 2 or "DISTINCT" in _tokens(node) or "OVER" in _tokens(node):
+        raise DSLSQLCompilationError(f"Aggregate/window function {name} is not a row-level expression")
+    return _function(compiler, name, trees[1:])
+
+
+def _function(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+    if name in get_distribution_registry():
+        raise DSLSQLCompilationError(f"{name} samples random values; it cannot be compiled to a deterministic SQL expression")
+    handler = _FUNCTIONS.get(name)
+    if handler is None:
+        raise DSLSQLCompilationError(f"Function {name} has no {compiler.dialect} translation")
+    return handler(compiler, name, args)
+
+
+def _distribution(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    raise DSLSQLCompilationError("Distribution expressions sample random values; they cannot be compiled to SQL")
+
+
+def _unsupported(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    raise DSLSQLCompilationError(f"{node.data} is not supported by the SQL compiler")
+
+
+def _relational_exists(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    table, predicate = _subtrees(node)
+    return f"EXISTS ({compiler.subquery(table, lambda: '1', predicate)})", "boolean"
+
+
+def _exists_expr(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    """EXISTS (SELECT ... FROM table WHERE condition)."""
+    clauses: Dict[str, Tree] = {}
+    keyword = None
+    for child in node.children:
+        if isinstance(child, Token):
+            keyword = child.value.upper()
+        elif keyword in ("FROM", "WHERE"):
+            clauses[keyword] = child
+    if "WHERE" not in clauses:
+        raise DSLSQLCompilationError("EXISTS (SELECT ...) needs a WHERE clause")
+    return f"EXISTS ({compiler.subquery(clauses['FROM'], lambda: '1', clauses['WHERE'])})", "boolean"
+
+
+def _relational_lookup(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    table, value, predicate = _subtrees(node)
+    result: Dict[str, str] = {}
+
+    def _select() -> str:
+        sql, result["type"] = compiler.compile(value)
+        return sql
+    sql = compiler.subquery(table, _select, predicate)
+    return f"({sql} LIMIT 1)", result.get("type", "unknown")
+
+
+def _relational_agg(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    aggregate = _RELATIONAL_AGGREGATES[_tokens(node)[0]]
+    trees = _subtrees(node)
+    if aggregate == "COUNT":
+        if len(trees) != 2:
+            raise DSLSQLCompilationError("COUNT_WHERE expects (table WHERE predicate)")
+        return f"({compiler.subquery(trees[0], lambda: 'COUNT(*)', trees[1])})", "number"
+    if len(trees) != 3:
+        raise DSLSQLCompilationError(f"{aggregate}_WHERE expects (table, value WHERE predicate)")
+    table, value, predicate = trees
+    result: Dict[str, str] = {}
+
+    def _select() -> str:
+        sql, result["type"] = compiler.compile(value)
+        return f"{aggregate}({sql})"
+    sql = compiler.subquery(table, _select, predicate)
+    return f"({sql})", ("number" if aggregate in ("COUNT", "SUM", "AVG") else result.get("type", "unknown"))
+
+
+def _in_range(compiler: _SQLCompiler, node: Tree) -> Fragment:
+    value, low, high = (compiler.compile(c)[0] for c in _subtrees(node))
+    return f"({value} BETWEEN {low} AND {high})", "boolean"
+
+
+# ----------------------------------------------------------------------
+# Functions
+# ----------------------------------------------------------------------
+
+def _arity(name: str, args: List[Tree], low: int, high: int) -> None:
+    if not low <= len(args) <= high:
+        expected = str(low) if low == high else f"{low}-{high}"
+        raise DSLSQLCompilationError(f"{name} expects {expected} arguments, got {len(args)}")
+
+
+def _passthrough(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+    fragments = [compiler.compile(a) for a in args]
+    result_type = _PASSTHROUGH[name] or _branch_type([t for _, t in fragments])
+    sql_name = "CEIL" if name == "CEILING" else name
+    return f"{sql_name}({', '.join(sql for sql, _ in fragments)})", result_type
+
+
+def _substr(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+    _arity(name, args, 2, 3)
+    return f"SUBSTR({', '.join(compiler.compile(a)[0] for a in args)})", "string"
+
+
+def _round(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+    _arity(name, args, 1, 2)
+    value = compiler.compile(args[0])[0]
+    if len(args) == 1:
+        return f"ROUND({value})", "number"
+    digits = compiler.compile(args[1])[0]
+    if compiler.postgres:
+        # ROUND(x, n) is only defined for NUMERIC in PostgreSQL
+        return f"ROUND(CAST({value} AS NUMERIC), {digits})", "number"
+    return f"ROUND({value}, {digits})", "number"
+
+
+def _concat(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+    fragments = [compiler.compile(a)[0] for a in args]
+    if compiler.postgres:
+        return f"CONCAT({', '.join(fragments)})", "string"
+    # CONCAT skips NULLs
+    return "(" + " || ".join(f"COALESCE({f}, '')" for f in fragments) + ")", "string"
+
+
+def _postgres_only(sql_name: str, result_type: str) -> FunctionHandler:
+    def _handler(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+        if not compiler.postgres:
+            raise DSLSQLCompilationError(f"{name} has no SQLite translation")
+        return f"{sql_name}({', '.join(compiler.compile(a)[0] for a in args)})", result_type
+    return _handler
+
+
+def _regexp_extract(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+    _arity(name, args, 2, 3)
+    if not compiler.postgres:
+        raise DSLSQLCompilationError(f"{name} has no SQLite translation")
+    text, pattern = (compiler.compile(a)[0] for a in args[:2])
+    group = compiler.compile(args[2])[0] if len(args) == 3 else "0"
+    if group == "0":
+        return f"(regexp_match({text}, '(' || {pattern} || ')'))[1]", "string"
+    return f"(regexp_match({text}, {pattern}))[{group}]", "string"
+
+
+def _regexp_replace(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+    _arity(name, args, 3, 3)
+    if not compiler.postgres:
+        raise DSLSQLCompilationError(f"{name} has no SQLite translation")
+    text, pattern, replacement = (compiler.compile(a)[0] for a in args)
+    return f"regexp_replace({text}, {pattern}, {replacement}, 'g')", "string"
+
+
+def _cast(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+    _arity(name, args, 2, 2)
+    value = compiler.compile(args[0])[0]
+    type_name = compiler.literal_text(args[1], "CAST type").strip().upper()
+    match = re.fullmatch(r"(\w+)(?: PRECISION)?\s*(\(\s*\d+\s*(?:,\s*\d+\s*)?\))?", type_name)
+    if not match or match.group(1) not in _CAST_TYPES:
+        raise DSLSQLCompilationError(f"Unsupported CAST type: {type_name}")
+    sqlite_type, postgres_type, dsl_type = _CAST_TYPES[match.group(1)]
+    if compiler.postgres:
+        sql_type = postgres_type + (re.sub(r"\s+", "", match.group(2)) if match.group(2) else "")
+        return f"CAST({value} AS {sql_type})", dsl_type
+    if dsl_type == "date":
+        return f"date({value})", dsl_type
+    if dsl_type == "datetime":
+        return f"datetime({value})", dsl_type
+    if match.group(1) in ("DECIMAL", "NUMERIC") and match.group(2) and "," in match.group(2):
+        scale = match.group(2).strip("()").split(",")[1].strip()
+        return f"ROUND(CAST({value} AS REAL), {scale})", dsl_type
+    return f"CAST({value} AS {sqlite_type})", dsl_type
+
+
+def _dateadd(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+    _arity(name, args, 3, 3)
+    unit = compiler.unit(args[0], name)
+    if unit not in _UNITS:
+        raise DSLSQLCompilationError(f"Unsupported DATEADD unit: {unit}")
+    amount = compiler.compile(args[1])[0]
+    timestamp = compiler.compile(args[2])
+    result_type = "date" if timestamp[1] == "date" and unit not in _SECONDS else "datetime"
+    step = {"QUARTER": ("3", "month"), "WEEK": ("7", "day")}.get(unit, ("1", unit.lower()))
+    if compiler.postgres:
+        sql = f"({compiler.temporal(timestamp)} + {amount} * INTERVAL '{step[0]} {step[1]}')"
+        return (f"CAST({sql} AS DATE)" if result_type == "date" else sql), result_type
+    count = amount if step[0] == "1" else f"({amount}) * {step[0]}"
+    function = "date" if result_type == "date" else "datetime"
+    return f"{function}({timestamp[0]}, ({count}) || ' {step[1]}s')", result_type
+
+
+def _datediff(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+    _arity(name, args, 3, 3)
+    unit = compiler.unit(args[0], name)
+    if unit not in _UNITS:
+        raise DSLSQLCompilationError(f"Unsupported DATEDIFF unit: {unit}")
+    start, end = (compiler.temporal(compiler.compile(a)) for a in args[1:])
+
+    # Number of unit boundaries crossed between start and end
+    if compiler.postgres:
+        def _months(ts: str) -> str:
+            return f"(EXTRACT(YEAR FROM {ts}) * 12 + EXTRACT(MONTH FROM {ts}) - 1)"
+        if unit == "YEAR":
+            sql = f"EXTRACT(YEAR FROM {end}) - EXTRACT(YEAR FROM {start})"
+        elif unit in ("QUARTER", "MONTH"):
+            step = 3 if unit == "QUARTER" else 1
+            sql = f"FLOOR({_months(end)} / {step}) - FLOOR({_months(start)} / {step})"
+        elif unit in ("DAY", "WEEK"):
+            days = f"(CAST({end} AS DATE) - CAST({start} AS DATE))"
+            sql = days if unit == "DAY" else f"FLOOR({days} / 7.0)"
+        else:
+            seconds = _SECONDS[unit]
+            sql = f"FLOOR(EXTRACT(EPOCH FROM {end}) / {seconds}) - FLOOR(EXTRACT(EPOCH FROM {start}) / {seconds})"
+        return f"CAST({sql} AS BIGINT)", "number"
+
+    def _part(ts: str, fmt: str) -> str:
+        return f"CAST(strftime('{fmt}', {ts}) AS INTEGER)"
+
+    def _months_sqlite(ts: str) -> str:
+        return f"({_part(ts, '%Y')} * 12 + {_part(ts, '%m')} - 1)"
+    if unit == "YEAR":
+        sql = f"{_part(end, '%Y')} - {_part(start, '%Y')}"
+    elif unit in ("QUARTER", "MONTH"):
+        step = 3 if unit == "QUARTER" else 1
+        sql = f"{_months_sqlite(end)} / {step} - {_months_sqlite(start)} / {step}"
+    elif unit in ("DAY", "WEEK"):
+        days = f"(julianday(date({end})) - julianday(date({start})))"
+        sql = days if unit == "DAY" else f"floor({days} / 7.0)"
+    else:
+        seconds = _SECONDS[unit]
+        sql = f"floor(strftime('%s', {end}) / {seconds}.0) - floor(strftime('%s', {start}) / {seconds}.0)"
+    return f"CAST({sql} AS INTEGER)", "number"
+
+
+def _date_trunc(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+    _arity(name, args, 2, 2)
+    unit = compiler.unit(args[0], name)
+    if unit not in _UNITS:
+        raise DSLSQLCompilationError(f"Unsupported DATE_TRUNC unit: {unit}")
+    timestamp = compiler.compile(args[1])
+    # A truncated date stays a date
+    result_type = "date" if timestamp[1] == "date" else "datetime"
+    if compiler.postgres:
+        sql = f"date_trunc('{unit.lower()}', {compiler.temporal(timestamp)})"
+        return (f"CAST({sql} AS DATE)" if result_type == "date" else sql), result_type
+    ts = timestamp[0]
+    function = "date" if result_type == "date" else "datetime"
+    if unit in ("YEAR", "MONTH", "DAY"):
+        modifier = {"YEAR": "'start of year'", "MONTH": "'start of month'", "DAY": "'start of day'"}[unit]
+        return f"{function}({ts}, {modifier})", result_type
+    if unit == "QUARTER":
+        back = f"'-' || ((CAST(strftime('%m', {ts}) AS INTEGER) - 1) % 3) || ' months'"
+        return f"{function}({ts}, 'start of month', {back})", result_type
+    if unit == "WEEK":
+        # Weeks start on Monday
+        back = f"'-' || ((CAST(strftime('%w', {ts}) AS INTEGER) + 6) % 7) || ' days'"
+        return f"{function}({ts}, 'start of day', {back})", result_type
+    fmt = {"HOUR": "%Y-%m-%d %H:00:00", "MINUTE": "%Y-%m-%d %H:%M:00", "SECOND": "%Y-%m-%d %H:%M:%S"}[unit]
+    return f"strftime('{fmt}', {ts})", "datetime"
+
+
+def _extract(compiler: _SQLCompiler, name: str, args: List[Tree]) -> Fragment:
+    _arity(name, args, 2, 2)
+    part = compiler.unit(args[0], name)
+    timestamp = compiler.compile(args[1])
+    if compiler.postgres:
+        if part not in _POSTGRES_PARTS:
+            raise DSLSQLCompilationError(f"Unsupported EXTRACT part: {part}")
+        return f"CAST(EXTRACT({_POSTGRES_PARTS[part]} FROM {compiler.temporal(timestamp)}) AS BIGINT)", "number"
+    if part == "QUARTER":
+        return f"((CAST(strftime('%m', {timestamp[0]}) AS INTEGER) + 2) / 3)", "number"
+    if part not in _SQLITE_PARTS:
+        raise DSLSQLCompilationError(f"EXTRACT part {part} has no SQLite translation")
+    return f"CAST(strftime('{_SQLITE_PARTS[part]}', {timestamp[0]}) AS INTEGER)", "number"
+
+
+_NODE_HANDLERS: Dict[str, NodeHandler] = {
+    "number": _number,
+    "string": _string,
+    "true": _true,
+    "false": _false,
+    "null": _null,
+    "identifier": _identifier,
+    "atom": _group,
+    "sum_expr": _chain,
+    "term": _chain,
+    "unary": _unary,
+    "comparison": _comparison,
+    "and_expr": _logic("AND"),
+    "or_expr": _logic("OR"),
+    "not_expr": _not,
+    "case_expr": _case,
+    "if_expr": _if,
+    "func_call": _func_call,
+    "aggregate_func_call": _aggregate_call,
+    "distribution_expr": _distribution,
+    "relational_exists": _relational_exists,
+    "exists_expr": _exists_expr,
+    "relational_lookup": _relational_lookup,
+    "relational_agg": _relational_agg,
+    "in_range_call": _in_range,
+    "window_func_call": _unsupported,
+    "scalar_subquery": _unsupported,
+}
+
+_FUNCTIONS: Dict[str, FunctionHandler] = {
+    **{name: _passthrough for name in _PASSTHROUGH},
+    "SUBSTR": _substr,
+    "SUBSTRING": _substr,
+    "ROUND": _round,
+    "CONCAT": _concat,
+    "SPLIT_PART": _postgres_only("SPLIT_PART", "string"),
+    "REGEXP_EXTRACT": _regexp_extract,
+    "REGEXP_REPLACE": _regexp_replace,
+    "CAST": _cast,
+    "DATEADD": _dateadd,
+    "DATEDIFF": _datediff,
+    "DATE_TRUNC": _date_trunc,
+    "EXTRACT": _extract,
+}
+
+
+# ----------------------------------------------------------------------
+# Public API
+# ----------------------------------------------------------------------
+
+def compile_dsl_to_sql(
+    expression: Union[str, Tree],
+    dialect: str = DIALECT_SQLITE,
+    table: Optional[str] = None,
+    schema: Optional[DSLSchemaContext] = None,
+) -> SQLExpression:
+    """
+    Compile a DSL expression to a SQL expression.
+
+    Args:
+        expression: DSL expression string or parse tree
+        dialect: "sqlite" or "postgresql"
+        table: Anchor table the expression is evaluated on (rows of an UPDATE,
+            a generated column or CHECK constraint)
+        schema: Optional schema; when given, the expression is validated with
+            `validate_dsl_expression_with_schema` and column types guide the translation
+
+    Returns:
+        SQLExpression
+
+    Raises:
+        DSLSQLCompilationError: If the expression is invalid or has no translation in the dialect
+    """
+    tree = expression
+    if isinstance(expression, str):
+        if schema is not None:
+            from .validator import validate_dsl_expression_with_schema
+
+            result = validate_dsl_expression_with_schema(expression, schema, anchor_table=table)
+            if not result.get("valid", False):
+                raise DSLSQLCompilationError(f"Invalid DSL expression {expression!r}: {result.get('error')}")
+        try:
+            tree = parse_dsl_expression(expression)
+        except Exception as e:
+            raise DSLSQLCompilationError(f"Cannot parse DSL expression {expression!r}: {e}") from e
+    compiler = _SQLCompiler(dialect, table, schema)
+    sql, _ = compiler.compile(tree)
+    return SQLExpression(sql=sql, dialect=dialect, columns=frozenset(compiler.columns), row_level=compiler.row_level)
+
+
+def _row_level(expression: Union[str, Tree], dialect: str, table: Optional[str],
+               schema: Optional[DSLSchemaContext], what: str) -> SQLExpression:
+    compiled = compile_dsl_to_sql(expression, dialect=dialect, table=table, schema=schema)
+    if not compiled.row_level:
+        raise DSLSQLCompilationError(f"{what} cannot contain subqueries (relational functions); use update_sql")
+    return compiled
+
+
+def generated_column_sql(
+    column: str,
+    sql_type: str,
+    expression: Union[str, Tree],
+    dialect: str = DIALECT_SQLITE,
+    table: Optional[str] = None,
+    schema: Optional[DSLSchemaContext] = None,
+) -> str:
+    """
+    Column definition for a stored generated column (for CREATE TABLE).
+
+    Example: "total" NUMERIC GENERATED ALWAYS AS (("quantity" * "unit_price")) STORED
+    """
+    compiled = _row_level(expression, dialect, table, schema, "Generated columns")
+    return f"{quote_identifier(column)} {sql_type} GENERATED ALWAYS AS ({compiled.sql}) STORED"
+
+
+def check_constraint_sql(
+    expression: Union[str, Tree],
+    dialect: str = DIALECT_SQLITE,
+    table: Optional[str] = None,
+    schema: Optional[DSLSchemaContext] = None,
+    name: Optional[str] = None,
+) -> str:
+    """
+    Table constraint clause for a row-level DSL predicate.
+
+    Example: CONSTRAINT "chk_price" CHECK (("price" > 0))
+    """
+    compiled = _row_level(expression, dialect, table, schema, "CHECK constraints")
+    prefix = f"CONSTRAINT {quote_identifier(name)} " if name else ""
+    return f"{prefix}CHECK ({compiled.sql})"
+
+
+def update_sql(
+    table: str,
+    assignments: Mapping[str, Union[str, Tree]],
+    dialect: str = DIALECT_SQLITE,
+    schema: Optional[DSLSchemaContext] = None,
+    where: Optional[Union[str, Tree]] = None,
+) -> str:
+    """
+    UPDATE statement computing columns from DSL expressions, set-based over the table.
+
+    All assignments read the values from before the update, so derived columns
+    that depend on each other need one statement each (in dependency order).
+
+    Args:
+        table: Table to update
+        assignments: Column -> DSL expression
+        dialect: "sqlite" or "postgresql"
+        schema: Optional schema for validation and typing
+        where: Optional DSL predicate restricting the updated rows
+
+    Returns:
+        UPDATE statement
+    """
+    if not assignments:
+        raise DSLSQLCompilationError("update_sql needs at least one assignment")
+    sets = ", ".join(
+        f"{quote_identifier(column)} = {compile_dsl_to_sql(expr, dialect=dialect, table=table, schema=schema).sql}"
+        for column, expr in assignments.items()
+    )
+    statement = f"UPDATE {quote_identifier(table)} SET {sets}"
+    if where is not None:
+        statement += f" WHERE {compile_dsl_to_sql(where, dialect=dialect, table=table, schema=schema).sql}"
+    return statement
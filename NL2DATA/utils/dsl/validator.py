@@ -22,13 +22,13 @@ from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 from lark import Tree, Token
 
-from .parser import DSLParseError, parse_dsl_expression, parse_tokens
-from .lexer import tokenize_dsl
+from .parser import DSLParseError
 from .grammar_profile import DSLGrammarProfile
 from .schema_context import DSLSchemaContext
 from .function_registry import get_distribution_registry, get_function_registry, supported_distribution_names, supported_function_names
 from .models import ValidationResult, SemanticError, ErrorSeverity, ColumnBoundDSL
 from .errors import SemanticErrorDetail
+from .cache import memoize_validation, parse_dsl_cached
 
 
 _DIST_REGISTRY = get_distribution_registry()
@@ -294,34 +294,54 @@ def _validate_distribution_calls(tree: Tree) -> Optional[SemanticErrorDetail]:
     return None
 
 
-def validate_dsl_expression_strict(dsl: str) -> Dict[str, Any]:
-    """Validate DSL expression against the formal grammar.
+def _profile_from_grammar(grammar: Optional[str]) -> Optional[DSLGrammarProfile]:
+    """Grammar profile of a "profile:<version>[+feature...]" selector (None otherwise)."""
+    if isinstance(grammar, str) and grammar.startswith("profile:"):
+        spec = grammar[len("profile:") :].strip()
+        parts = [p for p in spec.split("+") if p]
+        if parts:
+            return DSLGrammarProfile(version=parts[0], features=frozenset(parts[1:]))
+    return None
 
-    Returns a tool-friendly dict:
-      {"valid": bool, "error": Optional[str]}
+
+def _validate_syntax(dsl: str, profile: Optional[DSLGrammarProfile], tree: Optional[Tree] = None) -> Tuple[Dict[str, Any], Optional[Tree]]:
+    """Parse (through the parse cache unless a tree is given) and check calls.
+
+    Returns:
+        ({"valid", "error"} dict, parse tree or None if parsing failed)
     """
-    # Tokenize first, then parse tokens (proper separation)
-    from .lexer import tokenize_dsl
-    from .parser import parse_tokens
-    
     try:
-        tokens = tokenize_dsl(dsl, return_model=False)
-        if not tokens:
-            return {"valid": False, "error": "Empty or whitespace-only expression"}
-        tree = parse_tokens(tokens, original_text=dsl)
+        if tree is None:
+            tree = parse_dsl_cached(dsl, profile)
+    except DSLParseError as e:
+        return {"valid": False, "error": str(e)}, None
+    except Exception as e:
+        return {"valid": False, "error": f"DSL validation error: {e}"}, None
+    try:
         err = _validate_distribution_calls(tree)
         if err:
-            return {"valid": False, "error": err.format_message()}
+            return {"valid": False, "error": err.format_message()}, tree
         err2 = _validate_function_calls(tree)
         if err2:
-            return {"valid": False, "error": err2.format_message()}
-        return {"valid": True, "error": None}
-    except DSLParseError as e:
-        return {"valid": False, "error": str(e)}
+            return {"valid": False, "error": err2.format_message()}, tree
     except Exception as e:
-        return {"valid": False, "error": f"DSL validation error: {e}"}
+        return {"valid": False, "error": f"DSL validation error: {e}"}, tree
+    return {"valid": True, "error": None}, tree
+
+
+@memoize_validation
+def validate_dsl_expression_strict(dsl: str) -> Dict[str, Any]:
+    """Validate DSL expression against the formal grammar.
+
+    Returns a tool-friendly dict:
+      {"valid": bool, "error": Optional[str]}
+    """
+    if not (dsl or "").strip():
+        return {"valid": False, "error": "Empty or whitespace-only expression"}
+    return _validate_syntax(dsl, None)[0]
 
 
+@memoize_validation
 def validate_dsl_expression(
     dsl: str,
     grammar: Optional[str] = None,
@@ -336,30 +356,7 @@ def validate_dsl_expression(
     # Examples:
     # - "profile:v1" (default)
     # - "profile:v1+between+is_null"
-    profile = None
-    if isinstance(grammar, str) and grammar.startswith("profile:"):
-        spec = grammar[len("profile:") :].strip()
-        parts = [p for p in spec.split("+") if p]
-        if parts:
-            version = parts[0]
-            feats = frozenset(parts[1:])
-            profile = DSLGrammarProfile(version=version, features=feats)
-
-    # Tokenize and parse (proper separation: lexer → tokens → parser)
-    try:
-        tokens = tokenize_dsl(dsl, profile=profile, return_model=False)
-        tree = parse_tokens(tokens, original_text=dsl, profile=profile)
-        err = _validate_distribution_calls(tree)
-        if err:
-            return {"valid": False, "error": err.format_message()}
-        err2 = _validate_function_calls(tree)
-        if err2:
-            return {"valid": False, "error": err2.format_message()}
-        return {"valid": True, "error": None}
-    except DSLParseError as e:
-        return {"valid": False, "error": str(e)}
-    except Exception as e:
-        return {"valid": False, "error": f"DSL validation error: {e}"}
+    return _validate_syntax(dsl, _profile_from_grammar(grammar))[0]
 
 
 def validate_column_bound_dsl(
@@ -408,6 +405,7 @@ def validate_column_bound_dsl(
     )
 
 
+@memoize_validation
 def validate_dsl_expression_with_schema(
     dsl: str,
     schema: DSLSchemaContext,
@@ -415,6 +413,7 @@ def validate_dsl_expression_with_schema(
     anchor_table: Optional[str] = None,
     anchor_column: Optional[str] = None,
     return_model: bool = False,
+    tree: Optional[Tree] = None,
 ) -> Union[Dict[str, Any], ValidationResult]:
     """Validate DSL expression with comprehensive schema-aware semantic checks.
 
@@ -466,6 +465,8 @@ def validate_dsl_expression_with_schema(
         grammar: Optional grammar profile (for extensions)
         anchor_table: Optional anchor table name for anchor-first identifier resolution
         anchor_column: Optional anchor column name (for constraint validation warnings)
+        tree: Optional parse tree of `dsl` (parsed with the same grammar), e.g. from the
+            pipeline's parse phase; the expression is then not parsed again
 
     Returns:
         If return_model=False: Dictionary with:
@@ -491,10 +492,9 @@ def validate_dsl_expression_with_schema(
           fail unless the identifier itself is invalid.
         - Schema validation happens first (identifier resolution), then type checking.
         - All type checks use types from the schema when available.
+        - Results are cached by (expression, grammar, anchor, schema fingerprint); see cache.py.
     """
-    _ = grammar
-
-    strict = validate_dsl_expression(dsl, grammar=grammar)
+    strict, tree = _validate_syntax(dsl, _profile_from_grammar(grammar), tree)
     if not strict.get("valid", False):
         if return_model:
             # Convert dict error to ValidationResult
@@ -507,39 +507,6 @@ def validate_dsl_expression_with_schema(
             return ValidationResult.from_errors(dsl, semantic_errors)
         return strict
 
-    # If caller passes a profile via `grammar`, parse with that same profile.
-    profile = None
-    if isinstance(grammar, str) and grammar.startswith("profile:"):
-        spec = grammar[len("profile:") :].strip()
-        if spec:
-            parts = [p for p in spec.split("+") if p]
-            version = parts[0]
-            feats = frozenset(parts[1:])
-            profile = DSLGrammarProfile(version=version, features=feats)
-
-    try:
-        # Tokenize first, then parse tokens (proper separation: lexer → tokens → parser)
-        tokens = tokenize_dsl(dsl, profile=profile, return_model=False)
-        tree = parse_tokens(tokens, original_text=dsl, profile=profile)
-    except DSLParseError as e:
-        if return_model:
-            semantic_errors = [SemanticError(
-                error_type="Parse Error",
-                message=str(e),
-                severity=ErrorSeverity.ERROR,
-            )]
-            return ValidationResult.from_errors(dsl, semantic_errors)
-        return {"valid": False, "error": str(e)}
-    except Exception as e:
-        if return_model:
-            semantic_errors = [SemanticError(
-                error_type="Validation Error",
-                message=f"DSL validation error: {e}",
-                severity=ErrorSeverity.ERROR,
-            )]
-            return ValidationResult.from_errors(dsl, semantic_errors)
-        return {"valid": False, "error": f"DSL validation error: {e}"}
-
     errors: List[SemanticErrorDetail] = []
     warnings: List[str] = []
     
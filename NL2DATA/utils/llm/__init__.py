@@ -4,6 +4,11 @@ This module provides:
 - Standardized LLM call interface with enforced Pydantic output
 - Agent executor utilities for tool-based workflows
 - Chain utilities for simple structured output
+- Persistent response cache for deterministic structured calls
+- Process-wide registry of pooled chat model clients
+- Cache of compiled chains/executors shared by identical calls
+- Multi-entity request packing for per-entity steps
+- Offline batch submission mode for whole corpora
 """
 
 from .standardized_calls import (
@@ -20,6 +25,39 @@ from .agent_utils import (
     invoke_agent_with_structured_output,
     invoke_agent_with_retry,
 )
+from .response_cache import (
+    LLMResponseCache,
+    get_response_cache,
+    reset_response_cache,
+)
+from .client_registry import (
+    get_chat_model,
+    get_chat_model_like,
+    llm_client_stats,
+    clear_llm_clients,
+)
+from .chain_cache import (
+    chain_cache_stats,
+    clear_chain_cache,
+)
+from .request_packing import (
+    plan_packs,
+    packed_output_model,
+    run_packed,
+)
+from .batch_mode import (
+    BatchBackend,
+    BatchCollector,
+    BatchRequestError,
+    LocalFileBatchBackend,
+    OpenAIBatchBackend,
+    get_batch_collector,
+    run_offline_batch,
+)
+from .token_usage import (
+    TokenUsageCallbackHandler,
+    with_callback,
+)
 from .error_feedback import (
     NoneOutputError,
     NoneFieldError,
@@ -40,6 +78,33 @@ __all__ = [
     "create_agent_executor_chain",
     "invoke_agent_with_structured_output",
     "invoke_agent_with_retry",
+    # Response cache
+    "LLMResponseCache",
+    "get_response_cache",
+    "reset_response_cache",
+    # Pooled clients
+    "get_chat_model",
+    "get_chat_model_like",
+    "llm_client_stats",
+    "clear_llm_clients",
+    # Chain cache
+    "chain_cache_stats",
+    "clear_chain_cache",
+    # Request packing
+    "plan_packs",
+    "packed_output_model",
+    "run_packed",
+    # Offline batch mode
+    "BatchBackend",
+    "BatchCollector",
+    "BatchRequestError",
+    "LocalFileBatchBackend",
+    "OpenAIBatchBackend",
+    "get_batch_collector",
+    "run_offline_batch",
+    # Token usage
+    "TokenUsageCallbackHandler",
+    "with_callback",
     # Error handling
     "NoneOutputError",
     "NoneFieldError",
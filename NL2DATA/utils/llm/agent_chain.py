@@ -56,6 +56,7 @@ except ImportError:
     HAS_RUNNABLE_RETRY = False
     RunnableRetry = None
 
+from NL2DATA.utils.llm.client_registry import get_chat_model_like
 from NL2DATA.utils.llm.tool_converter import convert_to_structured_tools
 from NL2DATA.utils.llm.prompt_enhancement import enhance_system_prompt
 from NL2DATA.utils.llm.tool_utils import (
@@ -129,18 +130,9 @@ def create_agent_executor_chain(
     # Create agent using LangChain's create_tool_calling_agent
     # Set max_retries=0 on LLM to avoid double-retrying (network retries handled by .with_retry())
     llm_for_agent = llm
-    if hasattr(llm, 'max_retries'):
-        # Create a copy with max_retries=0 if possible
-        try:
-            llm_for_agent = llm.__class__(
-                model=llm.model_name if hasattr(llm, 'model_name') else getattr(llm, 'model', None),
-                temperature=getattr(llm, 'temperature', 0),
-                timeout=getattr(llm, 'timeout', None),
-                max_retries=0,  # No retries here - handled by .with_retry() below
-            )
-        except Exception as e:
-            logger.warning(f"Could not create LLM copy with max_retries=0: {e}. Using original LLM.")
-            llm_for_agent = llm
+    if isinstance(llm, ChatOpenAI):
+        # Pooled variant with max_retries=0 (network retries handled by .with_retry() below)
+        llm_for_agent = get_chat_model_like(llm, max_retries=0)
     
     # Lazy import agents
     AgentExecutor, create_tool_calling_agent = _lazy_import_agents()
@@ -340,17 +332,9 @@ def create_tool_only_executor(
     
     # Set max_retries=0 on LLM to avoid double-retrying
     llm_for_agent = llm
-    if hasattr(llm, 'max_retries'):
-        try:
-            llm_for_agent = llm.__class__(
-                model=llm.model_name if hasattr(llm, 'model_name') else getattr(llm, 'model', None),
-                temperature=getattr(llm, 'temperature', 0),
-                timeout=getattr(llm, 'timeout', None),
-                max_retries=0,
-            )
-        except Exception as e:
-            logger.warning(f"Could not create LLM copy with max_retries=0: {e}. Using original LLM.")
-            llm_for_agent = llm
+    if isinstance(llm, ChatOpenAI):
+        # Pooled variant with max_retries=0 (keeps max_tokens and the API key)
+        llm_for_agent = get_chat_model_like(llm, max_retries=0)
     
     # Lazy import agents
     AgentExecutor, create_tool_calling_agent = _lazy_import_agents()
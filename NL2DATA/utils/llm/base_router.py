@@ -10,6 +10,7 @@ from langchain_core.runnables import RunnableConfig
 
 from NL2DATA.config import get_config
 from NL2DATA.utils.env import get_api_key
+from NL2DATA.utils.llm.client_registry import get_chat_model
 from NL2DATA.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -50,7 +51,7 @@ def get_model_for_task(
         timeout: Request timeout in seconds (defaults to config)
         
     Returns:
-        ChatOpenAI: Configured LangChain model instance
+        ChatOpenAI: Configured LangChain model instance (shared by calls with the same settings)
         
     Example:
         >>> # For simple task
@@ -175,5 +176,6 @@ def get_model_for_task(
     # but we can add them via RunnableConfig when invoking
     # For now, we'll add them via model_kwargs if supported in future versions
     
-    return ChatOpenAI(**model_kwargs)
+    # Shared instance per configuration (pooled HTTP connections, see client_registry.py)
+    return get_chat_model(ChatOpenAI, **model_kwargs)
 
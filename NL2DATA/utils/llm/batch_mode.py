@@ -0,0 +1,377 @@
+"""Offline batch submission of LLM requests for whole corpora.
+
+Interactive runs send every LLM request as soon as a step needs it. For corpus
+regeneration (e.g. all of `nl_descriptions.txt`) latency does not matter, and
+batch endpoints (OpenAI Batch API) offer higher throughput at lower cost.
+
+In offline batch mode all descriptions run concurrently in one event loop
+(`run_offline_batch`). Plain structured `StandardizedLLMCall`s do not call the
+model. Instead they hand a chat-completions request body to the active
+`BatchCollector` and wait. Once no new request has arrived for `idle_sec` (all
+descriptions are waiting on the same step), the collector writes the pending
+requests to one JSONL file in the Batch API format, submits it through a
+`BatchBackend`, polls until the job finishes, and resolves each waiting call
+with its response. Each description's graph then resumes to its next step.
+
+Loops run through `SafeLoopExecutor` skip their wall-clock limit in this mode,
+since one iteration can wait hours for its batch job.
+
+Tool-using (agent) calls are not batched and run online. A batched request that
+fails, or whose response does not validate, falls back to the online call with
+its usual retries and error feedback.
+
+Backends:
+- `OpenAIBatchBackend`: OpenAI Files + Batches API
+- `LocalFileBatchBackend`: file-based stand-in that answers requests with a
+  local responder (for tests and dry runs)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import itertools
+import json
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from NL2DATA.utils.llm.json_schema_fix import get_openai_compatible_json_schema
+from NL2DATA.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+_active_collector: contextvars.ContextVar[Optional["BatchCollector"]] = contextvars.ContextVar(
+    "nl2data_batch_collector", default=None
+)
+
+
+class BatchRequestError(Exception):
+    """A batched request failed (job failure, request error or missing response)."""
+
+
+def get_batch_collector() -> Optional["BatchCollector"]:
+    """Batch collector of the current offline batch run (None in interactive mode)."""
+    return _active_collector.get()
+
+
+def build_batch_body(llm: Any, messages: Sequence[Any], output_schema: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Chat-completions request body for one call, as the online chain would send it.
+
+    Args:
+        llm: ChatOpenAI instance (model, temperature, max_tokens, ...)
+        messages: Rendered prompt messages
+        output_schema: Pydantic output model (sent as a json_schema response format)
+
+    Returns:
+        Request body for a Batch API line
+    """
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": output_schema.__name__,
+            "schema": get_openai_compatible_json_schema(output_schema),
+        },
+    }
+    body = llm._get_request_payload(list(messages), response_format=response_format)
+    body.pop("stream", None)
+    return body
+
+
+def response_content(record: Dict[str, Any]) -> str:
+    """
+    Message content of one Batch API output record.
+
+    Raises:
+        BatchRequestError: If the record holds an error or no content
+    """
+    if record.get("error"):
+        raise BatchRequestError(f"Batched request {record.get('custom_id')} failed: {record['error']}")
+    response = record.get("response") or {}
+    if response.get("status_code", 200) != 200:
+        raise BatchRequestError(
+            f"Batched request {record.get('custom_id')} returned status {response.get('status_code')}"
+        )
+    try:
+        content = response["body"]["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError) as e:
+        raise BatchRequestError(f"Batched request {record.get('custom_id')} has no message content") from e
+    if not content:
+        raise BatchRequestError(f"Batched request {record.get('custom_id')} returned empty content")
+    return content
+
+
+class BatchBackend(ABC):
+    """Submits JSONL batch files and returns their output records."""
+
+    @abstractmethod
+    async def submit(self, input_path: Path) -> str:
+        """Submit a JSONL request file; returns a job id."""
+
+    @abstractmethod
+    async def status(self, job_id: str) -> str:
+        """Job status: "completed", "failed", "expired", "cancelled" or an in-progress status."""
+
+    @abstractmethod
+    async def fetch_results(self, job_id: str) -> List[Dict[str, Any]]:
+        """Output records of a finished job (Batch API output format, with custom_id)."""
+
+
+class LocalFileBatchBackend(BatchBackend):
+    """
+    File-based stand-in for a batch service.
+
+    `submit` answers every request line with `responder(body)` (the message
+    content, or an exception for a failed request) and writes the Batch API
+    output next to the input file, so result handling is the same as for a
+    real backend.
+    """
+
+    def __init__(self, responder: Callable[[Dict[str, Any]], Any]):
+        """
+        Initialize backend.
+
+        Args:
+            responder: Returns the message content for a request body (sync or async)
+        """
+        self.responder = responder
+        self.submitted: List[Path] = []
+
+    async def submit(self, input_path: Path) -> str:
+        output_path = input_path.with_name(f"{input_path.stem}.output.jsonl")
+        records = []
+        with open(input_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                record: Dict[str, Any] = {"custom_id": request["custom_id"], "response": None, "error": None}
+                try:
+                    content = self.responder(request["body"])
+                    if asyncio.iscoroutine(content):
+                        content = await content
+                    record["response"] = {
+                        "status_code": 200,
+                        "body": {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]},
+                    }
+                except Exception as e:
+                    record["error"] = {"code": type(e).__name__, "message": str(e)}
+                records.append(record)
+        with open(output_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=True) + "\n")
+        self.submitted.append(input_path)
+        return str(output_path)
+
+    async def status(self, job_id: str) -> str:
+        return "completed" if Path(job_id).exists() else "failed"
+
+    async def fetch_results(self, job_id: str) -> List[Dict[str, Any]]:
+        with open(job_id, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API backend (uploads the JSONL file, creates a batch, downloads the output)."""
+
+    def __init__(self, client: Any = None, completion_window: str = "24h"):
+        """
+        Initialize backend.
+
+        Args:
+            client: Optional openai.AsyncOpenAI client (created from the configured API key if omitted)
+            completion_window: Batch completion window
+        """
+        if client is None:
+            from openai import AsyncOpenAI
+            from NL2DATA.utils.env import get_api_key
+
+            client = AsyncOpenAI(api_key=get_api_key())
+        self.client = client
+        self.completion_window = completion_window
+
+    async def submit(self, input_path: Path) -> str:
+        with open(input_path, "rb") as f:
+            uploaded = await self.client.files.create(file=f, purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+            metadata={"source": "nl2data", "file": input_path.name},
+        )
+        return batch.id
+
+    async def status(self, job_id: str) -> str:
+        batch = await self.client.batches.retrieve(job_id)
+        return batch.status
+
+    async def fetch_results(self, job_id: str) -> List[Dict[str, Any]]:
+        batch = await self.client.batches.retrieve(job_id)
+        records: List[Dict[str, Any]] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await self.client.files.content(file_id)
+            records.extend(json.loads(line) for line in content.text.splitlines() if line.strip())
+        return records
+
+
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchCollector:
+    """Collects pending LLM requests and submits them as batch jobs."""
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        work_dir: Path,
+        idle_sec: float = 2.0,
+        max_requests: int = 50000,
+        poll_interval_sec: float = 30.0,
+    ):
+        """
+        Initialize collector.
+
+        Args:
+            backend: Batch backend
+            work_dir: Directory for the JSONL request files
+            idle_sec: Submit once no request has arrived for this long
+            max_requests: Submit as soon as this many requests are pending
+            poll_interval_sec: Interval between job status polls
+        """
+        self.backend = backend
+        self.work_dir = Path(work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.idle_sec = idle_sec
+        self.max_requests = max_requests
+        self.poll_interval_sec = poll_interval_sec
+        self._ids = itertools.count(1)
+        self._batch_ids = itertools.count(1)
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self._last_arrival = 0.0
+        self._timer: Optional[asyncio.Task] = None
+        self._jobs: set = set()
+        self.stats = {"requests": 0, "batches": 0, "failed_requests": 0}
+
+    async def request(self, body: Dict[str, Any]) -> str:
+        """
+        Queue one chat-completions request and wait for its response content.
+
+        Raises:
+            BatchRequestError: If the batched request fails
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((f"req-{next(self._ids)}", body, future))
+        self._last_arrival = loop.time()
+        self.stats["requests"] += 1
+        if len(self._pending) >= self.max_requests:
+            self._flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_when_idle())
+        return await future
+
+    async def _flush_when_idle(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            remaining = self._last_arrival + self.idle_sec - loop.time()
+            if remaining <= 0:
+                self._flush()
+                return
+            await asyncio.sleep(remaining)
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, []
+        if pending:
+            job = asyncio.create_task(self._run_batch(pending))
+            self._jobs.add(job)
+            job.add_done_callback(self._jobs.discard)
+
+    async def _run_batch(self, pending: List[Tuple[str, Dict[str, Any], asyncio.Future]]) -> None:
+        batch_number = next(self._batch_ids)
+        input_path = self.work_dir / f"batch_{batch_number:04d}.jsonl"
+        with open(input_path, "w", encoding="utf-8") as f:
+            for custom_id, body, _ in pending:
+                line = {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+                f.write(json.dumps(line, ensure_ascii=True, default=str) + "\n")
+        self.stats["batches"] += 1
+        logger.info(f"Submitting batch {batch_number} with {len(pending)} request(s): {input_path}")
+
+        started = time.monotonic()
+        try:
+            job_id = await self.backend.submit(input_path)
+            status = await self.backend.status(job_id)
+            while status not in _TERMINAL_STATUSES:
+                await asyncio.sleep(self.poll_interval_sec)
+                status = await self.backend.status(job_id)
+            records = {r.get("custom_id"): r for r in await self.backend.fetch_results(job_id)}
+        except Exception as e:
+            logger.error(f"Batch {batch_number} failed: {e}")
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(BatchRequestError(f"Batch {batch_number} failed: {e}"))
+            self.stats["failed_requests"] += len(pending)
+            return
+
+        logger.info(f"Batch {batch_number} {status} in {time.monotonic() - started:.1f}s")
+        for custom_id, _, future in pending:
+            if future.done():
+                continue
+            record = records.get(custom_id)
+            try:
+                if record is None:
+                    raise BatchRequestError(f"No response for {custom_id} in batch {batch_number} ({status})")
+                future.set_result(response_content(record))
+            except BatchRequestError as e:
+                self.stats["failed_requests"] += 1
+                future.set_exception(e)
+
+
+async def run_offline_batch(
+    items: Sequence[T],
+    run_one: Callable[[T], Awaitable[Any]],
+    backend: BatchBackend,
+    work_dir: Path,
+    *,
+    idle_sec: float = 2.0,
+    max_requests: int = 50000,
+    poll_interval_sec: float = 30.0,
+) -> List[Any]:
+    """
+    Run `run_one` for every item (e.g. every NL description) in offline batch mode.
+
+    Args:
+        items: Inputs, one pipeline run each
+        run_one: Runs the pipeline for one input (e.g. `workflow.ainvoke`)
+        backend: Batch backend
+        work_dir: Directory for the JSONL request/response files
+        idle_sec: Submit pending requests after this much inactivity
+        max_requests: Submit as soon as this many requests are pending
+        poll_interval_sec: Interval between job status polls
+
+    Returns:
+        One result per item; failed runs return their exception
+    """
+    collector = BatchCollector(
+        backend,
+        work_dir,
+        idle_sec=idle_sec,
+        max_requests=max_requests,
+        poll_interval_sec=poll_interval_sec,
+    )
+    token = _active_collector.set(collector)
+    try:
+        # Tasks copy the current context, so every run sees the collector
+        return await asyncio.gather(*(run_one(item) for item in items), return_exceptions=True)
+    finally:
+        _active_collector.reset(token)
+        logger.info(f"Offline batch run finished: {collector.stats}")
@@ -0,0 +1,115 @@
+"""In-process cache of compiled chains and agent executors.
+
+Building a chain for `StandardizedLLMCall` is not free. It fixes up the prompts
+(`safe_create_prompt_template`), scans template variables, rewrites the output
+JSON schema for OpenAI and converts tools. Agent chains also run
+`create_tool_calling_agent`. In a per-entity fan-out only the input variables
+change between calls, so the same runnable is rebuilt for every entity.
+
+`cached_runnable` builds a runnable once per
+(kind, model instance, output schema, prompt templates, tool set, options)
+and shares it. Runnables are stateless between invocations, so concurrent calls
+can safely use one instance.
+
+Models and tools are keyed by identity, and the cache holds references to them,
+so an identity cannot be reused while its entry exists. Models from the client
+registry (client_registry.py) are shared per configuration, so identity is
+effectively keyed by model configuration.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from langchain_core.runnables import Runnable
+
+from NL2DATA.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+
+_lock = threading.Lock()
+# key -> (runnable, pinned objects)
+_entries: "OrderedDict[Tuple[Hashable, ...], Tuple[Runnable, Tuple[Any, ...]]]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_max_entries = DEFAULT_MAX_ENTRIES
+
+
+def cached_runnable(
+    kind: str,
+    llm: Any,
+    output_schema: Optional[type],
+    system_prompt: str,
+    human_prompt_template: str,
+    tools: Optional[Sequence[Any]],
+    build: Callable[[], Runnable],
+    **options: Hashable,
+) -> Runnable:
+    """
+    Return the cached runnable for a chain configuration, building it on first use.
+
+    Args:
+        kind: Chain kind ("structured", "agent", "tool_only", ...)
+        llm: Model instance the chain calls
+        output_schema: Pydantic output model (None if the chain has none)
+        system_prompt: System prompt as passed to the builder
+        human_prompt_template: Human prompt template as passed to the builder
+        tools: Tools bound to the chain
+        build: Builds the runnable on a miss
+        **options: Further builder arguments that change the chain (use_parser, max_iterations, ...)
+
+    Returns:
+        Shared runnable
+    """
+    tools = list(tools or [])
+    key = (
+        kind,
+        id(llm),
+        output_schema,
+        system_prompt,
+        human_prompt_template,
+        tuple(id(tool) for tool in tools),
+        tuple(sorted(options.items())),
+    )
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            return entry[0]
+        _stats["misses"] += 1
+
+    runnable = build()
+    with _lock:
+        entry = _entries.setdefault(key, (runnable, (llm, *tools)))
+        _entries.move_to_end(key)
+        while len(_entries) > _max_entries:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+    return entry[0]
+
+
+def set_chain_cache_size(max_entries: int) -> None:
+    """Set the maximum number of cached runnables (least recently used are evicted)."""
+    global _max_entries
+    with _lock:
+        _max_entries = max(1, int(max_entries))
+        while len(_entries) > _max_entries:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+
+
+def chain_cache_stats() -> Dict[str, int]:
+    """Cached runnables and hit/miss/eviction counters."""
+    with _lock:
+        return {"entries": len(_entries), "max_entries": _max_entries, **_stats}
+
+
+def clear_chain_cache() -> None:
+    """Drop all cached runnables and reset the counters."""
+    with _lock:
+        _entries.clear()
+        _stats.update(hits=0, misses=0, evictions=0)
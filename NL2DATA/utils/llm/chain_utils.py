@@ -40,6 +40,12 @@ from NL2DATA.utils.llm.prompt_validation import safe_create_prompt_template
 from NL2DATA.utils.llm.error_feedback import create_error_feedback_message, NoneOutputError, NoneFieldError
 from NL2DATA.utils.llm.model_validation import validate_no_none_fields
 from NL2DATA.utils.llm.json_schema_fix import get_openai_compatible_json_schema, _sanitize_for_json
+from NL2DATA.utils.rate_limiting import (
+    ERROR_INVALID_OUTPUT,
+    ERROR_THROTTLED,
+    ERROR_TRANSIENT,
+    report_llm_error,
+)
 
 logger = get_logger(__name__)
 
@@ -608,6 +614,7 @@ async def invoke_with_retry(
                 raise InvalidResponseFormatSchemaError(str(e)) from e
             # Other BadRequestErrors might be retryable (e.g., invalid schema)
             last_exception = e
+            report_llm_error(ERROR_INVALID_OUTPUT)
             if attempt < max_retries - 1:
                 wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
                 logger.warning(
@@ -620,6 +627,8 @@ async def invoke_with_retry(
                 raise
         except (RateLimitError, APIError) as e:
             last_exception = e
+            # Let adaptive concurrency back off for this step type
+            report_llm_error(ERROR_THROTTLED if isinstance(e, RateLimitError) else ERROR_TRANSIENT)
             if attempt < max_retries - 1:
                 wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
                 logger.warning(
@@ -633,6 +642,8 @@ async def invoke_with_retry(
         except (asyncio.CancelledError, TimeoutError, *HTTPX_TIMEOUT_EXCEPTIONS) as e:
             # Network timeout or cancellation - retry with exponential backoff
             last_exception = e
+            if not isinstance(e, asyncio.CancelledError):
+                report_llm_error(ERROR_TRANSIENT)
             if attempt < max_retries - 1:
                 wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
                 error_type = type(e).__name__
@@ -647,6 +658,7 @@ async def invoke_with_retry(
         except (ValidationError, OutputParserException, NoneOutputError, NoneFieldError) as e:
             # Output parsing/schema errors - capture for feedback
             last_exception = e
+            report_llm_error(ERROR_INVALID_OUTPUT)
             # Try to extract raw output from exception
             if isinstance(e, OutputParserException) and hasattr(e, "llm_output"):
                 last_raw_output = str(e.llm_output)
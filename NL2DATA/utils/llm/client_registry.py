@@ -0,0 +1,173 @@
+"""Process-wide registry of pooled LLM clients.
+
+Every step used to build a fresh `ChatOpenAI`, and with it fresh HTTP clients,
+so per-entity fan-out paid TLS handshakes and connection setup on every call.
+The registry instead returns one model instance per distinct configuration
+(model, temperature, max_tokens, timeout, ...). All instances share one tuned
+HTTP connection pool, which keeps connections alive and uses HTTP/2 when the
+optional `h2` package is installed.
+
+httpx async connections belong to the event loop that opened them. For that
+reason, async pools and the models that use them are kept per running event
+loop. A model requested outside a running loop is not cached and gets no shared
+async pool: its async client is created lazily in whichever loop first awaits
+it, so a later `asyncio.run(...)` never reuses a client bound to a closed loop.
+
+Pool settings live under `openai.http_pool` in config.yaml:
+    http_pool:
+      max_connections: 100
+      max_keepalive_connections: 20
+      keepalive_expiry: 30      # seconds
+      http2: true               # used only if `h2` is installed
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import httpx
+
+from NL2DATA.config import get_config
+from NL2DATA.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+M = TypeVar("M")
+
+_lock = threading.Lock()
+_sync_client: Optional[httpx.Client] = None
+# Async pools per event loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_models: Dict[Tuple[Hashable, ...], Any] = {}
+_stats = {"hits": 0, "misses": 0}
+
+
+def _pool_settings() -> Dict[str, Any]:
+    try:
+        settings = (get_config("openai") or {}).get("http_pool", {}) or {}
+    except Exception as e:
+        logger.debug(f"Using default HTTP pool settings: {e}")
+        settings = {}
+    http2 = bool(settings.get("http2", True)) and importlib.util.find_spec("h2") is not None
+    return {
+        "limits": httpx.Limits(
+            max_connections=int(settings.get("max_connections", 100)),
+            max_keepalive_connections=int(settings.get("max_keepalive_connections", 20)),
+            keepalive_expiry=float(settings.get("keepalive_expiry", 30)),
+        ),
+        "http2": http2,
+    }
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_http_client() -> httpx.Client:
+    """Shared synchronous HTTP client (created on first use)."""
+    global _sync_client
+    with _lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(**_pool_settings())
+        return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Shared async HTTP client of the running event loop (created on first use)."""
+    loop = _running_loop()
+    if loop is None:
+        raise RuntimeError("get_async_http_client() must be called from a running event loop")
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = _async_clients[loop] = httpx.AsyncClient(**_pool_settings())
+        return client
+
+
+def get_chat_model(model_cls: Callable[..., M], **kwargs: Any) -> M:
+    """
+    Return the shared chat model for a configuration, creating it on first use.
+
+    Args:
+        model_cls: Chat model class (e.g. ChatOpenAI); must accept `http_client`
+            and `http_async_client`
+        **kwargs: Constructor arguments (model, temperature, max_tokens, timeout,
+            api_key, max_retries, ...); they must be hashable and form the cache key
+
+    Returns:
+        Model instance shared by all callers with the same configuration and event loop
+        (outside a running loop: a new model without a shared async pool)
+    """
+    loop = _running_loop()
+    if loop is None:
+        # No loop to bind an async pool to; the model creates its own async client lazily
+        with _lock:
+            _stats["misses"] += 1
+        return model_cls(http_client=get_http_client(), **kwargs)
+    key = (model_cls, id(loop)) + tuple(sorted(kwargs.items()))
+    with _lock:
+        model = _models.get(key)
+        if model is not None:
+            _stats["hits"] += 1
+            return model
+        _stats["misses"] += 1
+    model = model_cls(http_client=get_http_client(), http_async_client=get_async_http_client(), **kwargs)
+    with _lock:
+        # Drop the loop's models with its pool once the loop is gone
+        weakref.finalize(loop, _models.pop, key, None)
+        return _models.setdefault(key, model)
+
+
+def get_chat_model_like(llm: Any, **overrides: Any) -> Any:
+    """
+    Return the shared ChatOpenAI with the settings of `llm` plus overrides
+    (e.g. `max_retries=0` for agents that retry via `.with_retry()`).
+
+    Args:
+        llm: ChatOpenAI instance
+        **overrides: Settings to change
+
+    Returns:
+        Registry model, or `llm` itself if its settings cannot be read
+    """
+    try:
+        api_key = getattr(llm, "openai_api_key", None)
+        settings = {
+            "model": llm.model_name,
+            "temperature": llm.temperature,
+            "max_tokens": llm.max_tokens,
+            "timeout": llm.request_timeout,
+            "api_key": api_key.get_secret_value() if api_key is not None else None,
+            "max_retries": llm.max_retries,
+        }
+    except AttributeError as e:
+        logger.warning(f"Cannot derive a pooled client from {type(llm).__name__}: {e}. Using it as is.")
+        return llm
+    settings.update(overrides)
+    return get_chat_model(type(llm), **settings)
+
+
+def llm_client_stats() -> Dict[str, int]:
+    """Registry counters: cached models and hits/misses."""
+    with _lock:
+        return {"models": len(_models), **_stats}
+
+
+def clear_llm_clients() -> None:
+    """Drop all cached models and close the shared synchronous HTTP client."""
+    global _sync_client
+    with _lock:
+        _models.clear()
+        _stats.update(hits=0, misses=0)
+        if _sync_client is not None:
+            _sync_client.close()
+        _sync_client = None
+        # Async clients can only be closed from their loop; dropping them releases the pools
+        _async_clients.clear()
@@ -5,6 +5,7 @@ from typing import Optional
 
 from NL2DATA.config import get_config
 from NL2DATA.utils.env import get_api_key
+from NL2DATA.utils.llm.client_registry import get_chat_model
 from NL2DATA.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -26,7 +27,7 @@ def get_llm_model(
         timeout: Request timeout in seconds (defaults to config)
         
     Returns:
-        ChatOpenAI: Configured LangChain model instance
+        ChatOpenAI: Configured LangChain model instance (shared by calls with the same settings)
     """
     # Get API key
     api_key = get_api_key()
@@ -43,7 +44,8 @@ def get_llm_model(
     # Note: Logging is handled by base_router.py to avoid duplicates
     # Only log here if this function is called directly (not via base_router)
     
-    return ChatOpenAI(
+    return get_chat_model(
+        ChatOpenAI,
         model=model,
         temperature=temp,
         max_tokens=tokens,
@@ -0,0 +1,162 @@
+"""Multi-entity request packing for per-entity LLM steps.
+
+Per-entity steps (2.2 intrinsic attributes, 2.7 primary keys, ...) issue one
+request per entity through `asyncio.gather`. Most of each request is shared: the
+system prompt, the rules and the NL description. Packing puts several small
+entities into one request whose output is a list of per-entity results keyed by
+entity name, which cuts the request count (and RPM pressure) for schemas with
+many small entities.
+
+Packs are sized from the step registry: `avg_tokens_per_call` is split like the
+cost estimators do (75% input, mostly shared; 25% output, per entity), and
+entities are added to a pack while the estimate stays within the token budget.
+
+A pack whose call fails (context overflow, invalid output, ...) is split in
+half and retried. Entities that are missing from a packed result, or whose
+result is rejected, are retried in a smaller pack. Single entities always go
+through the regular per-entity call, so packing never loses an entity.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Type, TypeVar
+
+from pydantic import BaseModel, Field, create_model
+
+from NL2DATA.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Share of `avg_tokens_per_call` that is per-entity output (see step_registry.estimators)
+OUTPUT_TOKEN_SHARE = 0.25
+
+
+def plan_packs(
+    items: Sequence[T],
+    step_id: str,
+    *,
+    token_budget: int,
+    max_items: int,
+    item_tokens: Optional[Callable[[T], int]] = None,
+) -> List[List[T]]:
+    """
+    Group items into packs that fit the token budget of one request.
+
+    Args:
+        items: Items (entities, tables, ...) in request order
+        step_id: Step registry id (e.g. "P2_S2_INTRINSIC_ATTRIBUTES")
+        token_budget: Estimated tokens allowed per packed request
+        max_items: Maximum items per pack
+        item_tokens: Optional estimate of an item's own prompt tokens (context section)
+
+    Returns:
+        Packs in item order; every item appears exactly once
+    """
+    # Imported lazily: the orchestration package imports the phase steps
+    from NL2DATA.orchestration.step_registry import get_step_by_id
+
+    step = get_step_by_id(step_id)
+    avg_tokens = step.avg_tokens_per_call if step is not None else 2000
+    per_item = int(avg_tokens * OUTPUT_TOKEN_SHARE)
+    shared = avg_tokens - per_item
+    max_items = max(1, int(max_items))
+
+    packs: List[List[T]] = []
+    current: List[T] = []
+    used = shared
+    for item in items:
+        cost = per_item + (item_tokens(item) if item_tokens else 0)
+        if current and (len(current) >= max_items or used + cost > token_budget):
+            packs.append(current)
+            current, used = [], shared
+        current.append(item)
+        used += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+@lru_cache(maxsize=None)
+def packed_output_model(item_model: Type[BaseModel], field_name: str = "entity_results") -> Type[BaseModel]:
+    """
+    List-shaped output schema for a packed request.
+
+    The model has one field, `field_name`, holding a list of `item_model`
+    (which must carry the entity key, e.g. `entity_name`). Models are cached,
+    so chain caching sees the same schema for every pack.
+    """
+    return create_model(
+        f"Packed{item_model.__name__}",
+        **{
+            field_name: (
+                List[item_model],
+                Field(description="One result per requested entity, keyed by entity name"),
+            )
+        },
+    )
+
+
+async def run_packed(
+    items: Sequence[T],
+    packs: Sequence[Sequence[T]],
+    key: Callable[[T], str],
+    call_pack: Callable[[List[T]], Awaitable[Dict[str, R]]],
+    call_single: Callable[[T], Awaitable[R]],
+    accept: Optional[Callable[[T, R], bool]] = None,
+) -> List[Any]:
+    """
+    Run packed requests, splitting on failure, and return one result per item.
+
+    Args:
+        items: All items, in output order
+        packs: Packs from `plan_packs`
+        key: Item key (entity name) used in packed results
+        call_pack: Makes one packed request; returns results by key
+        call_single: Regular per-entity call
+        accept: Optional check of a packed result; rejected items are retried
+
+    Returns:
+        Results in item order; like `asyncio.gather(..., return_exceptions=True)`,
+        an item whose per-entity call failed gets the exception
+    """
+    results: Dict[str, Any] = {}
+
+    async def run_single(item: T) -> None:
+        try:
+            results[key(item)] = await call_single(item)
+        except Exception as e:
+            results[key(item)] = e
+
+    async def run(pack: List[T]) -> None:
+        if len(pack) == 1:
+            await run_single(pack[0])
+            return
+        try:
+            packed = await call_pack(pack)
+        except Exception as e:
+            logger.warning(f"Packed request for {len(pack)} entities failed ({e}); splitting")
+            packed = {}
+
+        rest = []
+        for item in pack:
+            result = packed.get(key(item))
+            if result is not None and (accept is None or accept(item, result)):
+                results[key(item)] = result
+            else:
+                rest.append(item)
+        if not rest:
+            return
+        if len(rest) < len(pack):
+            logger.debug(f"Retrying {len(rest)} of {len(pack)} packed entities")
+            await run(rest)
+            return
+        middle = len(rest) // 2
+        await asyncio.gather(run(rest[:middle]), run(rest[middle:]))
+
+    await asyncio.gather(*(run(list(pack)) for pack in packs))
+    return [results[key(item)] for item in items]
@@ -0,0 +1,339 @@
+"""Persistent, content-addressed cache for structured LLM responses.
+
+Responses are stored in a local SQLite database keyed by a SHA-256 digest of
+everything that determines the model output:
+- model name, temperature and max_tokens
+- the JSON schema of the Pydantic output model
+- the exact rendered prompt messages (role + content)
+
+The cache is size-bounded; when it grows past `max_entries` or `max_bytes`, the
+least recently used entries are evicted. Entry and byte totals are read once when
+the cache is opened and then tracked per write, so a put costs O(1) queries plus
+an indexed scan of the entries it evicts (writes from other processes to the same
+file are not counted until the cache is reopened). Hit/miss counters are kept in
+memory and exposed via `stats()`.
+
+Configuration lives under `langchain` in config.yaml:
+    enable_caching: true
+    cache:
+      path: "cache/llm_responses.sqlite3"   # relative to NL2DATA root
+      max_entries: 50000
+      max_bytes: 536870912
+      only_deterministic: true            # only cache temperature == 0 calls
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from NL2DATA.config import get_config
+from NL2DATA.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Least recently used entries fetched per eviction query
+_EVICTION_BATCH = 64
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    schema_name TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON llm_responses(last_access);
+"""
+
+
+def _schema_fingerprint(output_schema: Type[BaseModel]) -> str:
+    """Stable fingerprint of a Pydantic output schema."""
+    try:
+        schema = output_schema.model_json_schema()
+        return json.dumps(schema, sort_keys=True, default=str)
+    except Exception:
+        # Some schemas use custom generators that may fail outside OpenAI wrappers.
+        return f"{output_schema.__module__}.{output_schema.__qualname__}"
+
+
+def _serialize_messages(messages: List[Any]) -> List[Dict[str, str]]:
+    """Reduce LangChain messages to (role, content) pairs for hashing."""
+    out: List[Dict[str, str]] = []
+    for m in messages or []:
+        role = getattr(m, "type", None) or type(m).__name__
+        content = getattr(m, "content", m)
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True, default=str)
+        out.append({"role": str(role), "content": content})
+    return out
+
+
+def make_cache_key(
+    *,
+    model: Optional[str],
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+    output_schema: Type[BaseModel],
+    messages: List[Any],
+) -> str:
+    """
+    Build a content-addressed cache key for an LLM call.
+
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        max_tokens: Max output tokens
+        output_schema: Pydantic model class for structured output
+        messages: Rendered prompt messages (LangChain messages or plain strings)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    material = {
+        "model": model,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "schema": _schema_fingerprint(output_schema),
+        "messages": _serialize_messages(messages),
+    }
+    raw = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed LRU cache of structured LLM responses.
+
+    Values are stored as the JSON dump of the Pydantic result and re-validated
+    against the requested schema on read, so a schema change never returns a
+    stale object (the schema is also part of the key).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = 50_000,
+        max_bytes: int = 512 * 1024 * 1024,
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            path: SQLite database file path (created if missing)
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total payload size in bytes
+        """
+        self.path = Path(path)
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA_SQL)
+        self._count, self._bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_responses"
+        ).fetchone()
+
+    def get(self, key: str, output_schema: Type[BaseModel]) -> Optional[BaseModel]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_cache_key()
+            output_schema: Pydantic model class to validate the payload into
+
+        Returns:
+            Pydantic model instance, or None on miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_responses SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+
+        try:
+            result = output_schema.model_validate_json(row[0])
+        except ValidationError as e:
+            logger.warning(f"Discarding invalid cached {output_schema.__name__} response: {e}")
+            self.delete(key)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: BaseModel) -> None:
+        """
+        Store a response and evict least recently used entries if over budget.
+
+        Args:
+            key: Cache key from make_cache_key()
+            result: Pydantic model instance to store
+        """
+        payload = result.model_dump_json()
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._forget_locked(key)
+            self._conn.execute(
+                "INSERT INTO llm_responses "
+                "(key, schema_name, payload, size_bytes, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, type(result).__name__, payload, size, now, now),
+            )
+            self._count += 1
+            self._bytes += size
+            self._evict_locked()
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry."""
+        with self._lock:
+            self._forget_locked(key)
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._count = 0
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def _forget_locked(self, key: str) -> None:
+        """Delete an entry, if present, and update the tracked totals."""
+        row = self._conn.execute("SELECT size_bytes FROM llm_responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            self._count -= 1
+            self._bytes -= row[0]
+
+    def _evict_locked(self) -> None:
+        """Evict LRU entries (oldest first, via the last_access index) until both budgets are satisfied."""
+        evicted = 0
+        while self._count > self.max_entries or self._bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size_bytes FROM llm_responses ORDER BY last_access ASC LIMIT ?",
+                (max(self._count - self.max_entries, _EVICTION_BATCH),),
+            ).fetchall()
+            if not rows:
+                # Totals drifted from the table (e.g. another process wrote to it)
+                self._count, self._bytes = 0, 0
+                break
+            to_delete = []
+            for key, size in rows:
+                if self._count <= self.max_entries and self._bytes <= self.max_bytes:
+                    break
+                to_delete.append((key,))
+                self._count -= 1
+                self._bytes -= size
+            self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", to_delete)
+            evicted += len(to_delete)
+        self.evictions += evicted
+        if evicted:
+            logger.debug(f"Evicted {evicted} LLM cache entries")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "entries": self._count,
+                "bytes": self._bytes,
+            }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# Global cache instance (lazy initialization)
+_response_cache: Optional[LLMResponseCache] = None
+_response_cache_initialized = False
+_only_deterministic = True
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Get or create the global response cache.
+
+    Returns:
+        LLMResponseCache instance, or None if caching is disabled in config
+    """
+    global _response_cache, _response_cache_initialized, _only_deterministic
+
+    if _response_cache_initialized:
+        return _response_cache
+    _response_cache_initialized = True
+
+    try:
+        langchain_config = get_config("langchain") or {}
+        if not langchain_config.get("enable_caching", False):
+            logger.info("LLM response caching is disabled in config")
+            return None
+
+        cache_config = langchain_config.get("cache", {}) or {}
+        nl2data_root = Path(__file__).parent.parent.parent
+        path = Path(cache_config.get("path", "cache/llm_responses.sqlite3"))
+        if not path.is_absolute():
+            path = nl2data_root / path
+        _only_deterministic = bool(cache_config.get("only_deterministic", True))
+
+        _response_cache = LLMResponseCache(
+            path=path,
+            max_entries=cache_config.get("max_entries", 50_000),
+            max_bytes=cache_config.get("max_bytes", 512 * 1024 * 1024),
+        )
+        logger.info(f"Initialized LLM response cache at {path}")
+        return _response_cache
+    except Exception as e:
+        logger.warning(f"Failed to initialize LLM response cache: {e}. Continuing without caching.")
+        _response_cache = None
+        return None
+
+
+def is_cacheable_temperature(temperature: Optional[float]) -> bool:
+    """Whether a call at this temperature may be served from cache."""
+    if not _only_deterministic:
+        return True
+    return temperature is None or float(temperature) == 0.0
+
+
+def reset_response_cache():
+    """Reset the global response cache instance (useful for testing)."""
+    global _response_cache, _response_cache_initialized, _only_deterministic
+    if _response_cache is not None:
+        try:
+            _response_cache.close()
+        except Exception:
+            pass
+    _response_cache = None
+    _response_cache_initialized = False
+    _only_deterministic = True
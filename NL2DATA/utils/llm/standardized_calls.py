@@ -11,12 +11,20 @@ from typing import TypeVar, Type, Optional, Any, Dict, List
 from pydantic import BaseModel, ValidationError
 from langchain_openai import ChatOpenAI
 from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.prompts import ChatPromptTemplate
 import json
 
 from NL2DATA.utils.llm.chain_utils import (
     create_structured_chain,
     invoke_with_retry,
     InvalidResponseFormatSchemaError,
+    _split_prompt_messages,
+)
+from NL2DATA.utils.llm.batch_mode import (
+    BatchCollector,
+    BatchRequestError,
+    build_batch_body,
+    get_batch_collector,
 )
 from NL2DATA.utils.llm.agent_utils import (
     create_agent_executor_chain,
@@ -24,9 +32,17 @@ from NL2DATA.utils.llm.agent_utils import (
     invoke_agent_with_retry,
 )
 from NL2DATA.utils.llm.agent_chain import create_tool_only_executor
+from NL2DATA.utils.llm.chain_cache import cached_runnable
 from NL2DATA.utils.llm.tool_result_extraction import format_tool_results_for_prompt
 from NL2DATA.utils.llm.error_feedback import NoneOutputError, NoneFieldError
 from NL2DATA.utils.llm.model_validation import validate_no_none_fields
+from NL2DATA.utils.llm.parsing_helpers import parse_from_json_string
+from NL2DATA.utils.llm.response_cache import (
+    get_response_cache,
+    is_cacheable_temperature,
+    make_cache_key,
+)
+from NL2DATA.utils.llm.token_usage import TokenUsageCallbackHandler, with_callback
 from NL2DATA.utils.rate_limiting import get_rate_limiter
 from NL2DATA.utils.logging import get_logger
 
@@ -90,42 +106,117 @@ class StandardizedLLMCall:
         self.max_retries = max_retries
         self.agent_max_iterations = agent_max_iterations
         
-        # Create chain or executor
+        # Create chain or executor (shared between calls with the same configuration,
+        # see chain_cache.py)
         if self.decouple_tools and self.tools:
             # Decoupled mode: create tool-only executor and structured chain separately
-            self.tool_executor = create_tool_only_executor(
-                llm=llm,
-                tools=self.tools,
-                system_prompt=system_prompt,
-                human_prompt_template=human_prompt_template,
+            self.tool_executor = cached_runnable(
+                "tool_only", llm, None, system_prompt, human_prompt_template, self.tools,
+                lambda: create_tool_only_executor(
+                    llm=llm,
+                    tools=self.tools,
+                    system_prompt=system_prompt,
+                    human_prompt_template=human_prompt_template,
+                    max_iterations=self.agent_max_iterations,
+                ),
                 max_iterations=self.agent_max_iterations,
             )
-            # Structured chain for JSON generation (no tools)
-            self.chain = create_structured_chain(
-                llm=llm,
-                output_schema=output_schema,
-                system_prompt=system_prompt,
-                human_prompt_template=human_prompt_template,
-                tools=None,  # No tools in JSON generation phase
-            )
+            # Structured chain for JSON generation (no tools in JSON generation phase)
+            self.chain = self._structured_chain(human_prompt_template)
         elif self.use_agent_executor:
             # Coupled mode: agent executor handles both tools and JSON
-            self.executor = create_agent_executor_chain(
-                llm=llm,
-                tools=self.tools,
-                system_prompt=system_prompt,
-                human_prompt_template=human_prompt_template,
+            self.executor = cached_runnable(
+                "agent", llm, None, system_prompt, human_prompt_template, self.tools,
+                lambda: create_agent_executor_chain(
+                    llm=llm,
+                    tools=self.tools,
+                    system_prompt=system_prompt,
+                    human_prompt_template=human_prompt_template,
+                    max_iterations=self.agent_max_iterations,
+                ),
                 max_iterations=self.agent_max_iterations,
             )
         else:
             # Standard structured chain (no tools or tools bound directly)
-            self.chain = create_structured_chain(
-                llm=llm,
-                output_schema=output_schema,
-                system_prompt=system_prompt,
+            self.chain = self._structured_chain(human_prompt_template, tools=self.tools or None)
+
+    def _structured_chain(
+        self,
+        human_prompt_template: str,
+        tools: Optional[List[Any]] = None,
+        use_parser: bool = False,
+    ) -> Runnable:
+        """Structured-output chain for this call's model, schema and system prompt (cached)."""
+        return cached_runnable(
+            "structured", self.llm, self.output_schema, self.system_prompt, human_prompt_template, tools,
+            lambda: create_structured_chain(
+                llm=self.llm,
+                output_schema=self.output_schema,
+                system_prompt=self.system_prompt,
                 human_prompt_template=human_prompt_template,
-                tools=self.tools if self.tools else None,
-            )
+                tools=tools,
+                use_parser=use_parser,
+            ),
+            use_parser=use_parser,
+        )
+    
+    def _render_messages(self, input_data: Dict[str, Any]) -> Optional[List[Any]]:
+        """Render the chain's prompt messages for `input_data` (None if the prompt cannot be rendered)."""
+        # Unwrap RunnableRetry (.bound) and RunnableSequence (.first) to reach the prompt
+        prompt = self.chain
+        for _ in range(4):
+            if isinstance(prompt, ChatPromptTemplate):
+                break
+            prompt = getattr(prompt, "bound", None) or getattr(prompt, "first", None)
+        if not isinstance(prompt, ChatPromptTemplate):
+            return None
+        
+        try:
+            return prompt.format_messages(**input_data)
+        except Exception as e:
+            logger.debug(f"Could not render prompt messages: {e}")
+            return None
+    
+    def _response_cache_key(self, input_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Build the response cache key from the exact rendered prompt messages.
+        
+        Returns None when the call is not cacheable (non-zero temperature when only
+        deterministic calls are cached, or the prompt cannot be rendered).
+        """
+        temperature = getattr(self.llm, "temperature", None)
+        if not is_cacheable_temperature(temperature):
+            return None
+        
+        messages = self._render_messages(input_data)
+        if messages is None:
+            return None
+        
+        return make_cache_key(
+            model=getattr(self.llm, "model_name", None) or getattr(self.llm, "model", None),
+            temperature=temperature,
+            max_tokens=getattr(self.llm, "max_tokens", None),
+            output_schema=self.output_schema,
+            messages=messages,
+        )
+    
+    async def _invoke_batched(self, collector: BatchCollector, input_data: Dict[str, Any]) -> Optional[T]:
+        """
+        Send this call through the offline batch collector (see batch_mode.py).
+        
+        Returns None if the call cannot be batched or the batched response is unusable;
+        the caller then makes the call online.
+        """
+        messages = self._render_messages(input_data)
+        if messages is None:
+            return None
+        try:
+            body = build_batch_body(self.llm, _split_prompt_messages(messages), self.output_schema)
+            content = await collector.request(body)
+            return parse_from_json_string(content, self.output_schema)
+        except (BatchRequestError, ValidationError, NoneOutputError, NoneFieldError, AttributeError, ValueError) as e:
+            logger.warning(f"Batched {self.output_schema.__name__} call unusable ({e}); calling online")
+            return None
     
     async def invoke(
         self,
@@ -173,9 +264,35 @@ class StandardizedLLMCall:
                         enhanced_input["step_number"] = tag
                         break
         
+        # Serve plain structured calls from the persistent response cache when possible.
+        # Tool-using calls are never cached (tool calls may have side effects/depend on state).
+        response_cache = None
+        cache_key = None
+        if not self.use_agent_executor:
+            response_cache = get_response_cache()
+            if response_cache is not None:
+                cache_key = self._response_cache_key(enhanced_input)
+                if cache_key:
+                    cached = response_cache.get(cache_key, self.output_schema)
+                    if cached is not None:
+                        logger.debug(f"LLM response cache hit: {self.output_schema.__name__}")
+                        return cached
+        
+        # Offline batch mode: plain structured calls go through the batch collector
+        result = None
+        batch_collector = None if self.use_agent_executor else get_batch_collector()
+        if batch_collector is not None:
+            result = await self._invoke_batched(batch_collector, enhanced_input)
+        
         # Get rate limiter (may be None if disabled)
         rate_limiter = get_rate_limiter()
         
+        # Capture actual token usage so the limiter can calibrate its token estimates
+        usage_handler = None
+        if rate_limiter:
+            usage_handler = TokenUsageCallbackHandler()
+            config = with_callback(config, usage_handler)
+        
         # Define the actual invocation function
         async def _invoke_with_rate_limit():
             if self.decouple_tools and self.tools:
@@ -198,14 +315,8 @@ class StandardizedLLMCall:
                 if "{tool_results}" not in json_human_prompt:
                     json_human_prompt = f"{json_human_prompt}\n\nTool Call Results:\n{{tool_results}}"
                 
-                # Create a new chain with updated prompt (or use existing chain and inject tool_results)
-                json_chain = create_structured_chain(
-                    llm=self.llm,
-                    output_schema=self.output_schema,
-                    system_prompt=self.system_prompt,
-                    human_prompt_template=json_human_prompt,
-                    tools=None,
-                )
+                # Chain with the updated prompt (built once per prompt, see chain_cache.py)
+                json_chain = self._structured_chain(json_human_prompt)
                 
                 # Use standard chain with retry
                 try:
@@ -222,14 +333,7 @@ class StandardizedLLMCall:
                         "Falling back to parser-based structured output (decoupled JSON phase) "
                         "due to invalid response_format schema."
                     )
-                    json_chain = create_structured_chain(
-                        llm=self.llm,
-                        output_schema=self.output_schema,
-                        system_prompt=self.system_prompt,
-                        human_prompt_template=json_human_prompt,
-                        tools=None,
-                        use_parser=True,
-                    )
+                    json_chain = self._structured_chain(json_human_prompt, use_parser=True)
                     return await invoke_with_retry(
                         chain=json_chain,
                         input_data=json_input,
@@ -260,14 +364,7 @@ class StandardizedLLMCall:
                     logger.warning(
                         "Falling back to parser-based structured output due to invalid response_format schema."
                     )
-                    parser_chain = create_structured_chain(
-                        llm=self.llm,
-                        output_schema=self.output_schema,
-                        system_prompt=self.system_prompt,
-                        human_prompt_template=self.human_prompt_template,
-                        tools=None,
-                        use_parser=True,
-                    )
+                    parser_chain = self._structured_chain(self.human_prompt_template, use_parser=True)
                     return await invoke_with_retry(
                         chain=parser_chain,
                         input_data=enhanced_input,
@@ -275,11 +372,14 @@ class StandardizedLLMCall:
                         max_retries=self.max_retries,
                     )
         
-        # Execute with rate limiting if enabled
-        if rate_limiter:
-            async with rate_limiter.acquire(step_type=step_type, estimated_tokens=estimated_tokens):
-                result = await _invoke_with_rate_limit()
-        else:
+        # Execute with rate limiting if enabled (unless served by the offline batch)
+        if result is None and rate_limiter:
+            async with rate_limiter.acquire(step_type=step_type, estimated_tokens=estimated_tokens) as permit:
+                try:
+                    result = await _invoke_with_rate_limit()
+                finally:
+                    permit.record_usage(usage_handler.get_total_tokens())
+        elif result is None:
             result = await _invoke_with_rate_limit()
         
         # CRITICAL: Check for None output - always raise error for retry
@@ -352,6 +452,12 @@ class StandardizedLLMCall:
                     model_name=self.output_schema.__name__
                 )
         
+        if response_cache is not None and cache_key:
+            try:
+                response_cache.put(cache_key, result)
+            except Exception as cache_error:
+                logger.debug(f"Could not store LLM response in cache: {cache_error}")
+        
         # Note: Detailed logging (messages + response) is now handled in chain_utils.py
         # after the chain invocation completes, so we don't duplicate it here.
         # We only log a summary to the regular logger.
@@ -0,0 +1,62 @@
+"""Token usage capture for LLM calls.
+
+Structured-output chains return only the parsed Pydantic object, so the provider's
+token usage is collected with a callback handler attached to the call config.
+"""
+
+from typing import Any, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import RunnableConfig
+
+
+class TokenUsageCallbackHandler(BaseCallbackHandler):
+    """Sum total tokens over every LLM completion made under a config (including retries)."""
+
+    def __init__(self):
+        super().__init__()
+        self.total_tokens = 0
+        self.calls = 0
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        self.calls += 1
+        tokens = 0
+        for generations in response.generations or []:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) if message is not None else None
+                if usage:
+                    tokens += int(usage.get("total_tokens", 0) or 0)
+        if not tokens and response.llm_output:
+            token_usage = response.llm_output.get("token_usage") or {}
+            tokens = int(token_usage.get("total_tokens", 0) or 0)
+        self.total_tokens += tokens
+
+    def get_total_tokens(self) -> Optional[int]:
+        """Total tokens reported, or None if the provider reported no usage."""
+        return self.total_tokens or None
+
+
+def with_callback(config: Optional[RunnableConfig], handler: BaseCallbackHandler) -> RunnableConfig:
+    """
+    Return a copy of config with an extra callback handler attached.
+
+    Args:
+        config: Optional RunnableConfig (callbacks may be a list or a callback manager)
+        handler: Callback handler to add
+
+    Returns:
+        New RunnableConfig including the handler
+    """
+    new_config: RunnableConfig = dict(config or {})  # type: ignore[assignment]
+    callbacks = new_config.get("callbacks")
+    if callbacks is None:
+        new_config["callbacks"] = [handler]
+    elif isinstance(callbacks, list):
+        new_config["callbacks"] = [*callbacks, handler]
+    else:
+        manager = callbacks.copy()
+        manager.add_handler(handler, inherit=True)
+        new_config["callbacks"] = manager
+    return new_config
@@ -1,6 +1,7 @@
 """Loop utilities for iterative refinement steps."""
 
 from .loop_executor import SafeLoopExecutor, LoopConfig
+from .fingerprint import fingerprint_state
+from .metrics import LoopMetrics, get_loop_metrics
 
-__all__ = ["SafeLoopExecutor", "LoopConfig"]
-
+__all__ = ["SafeLoopExecutor", "LoopConfig", "fingerprint_state", "LoopMetrics", "get_loop_metrics"]
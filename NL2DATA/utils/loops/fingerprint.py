@@ -0,0 +1,81 @@
+"""Structural fingerprints of loop states for cycle detection.
+
+A fingerprint is a Merkle-style hash: every field of a state is hashed once and a
+container's hash is combined from its children's digests. Comparing two states
+therefore never re-serializes a subtree, and ordering a list only sorts fixed-size
+child digests instead of JSON dumps of the items.
+
+Canonicalization (what counts as "the same state"):
+- Strings: whitespace-normalized and lowercased (values of `*_id` fields are kept as-is)
+- Dicts and pydantic models: key order does not matter, None-valued fields are dropped
+- Lists, tuples and sets: order does not matter (compared as multisets)
+"""
+
+import hashlib
+from typing import Any, Dict, Tuple
+
+_NONE_DIGEST = hashlib.sha256(b"none").digest()
+
+
+def fingerprint_state(state: Any) -> str:
+    """
+    Canonical fingerprint of a loop state.
+
+    Args:
+        state: Step result (dicts, lists, pydantic models, scalars)
+
+    Returns:
+        Hex digest; equal for states that are equal after canonicalization
+    """
+    return _digest(state, {}).hex()
+
+
+def _digest(value: Any, memo: Dict[int, Tuple[Any, bytes]]) -> bytes:
+    """Digest of one value; subtrees shared within the state are hashed once (memo by identity)."""
+    if value is None:
+        return _NONE_DIGEST
+    if isinstance(value, str):
+        return hashlib.sha256(b"s" + " ".join(value.lower().split()).encode("utf-8")).digest()
+    if isinstance(value, (bool, int, float)):
+        return hashlib.sha256(f"{type(value).__name__}:{value!r}".encode("utf-8")).digest()
+
+    cached = memo.get(id(value))
+    if cached is not None and cached[0] is value:
+        return cached[1]
+
+    if isinstance(value, dict):
+        digest = _digest_fields(value.items(), memo)
+    elif hasattr(type(value), "model_fields"):
+        digest = _digest_fields(((name, getattr(value, name)) for name in type(value).model_fields), memo)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        hasher = hashlib.sha256(b"l")
+        for child in sorted(_digest(item, memo) for item in value):
+            hasher.update(child)
+        digest = hasher.digest()
+    else:
+        digest = hashlib.sha256(b"o" + str(value).encode("utf-8")).digest()
+
+    memo[id(value)] = (value, digest)
+    return digest
+
+
+def _digest_fields(items, memo: Dict[int, Tuple[Any, bytes]]) -> bytes:
+    """Combine field digests, independent of field order."""
+    fields = []
+    for key, field_value in items:
+        if field_value is None:
+            continue
+        key = str(key)
+        if key.endswith("_id") and isinstance(field_value, str):
+            # Stable IDs are compared exactly
+            field_digest = hashlib.sha256(b"i" + field_value.encode("utf-8")).digest()
+        else:
+            field_digest = _digest(field_value, memo)
+        fields.append((key, field_digest))
+
+    hasher = hashlib.sha256(b"d")
+    for key, field_digest in sorted(fields):
+        hasher.update(key.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(field_digest)
+    return hasher.digest()
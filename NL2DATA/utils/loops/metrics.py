@@ -0,0 +1,98 @@
+"""Per-iteration timing metrics for SafeLoopExecutor loops."""
+
+import threading
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# Histogram buckets for loop iteration time (seconds); iterations are LLM calls
+ITERATION_TIME_BUCKETS: Tuple[float, ...] = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class LoopMetrics:
+    """
+    Collects iteration times and termination reasons of refinement loops, per loop name.
+
+    Exported in the Prometheus text exposition format (`metrics_text()`).
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = ITERATION_TIME_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # loop -> [per-bucket counts, count, sum]
+        self._iterations: Dict[str, list] = {}
+        self._fingerprint_seconds: Dict[str, float] = defaultdict(float)
+        self._terminations: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def observe_iteration(self, loop: str, seconds: float, fingerprint_seconds: float = 0.0) -> None:
+        """Record one iteration (step call time and time spent on cycle detection)."""
+        with self._lock:
+            histogram = self._iterations.get(loop)
+            if histogram is None:
+                histogram = self._iterations[loop] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += 1
+            histogram[2] += seconds
+            self._fingerprint_seconds[loop] += fingerprint_seconds
+
+    def observe_termination(self, loop: str, terminated_by: str) -> None:
+        """Record how a loop run ended."""
+        with self._lock:
+            self._terminations[(loop, terminated_by)] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Iteration count, total and fingerprinting time per loop."""
+        with self._lock:
+            return {
+                loop: {
+                    "iterations": count,
+                    "seconds_total": total,
+                    "fingerprint_seconds_total": self._fingerprint_seconds[loop],
+                }
+                for loop, (_, count, total) in self._iterations.items()
+            }
+
+    def metrics_text(self, prefix: str = "nl2data_loop") -> str:
+        """
+        Render metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            Metrics text (one sample per line)
+        """
+        lines: List[str] = []
+        with self._lock:
+            name = f"{prefix}_iteration_seconds"
+            lines.append(f"# HELP {name} Duration of one refinement loop iteration.")
+            lines.append(f"# TYPE {name} histogram")
+            for loop, (counts, count, total) in sorted(self._iterations.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f'{name}_bucket{{loop="{loop}",le="{bound}"}} {bucket_count}')
+                lines.append(f'{name}_bucket{{loop="{loop}",le="+Inf"}} {count}')
+                lines.append(f'{name}_sum{{loop="{loop}"}} {total}')
+                lines.append(f'{name}_count{{loop="{loop}"}} {count}')
+
+            name = f"{prefix}_fingerprint_seconds_total"
+            lines.append(f"# HELP {name} Time spent fingerprinting states for cycle detection.")
+            lines.append(f"# TYPE {name} counter")
+            for loop, seconds in sorted(self._fingerprint_seconds.items()):
+                lines.append(f'{name}{{loop="{loop}"}} {seconds}')
+
+            name = f"{prefix}_terminations_total"
+            lines.append(f"# HELP {name} Loop runs by termination reason.")
+            lines.append(f"# TYPE {name} counter")
+            for (loop, terminated_by), count in sorted(self._terminations.items()):
+                lines.append(f'{name}{{loop="{loop}",terminated_by="{terminated_by}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+
+_loop_metrics = LoopMetrics()
+
+
+def get_loop_metrics() -> LoopMetrics:
+    """Process-wide loop metrics (shared by all SafeLoopExecutor instances)."""
+    return _loop_metrics
@@ -65,6 +65,12 @@ class Phase2Config:
     # Step 2.2 intrinsic attribute "revise until clean" loop
     step_2_2_max_revision_rounds: int = _get_int("NL2DATA_PHASE2_STEP_2_2_MAX_REVISION_ROUNDS", 5, min_value=0, max_value=10)
 
+    # Step 2.2 request packing: several small entities per LLM request (sized from the step registry).
+    # When enabled, the Phase 2 graph runs 2.1 -> 2.2 as batch steps instead of streaming entities.
+    step_2_2_packing_enabled: int = _get_int("NL2DATA_PHASE2_STEP_2_2_PACKING_ENABLED", 0, min_value=0, max_value=1)
+    step_2_2_packing_token_budget: int = _get_int("NL2DATA_PHASE2_STEP_2_2_PACKING_TOKEN_BUDGET", 12000, min_value=1000, max_value=100000)
+    step_2_2_packing_max_entities: int = _get_int("NL2DATA_PHASE2_STEP_2_2_PACKING_MAX_ENTITIES", 5, min_value=1, max_value=20)
+
     # Step 2.3 synonym validation/retry loop
     step_2_3_max_revision_rounds: int = _get_int("NL2DATA_PHASE2_STEP_2_3_MAX_REVISION_ROUNDS", 5, min_value=0, max_value=10)
 
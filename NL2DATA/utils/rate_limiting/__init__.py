@@ -1,14 +1,31 @@
 """Rate limiting and concurrency control for LLM API calls.
 
-This module provides token bucket rate limiting with per-step-type
-concurrency limits to prevent API throttling and cascading failures.
+This module provides GCRA/token bucket rate limiting with per-step-type
+(optionally adaptive) concurrency limits to prevent API throttling and
+cascading failures.
 """
 
-from .limiter import RateLimiter, run_with_rate_limit
-from .singleton import get_rate_limiter
+from .adaptive import AdaptiveConcurrencyLimit
+from .limiter import (
+    ERROR_INVALID_OUTPUT,
+    ERROR_THROTTLED,
+    ERROR_TRANSIENT,
+    RateLimiter,
+    RatePermit,
+    report_llm_error,
+    run_with_rate_limit,
+)
+from .singleton import get_rate_limiter, reset_rate_limiter
 
 __all__ = [
     "RateLimiter",
+    "RatePermit",
+    "AdaptiveConcurrencyLimit",
+    "report_llm_error",
+    "ERROR_THROTTLED",
+    "ERROR_TRANSIENT",
+    "ERROR_INVALID_OUTPUT",
     "run_with_rate_limit",
     "get_rate_limiter",
+    "reset_rate_limiter",
 ]
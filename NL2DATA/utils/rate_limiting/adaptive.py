@@ -0,0 +1,181 @@
+"""Adaptive (AIMD) concurrency limits for LLM API calls.
+
+A fixed per-step-type limit is either too low for a healthy provider (throughput
+left unused) or too high for a throttling one (every extra call turns into a 429
+and a retry storm). `AdaptiveConcurrencyLimit` finds the limit at runtime, the
+same way TCP congestion control does:
+
+- Additive increase: after a full window of healthy calls (as many calls as the
+  current limit, none throttled) the limit grows by one.
+- Multiplicative decrease: a 429 or a transient provider error (5xx, timeout)
+  shrinks the limit by `backoff_factor`.
+
+Latency is only a congestion signal when `latency_tolerance` is set: then a call
+slower than tolerance x the latency baseline also shrinks the limit. It is off by
+default because one baseline covers a whole step type, whose steps produce very
+different output lengths (e.g. count detection vs attribute generation), so
+normal variation would read as congestion without a single 429.
+
+Only one decrease is applied per congestion episode: calls admitted before the
+last decrease report on a limit that no longer exists and are ignored, so a burst
+of simultaneous 429s halves the limit once instead of collapsing it to the floor.
+
+With `adaptive=False` the limit behaves like a plain FIFO semaphore.
+"""
+
+from collections import deque
+from typing import Deque, Optional
+import asyncio
+
+from NL2DATA.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Weight of the newest healthy call in the latency baseline moving average
+_LATENCY_ALPHA = 0.1
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    Resizable FIFO concurrency limit driven by AIMD feedback.
+
+    Call `acquire()` before the API call and `release()` after it, then report the
+    outcome with `on_success(latency, epoch)` or `on_congestion(epoch)` using the
+    epoch returned by `acquire()`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        backoff_factor: float = 0.7,
+        latency_tolerance: Optional[float] = None,
+        adaptive: bool = True,
+    ):
+        """
+        Initialize the limit.
+
+        Args:
+            name: Step type this limit applies to (for logging)
+            initial_limit: Starting concurrency
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit (defaults to initial_limit)
+            backoff_factor: Multiplier applied on congestion (0 < factor < 1)
+            latency_tolerance: A call slower than tolerance x baseline latency counts as congestion
+                (None: latency is not a congestion signal)
+            adaptive: If False, the limit never changes
+        """
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit if max_limit is not None else initial_limit)
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial_limit)))
+        self.backoff_factor = backoff_factor
+        self.latency_tolerance = latency_tolerance
+        self.adaptive = adaptive
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._healthy_streak = 0
+        self._epoch = 0  # Incremented on every decrease
+        self.baseline_latency: Optional[float] = None
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def current_limit(self) -> int:
+        """Number of calls currently allowed in flight."""
+        return int(self.limit)
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> int:
+        """
+        Wait for a slot (FIFO).
+
+        Returns:
+            Epoch at admission, to be passed back with the call's outcome
+        """
+        if self.in_flight < self.current_limit and not self._waiters:
+            self.in_flight += 1
+            return self._epoch
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot but cancelled before using it: pass it on
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+        return self._epoch
+
+    def release(self) -> None:
+        """Release a slot acquired with `acquire()`."""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.current_limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def on_success(self, latency: float, epoch: int) -> None:
+        """
+        Report a call that completed without provider errors.
+
+        Args:
+            latency: Seconds the call spent holding its slot (per attempt)
+            epoch: Epoch returned by `acquire()`
+        """
+        if not self.adaptive:
+            return
+        baseline = self.baseline_latency
+        self.baseline_latency = latency if baseline is None else baseline + _LATENCY_ALPHA * (latency - baseline)
+        if (
+            self.latency_tolerance is not None
+            and baseline is not None
+            and latency > self.latency_tolerance * baseline
+        ):
+            self.on_congestion(epoch, reason=f"latency {latency:.1f}s > {self.latency_tolerance:g}x baseline {baseline:.1f}s")
+            return
+
+        self._healthy_streak += 1
+        if self._healthy_streak >= self.current_limit and self.limit < self.max_limit:
+            self._healthy_streak = 0
+            self.limit = min(float(self.max_limit), self.limit + 1)
+            self.increases += 1
+            logger.debug(f"Concurrency limit for {self.name} increased to {self.current_limit}")
+            self._wake()
+
+    def on_congestion(self, epoch: int, reason: str = "provider error") -> None:
+        """
+        Report a throttled, failed-transiently or slow call.
+
+        Args:
+            epoch: Epoch returned by `acquire()`
+            reason: Short description for the log
+        """
+        if not self.adaptive:
+            return
+        self._healthy_streak = 0
+        if epoch != self._epoch:
+            return  # Admitted before the last decrease; already accounted for
+        self._epoch += 1
+        previous = self.current_limit
+        self.limit = max(float(self.min_limit), self.limit * self.backoff_factor)
+        if self.current_limit < previous:
+            self.decreases += 1
+            logger.info(f"Concurrency limit for {self.name} decreased {previous} -> {self.current_limit} ({reason})")
@@ -1,64 +1,230 @@
-"""Token bucket rate limiter for LLM API calls.
+"""Rate limiter for LLM API calls.
 
 Provides request-based and token-based rate limiting with per-step-type
-concurrency control.
+concurrency control:
+- Requests/minute are enforced with GCRA (generic cell rate algorithm).
+- Tokens/minute are enforced with a token bucket.
+
+Both are reservation based: an acquirer reserves its slot synchronously (no
+awaits in between, so no lock is needed on the event loop) and then sleeps until
+its slot without holding anything. Reservations are handed out in call order, so
+waiters wake up FIFO and one sleeping waiter never delays the bookkeeping of
+others. All state is O(1) per acquire.
+
+Token estimates are calibrated from the actual usage reported after each call
+(see `RatePermit.record_usage`): the bucket is corrected by the difference and
+per-step-type averages are used to scale future estimates.
+
+Per-step-type concurrency can be adaptive (see `adaptive.py`): the configured
+limits are starting points, grown while calls are healthy and cut back on 429s,
+transient errors (reported from the retry loop via `report_llm_error`) and,
+if `latency_tolerance` is set, latency spikes.
+
+Wait times, usage and current concurrency limits are exported as Prometheus-style
+metrics (`metrics_text()`).
 """
 
-from asyncio import Semaphore, Lock
+from asyncio import Semaphore
+from collections import deque
 from contextlib import asynccontextmanager
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Tuple
+from contextvars import ContextVar
+from typing import Optional, Dict, List, Tuple, Deque, Any
 import asyncio
+import time
 
 from NL2DATA.utils.logging import get_logger
+from .adaptive import AdaptiveConcurrencyLimit
 
 logger = get_logger(__name__)
 
+# Histogram buckets for permit wait time (seconds)
+WAIT_TIME_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Weight of the newest observation in calibration moving averages
+_CALIBRATION_ALPHA = 0.2
+
+_DEFAULT_STEP_TYPE = "default"
+
+# Error kinds reported by retry loops (see `report_llm_error`)
+ERROR_THROTTLED = "throttled"  # HTTP 429
+ERROR_TRANSIENT = "transient"  # 5xx, connection errors, timeouts
+ERROR_INVALID_OUTPUT = "invalid_output"  # Parse/validation failure retried with feedback
+_CONGESTION_ERRORS = (ERROR_THROTTLED, ERROR_TRANSIENT)
+
+# Permit held by the current task (so retry loops can report errors without plumbing)
+_current_permit: ContextVar[Optional["RatePermit"]] = ContextVar("nl2data_rate_permit", default=None)
+
+
+class _Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = WAIT_TIME_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class RatePermit:
+    """
+    Permit handed out by `RateLimiter.acquire`.
+
+    Call `record_usage` with the actual token usage once the call finished so the
+    limiter can correct its token bucket and calibrate future estimates.
+    """
+
+    def __init__(self, limiter: "RateLimiter", step_type: str, estimated_tokens: int, reserved_tokens: int, wait_seconds: float):
+        self._limiter = limiter
+        self.step_type = step_type
+        self.estimated_tokens = estimated_tokens
+        self.reserved_tokens = reserved_tokens
+        self.wait_seconds = wait_seconds
+        self.actual_tokens: Optional[int] = None
+        self.errors: Dict[str, int] = {}
+
+    def record_usage(self, actual_tokens: Optional[int]) -> None:
+        """
+        Record actual token usage for this call (ignored if unknown or already recorded).
+
+        Args:
+            actual_tokens: Total tokens (prompt + completion) reported by the provider
+        """
+        if actual_tokens is None or actual_tokens <= 0 or self.actual_tokens is not None:
+            return
+        self.actual_tokens = int(actual_tokens)
+        self._limiter._record_usage(self)
+
+    def record_error(self, kind: str) -> None:
+        """
+        Record a failed attempt made while holding this permit.
+
+        Args:
+            kind: ERROR_THROTTLED, ERROR_TRANSIENT or ERROR_INVALID_OUTPUT
+        """
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+        self._limiter._record_error(self.step_type, kind)
+
+    @property
+    def congested(self) -> bool:
+        """True if any attempt was throttled or failed transiently."""
+        return any(self.errors.get(kind) for kind in _CONGESTION_ERRORS)
+
+    @property
+    def attempts(self) -> int:
+        return 1 + sum(self.errors.values())
+
+
+def report_llm_error(kind: str) -> None:
+    """
+    Report a failed LLM attempt to the rate limiter permit held by the current task.
+
+    Called from retry loops (e.g. `invoke_with_retry`) so adaptive concurrency can
+    react to 429s and transient errors. No-op outside of `RateLimiter.acquire`.
+
+    Args:
+        kind: ERROR_THROTTLED, ERROR_TRANSIENT or ERROR_INVALID_OUTPUT
+    """
+    permit = _current_permit.get()
+    if permit is not None:
+        permit.record_error(kind)
+
 
 class RateLimiter:
     """
-    Token bucket rate limiter for LLM API calls with per-step-type concurrency limits.
-    
+    GCRA/token-bucket rate limiter for LLM API calls with per-step-type concurrency limits.
+
     CRITICAL: Uses asynccontextmanager to hold semaphores for the full duration
     of the API call, not just during acquisition. This prevents concurrency bursts
     that would trigger throttling.
-    
+
     Also includes token-based rate limiting (tokens/minute) in addition to request-based.
     """
-    
+
     def __init__(
         self,
         requests_per_minute: int = 500,
         tokens_per_minute: int = 1_000_000,
         max_concurrent: int = 10,
-        max_concurrency_per_step_type: Optional[Dict[str, int]] = None
+        max_concurrency_per_step_type: Optional[Dict[str, int]] = None,
+        request_burst: Optional[int] = None,
+        wait_sample_size: int = 1024,
+        adaptive_concurrency: bool = False,
+        min_concurrency: int = 1,
+        max_concurrency: Optional[int] = None,
+        backoff_factor: float = 0.7,
+        latency_tolerance: Optional[float] = None,
     ):
         """
         Initialize rate limiter.
-        
+
         Args:
             requests_per_minute: Maximum requests per minute
             tokens_per_minute: Maximum tokens per minute
             max_concurrent: Global maximum concurrent requests
             max_concurrency_per_step_type: Per-step-type limits (e.g., {"per-entity": 5})
+            request_burst: Requests allowed back-to-back before pacing kicks in
+                (defaults to one minute's worth, matching a 60s sliding window)
+            wait_sample_size: Number of recent wait times kept for percentile stats
+            adaptive_concurrency: Adapt per-step-type limits (AIMD) instead of keeping them fixed;
+                step types without a configured limit start at max_concurrent
+            min_concurrency: Lower bound for adaptive limits
+            max_concurrency: Upper bound for adaptive limits (defaults to max_concurrent)
+            backoff_factor: Multiplicative decrease applied on 429s/transient errors/latency spikes
+            latency_tolerance: Calls slower than tolerance x baseline latency count as congestion
+                (None: latency is not a congestion signal)
         """
-        # Concurrency control: semaphores held for full API call duration
+        # Concurrency control: held for full API call duration. The global semaphore is
+        # a hard ceiling; per-step-type limits may adapt below it.
+        self.max_concurrent = max_concurrent
         self.semaphore = Semaphore(max_concurrent)
-        self.step_type_semaphores: Dict[str, Semaphore] = {}
-        if max_concurrency_per_step_type:
-            for step_type, limit in max_concurrency_per_step_type.items():
-                self.step_type_semaphores[step_type] = Semaphore(limit)
-        
-        # Request rate limiting (requests/minute)
-        self.request_times: List[datetime] = []
-        self._request_lock = Lock()
+        self.adaptive_concurrency = adaptive_concurrency
+        self._limit_options = {
+            "min_limit": min_concurrency,
+            "max_limit": max_concurrency if max_concurrency is not None else max_concurrent,
+            "backoff_factor": backoff_factor,
+            "latency_tolerance": latency_tolerance,
+            "adaptive": adaptive_concurrency,
+        }
+        self.step_type_limits: Dict[str, AdaptiveConcurrencyLimit] = {}
+        for step_type, limit in (max_concurrency_per_step_type or {}).items():
+            self.step_type_limits[step_type] = self._new_limit(step_type, limit)
+
+        # Request rate limiting (GCRA): one request every `_emission_interval` seconds,
+        # with up to `request_burst` requests allowed ahead of schedule.
         self.rpm = requests_per_minute
-        
-        # Token rate limiting (tokens/minute)
-        self.token_times: List[Tuple[datetime, int]] = []
-        self._token_lock = Lock()
+        self._emission_interval = 60.0 / max(1, requests_per_minute)
+        burst = request_burst if request_burst is not None else requests_per_minute
+        self._burst_tolerance = self._emission_interval * max(0, burst - 1)
+        self._tat = 0.0  # Theoretical arrival time of the next request (monotonic clock)
+
+        # Token rate limiting (token bucket). The level may go negative: that is the
+        # backlog already promised to queued waiters.
         self.tpm = tokens_per_minute
-    
+        self._token_rate = max(1, tokens_per_minute) / 60.0
+        self._token_level = float(tokens_per_minute)
+        self._token_updated = time.monotonic()
+
+        # Calibration of token estimates (per step type)
+        self._estimate_ratio: Dict[str, float] = {}
+        self._avg_actual_tokens: Dict[str, float] = {}
+
+        # Metrics
+        self._wait_histograms: Dict[str, _Histogram] = {}
+        self._recent_waits: Deque[float] = deque(maxlen=wait_sample_size)
+        self._requests_total: Dict[str, int] = {}
+        self._errors_total: Dict[Tuple[str, str], int] = {}
+        self._tokens_estimated_total = 0
+        self._tokens_actual_total = 0
+        self._in_flight = 0
+        self._waiting = 0
+
     @asynccontextmanager
     async def acquire(
         self,
@@ -68,89 +234,240 @@ class RateLimiter:
         """
         Acquire permission to make an API call. Returns a context manager that holds
         the permit for the full duration of the API call.
-        
+
         Args:
             step_type: Optional step type (e.g., "per-entity", "per-relation") for per-type limits
             estimated_tokens: Estimated tokens for this call (for token-based rate limiting)
-        
+
+        Yields:
+            RatePermit: call `permit.record_usage(actual_tokens)` after the call
+
         Usage:
-            async with rate_limiter.acquire(step_type="per-entity", estimated_tokens=2000):
+            async with rate_limiter.acquire(step_type="per-entity", estimated_tokens=2000) as permit:
                 result = await llm_call(...)
+                permit.record_usage(actual_tokens)
+        """
+        key = step_type or _DEFAULT_STEP_TYPE
+        step_limit = self._limit_for(key)
+
+        # Reserve rate limit slots (requests/minute and tokens/minute) without awaiting,
+        # then wait for the reserved slot outside of any critical section.
+        reserved_tokens = self._calibrated_estimate(key, estimated_tokens)
+        wait_seconds = max(self._reserve_request(), self._reserve_tokens(reserved_tokens))
+        if wait_seconds > 0:
+            self._waiting += 1
+            try:
+                await asyncio.sleep(wait_seconds)
+            except BaseException:
+                # Cancelled while queued: give the tokens back to later waiters
+                self._adjust_tokens(-reserved_tokens)
+                raise
+            finally:
+                self._waiting -= 1
+
+        self._observe_wait(key, wait_seconds)
+        self._tokens_estimated_total += reserved_tokens
+        permit = RatePermit(self, key, estimated_tokens, reserved_tokens, wait_seconds)
+
+        # Acquire concurrency limits (held for full duration via context manager).
+        # Per-step-type first, so a queued step type does not hold a global slot.
+        epoch = await step_limit.acquire() if step_limit else 0
+        try:
+            async with self.semaphore:  # Global concurrency limit
+                async with self._track_in_flight(permit):
+                    started = time.monotonic()
+                    completed = False
+                    try:
+                        yield permit  # Permit held here - API call happens inside this block
+                        completed = True
+                    finally:
+                        if step_limit:
+                            if permit.congested:
+                                step_limit.on_congestion(epoch, reason=f"errors {permit.errors}")
+                            elif completed:
+                                step_limit.on_success((time.monotonic() - started) / permit.attempts, epoch)
+        finally:
+            if step_limit:
+                step_limit.release()
+
+    def _new_limit(self, step_type: str, initial_limit: int) -> AdaptiveConcurrencyLimit:
+        return AdaptiveConcurrencyLimit(step_type, initial_limit, **self._limit_options)
+
+    def _limit_for(self, key: str) -> Optional[AdaptiveConcurrencyLimit]:
+        """Per-step-type limit; in adaptive mode every step type gets one."""
+        limit = self.step_type_limits.get(key)
+        if limit is None and self.adaptive_concurrency:
+            limit = self.step_type_limits[key] = self._new_limit(key, self.max_concurrent)
+        return limit
+
+    @asynccontextmanager
+    async def _track_in_flight(self, permit: RatePermit):
+        self._in_flight += 1
+        token = _current_permit.set(permit)
+        try:
+            yield
+        finally:
+            _current_permit.reset(token)
+            self._in_flight -= 1
+
+    def _reserve_request(self) -> float:
+        """Reserve the next GCRA request slot; returns seconds to wait for it."""
+        now = time.monotonic()
+        tat = max(self._tat, now)
+        self._tat = tat + self._emission_interval
+        return max(0.0, tat - self._burst_tolerance - now)
+
+    def _refill_tokens(self) -> None:
+        now = time.monotonic()
+        self._token_level = min(
+            float(self.tpm),
+            self._token_level + (now - self._token_updated) * self._token_rate,
+        )
+        self._token_updated = now
+
+    def _reserve_tokens(self, tokens: int) -> float:
+        """Reserve tokens from the bucket; returns seconds until they are available."""
+        if tokens <= 0:
+            return 0.0
+        self._refill_tokens()
+        # A single call larger than the bucket could never fit; cap it at a full bucket.
+        self._token_level -= min(tokens, self.tpm)
+        if self._token_level >= 0:
+            return 0.0
+        return -self._token_level / self._token_rate
+
+    def _adjust_tokens(self, delta: int) -> None:
+        """Charge (delta > 0) or refund (delta < 0) tokens against the bucket."""
+        if delta == 0:
+            return
+        self._refill_tokens()
+        self._token_level = min(float(self.tpm), self._token_level - delta)
+
+    def _calibrated_estimate(self, key: str, estimated_tokens: int) -> int:
+        """Scale the caller's estimate by observed actual/estimated ratio (or use observed average)."""
+        if estimated_tokens > 0:
+            return int(round(estimated_tokens * self._estimate_ratio.get(key, 1.0)))
+        return int(round(self._avg_actual_tokens.get(key, 0.0)))
+
+    def _record_usage(self, permit: RatePermit) -> None:
+        """Correct the bucket by the estimation error and update calibration."""
+        actual = permit.actual_tokens or 0
+        self._adjust_tokens(actual - permit.reserved_tokens)
+        self._tokens_actual_total += actual
+
+        key = permit.step_type
+        if permit.estimated_tokens > 0:
+            ratio = actual / permit.estimated_tokens
+            prev = self._estimate_ratio.get(key)
+            self._estimate_ratio[key] = ratio if prev is None else prev + _CALIBRATION_ALPHA * (ratio - prev)
+        prev_avg = self._avg_actual_tokens.get(key)
+        self._avg_actual_tokens[key] = actual if prev_avg is None else prev_avg + _CALIBRATION_ALPHA * (actual - prev_avg)
+
+    def _record_error(self, key: str, kind: str) -> None:
+        self._errors_total[(key, kind)] = self._errors_total.get((key, kind), 0) + 1
+
+    def concurrency_limits(self) -> Dict[str, int]:
+        """Current per-step-type concurrency limits."""
+        return {step_type: limit.current_limit for step_type, limit in self.step_type_limits.items()}
+
+    def _observe_wait(self, key: str, wait_seconds: float) -> None:
+        histogram = self._wait_histograms.get(key)
+        if histogram is None:
+            histogram = self._wait_histograms[key] = _Histogram()
+        histogram.observe(wait_seconds)
+        self._recent_waits.append(wait_seconds)
+        self._requests_total[key] = self._requests_total.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of limiter state and recent wait-time percentiles.
+
+        Returns:
+            Dictionary with request/token counters, bucket level, in-flight/waiting
+            counts, calibration ratios, current concurrency limits, error counts and
+            p50/p95/max wait over the recent sample
+        """
+        self._refill_tokens()
+        waits = sorted(self._recent_waits)
+
+        def _pct(p: float) -> float:
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(p * len(waits)))]
+
+        return {
+            "requests_total": sum(self._requests_total.values()),
+            "tokens_estimated_total": self._tokens_estimated_total,
+            "tokens_actual_total": self._tokens_actual_total,
+            "token_bucket_level": self._token_level,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "wait_p50_seconds": _pct(0.50),
+            "wait_p95_seconds": _pct(0.95),
+            "wait_max_seconds": waits[-1] if waits else 0.0,
+            "estimate_ratio": dict(self._estimate_ratio),
+            "concurrency_limits": self.concurrency_limits(),
+            "errors_total": {f"{step_type}:{kind}": count for (step_type, kind), count in self._errors_total.items()},
+        }
+
+    def metrics_text(self, prefix: str = "nl2data_llm") -> str:
+        """
+        Render metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            Metrics text (one sample per line)
         """
-        # Acquire per-step-type semaphore if applicable
-        step_semaphore = self.step_type_semaphores.get(step_type) if step_type else None
-        
-        # Acquire rate limit permits (requests/minute and tokens/minute)
-        await self._acquire_request_permit()
-        await self._acquire_token_permit(estimated_tokens)
-        
-        # Acquire concurrency semaphores (held for full duration via context manager)
-        async with self.semaphore:  # Global concurrency limit
-            if step_semaphore:
-                async with step_semaphore:  # Per-step-type limit
-                    yield  # Permit held here - API call happens inside this block
-            else:
-                yield  # Permit held here - API call happens inside this block
-    
-    async def _acquire_request_permit(self):
-        """Acquire request rate limit permit (requests/minute)."""
-        async with self._request_lock:
-            now = datetime.now()
-            # Clean old entries (older than 1 minute)
-            cutoff = now - timedelta(minutes=1)
-            self.request_times = [t for t in self.request_times if t > cutoff]
-            
-            # Check rate limit
-            if len(self.request_times) >= self.rpm:
-                # Wait until oldest request is 1 minute old
-                wait_time = (self.request_times[0] + timedelta(minutes=1) - now).total_seconds()
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                    # Re-clean after sleep
-                    now = datetime.now()
-                    cutoff = now - timedelta(minutes=1)
-                    self.request_times = [t for t in self.request_times if t > cutoff]
-            
-            # Record this request
-            self.request_times.append(datetime.now())
-    
-    async def _acquire_token_permit(self, estimated_tokens: int):
-        """Acquire token rate limit permit (tokens/minute)."""
-        if estimated_tokens <= 0:
-            return  # Skip token limiting if not estimated
-        
-        async with self._token_lock:
-            now = datetime.now()
-            # Clean old entries (older than 1 minute)
-            cutoff = now - timedelta(minutes=1)
-            self.token_times = [(t, tokens) for t, tokens in self.token_times if t > cutoff]
-            
-            # Calculate current token usage in last minute
-            current_tokens = sum(tokens for _, tokens in self.token_times)
-            
-            # Check if we would exceed limit
-            if current_tokens + estimated_tokens > self.tpm:
-                # Wait until we can fit this request
-                tokens_to_wait_for = current_tokens + estimated_tokens - self.tpm
-                cumulative = 0
-                wait_until = None
-                for timestamp, tokens in self.token_times:
-                    cumulative += tokens
-                    if cumulative >= tokens_to_wait_for:
-                        wait_until = timestamp + timedelta(minutes=1)
-                        break
-                
-                if wait_until:
-                    wait_time = (wait_until - now).total_seconds()
-                    if wait_time > 0:
-                        await asyncio.sleep(wait_time)
-                        # Re-clean after sleep
-                        now = datetime.now()
-                        cutoff = now - timedelta(minutes=1)
-                        self.token_times = [(t, tokens) for t, tokens in self.token_times if t > cutoff]
-            
-            # Record this token usage (will be cleaned up after 1 minute)
-            self.token_times.append((datetime.now(), estimated_tokens))
+        self._refill_tokens()
+        lines: List[str] = []
+
+        name = f"{prefix}_rate_limit_wait_seconds"
+        lines.append(f"# HELP {name} Time spent waiting for a rate limit permit.")
+        lines.append(f"# TYPE {name} histogram")
+        for step_type, histogram in sorted(self._wait_histograms.items()):
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{name}_bucket{{step_type="{step_type}",le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{step_type="{step_type}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{step_type="{step_type}"}} {histogram.sum}')
+            lines.append(f'{name}_count{{step_type="{step_type}"}} {histogram.count}')
+
+        name = f"{prefix}_requests_total"
+        lines.append(f"# HELP {name} LLM requests admitted by the rate limiter.")
+        lines.append(f"# TYPE {name} counter")
+        for step_type, count in sorted(self._requests_total.items()):
+            lines.append(f'{name}{{step_type="{step_type}"}} {count}')
+
+        name = f"{prefix}_tokens_total"
+        lines.append(f"# HELP {name} Tokens reserved (estimated) and reported (actual).")
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f'{name}{{kind="estimated"}} {self._tokens_estimated_total}')
+        lines.append(f'{name}{{kind="actual"}} {self._tokens_actual_total}')
+
+        name = f"{prefix}_errors_total"
+        lines.append(f"# HELP {name} Failed LLM attempts reported by retry loops.")
+        lines.append(f"# TYPE {name} counter")
+        for (step_type, kind), count in sorted(self._errors_total.items()):
+            lines.append(f'{name}{{step_type="{step_type}",kind="{kind}"}} {count}')
+
+        name = f"{prefix}_concurrency_limit"
+        lines.append(f"# HELP {name} Current per-step-type concurrency limit.")
+        lines.append(f"# TYPE {name} gauge")
+        for step_type, limit in sorted(self.concurrency_limits().items()):
+            lines.append(f'{name}{{step_type="{step_type}"}} {limit}')
+
+        for metric, help_text, value in (
+            ("token_bucket_level", "Tokens currently available (negative = promised backlog).", self._token_level),
+            ("in_flight_requests", "LLM requests currently holding a permit.", self._in_flight),
+            ("waiting_requests", "Requests waiting for their rate limit slot.", self._waiting),
+        ):
+            name = f"{prefix}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
 
 
 async def run_with_rate_limit(
@@ -164,17 +481,16 @@ async def run_with_rate_limit(
     """
     Run function with rate limiting. The permit is held for the full duration
     of the function call, ensuring true concurrency control.
-    
+
     Args:
         func: Async function to execute
         rate_limiter: RateLimiter instance
         step_type: Optional step type for per-type limits
         estimated_tokens: Estimated tokens for this call
         *args, **kwargs: Arguments to pass to func
-        
+
     Returns:
         Result of func(*args, **kwargs)
     """
     async with rate_limiter.acquire(step_type=step_type, estimated_tokens=estimated_tokens):
         return await func(*args, **kwargs)
-
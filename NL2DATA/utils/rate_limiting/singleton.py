@@ -36,17 +36,25 @@ def get_rate_limiter() -> Optional[RateLimiter]:
             logger.info("Rate limiting is disabled in config")
             return None
         
+        adaptive_config = rate_config.get("adaptive_concurrency") or {}
         _rate_limiter = RateLimiter(
             requests_per_minute=rate_config.get("requests_per_minute", 500),
             tokens_per_minute=rate_config.get("tokens_per_minute", 1_000_000),
             max_concurrent=rate_config.get("max_concurrent", 10),
-            max_concurrency_per_step_type=rate_config.get("max_concurrency_per_step_type", {})
+            max_concurrency_per_step_type=rate_config.get("max_concurrency_per_step_type", {}),
+            request_burst=rate_config.get("request_burst"),
+            adaptive_concurrency=adaptive_config.get("enabled", False),
+            min_concurrency=adaptive_config.get("min_concurrency", 1),
+            max_concurrency=adaptive_config.get("max_concurrency"),
+            backoff_factor=adaptive_config.get("backoff_factor", 0.7),
+            latency_tolerance=adaptive_config.get("latency_tolerance"),
         )
         
         logger.info(
             f"Initialized rate limiter: {rate_config.get('requests_per_minute')} req/min, "
             f"{rate_config.get('tokens_per_minute')} tokens/min, "
             f"{rate_config.get('max_concurrent')} max concurrent"
+            + (" (adaptive per-step-type concurrency)" if adaptive_config.get("enabled", False) else "")
         )
         
         return _rate_limiter
@@ -4,7 +4,8 @@ This module provides validation functions to check state consistency,
 especially after parallel updates that may have race conditions or inconsistencies.
 """
 
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List
+from NL2DATA.ir.schema_index import get_schema_index, item_field
 from NL2DATA.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -34,31 +35,19 @@ def validate_state_consistency(state: Dict[str, Any]) -> List[str]:
     """
     issues = []
     
-    entities = state.get("entities", [])
     relations = state.get("relations", [])
     attributes = state.get("attributes", {})
     primary_keys = state.get("primary_keys", {})
-    foreign_keys = state.get("foreign_keys", [])
     
-    # Build entity name set for quick lookup
-    entity_names: Set[str] = set()
-    for entity in entities:
-        if isinstance(entity, dict):
-            entity_name = entity.get("name", "")
-        else:
-            entity_name = getattr(entity, "name", "")
-        if entity_name:
-            entity_names.add(entity_name)
+    # Indexed entity/attribute/FK lookups (shared with gates, refreshed incrementally)
+    schema = get_schema_index(state)
     
     # Check 1: All entities referenced in relations exist
     for relation in relations:
-        if isinstance(relation, dict):
-            rel_entities = relation.get("entities", [])
-        else:
-            rel_entities = getattr(relation, "entities", [])
+        rel_entities = item_field(relation, "entities") or []
         
         for entity_name in rel_entities:
-            if entity_name not in entity_names:
+            if not schema.has_entity(entity_name):
                 issues.append(
                     f"Relation references non-existent entity: '{entity_name}'. "
                     f"Relation entities: {rel_entities}"
@@ -66,70 +55,44 @@ def validate_state_consistency(state: Dict[str, Any]) -> List[str]:
     
     # Check 2: All primary key attributes exist for their entities
     for entity_name, pk_attrs in primary_keys.items():
-        if entity_name not in entity_names:
+        if not schema.has_entity(entity_name):
             issues.append(
                 f"Primary key defined for non-existent entity: '{entity_name}'"
             )
             continue
         
-        entity_attrs = attributes.get(entity_name, [])
-        attr_names = set()
-        for attr in entity_attrs:
-            if isinstance(attr, dict):
-                attr_name = attr.get("name", "")
-            else:
-                attr_name = getattr(attr, "name", "")
-            if attr_name:
-                attr_names.add(attr_name)
-        
         for pk_attr in pk_attrs:
-            if pk_attr not in attr_names:
+            if not schema.has_attribute(entity_name, pk_attr):
                 issues.append(
                     f"Primary key attribute '{pk_attr}' does not exist for entity '{entity_name}'. "
-                    f"Available attributes: {sorted(attr_names)}"
+                    f"Available attributes: {sorted(schema.attribute_name_set(entity_name))}"
                 )
     
     # Check 3: All foreign keys reference existing primary keys
-    for fk in foreign_keys:
-        if isinstance(fk, dict):
-            fk_from = fk.get("from_entity", "")
-            fk_to = fk.get("to_entity", "")
-            fk_attrs = fk.get("attributes", [])
-        else:
-            fk_from = getattr(fk, "from_entity", "")
-            fk_to = getattr(fk, "to_entity", "")
-            fk_attrs = getattr(fk, "attributes", [])
+    for fk in schema.foreign_keys:
+        fk_from, fk_to = fk.from_entity, fk.to_entity
+        fk_attrs = list(fk.from_attributes)
         
-        if fk_from not in entity_names:
+        if not schema.has_entity(fk_from):
             issues.append(
                 f"Foreign key from non-existent entity: '{fk_from}' -> '{fk_to}'"
             )
         
-        if fk_to not in entity_names:
+        if not schema.has_entity(fk_to):
             issues.append(
                 f"Foreign key references non-existent entity: '{fk_from}' -> '{fk_to}'"
             )
         
         # Check FK attributes exist in from_entity
-        if fk_from in entity_names:
-            entity_attrs = attributes.get(fk_from, [])
-            attr_names = set()
-            for attr in entity_attrs:
-                if isinstance(attr, dict):
-                    attr_name = attr.get("name", "")
-                else:
-                    attr_name = getattr(attr, "name", "")
-                if attr_name:
-                    attr_names.add(attr_name)
-            
+        if schema.has_entity(fk_from):
             for fk_attr in fk_attrs:
-                if fk_attr not in attr_names:
+                if not schema.has_attribute(fk_from, fk_attr):
                     issues.append(
                         f"Foreign key attribute '{fk_attr}' does not exist in entity '{fk_from}'"
                     )
         
         # Check FK references existing PK in to_entity
-        if fk_to in entity_names:
+        if schema.has_entity(fk_to):
             to_pk = primary_keys.get(fk_to, [])
             if not to_pk:
                 issues.append(
@@ -143,7 +106,7 @@ def validate_state_consistency(state: Dict[str, Any]) -> List[str]:
     
     # Check 4: All entities have at least one attribute (after Phase 2)
     if attributes:  # Only check if attributes have been populated
-        for entity_name in entity_names:
+        for entity_name in schema.entity_names:
             entity_attrs = attributes.get(entity_name, [])
             if not entity_attrs:
                 issues.append(
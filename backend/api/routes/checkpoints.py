@@ -2,6 +2,7 @@
 
 import logging
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
 from typing import Dict, Any
 
 from backend.models.requests import (
@@ -24,11 +25,15 @@ from backend.models.requests import (
 from backend.models.responses import CheckpointResponse, CheckpointProceedResponse
 from backend.dependencies import (
     get_job_manager,
-    get_nl2data_service
+    get_nl2data_service,
+    get_checkpoint_runner,
+    get_er_render_service
 )
-from backend.utils.job_manager import JobManager
+from backend.utils.job_manager import ACTIVE_STATUSES, JobManager
+from backend.utils.checkpoint_runner import CheckpointRunner
 from backend.services.nl2data_service import NL2DataService
-from backend.services.er_diagram_compiler import generate_and_save_er_diagram
+from backend.services.er_diagram_compiler import generate_and_save_er_diagram_cached
+from backend.services.er_render_service import ERRenderService
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
@@ -168,10 +173,87 @@ def _extract_checkpoint_data(state: Dict[str, Any], checkpoint_type: str) -> Dic
         return {}
 
 
+# Checkpoint statuses in pipeline order
+_CHECKPOINT_ORDER = [
+    "checkpoint_domain",
+    "checkpoint_entities",
+    "checkpoint_relations",
+    "checkpoint_attributes",
+    "checkpoint_primary_keys",
+    "checkpoint_multivalued_derived",
+    "checkpoint_er_diagram",
+    "checkpoint_datatypes",
+    "checkpoint_nullability",
+    "checkpoint_relational_schema",
+    "checkpoint_information_mining",
+    "checkpoint_functional_dependencies",
+    "checkpoint_constraints",
+    "checkpoint_generation_strategies",
+]
+
+# Deterministically compiled state, keyed by the checkpoint that (re)builds it
+_COMPILED_ARTIFACTS = {
+    "er_design": "checkpoint_er_diagram",
+    "relational_schema": "checkpoint_datatypes",
+    "foreign_keys": "checkpoint_datatypes",
+}
+
+
+def _state_for_edit(
+    job: Dict[str, Any],
+    job_manager: JobManager,
+    checkpoint_status: str,
+    checkpoint_label: str
+) -> Dict[str, Any]:
+    """
+    Job state to apply an edit at a checkpoint to.
+    
+    Edits are accepted at the checkpoint itself or, for a job that is further
+    along, rewind the job to that checkpoint. Downstream LLM results stay in the
+    state: on the following proceeds only entities whose inputs changed are
+    recomputed (see ArtifactTracker). Compiled state built after the checkpoint
+    (ER design, relational schema) is dropped and rebuilt.
+    """
+    status = job.get("status")
+    if status != checkpoint_status:
+        if (
+            status not in _CHECKPOINT_ORDER
+            or _CHECKPOINT_ORDER.index(status) < _CHECKPOINT_ORDER.index(checkpoint_status)
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Job is not at {checkpoint_label} checkpoint. Current status: {status}"
+            )
+        logger.info(f"Job {job['job_id']}: rewinding from {status} to {checkpoint_status} for edit")
+        state = job.get("state", {})
+        edit_index = _CHECKPOINT_ORDER.index(checkpoint_status)
+        for key, built_at in _COMPILED_ARTIFACTS.items():
+            if _CHECKPOINT_ORDER.index(built_at) > edit_index:
+                state.pop(key, None)
+        job_manager.update_job(job["job_id"], status=checkpoint_status)
+    return job.get("state", {})
+
+
+def _recover_orphaned_run(job: Dict[str, Any], job_manager: JobManager) -> Dict[str, Any]:
+    """
+    Job with a lost run reset to its last checkpoint.
+    
+    A job stays queued/in progress only while the run holding its lease is
+    alive; if that run is gone (worker restarted or died), the job goes back to
+    its last checkpoint snapshot, or fails if it has none.
+    """
+    job_id = job["job_id"]
+    if job.get("status") in ACTIVE_STATUSES and not job_manager.is_run_active(job_id):
+        job_manager.recover_job(job_id, reason="run lease expired")
+        job = job_manager.get_job(job_id) or job
+    return job
+
+
 @router.get("/{job_id}", response_model=CheckpointResponse)
 async def get_checkpoint(
     job_id: str,
-    job_manager: JobManager = Depends(get_job_manager)
+    job_manager: JobManager = Depends(get_job_manager),
+    render_service: ERRenderService = Depends(get_er_render_service)
 ):
     """
     Get current checkpoint data for a job.
@@ -183,6 +265,7 @@ async def get_checkpoint(
     job = job_manager.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    job = _recover_orphaned_run(job, job_manager)
     
     status = job.get("status", "")
     state = job.get("state", {})
@@ -210,11 +293,16 @@ async def get_checkpoint(
     if not checkpoint_type:
         # If job is still processing (pending or in_progress), return a "not ready" response
         # Frontend should poll until checkpoint is ready
-        if status in ["pending", "in_progress"]:
+        if status in ["pending", "queued", "in_progress"]:
             raise HTTPException(
                 status_code=202,  # Accepted - processing in progress
                 detail=f"Checkpoint not ready yet. Job status: {status}. Please retry in a moment."
             )
+        if status == "failed":
+            raise HTTPException(
+                status_code=500,
+                detail=f"Pipeline failed: {job.get('error') or 'unknown error'}"
+            )
         raise HTTPException(
             status_code=400,
             detail=f"Job is not at a checkpoint. Current status: {status}"
@@ -233,10 +321,11 @@ async def get_checkpoint(
             if er_design_dict.get("entities") and not er_design_dict.get("imageUrl"):
                 try:
                     logger.info(f"Generating ER diagram image for job {job_id} (imageUrl missing)")
-                    image_path = generate_and_save_er_diagram(
+                    image_path = await generate_and_save_er_diagram_cached(
                         er_design_dict=er_design_dict,
                         job_id=job_id,
                         storage_path=settings.er_diagram_storage_path,
+                        render_service=render_service,
                         format="svg"
                     )
                     # Add imageUrl to er_design object (frontend expects it there)
@@ -366,14 +455,8 @@ async def save_attributes_edit(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    if job.get("status") != "checkpoint_attributes":
-        raise HTTPException(
-            status_code=400,
-            detail=f"Job is not at attributes checkpoint. Current status: {job.get('status')}"
-        )
-    
     # Update state with edited attributes
-    state = job.get("state", {})
+    state = _state_for_edit(job, job_manager, "checkpoint_attributes", "attributes")
     state["attributes"] = request.attributes
     job_manager.update_job_state(request.job_id, state)
     
@@ -398,14 +481,8 @@ async def save_primary_keys_edit(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    if job.get("status") != "checkpoint_primary_keys":
-        raise HTTPException(
-            status_code=400,
-            detail=f"Job is not at primary keys checkpoint. Current status: {job.get('status')}"
-        )
-    
     # Update state with edited primary keys
-    state = job.get("state", {})
+    state = _state_for_edit(job, job_manager, "checkpoint_primary_keys", "primary keys")
     state["primary_keys"] = request.primary_keys
     job_manager.update_job_state(request.job_id, state)
     
@@ -527,14 +604,8 @@ async def save_datatypes_edit(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    if job.get("status") != "checkpoint_datatypes":
-        raise HTTPException(
-            status_code=400,
-            detail=f"Job is not at datatypes checkpoint. Current status: {job.get('status')}"
-        )
-    
     # Update state with edited data types
-    state = job.get("state", {})
+    state = _state_for_edit(job, job_manager, "checkpoint_datatypes", "datatypes")
     state["data_types"] = request.data_types
     job_manager.update_job_state(request.job_id, state)
     
@@ -559,14 +630,8 @@ async def save_relational_schema_edit(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    if job.get("status") != "checkpoint_relational_schema":
-        raise HTTPException(
-            status_code=400,
-            detail=f"Job is not at relational schema checkpoint. Current status: {job.get('status')}"
-        )
-    
     # Update state with edited relational schema
-    state = job.get("state", {})
+    state = _state_for_edit(job, job_manager, "checkpoint_relational_schema", "relational schema")
     state["relational_schema"] = request.relational_schema
     job_manager.update_job_state(request.job_id, state)
     
@@ -905,16 +970,85 @@ async def save_generation_strategies_edit(
     )
 
 
+# Checkpoint a proceed runs to, keyed by the job status it starts from
+_NEXT_CHECKPOINT = {
+    "pending": "entities",
+    "checkpoint_domain": "entities",
+    "checkpoint_entities": "relations",
+    "checkpoint_relations": "attributes",
+    "checkpoint_attributes": "primary_keys",
+    "checkpoint_primary_keys": "multivalued_derived",
+    "checkpoint_multivalued_derived": "er_diagram",
+    # Relational schema is compiled internally during the datatypes checkpoint if needed
+    "checkpoint_er_diagram": "datatypes",
+    "checkpoint_datatypes": "nullability",
+    "checkpoint_nullability": "relational_schema",
+    "checkpoint_relational_schema": "information_mining",
+    "checkpoint_information_mining": "functional_dependencies",
+    "checkpoint_functional_dependencies": "constraints",
+    "checkpoint_constraints": "generation_strategies",
+}
+
+
+async def _run_to_checkpoint(
+    job_id: str,
+    checkpoint_type: str,
+    nl_description: str,
+    state: Dict[str, Any],
+    job_manager: JobManager,
+    nl2data_service: NL2DataService,
+    render_service: ERRenderService
+) -> None:
+    """Execute the pipeline to the next checkpoint (runs on the CheckpointRunner pool)."""
+    new_state = await nl2data_service.execute_to_checkpoint(
+        job_id=job_id,
+        nl_description=nl_description,
+        checkpoint_type=checkpoint_type,
+        job_manager=job_manager,
+        current_state=state
+    )
+    
+    if checkpoint_type == "er_diagram":
+        # Generate ER diagram image
+        er_design = new_state.get("er_design", {})
+        # Only generate if er_design has entities (valid ER design)
+        if er_design and er_design.get("entities"):
+            try:
+                logger.info(f"Generating ER diagram image for job {job_id}")
+                image_path = await generate_and_save_er_diagram_cached(
+                    er_design_dict=er_design,
+                    job_id=job_id,
+                    storage_path=settings.er_diagram_storage_path,
+                    render_service=render_service,
+                    format="svg"
+                )
+                # Store imageUrl on the er_design object (frontend expects it there)
+                er_design["imageUrl"] = f"/static/{image_path}"
+                job_manager.update_job_state(job_id, new_state)
+                logger.info(f"ER diagram image generated successfully: /static/{image_path}")
+            except Exception as e:
+                logger.error(f"Error generating ER diagram image: {e}", exc_info=True)
+                # Continue without image URL if generation fails
+        else:
+            logger.warning(f"ER design has no entities, skipping image generation for job {job_id}")
+
+
 @router.post("/proceed", response_model=CheckpointProceedResponse)
 async def proceed_to_next_checkpoint(
     request: CheckpointProceedRequest,
     job_manager: JobManager = Depends(get_job_manager),
-    nl2data_service: NL2DataService = Depends(get_nl2data_service)
+    nl2data_service: NL2DataService = Depends(get_nl2data_service),
+    runner: CheckpointRunner = Depends(get_checkpoint_runner),
+    render_service: ERRenderService = Depends(get_er_render_service)
 ):
     """
     Proceed to the next checkpoint in the pipeline.
     
-    Executes the next phase of the pipeline and stops at the next checkpoint.
+    Enqueues the next phase of the pipeline on the checkpoint worker pool and
+    returns 202 immediately. Progress is sent as `checkpoint_status` WebSocket
+    events; GET /api/checkpoint/{job_id} returns the new checkpoint once it is
+    ready (202 until then). A proceed while a run for the job is still queued
+    or running is coalesced into that run.
     """
     logger.info(f"POST /api/checkpoint/proceed for job {request.job_id}")
     
@@ -922,388 +1056,23 @@ async def proceed_to_next_checkpoint(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
+    active_checkpoint = runner.target_of(request.job_id)
+    if not active_checkpoint:
+        job = _recover_orphaned_run(job, job_manager)
     status = job.get("status", "")
-    state = job.get("state", {})
-    nl_description = job.get("nl_description", "")
-    
-    # Determine next checkpoint based on current status
-    if status == "checkpoint_domain" or status == "pending":
-        # Execute to entities checkpoint
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="entities",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "entities")
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to entities checkpoint",
-                next_checkpoint="entities",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to entities checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_entities":
-        # Execute to relations checkpoint
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="relations",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "relations")
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to relations checkpoint",
-                next_checkpoint="relations",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to relations checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_relations":
-        # Execute to attributes checkpoint
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="attributes",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "attributes")
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to attributes checkpoint",
-                next_checkpoint="attributes",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to attributes checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_attributes":
-        # Execute to primary keys checkpoint
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="primary_keys",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "primary_keys")
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to primary keys checkpoint",
-                next_checkpoint="primary_keys",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to primary keys checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_primary_keys":
-        # Execute to multivalued/derived checkpoint
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="multivalued_derived",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "multivalued_derived")
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to multivalued/derived attributes checkpoint",
-                next_checkpoint="multivalued_derived",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to ER diagram checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_multivalued_derived":
-        # Execute to ER diagram checkpoint
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="er_diagram",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "er_diagram")
-            
-            # Generate ER diagram image
-            er_design = new_state.get("er_design", {})
-            if er_design and "er_design" in checkpoint_data:
-                # Only generate if er_design has entities (valid ER design)
-                if er_design.get("entities"):
-                    try:
-                        logger.info(f"Generating ER diagram image for job {request.job_id}")
-                        image_path = generate_and_save_er_diagram(
-                            er_design_dict=er_design,
-                            job_id=request.job_id,
-                            storage_path=settings.er_diagram_storage_path,
-                            format="svg"
-                        )
-                        # Add imageUrl to er_design object (frontend expects it there)
-                        checkpoint_data["er_design"]["imageUrl"] = f"/static/{image_path}"
-                        logger.info(f"ER diagram image generated successfully: /static/{image_path}")
-                    except Exception as e:
-                        logger.error(f"Error generating ER diagram image: {e}", exc_info=True)
-                        # Continue without image URL if generation fails
-                else:
-                    logger.warning(f"ER design has no entities, skipping image generation for job {request.job_id}")
-            
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to ER diagram checkpoint",
-                next_checkpoint="er_diagram",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to ER diagram checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_er_diagram":
-        # Execute to datatypes checkpoint (Phase 5)
-        # Note: Relational schema will be compiled internally during datatypes checkpoint if needed
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="datatypes",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "datatypes")
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to datatypes checkpoint",
-                next_checkpoint="datatypes",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to datatypes checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_datatypes":
-        # Execute to nullability checkpoint (Phase 5.5)
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="nullability",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "nullability")
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to nullability checkpoint",
-                next_checkpoint="nullability",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to nullability checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_nullability":
-        # Execute to relational schema checkpoint (Phase 4)
-        # Note: Relational schema should already be compiled (done during datatypes), but we show it here
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="relational_schema",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "relational_schema")
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to relational schema checkpoint",
-                next_checkpoint="relational_schema",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to relational schema checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_relational_schema":
-        # Execute to information mining checkpoint (Phase 7)
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="information_mining",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "information_mining")
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to information mining checkpoint",
-                next_checkpoint="information_mining",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to information mining checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_information_mining":
-        # Execute to functional dependencies checkpoint (Phase 8)
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="functional_dependencies",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "functional_dependencies")
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to functional dependencies checkpoint",
-                next_checkpoint="functional_dependencies",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to functional dependencies checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_functional_dependencies":
-        # Execute to constraints checkpoint (Phase 9)
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="constraints",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "constraints")
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to constraints checkpoint",
-                next_checkpoint="constraints",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to constraints checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_constraints":
-        # Execute to generation strategies checkpoint (Phase 9)
-        try:
-            new_state = await nl2data_service.execute_to_checkpoint(
-                job_id=request.job_id,
-                nl_description=nl_description,
-                checkpoint_type="generation_strategies",
-                job_manager=job_manager,
-                current_state=state
-            )
-            checkpoint_data = _extract_checkpoint_data(new_state, "generation_strategies")
-            return CheckpointProceedResponse(
-                status="success",
-                message="Proceeded to generation strategies checkpoint",
-                next_checkpoint="generation_strategies",
-                checkpoint_data=checkpoint_data,
-                checkpoint_justification=checkpoint_data.get("justification")
-            )
-        except Exception as e:
-            logger.error(f"Error proceeding to generation strategies checkpoint: {e}", exc_info=True)
-            return CheckpointProceedResponse(
-                status="error",
-                message=f"Failed to proceed: {str(e)}",
-                next_checkpoint=None,
-                checkpoint_data=None,
-                checkpoint_justification=None
-            )
-    elif status == "checkpoint_generation_strategies":
+    
+    if active_checkpoint or status in ACTIVE_STATUSES:
+        # Run active in this worker, or (live lease) in another worker sharing the job store
+        return JSONResponse(
+            status_code=202,
+            content=CheckpointProceedResponse(
+                status="accepted",
+                message=f"Already proceeding to {active_checkpoint or 'next'} checkpoint",
+                next_checkpoint=active_checkpoint
+            ).model_dump()
+        )
+    
+    if status == "checkpoint_generation_strategies":
         # Pipeline is complete - no more checkpoints
         return CheckpointProceedResponse(
             status="success",
@@ -1312,8 +1081,32 @@ async def proceed_to_next_checkpoint(
             checkpoint_data={"message": "Pipeline completed successfully"},
             checkpoint_justification=None
         )
-    else:
+    
+    checkpoint_type = _NEXT_CHECKPOINT.get(status)
+    if not checkpoint_type:
         raise HTTPException(
             status_code=400,
             detail=f"Cannot proceed from status: {status}"
         )
+    
+    runner.submit(
+        request.job_id,
+        checkpoint_type,
+        lambda: _run_to_checkpoint(
+            job_id=request.job_id,
+            checkpoint_type=checkpoint_type,
+            nl_description=job.get("nl_description", ""),
+            state=job.get("state", {}),
+            job_manager=job_manager,
+            nl2data_service=nl2data_service,
+            render_service=render_service
+        )
+    )
+    return JSONResponse(
+        status_code=202,
+        content=CheckpointProceedResponse(
+            status="accepted",
+            message=f"Proceeding to {checkpoint_type} checkpoint",
+            next_checkpoint=checkpoint_type
+        ).model_dump()
+    )
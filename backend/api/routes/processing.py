@@ -18,6 +18,23 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/process", tags=["processing"])
 
 
+async def _execute_to_domain_checkpoint(
+    job_id: str,
+    nl_description: str,
+    job_manager: JobManager,
+    nl2data_service: NL2DataService
+):
+    """Run the pipeline to the first checkpoint, holding the job's lease while it runs."""
+    async with job_manager.lease(job_id):
+        await nl2data_service.execute_to_checkpoint(
+            job_id=job_id,
+            nl_description=nl_description,
+            checkpoint_type="domain",
+            job_manager=job_manager,
+            current_state=None
+        )
+
+
 @router.post("/start", response_model=ProcessStartResponse)
 async def start_processing(
     request: ProcessStartRequest,
@@ -56,12 +73,11 @@ async def start_processing(
     # Start processing to first checkpoint (domain) in background
     logger.info("Adding background task to execute to domain checkpoint...")
     background_tasks.add_task(
-        nl2data_service.execute_to_checkpoint,
+        _execute_to_domain_checkpoint,
         job_id=job_id,
         nl_description=request.nl_description,
-        checkpoint_type="domain",
         job_manager=job_manager,
-        current_state=None
+        nl2data_service=nl2data_service
     )
     logger.info(f"Background task added for job {job_id}")
     
@@ -143,7 +143,7 @@ async def save_changes(
     # Note: Image is generated and stored, URL is constructed from job_id
     er_image_url = None
     if request.edit_mode == "er_diagram":
-        # Generate and store image (returns bytes, stored internally)
+        # Render now so the image request that follows is served from the render cache
         await diagram_service.generate_er_diagram(
             job_id=request.job_id,
             er_state=updated_state,
@@ -34,6 +34,19 @@ class Settings(BaseSettings):
     # WebSocket
     websocket_timeout: int = 300
     
+    # Checkpoint runs (POST /api/checkpoint/proceed executes in the background)
+    # Maximum number of pipeline segments executing at the same time
+    checkpoint_max_concurrent_runs: int = 4
+    
+    # Job store
+    # SQLite database shared by all API workers (":memory:" for a process-local store)
+    job_store_path: str = str(Path(tempfile.gettempdir()) / "nl2data_jobs.sqlite3")
+    # Jobs kept in memory; colder jobs are evicted and reloaded from the store on access
+    job_cache_max_jobs: int = 64
+    job_cache_ttl_sec: int = 900
+    # A queued/in-progress job whose run has not renewed its lease for this long is reset to its last checkpoint
+    job_lease_ttl_sec: int = 60
+    
     # File storage
     # Use OS temp dir by default (works on Windows/Linux/macOS).
     csv_storage_path: str = str(Path(tempfile.gettempdir()) / "nl2data_csv")
@@ -43,6 +56,15 @@ class Settings(BaseSettings):
     # Store ER diagram images in backend/static/er_diagrams/
     # Note: The generate_and_save_er_diagram function will create the er_diagrams subdirectory
     er_diagram_storage_path: str = str(Path(__file__).parent / "static")
+    
+    # ER diagram render cache (renders keyed by DOT source hash + format)
+    er_render_cache_path: str = str(Path(tempfile.gettempdir()) / "nl2data_er_renders")
+    er_render_memory_entries: int = 128
+    # Disk render cache limits (least recently used renders are evicted)
+    er_render_cache_max_entries: int = 2000
+    er_render_cache_max_bytes: int = 256 * 1024 * 1024
+    # Maximum number of concurrent Graphviz (dot) processes
+    er_render_max_workers: int = 2
 
 
 settings = Settings()
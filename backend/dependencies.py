@@ -3,26 +3,44 @@
 from functools import lru_cache
 from backend.utils.job_manager import JobManager
 from backend.utils.websocket_manager import WebSocketManager
+from backend.utils.checkpoint_runner import CheckpointRunner
 from backend.services.nl2data_service import NL2DataService
 from backend.services.validation_service import ValidationService
 from backend.services.conversion_service import ConversionService
 from backend.services.diagram_service import DiagramService
+from backend.services.er_render_service import ERRenderService
 from backend.services.suggestion_service import SuggestionService
+from backend.config import settings
 
 
-# Process-wide singletons (for demo - single process, no DB)
+# Process-wide singletons (jobs are persisted in the SQLite job store shared by all workers)
 @lru_cache(maxsize=1)
 def get_job_manager() -> JobManager:
     """Singleton JobManager - shared across all requests."""
-    return JobManager()
+    return JobManager(
+        db_path=settings.job_store_path,
+        max_cached_jobs=settings.job_cache_max_jobs,
+        cache_ttl_sec=settings.job_cache_ttl_sec,
+        lease_ttl_sec=settings.job_lease_ttl_sec
+    )
 
 
 @lru_cache(maxsize=1)
 def get_websocket_manager() -> WebSocketManager:
-    """Singleton WebSocketManager - for WebSocket connections (currently not used for pipeline)."""
+    """Singleton WebSocketManager - for WebSocket connections (checkpoint run progress events)."""
     return WebSocketManager()
 
 
+@lru_cache(maxsize=1)
+def get_checkpoint_runner() -> CheckpointRunner:
+    """Singleton CheckpointRunner - bounded worker pool for background checkpoint runs."""
+    return CheckpointRunner(
+        job_manager=get_job_manager(),
+        ws_manager=get_websocket_manager(),
+        max_concurrent=settings.checkpoint_max_concurrent_runs
+    )
+
+
 @lru_cache(maxsize=1)
 def get_validation_service() -> ValidationService:
     """Singleton ValidationService."""
@@ -35,10 +53,22 @@ def get_conversion_service() -> ConversionService:
     return ConversionService()
 
 
+@lru_cache(maxsize=1)
+def get_er_render_service() -> ERRenderService:
+    """Singleton ERRenderService - cached ER diagram rendering on a bounded worker pool."""
+    return ERRenderService(
+        cache_dir=settings.er_render_cache_path,
+        max_memory_entries=settings.er_render_memory_entries,
+        max_workers=settings.er_render_max_workers,
+        max_disk_entries=settings.er_render_cache_max_entries,
+        max_disk_bytes=settings.er_render_cache_max_bytes
+    )
+
+
 @lru_cache(maxsize=1)
 def get_diagram_service() -> DiagramService:
     """Singleton DiagramService."""
-    return DiagramService()
+    return DiagramService(render_service=get_er_render_service())
 
 
 @lru_cache(maxsize=1)
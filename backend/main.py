@@ -5,6 +5,7 @@ import sys
 import time
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.base import BaseHTTPMiddleware
 from pathlib import Path
@@ -182,6 +183,15 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus-style metrics for the LLM rate limiter and refinement loops."""
+    from NL2DATA.utils.rate_limiting import get_rate_limiter
+    from NL2DATA.utils.loops import get_loop_metrics
+    rate_limiter = get_rate_limiter()
+    return (rate_limiter.metrics_text() if rate_limiter else "") + get_loop_metrics().metrics_text()
+
+
 if __name__ == "__main__":
     import uvicorn
     import sys
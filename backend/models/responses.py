@@ -87,10 +87,10 @@ class CheckpointResponse(BaseModel):
 
 class CheckpointProceedResponse(BaseModel):
     """Response when proceeding to next checkpoint."""
-    status: str  # "success" | "error"
+    status: str  # "accepted" (run enqueued, poll GET /api/checkpoint/{job_id}) | "success" | "error"
     message: str
     next_checkpoint: Optional[str] = None  # Next checkpoint type if available
-    checkpoint_data: Optional[Dict[str, Any]] = None  # Checkpoint data directly in response (no polling needed)
+    checkpoint_data: Optional[Dict[str, Any]] = None  # Checkpoint data directly in response (only when no run is needed)
     checkpoint_justification: Optional[Dict[str, Any]] = None  # Justification for the checkpoint
 
 
@@ -105,12 +105,30 @@ class StepLifecycleData(BaseModel):
     summary: Optional[dict] = None
 
 
+class CheckpointStatusEvent(BaseModel):
+    """Event when a background checkpoint run changes state."""
+    type: Literal["checkpoint_status"] = "checkpoint_status"
+    data: "CheckpointStatusData"
+
+
+class CheckpointStatusData(BaseModel):
+    """Data for checkpoint status event."""
+    job_id: str
+    seq: int
+    ts: datetime
+    checkpoint: str
+    status: Literal["queued", "running", "ready", "failed"]
+    message: str
+    level: Literal["info", "warning", "error"] = "info"
+
+
 # Update forward references
 APIRequestStartEvent.model_rebuild()
 APIResponseSuccessEvent.model_rebuild()
 StatusTickEvent.model_rebuild()
 StepStartEvent.model_rebuild()
 StepCompleteEvent.model_rebuild()
+CheckpointStatusEvent.model_rebuild()
 
 
 
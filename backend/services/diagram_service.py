@@ -1,13 +1,24 @@
 """Diagram service - generates ER diagram images."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import graphviz
 from io import BytesIO
 
+from backend.services.er_render_service import ERRenderService
+
 
 class DiagramService:
     """Generates ER diagram images."""
     
+    def __init__(self, render_service: Optional[ERRenderService] = None):
+        """
+        Initialize diagram service.
+        
+        Args:
+            render_service: Render service (cache + worker pool); a memory-only one if omitted
+        """
+        self.render_service = render_service or ERRenderService()
+    
     async def generate_er_diagram(
         self,
         job_id: str,
@@ -41,11 +52,8 @@ class DiagramService:
                     label=relation.get("name", "")
                 )
         
-        # Render
-        if format == "png":
-            return dot.pipe(format="png")
-        else:
-            return dot.pipe(format="svg")
+        # Render (cached; misses render off the event loop)
+        return await self.render_service.render(dot, format="png" if format == "png" else "svg")
 
 
 
@@ -16,8 +16,9 @@ Features:
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, TYPE_CHECKING
 from pathlib import Path
+import asyncio
 import graphviz
 from graphviz import Digraph
 
@@ -28,6 +29,9 @@ from NL2DATA.ir.models.er_relational import (
     ERAttribute
 )
 
+if TYPE_CHECKING:
+    from backend.services.er_render_service import ERRenderService
+
 
 # ---- Helper functions ----
 
@@ -376,3 +380,39 @@ def generate_and_save_er_diagram(
     # Path will be like: er_diagrams/er_diagram_{job_id}.svg
     relative_path = f"er_diagrams/{Path(result_path).name}"
     return relative_path
+
+
+async def generate_and_save_er_diagram_cached(
+    er_design_dict: Dict[str, Any],
+    job_id: str,
+    storage_path: str,
+    render_service: ERRenderService,
+    format: str = "svg"
+) -> str:
+    """Async variant of generate_and_save_er_diagram rendering through an ERRenderService.
+    
+    Unchanged designs are served from the render cache; rendering and file
+    writes run off the event loop.
+    
+    Args:
+        er_design_dict: Dictionary containing er_design structure from state
+        job_id: Job ID to use as filename
+        storage_path: Directory path to save the image
+        render_service: Render service (cache + worker pool)
+        format: Output format - "svg" (recommended), "png", "jpg", or "pdf"
+        
+    Returns:
+        Relative path to the saved image (for use in API URLs)
+    """
+    design = dict_to_erdesign(er_design_dict)
+    image_data = await render_service.render(erdesign_to_graphviz(design), format=format)
+    
+    filename = f"er_diagram_{job_id}.{format}"
+    output_path = Path(storage_path) / "er_diagrams" / filename
+    
+    def _write():
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(image_data)
+    
+    await asyncio.to_thread(_write)
+    return f"er_diagrams/{filename}"
@@ -0,0 +1,181 @@
+"""ER render service - cached, off-loop Graphviz rendering of ER diagrams."""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from graphviz import Digraph
+
+logger = logging.getLogger(__name__)
+
+# Disk cache sweeps evict down to this fraction of the limits, so they do not run on every write
+_DISK_LOW_WATERMARK = 0.8
+
+
+class ERRenderService:
+    """
+    Renders Graphviz diagrams without blocking the event loop.
+
+    Renders are keyed by a hash of the DOT source (the canonical form of the
+    ER design as drawn) plus the output format. Rendered bytes are served from
+    an in-memory LRU cache, then from the disk cache; misses are rendered by
+    `dot` on a bounded thread pool. Concurrent requests for the same key share
+    one render.
+
+    The disk cache is bounded by entry count and total bytes: once a write takes
+    it over either limit, the least recently used files (by mtime, refreshed on
+    every disk hit) are deleted until it is back under 80% of both.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_memory_entries: int = 128,
+        max_workers: int = 2,
+        max_disk_entries: int = 2000,
+        max_disk_bytes: int = 256 * 1024 * 1024
+    ):
+        """
+        Initialize render service.
+
+        Args:
+            cache_dir: Directory for cached renders (None: memory cache only)
+            max_memory_entries: Maximum number of renders kept in memory
+            max_workers: Maximum number of concurrent `dot` processes
+            max_disk_entries: Maximum number of renders kept in the disk cache
+            max_disk_bytes: Maximum total size of the disk cache in bytes
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_memory_entries = max(1, max_memory_entries)
+        self.max_disk_entries = max(1, max_disk_entries)
+        self.max_disk_bytes = max(1, max_disk_bytes)
+        # (entries, bytes) of the disk cache, scanned on first write
+        self._disk_usage: Optional[Tuple[int, int]] = None
+        self._disk_lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="er-render")
+
+    @staticmethod
+    def render_key(graph: Digraph, format: str) -> str:
+        """Cache key of a render: hash of the DOT source and output format."""
+        return hashlib.sha256(f"{format}\n{graph.source}".encode("utf-8")).hexdigest()
+
+    async def render(self, graph: Digraph, format: str = "svg") -> bytes:
+        """
+        Render a diagram to image bytes, using the cache where possible.
+
+        Args:
+            graph: Graphviz diagram
+            format: Output format ("svg", "png", ...)
+
+        Returns:
+            Image bytes
+        """
+        key = self.render_key(graph, format)
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            return data
+
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self._load_or_render, graph, format, key)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.debug(f"ER diagram render {key[:12]} already in progress, waiting")
+
+        # Shield: a cancelled request must not cancel the render other requests wait on
+        data = await asyncio.shield(future)
+        self._remember(key, data)
+        return data
+
+    def _load_or_render(self, graph: Digraph, format: str, key: str) -> bytes:
+        """Disk cache lookup, else render (runs on the worker pool)."""
+        path = self.cache_dir / f"{key}.{format}" if self.cache_dir else None
+        if path is not None:
+            try:
+                data = path.read_bytes()
+                os.utime(path)  # Mark as recently used for eviction
+                return data
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not read ER diagram render cache {path}: {e}")
+
+        data = graph.pipe(format=format)
+        if path is not None:
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                existed = path.exists()
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+                if not existed:
+                    self._account_disk_write(len(data))
+            except OSError as e:
+                logger.warning(f"Could not write ER diagram render cache {path}: {e}")
+        return data
+
+    def _disk_entries(self) -> List[Tuple[float, int, Path]]:
+        """(mtime, size, path) of the cached renders on disk."""
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if path.name.endswith(".tmp"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Removed concurrently
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _account_disk_write(self, size: int):
+        """Count a new disk cache file and evict least recently used files when over a limit."""
+        with self._disk_lock:
+            if self._disk_usage is None:
+                entries = self._disk_entries()
+                count, total = len(entries), sum(size for _, size, _ in entries)
+            else:
+                count, total = self._disk_usage
+                count, total = count + 1, total + size
+            if count > self.max_disk_entries or total > self.max_disk_bytes:
+                count, total = self._sweep_disk()
+            self._disk_usage = (count, total)
+
+    def _sweep_disk(self) -> Tuple[int, int]:
+        """Delete the least recently used renders down to the low watermark; returns the new usage."""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[0])
+        count, total = len(entries), sum(size for _, size, _ in entries)
+        max_entries = int(self.max_disk_entries * _DISK_LOW_WATERMARK)
+        max_bytes = int(self.max_disk_bytes * _DISK_LOW_WATERMARK)
+        evicted = 0
+        for _, size, path in entries:
+            if count <= max_entries and total <= max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not evict ER diagram render cache {path}: {e}")
+                continue
+            count, total = count - 1, total - size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} ER diagram renders from the disk cache")
+        return count, total
+
+    def _remember(self, key: str, data: bytes):
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
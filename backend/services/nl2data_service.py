@@ -7,10 +7,56 @@ from NL2DATA.orchestration.graphs.master import get_phase_graph
 from NL2DATA.orchestration.state import create_initial_state, IRGenerationState
 
 from backend.utils.job_manager import JobManager
+from backend.utils.artifact_tracker import ArtifactTracker
 
 logger = logging.getLogger(__name__)
 
 
+def _as_dict(obj: Any) -> Any:
+    """Pydantic model -> dict (other values unchanged)."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return obj
+
+
+def _entity_name(entity: Any) -> str:
+    return entity.get("name", "") if isinstance(entity, dict) else getattr(entity, "name", "")
+
+
+def _entity_description(entity: Any) -> str:
+    return entity.get("description", "") if isinstance(entity, dict) else getattr(entity, "description", "")
+
+
+def _attribute_names(attrs: Any) -> list:
+    return [a.get("name") if isinstance(a, dict) else getattr(a, "name", "") for a in attrs]
+
+
+def _entity_results_by_name(result: Any) -> Dict[str, Any]:
+    """Per-entity results of a batch step (dict keyed by entity, or list of results with entity_name)."""
+    result = _as_dict(result) or {}
+    entity_results = result.get("entity_results", {})
+    if isinstance(entity_results, list):
+        return {
+            r.get("entity_name", ""): r
+            for r in (_as_dict(item) for item in entity_results)
+            if isinstance(r, dict)
+        }
+    return {name: _as_dict(r) for name, r in entity_results.items()}
+
+
+def _data_types_by_key(result: Any) -> Dict[str, Dict[str, Any]]:
+    """Type assignments of a Phase 5 batch step as "Entity.attribute" -> type info."""
+    result = _as_dict(result) or {}
+    data_types = result.get("data_types", {})
+    if isinstance(data_types, list):
+        return {
+            a["attribute_key"]: a.get("type_info", {})
+            for a in (_as_dict(item) for item in data_types)
+            if isinstance(a, dict) and a.get("attribute_key")
+        }
+    return dict(data_types)
+
+
 class NL2DataService:
     """Wraps NL2DATA pipeline for checkpoint-based execution via HTTP."""
     
@@ -111,8 +157,8 @@ class NL2DataService:
                         logger.info("-" * 80)
                         logger.info(f"STEP UPDATE #{state_update_count}: Phase {phase} Step {step}")
 
-                        # Update job state
-                        job_manager.update_job_state(job_id, phase_last_state)
+                        # Progress only: the full state is persisted at checkpoints/completion,
+                        # not serialized and written on every step
                         job_manager.update_job(job_id, phase=phase, step=step)
                         last_state_for_step = phase_last_state
                         last_phase = phase
@@ -149,7 +195,6 @@ class NL2DataService:
                         logger.info("-" * 80)
                         logger.info(f"STEP UPDATE #{state_update_count}: Phase {phase} Step {step} (node: {node_name})")
 
-                        job_manager.update_job_state(job_id, state)
                         job_manager.update_job(job_id, phase=phase, step=step)
                         last_state_for_step = state
                         last_phase = phase
@@ -431,16 +476,31 @@ class NL2DataService:
                         for a in attrs
                     ]
                 
+                # Only entities whose inputs changed since the last run are recomputed
+                def pk_inputs() -> Dict[str, Any]:
+                    return {
+                        _entity_name(e): {
+                            "description": _entity_description(e),
+                            "attributes": _attribute_names(attributes.get(_entity_name(e), [])),
+                            "domain": state.get("domain"),
+                        }
+                        for e in entities
+                    }
+                
+                tracker = ArtifactTracker(state)
+                previous_primary_keys = state.get("primary_keys", {})
+                reused, stale = tracker.split("2.7", pk_inputs(), previous_primary_keys)
+                primary_keys_dict = {name: previous_primary_keys[name] for name in reused}
+                
                 result_2_7 = await step_2_7_primary_key_identification_batch(
-                    entities=entities,
+                    entities=[e for e in entities if _entity_name(e) in stale],
                     entity_attributes=entity_attributes,
                     nl_description=nl_description,
                     domain=state.get("domain")
                 )
                 
                 # Convert results to the format expected by state
-                entity_results = result_2_7.get("entity_results", {})
-                primary_keys_dict = {}
+                entity_results = _entity_results_by_name(result_2_7)
                 for entity_name, entity_result in entity_results.items():
                     pk = entity_result.get("primary_key", [])
                     if pk:
@@ -471,6 +531,9 @@ class NL2DataService:
                             attributes[ent_name] = attrs_obj_list
                             logger.info(f"Added surrogate key '{pk_attr}' to attributes for entity '{ent_name}'")
                 
+                # Record after surrogate keys were added: an unchanged entity then matches on the next run
+                tracker.record("2.7", pk_inputs())
+                
                 # Update state with both primary keys AND updated attributes
                 state["primary_keys"] = primary_keys_dict
                 state["attributes"] = attributes
@@ -976,17 +1039,48 @@ class NL2DataService:
                     if entity_name:
                         entity_descriptions[entity_name] = entity_desc
                 
+                # Types of entities whose inputs are unchanged since the last run are reused
+                tracker = ArtifactTracker(state)
+                previous_types = {
+                    entity_name: entity_types.get("attribute_types", {})
+                    for entity_name, entity_types in state.get("data_types", {}).items()
+                    if isinstance(entity_types, dict)
+                }
+                
+                def entity_slice(entity_name: str, attribute_refs) -> Dict[str, Any]:
+                    return {
+                        "description": entity_descriptions.get(entity_name, ""),
+                        "attributes": attributes.get(entity_name, []),
+                        "primary_key": primary_keys.get(entity_name, []),
+                        "typed_attributes": sorted(a for e, a in attribute_refs if e == entity_name),
+                        "domain": domain,
+                    }
+                
+                def reusable_types(reused_entities, attribute_refs) -> Dict[str, Any]:
+                    return {
+                        f"{e}.{a}": previous_types[e][a]
+                        for e, a in attribute_refs
+                        if e in reused_entities and a in previous_types.get(e, {})
+                    }
+                
+                types_5_2_inputs = {name: entity_slice(name, independent_attributes) for name in entity_descriptions}
+                reused_5_2, _ = tracker.split("5.2", types_5_2_inputs, previous_types)
+                reused_independent = reusable_types(reused_5_2, independent_attributes)
+                
                 # Step 5.2: Assign types to independent attributes
                 logger.info("Executing Step 5.2: Independent Attribute Data Types...")
                 result_5_2 = await step_5_2_independent_attribute_data_types_batch(
-                    independent_attributes=independent_attributes,
+                    independent_attributes=[
+                        (e, a) for e, a in independent_attributes if f"{e}.{a}" not in reused_independent
+                    ],
                     attributes=attributes,
                     primary_keys=primary_keys,
                     domain=domain,
                     entity_descriptions=entity_descriptions,
                     nl_description=nl_description,
+                    categorical_attributes=state.get("categorical_attributes") or None,
                 )
-                independent_types = result_5_2.get("data_types", {})
+                independent_types = {**reused_independent, **_data_types_by_key(result_5_2)}
                 state["previous_answers"]["5.2"] = result_5_2
                 
                 # Step 5.3: Derive FK types from PK types
@@ -1003,7 +1097,26 @@ class NL2DataService:
                 fk_keys = set(fk_dependencies.keys())
                 non_fk_dependent = [(e, a) for e, a in dependent_attributes if f"{e}.{a}" not in fk_keys]
                 
-                dependent_types = {}
+                # A dependent type also depends on the types of the attributes it depends on
+                known_types = {**independent_types, **fk_types}
+                types_5_4_inputs = {}
+                for name in entity_descriptions:
+                    entity_inputs = entity_slice(name, non_fk_dependent)
+                    dependency_keys = [
+                        f"{name}.{a}" for a in entity_inputs["typed_attributes"]
+                    ]
+                    entity_inputs["dependencies"] = {
+                        key: {dep: known_types.get(dep) for dep in dependency_graph.get(key, [])}
+                        for key in dependency_keys
+                    }
+                    entity_inputs["derived_formulas"] = {
+                        key: derived_formulas.get(key) for key in dependency_keys if key in derived_formulas
+                    }
+                    types_5_4_inputs[name] = entity_inputs
+                reused_5_4, _ = tracker.split("5.4", types_5_4_inputs, previous_types)
+                dependent_types = reusable_types(reused_5_4, non_fk_dependent)
+                non_fk_dependent = [(e, a) for e, a in non_fk_dependent if f"{e}.{a}" not in dependent_types]
+                
                 if non_fk_dependent:
                     logger.info("Executing Step 5.4: Dependent Attribute Data Types...")
                     result_5_4 = await step_5_4_dependent_attribute_data_types_batch(
@@ -1018,9 +1131,12 @@ class NL2DataService:
                         derived_formulas=derived_formulas if derived_formulas else None,
                         domain=domain,
                         nl_description=nl_description,
+                        categorical_attributes=state.get("categorical_attributes") or None,
                     )
-                    dependent_types = result_5_4.get("data_types", {})
+                    dependent_types.update(_data_types_by_key(result_5_4))
                     state["previous_answers"]["5.4"] = result_5_4
+                tracker.record("5.2", types_5_2_inputs)
+                tracker.record("5.4", types_5_4_inputs)
                 
                 # Combine all type assignments
                 all_data_types = {**independent_types, **fk_types, **dependent_types}
@@ -1216,31 +1332,47 @@ class NL2DataService:
                 data_types = state.get("data_types", {})
                 relational_schema = state.get("relational_schema", {})
                 
-                # Step 8.2: Categorical Column Identification
-                logger.info("Executing Step 8.2: Categorical Column Identification...")
-                result_8_2 = await step_8_2_categorical_column_identification_batch(
-                    entities=entities,
-                    entity_attributes=attributes,
-                    entity_attribute_types=data_types,
-                    relational_schema=relational_schema,
-                    nl_description=nl_description,
-                    domain=state.get("domain")
-                )
+                # Entities whose attributes and types are unchanged since the last run keep their result
+                tracker = ArtifactTracker(state)
+                categorical_inputs = {
+                    _entity_name(e): {
+                        "description": _entity_description(e),
+                        "attributes": attributes.get(_entity_name(e), []),
+                        "data_types": data_types.get(_entity_name(e), {}),
+                        "domain": state.get("domain"),
+                    }
+                    for e in entities
+                }
+                previous_categorical = state.get("categorical_attributes", {})
+                reused, stale = tracker.split("8.2", categorical_inputs, previous_categorical)
+                categorical_attributes = {name: previous_categorical[name] for name in reused}
                 
-                # Extract categorical attributes from result
-                categorical_attributes = {}
-                if hasattr(result_8_2, "entity_results"):
-                    entity_results_8_2 = result_8_2.entity_results
-                else:
-                    entity_results_8_2 = result_8_2.get("entity_results", {})
-                for entity_name, cat_result in entity_results_8_2.items():
-                    if hasattr(cat_result, "categorical_attributes"):
-                        categorical_attributes[entity_name] = cat_result.categorical_attributes
+                # Step 8.2: Categorical Column Identification
+                state["previous_answers"] = state.get("previous_answers", {})
+                if stale:
+                    logger.info("Executing Step 8.2: Categorical Column Identification...")
+                    result_8_2 = await step_8_2_categorical_column_identification_batch(
+                        entities=[e for e in entities if _entity_name(e) in stale],
+                        entity_attributes=attributes,
+                        entity_attribute_types=data_types,
+                        relational_schema=relational_schema,
+                        nl_description=nl_description,
+                        domain=state.get("domain")
+                    )
+                    
+                    # Extract categorical attributes from result
+                    if hasattr(result_8_2, "entity_results"):
+                        entity_results_8_2 = result_8_2.entity_results
                     else:
-                        categorical_attributes[entity_name] = cat_result.get("categorical_attributes", [])
+                        entity_results_8_2 = result_8_2.get("entity_results", {})
+                    for entity_name, cat_result in entity_results_8_2.items():
+                        if hasattr(cat_result, "categorical_attributes"):
+                            categorical_attributes[entity_name] = cat_result.categorical_attributes
+                        else:
+                            categorical_attributes[entity_name] = cat_result.get("categorical_attributes", [])
+                    state["previous_answers"]["8.2"] = result_8_2
+                tracker.record("8.2", categorical_inputs)
                 
-                state["previous_answers"] = state.get("previous_answers", {})
-                state["previous_answers"]["8.2"] = result_8_2
                 state["categorical_attributes"] = categorical_attributes
                 
                 logger.info(f"Step 8.2 completed: Identified categorical attributes for {len(categorical_attributes)} entities")
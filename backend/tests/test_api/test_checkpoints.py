@@ -0,0 +1,109 @@
+"""Tests for checkpoint endpoints."""
+
+import pytest
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.utils.job_manager import JobManager
+from backend.utils.checkpoint_runner import CheckpointRunner
+from backend.dependencies import get_job_manager, get_nl2data_service, get_checkpoint_runner
+
+
+JOB_ID = "12345678-1234-4abc-8def-123456789abc"
+
+
+class FakeNL2DataService:
+    """Moves the job to the requested checkpoint without running the pipeline."""
+
+    async def execute_to_checkpoint(self, job_id, nl_description, checkpoint_type, job_manager, current_state=None):
+        state = {**(current_state or {}), "entities": [{"name": "Customer"}]}
+        job_manager.update_job(job_id, status=f"checkpoint_{checkpoint_type}", state=state)
+        return state
+
+
+@pytest.fixture
+def checkpoint_client():
+    """Client with a fresh job manager, runner and a fake pipeline service."""
+    job_manager = JobManager()
+    runner = CheckpointRunner(job_manager)
+    app.dependency_overrides[get_job_manager] = lambda: job_manager
+    app.dependency_overrides[get_checkpoint_runner] = lambda: runner
+    app.dependency_overrides[get_nl2data_service] = lambda: FakeNL2DataService()
+    try:
+        with TestClient(app) as client:
+            yield client, job_manager
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_proceed_returns_202_and_runs_in_background(checkpoint_client):
+    """Test that proceed is accepted immediately and the checkpoint becomes ready."""
+    client, job_manager = checkpoint_client
+    job_manager.create_job(JOB_ID, "A shop with customers", status="checkpoint_domain")
+
+    response = client.post("/api/checkpoint/proceed", json={"job_id": JOB_ID})
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == "accepted"
+    assert data["next_checkpoint"] == "entities"
+
+    for _ in range(50):
+        response = client.get(f"/api/checkpoint/{JOB_ID}")
+        if response.status_code != 202:
+            break
+    assert response.status_code == 200
+    assert response.json()["checkpoint_type"] == "entities"
+
+
+def test_proceed_from_unknown_status(checkpoint_client):
+    """Test that proceeding from a non-checkpoint status is rejected."""
+    client, job_manager = checkpoint_client
+    job_manager.create_job(JOB_ID, "A shop with customers", status="failed")
+
+    response = client.post("/api/checkpoint/proceed", json={"job_id": JOB_ID})
+    assert response.status_code == 400
+
+
+def test_proceed_after_last_checkpoint(checkpoint_client):
+    """Test that the last checkpoint completes without enqueuing a run."""
+    client, job_manager = checkpoint_client
+    job_manager.create_job(JOB_ID, "A shop with customers", status="checkpoint_generation_strategies")
+
+    response = client.post("/api/checkpoint/proceed", json={"job_id": JOB_ID})
+    assert response.status_code == 200
+    assert response.json()["next_checkpoint"] == "complete"
+
+
+def test_edit_at_earlier_checkpoint_rewinds_job(checkpoint_client):
+    """Test that an attributes edit on a job further along rewinds it to the attributes checkpoint."""
+    client, job_manager = checkpoint_client
+    job_manager.create_job(JOB_ID, "A shop with customers", status="checkpoint_er_diagram")
+    job_manager.update_job_state(JOB_ID, {
+        "attributes": {"Customer": [{"name": "customer_id"}]},
+        "primary_keys": {"Customer": ["customer_id"]},
+        "er_design": {"entities": [{"name": "Customer"}]},
+    })
+
+    response = client.post("/api/checkpoint/attributes/save", json={
+        "job_id": JOB_ID,
+        "attributes": {"Customer": [{"name": "customer_id"}, {"name": "email"}]},
+    })
+    assert response.status_code == 200
+
+    job = job_manager.get_job(JOB_ID)
+    assert job["status"] == "checkpoint_attributes"
+    assert len(job["state"]["attributes"]["Customer"]) == 2
+    # Per-entity results are kept for reuse, compiled ER design is rebuilt
+    assert job["state"]["primary_keys"] == {"Customer": ["customer_id"]}
+    assert "er_design" not in job["state"]
+
+
+def test_edit_before_checkpoint_is_rejected(checkpoint_client):
+    """Test that a checkpoint the job has not reached yet cannot be edited."""
+    client, job_manager = checkpoint_client
+    job_manager.create_job(JOB_ID, "A shop with customers", status="checkpoint_relations")
+
+    response = client.post("/api/checkpoint/primary_keys/save", json={
+        "job_id": JOB_ID,
+        "primary_keys": {"Customer": ["customer_id"]},
+    })
+    assert response.status_code == 400
@@ -0,0 +1,49 @@
+"""Tests for ArtifactTracker."""
+
+from backend.utils.artifact_tracker import ArtifactTracker
+
+
+def _inputs(customer_attrs):
+    return {
+        "Customer": {"attributes": customer_attrs, "domain": "retail"},
+        "Order": {"attributes": ["order_id", "order_date"], "domain": "retail"},
+    }
+
+
+def test_first_run_recomputes_everything():
+    """Test that entities without recorded inputs are recomputed."""
+    tracker = ArtifactTracker({})
+    reused, stale = tracker.split("2.7", _inputs(["customer_id"]), {})
+    assert reused == []
+    assert stale == ["Customer", "Order"]
+
+
+def test_only_changed_entities_are_recomputed():
+    """Test that an edit to one entity invalidates only that entity."""
+    state = {}
+    tracker = ArtifactTracker(state)
+    tracker.record("2.7", _inputs(["customer_id"]))
+    outputs = {"Customer": ["customer_id"], "Order": ["order_id"]}
+    
+    # Fingerprints persist in the job state
+    tracker = ArtifactTracker(state)
+    reused, stale = tracker.split("2.7", _inputs(["customer_id", "email"]), outputs)
+    
+    assert reused == ["Order"]
+    assert stale == ["Customer"]
+    assert "2.7" in state["artifact_inputs"]
+
+
+def test_missing_output_is_recomputed():
+    """Test that an entity is recomputed when its output is no longer in the state."""
+    tracker = ArtifactTracker({})
+    tracker.record("2.7", _inputs(["customer_id"]))
+    reused, stale = tracker.split("2.7", _inputs(["customer_id"]), {"Customer": ["customer_id"]})
+    assert reused == ["Customer"]
+    assert stale == ["Order"]
+
+
+def test_fingerprint_ignores_key_order():
+    """Test that fingerprints are stable under dict key order."""
+    assert ArtifactTracker.fingerprint({"a": 1, "b": [1, 2]}) == ArtifactTracker.fingerprint({"b": [1, 2], "a": 1})
+    assert ArtifactTracker.fingerprint({"a": 1}) != ArtifactTracker.fingerprint({"a": 2})
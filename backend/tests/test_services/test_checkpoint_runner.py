@@ -0,0 +1,132 @@
+"""Tests for CheckpointRunner."""
+
+import asyncio
+
+import pytest
+from backend.utils.checkpoint_runner import CheckpointRunner
+
+
+class RecordingWebSocketManager:
+    """Collects checkpoint status events instead of sending them."""
+
+    def __init__(self):
+        self.events = []
+
+    async def send_checkpoint_status(self, job_id, checkpoint, status, message, level="info"):
+        self.events.append((job_id, checkpoint, status))
+
+
+@pytest.mark.asyncio
+async def test_runs_are_bounded_by_pool_size(job_manager):
+    """Test that at most max_concurrent runs execute at a time."""
+    runner = CheckpointRunner(job_manager, max_concurrent=2)
+    active = 0
+    peak = 0
+
+    async def run():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    job_ids = [f"job-{i}" for i in range(5)]
+    for job_id in job_ids:
+        job_manager.create_job(job_id, "description")
+        assert runner.submit(job_id, "entities", run)
+    for job_id in job_ids:
+        await runner.wait(job_id)
+
+    assert peak == 2
+    assert not any(runner.is_running(job_id) for job_id in job_ids)
+
+
+@pytest.mark.asyncio
+async def test_duplicate_proceed_is_coalesced(job_manager):
+    """Test that a second submit for a busy job does not start another run."""
+    runner = CheckpointRunner(job_manager)
+    job_id = "test-job"
+    job_manager.create_job(job_id, "description")
+    release = asyncio.Event()
+    calls = []
+
+    async def run():
+        calls.append(1)
+        await release.wait()
+
+    assert runner.submit(job_id, "entities", run)
+    assert job_manager.get_job(job_id)["status"] == "queued"
+    assert not runner.submit(job_id, "entities", run)
+    assert runner.target_of(job_id) == "entities"
+
+    release.set()
+    await runner.wait(job_id)
+    assert calls == [1]
+    assert runner.target_of(job_id) is None
+    # A proceed after the run finished starts a new run
+    assert runner.submit(job_id, "relations", run)
+    await runner.wait(job_id)
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_progress_events(job_manager):
+    """Test queued/running/ready events for a successful run."""
+    ws = RecordingWebSocketManager()
+    runner = CheckpointRunner(job_manager, ws_manager=ws)
+    job_id = "test-job"
+    job_manager.create_job(job_id, "description")
+
+    async def run():
+        job_manager.update_job(job_id, status="checkpoint_entities")
+
+    runner.submit(job_id, "entities", run)
+    await runner.wait(job_id)
+
+    assert [status for _, _, status in ws.events] == ["queued", "running", "ready"]
+    assert job_manager.get_job(job_id)["status"] == "checkpoint_entities"
+
+
+@pytest.mark.asyncio
+async def test_failed_run_marks_job_failed(job_manager):
+    """Test that an exception in the run fails the job and is reported."""
+    ws = RecordingWebSocketManager()
+    runner = CheckpointRunner(job_manager, ws_manager=ws)
+    job_id = "test-job"
+    job_manager.create_job(job_id, "description")
+
+    async def run():
+        raise ValueError("no entities found")
+
+    runner.submit(job_id, "relations", run)
+    await runner.wait(job_id)
+
+    job = job_manager.get_job(job_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "no entities found"
+    assert ws.events[-1] == (job_id, "relations", "failed")
+
+
+@pytest.mark.asyncio
+async def test_cancelled_run_resets_job_to_last_checkpoint(job_manager):
+    """Test that a cancelled run does not leave the job in progress forever."""
+    runner = CheckpointRunner(job_manager)
+    job_id = "test-job"
+    job_manager.create_job(job_id, "description")
+    job_manager.update_job(job_id, status="checkpoint_entities", state={"entities": ["Customer"]})
+    started = asyncio.Event()
+
+    async def run():
+        job_manager.update_job(job_id, status="in_progress", state={"entities": ["Customer", "Order"]})
+        started.set()
+        await asyncio.Event().wait()
+
+    runner.submit(job_id, "relations", run)
+    await started.wait()
+    runner._runs[job_id].cancel()
+    await runner.wait(job_id)
+
+    job = job_manager.get_job(job_id)
+    assert job["status"] == "checkpoint_entities"
+    assert job["state"] == {"entities": ["Customer"]}
+    assert not job_manager.is_run_active(job_id)
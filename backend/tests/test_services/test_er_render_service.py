@@ -0,0 +1,105 @@
+"""Tests for ERRenderService."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+from backend.services.er_render_service import ERRenderService
+
+
+class FakeGraph:
+    """Stands in for a graphviz.Digraph (no `dot` binary needed); counts renders."""
+
+    def __init__(self, source, delay=0.0):
+        self.source = source
+        self.delay = delay
+        self.renders = 0
+        self.threads = set()
+
+    def pipe(self, format):
+        self.renders += 1
+        self.threads.add(threading.get_ident())
+        if self.delay:
+            threading.Event().wait(self.delay)
+        return f"{format}:{self.source}".encode("utf-8")
+
+
+@pytest.mark.asyncio
+async def test_render_is_cached_by_source_and_format():
+    """Test that unchanged diagrams are rendered once per format."""
+    service = ERRenderService()
+    graph = FakeGraph("digraph { A -> B }")
+
+    first = await service.render(graph, format="svg")
+    second = await service.render(FakeGraph("digraph { A -> B }"), format="svg")
+    png = await service.render(graph, format="png")
+
+    assert first == second == b"svg:digraph { A -> B }"
+    assert png == b"png:digraph { A -> B }"
+    assert graph.renders == 2
+
+
+@pytest.mark.asyncio
+async def test_render_runs_off_the_event_loop():
+    """Test that dot runs on the worker pool, not the event loop thread."""
+    service = ERRenderService()
+    graph = FakeGraph("digraph { A }")
+
+    await service.render(graph)
+
+    assert threading.get_ident() not in graph.threads
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_render():
+    """Test that concurrent requests for the same diagram are deduplicated."""
+    service = ERRenderService()
+    graph = FakeGraph("digraph { A -> B }", delay=0.05)
+
+    results = await asyncio.gather(*(service.render(graph) for _ in range(5)))
+
+    assert len(set(results)) == 1
+    assert graph.renders == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_survives_restart(tmp_path):
+    """Test that renders are served from the disk cache by a new service instance."""
+    await ERRenderService(cache_dir=str(tmp_path)).render(FakeGraph("digraph { A }"))
+
+    graph = FakeGraph("digraph { A }")
+    data = await ERRenderService(cache_dir=str(tmp_path)).render(graph)
+
+    assert data == b"svg:digraph { A }"
+    assert graph.renders == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_is_bounded():
+    """Test LRU eviction from the memory cache."""
+    service = ERRenderService(max_memory_entries=2)
+    graphs = [FakeGraph(f"digraph {{ N{i} }}") for i in range(3)]
+
+    for graph in graphs:
+        await service.render(graph)
+    await service.render(graphs[0])
+
+    assert graphs[0].renders == 2
+    assert len(service._memory) == 2
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_is_bounded(tmp_path):
+    """Test that the disk cache evicts least recently used renders past its entry limit."""
+    service = ERRenderService(cache_dir=str(tmp_path), max_memory_entries=1, max_disk_entries=5)
+    graphs = [FakeGraph(f"digraph {{ N{i} }}") for i in range(6)]
+
+    paths = [tmp_path / f"{service.render_key(graph, 'svg')}.svg" for graph in graphs]
+    for i, graph in enumerate(graphs[:5]):
+        await service.render(graph)
+        os.utime(paths[i], (i, i))  # graphs[0] is the least recently used
+    await service.render(graphs[5])
+
+    # Over the limit: swept down to 80% of it, oldest first
+    assert sorted(tmp_path.iterdir()) == sorted(paths[2:])
@@ -79,4 +79,118 @@ def test_multiple_jobs():
     assert job1["job_id"] != job2["job_id"]
 
 
+def test_jobs_persist_across_managers(tmp_path):
+    """Test that jobs survive a restart and are shared between managers (workers)."""
+    db_path = str(tmp_path / "jobs.sqlite3")
+    worker1 = JobManager(db_path=db_path)
+    worker2 = JobManager(db_path=db_path)
+    
+    worker1.create_job("job-1", "Description 1")
+    worker1.update_job("job-1", status="checkpoint_entities", state={"entities": [{"name": "Customer"}]})
+    assert worker2.get_job("job-1")["status"] == "checkpoint_entities"
+    
+    # A cached job is refreshed after another worker updated it
+    worker2.update_job("job-1", status="in_progress")
+    assert worker1.get_job("job-1")["status"] == "in_progress"
+    
+    worker1.close()
+    worker2.close()
+    restarted = JobManager(db_path=db_path)
+    job = restarted.get_job("job-1")
+    assert job["state"] == {"entities": [{"name": "Customer"}]}
+    assert job["status"] == "in_progress"
+
+
+def test_cold_jobs_are_evicted_and_reloaded():
+    """Test LRU eviction from memory and lazy reload on access."""
+    manager = JobManager(max_cached_jobs=2)
+    
+    for i in range(3):
+        manager.create_job(f"job-{i}", f"Description {i}")
+        manager.update_job_state(f"job-{i}", {"entities": [{"name": f"Entity{i}"}]})
+    assert manager.cached_job_count() == 2
+    
+    job = manager.get_job("job-0")
+    assert job["state"] == {"entities": [{"name": "Entity0"}]}
+    assert manager.cached_job_count() == 2
+
+
+def test_idle_jobs_expire_from_memory():
+    """Test TTL eviction of jobs not accessed recently."""
+    manager = JobManager(cache_ttl_sec=0)
+    manager.create_job("job-1", "Description")
+    
+    assert manager.cached_job_count() == 0
+    assert manager.get_job("job-1")["nl_description"] == "Description"
+
 
+def test_checkpoint_snapshots():
+    """Test that the state at each checkpoint is kept as a snapshot."""
+    manager = JobManager()
+    manager.create_job("job-1", "Description")
+    
+    manager.update_job("job-1", status="checkpoint_domain", state={"domain": "retail"})
+    manager.update_job("job-1", status="checkpoint_entities", state={"domain": "retail", "entities": ["Customer"]})
+    
+    assert manager.list_snapshots("job-1") == ["checkpoint_domain", "checkpoint_entities"]
+    assert manager.get_snapshot("job-1", "checkpoint_domain") == {"domain": "retail"}
+    assert manager.get_snapshot("job-1", "checkpoint_entities")["entities"] == ["Customer"]
+    assert manager.get_snapshot("job-1", "checkpoint_relations") is None
+    
+    # An edit at the checkpoint updates its snapshot
+    manager.update_job_state("job-1", {"domain": "retail", "entities": ["Customer", "Order"]})
+    assert manager.get_snapshot("job-1", "checkpoint_entities")["entities"] == ["Customer", "Order"]
+
+
+def test_lost_run_after_edit_and_rewind_restores_edited_state():
+    """Test that recovery restores edits and never jumps past a rewind to stale later snapshots."""
+    manager = JobManager()
+    manager.create_job("job-1", "Description")
+    manager.update_job("job-1", status="checkpoint_entities", state={"entities": ["Customer"]})
+    manager.update_job("job-1", status="checkpoint_attributes", state={"entities": ["Customer"], "attributes": {}})
+    manager.update_job("job-1", status="checkpoint_datatypes", state={"entities": ["Customer"], "data_types": {}})
+    
+    # Rewind to the attributes checkpoint for an edit, then lose the next run
+    manager.update_job("job-1", status="checkpoint_attributes")
+    manager.update_job_state("job-1", {"entities": ["Customer"], "attributes": {"Customer": ["email"]}})
+    assert manager.list_snapshots("job-1") == ["checkpoint_entities", "checkpoint_attributes"]
+    manager.update_job("job-1", status="in_progress")
+    
+    assert manager.recover_job("job-1") == "checkpoint_attributes"
+    assert manager.get_job("job-1")["state"]["attributes"] == {"Customer": ["email"]}
+
+
+def test_orphaned_runs_are_recovered_on_startup(tmp_path):
+    """Test that jobs left queued/in progress by a dead worker are reset on restart."""
+    db_path = str(tmp_path / "jobs.sqlite3")
+    worker = JobManager(db_path=db_path, lease_ttl_sec=0)
+    worker.create_job("job-1", "Description 1")
+    worker.update_job("job-1", status="checkpoint_entities", state={"entities": ["Customer"]})
+    worker.update_job("job-1", status="in_progress", state={"entities": ["Customer", "Order"]})
+    worker.create_job("job-2", "Description 2")
+    worker.update_job("job-2", status="queued")
+    assert not worker.is_run_active("job-1")
+    worker.close()
+    
+    # Restarted after the dead worker's lease ran out
+    restarted = JobManager(db_path=db_path, lease_ttl_sec=0)
+    job1 = restarted.get_job("job-1")
+    assert job1["status"] == "checkpoint_entities"
+    assert job1["state"] == {"entities": ["Customer"]}
+    job2 = restarted.get_job("job-2")
+    assert job2["status"] == "failed"
+    assert "lease expired" in job2["error"]
+
+
+def test_live_lease_is_not_recovered(tmp_path):
+    """Test that a run still renewing its lease in another worker is left alone."""
+    db_path = str(tmp_path / "jobs.sqlite3")
+    worker1 = JobManager(db_path=db_path)
+    worker1.create_job("job-1", "Description")
+    worker1.update_job("job-1", status="in_progress")
+    worker1.heartbeat("job-1")
+    
+    worker2 = JobManager(db_path=db_path)
+    assert worker2.is_run_active("job-1")
+    assert worker2.recover_orphaned_jobs() == []
+    assert worker2.get_job("job-1")["status"] == "in_progress"
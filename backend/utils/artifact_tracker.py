@@ -0,0 +1,76 @@
+"""Per-entity dependency tracking for incremental checkpoint recomputation."""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactTracker:
+    """
+    Tracks which per-entity (or per-table) step outputs in a job state are still valid.
+
+    For each step the tracker stores, per entity, a fingerprint of the inputs the
+    step's output was computed from (`state["artifact_inputs"][step][entity]`).
+    When the step runs again - e.g. after an edit at an earlier checkpoint - an
+    entity whose inputs are unchanged keeps its existing output (including user
+    edits to it) and only entities with changed inputs are recomputed. An edit
+    to one entity's attributes therefore re-runs the downstream LLM calls for
+    that entity only.
+    """
+
+    STATE_KEY = "artifact_inputs"
+
+    def __init__(self, state: Dict[str, Any]):
+        """
+        Initialize tracker.
+
+        Args:
+            state: Job state (fingerprints are stored in it, so they persist with the job)
+        """
+        self.state = state
+        self._inputs: Dict[str, Dict[str, str]] = state.setdefault(self.STATE_KEY, {})
+
+    @staticmethod
+    def fingerprint(value: Any) -> str:
+        """Stable hash of a JSON-like value (dict key order does not matter)."""
+        payload = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def split(
+        self,
+        step: str,
+        inputs: Mapping[str, Any],
+        outputs: Optional[Mapping[str, Any]] = None
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Split entities into those whose output can be reused and those to recompute.
+
+        Args:
+            step: Step identifier (e.g. "2.7")
+            inputs: Entity -> everything the step's output for that entity depends on
+            outputs: Entity -> existing output in the state (entities without one are recomputed)
+
+        Returns:
+            (reused entities, entities to recompute), both in input order
+        """
+        recorded = self._inputs.get(step, {})
+        reused, stale = [], []
+        for key, value in inputs.items():
+            if (
+                outputs is not None
+                and key in outputs
+                and recorded.get(key) == self.fingerprint(value)
+            ):
+                reused.append(key)
+            else:
+                stale.append(key)
+        if reused:
+            logger.info(f"Step {step}: reusing {len(reused)} unchanged, recomputing {len(stale)} of {len(inputs)}")
+        return reused, stale
+
+    def record(self, step: str, inputs: Mapping[str, Any]):
+        """Record the inputs the step's current outputs were computed from (replaces the step's record)."""
+        self._inputs[step] = {key: self.fingerprint(value) for key, value in inputs.items()}
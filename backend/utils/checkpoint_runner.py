@@ -0,0 +1,129 @@
+"""Background execution of checkpoint runs on a bounded worker pool."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from backend.utils.job_manager import JobManager
+from backend.utils.websocket_manager import WebSocketManager
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointRunner:
+    """
+    Runs pipeline segments (proceed to the next checkpoint) in the background.
+
+    `POST /api/checkpoint/proceed` enqueues a run and returns at once; the run
+    waits for a slot on the worker pool (at most `max_concurrent` runs execute
+    at a time), and progress goes out as `checkpoint_status` WebSocket events
+    and through the job status (GET /api/checkpoint/{job_id} answers 202 until
+    the checkpoint is ready). A proceed for a job that already has a run queued
+    or running is coalesced into that run. While a run is queued or executing
+    its lease on the job is renewed; a cancelled run resets the job to its last
+    checkpoint.
+    """
+
+    def __init__(
+        self,
+        job_manager: JobManager,
+        ws_manager: Optional[WebSocketManager] = None,
+        max_concurrent: int = 4
+    ):
+        self.job_manager = job_manager
+        self.ws_manager = ws_manager
+        self.max_concurrent = max(1, max_concurrent)
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._runs: Dict[str, asyncio.Task] = {}
+        self._targets: Dict[str, str] = {}
+
+    def is_running(self, job_id: str) -> bool:
+        """Whether a run for the job is queued or executing."""
+        task = self._runs.get(job_id)
+        return task is not None and not task.done()
+
+    def target_of(self, job_id: str) -> Optional[str]:
+        """Checkpoint the job's active run is heading to (None if idle)."""
+        return self._targets.get(job_id) if self.is_running(job_id) else None
+
+    def submit(
+        self,
+        job_id: str,
+        checkpoint_type: str,
+        run: Callable[[], Awaitable[Any]]
+    ) -> bool:
+        """
+        Enqueue a run for a job (must be called from the event loop).
+
+        Args:
+            job_id: Job identifier
+            checkpoint_type: Checkpoint the run executes to
+            run: Coroutine factory executing the pipeline segment
+
+        Returns:
+            True if a new run was enqueued, False if coalesced into the active run
+        """
+        if self.is_running(job_id):
+            logger.info(f"Job {job_id}: proceed coalesced into active run to '{self._targets.get(job_id)}'")
+            return False
+
+        self.job_manager.update_job(job_id, status="queued")
+        self._targets[job_id] = checkpoint_type
+        self._runs[job_id] = asyncio.create_task(self._execute(job_id, checkpoint_type, run))
+        logger.info(f"Job {job_id}: run to checkpoint '{checkpoint_type}' queued")
+        return True
+
+    async def wait(self, job_id: str) -> None:
+        """Wait for the job's active run (if any) to finish."""
+        task = self._runs.get(job_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _execute(
+        self,
+        job_id: str,
+        checkpoint_type: str,
+        run: Callable[[], Awaitable[Any]]
+    ) -> None:
+        await self._notify(job_id, checkpoint_type, "queued", f"Waiting to run to checkpoint '{checkpoint_type}'")
+        try:
+            async with self.job_manager.lease(job_id), self._slots:
+                await self._notify(job_id, checkpoint_type, "running", f"Running to checkpoint '{checkpoint_type}'")
+                await run()
+        except asyncio.CancelledError:
+            # Do not leave the job queued/in progress without a run
+            logger.warning(f"Job {job_id}: run to checkpoint '{checkpoint_type}' cancelled")
+            self.job_manager.recover_job(job_id, reason="run cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Job {job_id}: run to checkpoint '{checkpoint_type}' failed: {e}", exc_info=True)
+            job = self.job_manager.get_job(job_id) or {}
+            if job.get("status") != "failed":
+                self.job_manager.update_job(job_id, status="failed", error=str(e))
+            await self._notify(job_id, checkpoint_type, "failed", f"Failed to proceed: {e}", level="error")
+        else:
+            await self._notify(job_id, checkpoint_type, "ready", f"Checkpoint '{checkpoint_type}' is ready")
+        finally:
+            self._targets.pop(job_id, None)
+
+    async def _notify(
+        self,
+        job_id: str,
+        checkpoint_type: str,
+        run_status: str,
+        message: str,
+        level: str = "info"
+    ) -> None:
+        if self.ws_manager is None:
+            return
+        try:
+            await self.ws_manager.send_checkpoint_status(
+                job_id=job_id,
+                checkpoint=checkpoint_type,
+                status=run_status,
+                message=message,
+                level=level
+            )
+        except Exception as e:
+            # Progress events are best effort; never fail the run on them
+            logger.warning(f"Job {job_id}: could not send checkpoint status event: {e}")
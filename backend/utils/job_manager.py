@@ -1,16 +1,131 @@
 """Job state and lifecycle management."""
 
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional, List
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime, UTC
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
 import uuid
+import zlib
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    nl_description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    phase INTEGER,
+    step TEXT,
+    progress REAL NOT NULL DEFAULT 0.0,
+    error TEXT,
+    state BLOB,
+    version INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    heartbeat_at REAL
+);
+CREATE TABLE IF NOT EXISTS job_snapshots (
+    job_id TEXT NOT NULL,
+    checkpoint TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    state BLOB NOT NULL,
+    PRIMARY KEY (job_id, checkpoint)
+);
+"""
+
+_FIELDS = ("nl_description", "status", "created_at", "phase", "step", "progress", "error")
+
+# Statuses of a job with a run queued or executing; such a job is leased by the worker running it
+ACTIVE_STATUSES = ("queued", "in_progress")
+
+
+def _is_checkpoint(status: Optional[str]) -> bool:
+    """Whether a status is one the job's state is snapshotted at."""
+    return bool(status) and (status.startswith("checkpoint_") or status == "completed")
+
+
+def _json_default(obj: Any) -> Any:
+    """JSON fallback for non-JSON values in pipeline state (pydantic models, sets, datetimes)."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _compress_state(state: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(state, default=_json_default).encode("utf-8"))
+
+
+def _decompress_state(blob: Optional[bytes]) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob).decode("utf-8")) if blob else {}
 
 
 class JobManager:
-    """Manages job state and lifecycle."""
-    
-    def __init__(self):
-        self.jobs: Dict[str, Dict[str, Any]] = {}
-    
+    """
+    Manages job state and lifecycle.
+
+    Jobs are stored in SQLite (WAL mode, so several API workers can share one
+    database file); every update is written through. Job states are stored as
+    zlib-compressed JSON, and the state at each checkpoint is kept as a
+    snapshot (updated by edits at the checkpoint; a rewind to an earlier
+    checkpoint drops the snapshots after it). Only recently used jobs are held in memory: a job is evicted when
+    it has not been accessed for `cache_ttl_sec` or when more than
+    `max_cached_jobs` jobs are cached (least recently used first), and is
+    reloaded from the database on the next access. A cached job is also
+    reloaded when another worker has updated it since.
+
+    A queued or in-progress job is leased by the worker running it (`owner`
+    plus `heartbeat_at`, refreshed on every update and by `heartbeat()`). A job
+    whose lease has expired - its worker died or its run was lost - is reset to
+    its last checkpoint snapshot (or marked failed if it has none) by
+    `recover_job()`; on startup all such jobs are recovered.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        max_cached_jobs: int = 64,
+        cache_ttl_sec: float = 900.0,
+        lease_ttl_sec: float = 60.0
+    ):
+        """
+        Initialize job manager.
+
+        Args:
+            db_path: SQLite database file (":memory:" for a process-local store)
+            max_cached_jobs: Maximum number of jobs held in memory
+            cache_ttl_sec: Evict jobs from memory after this many seconds without access
+            lease_ttl_sec: A run's lease on its job expires this many seconds after the last heartbeat
+        """
+        self.db_path = db_path
+        self.max_cached_jobs = max(1, max_cached_jobs)
+        self.cache_ttl_sec = cache_ttl_sec
+        self.lease_ttl_sec = lease_ttl_sec
+        self.worker_id = uuid.uuid4().hex
+        # job_id -> (job, version, last access time), least recently used first
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30.0, isolation_level=None)
+        if db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, sql_type in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+            if column not in columns:
+                # Job stores created before run leases were introduced
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {sql_type}")
+        self.recover_orphaned_jobs()
+
     def create_job(
         self,
         job_id: str,
@@ -18,7 +133,7 @@ class JobManager:
         status: str = "pending"
     ):
         """Create a new job."""
-        self.jobs[job_id] = {
+        job = {
             "job_id": job_id,
             "nl_description": nl_description,
             "status": status,
@@ -28,11 +143,20 @@ class JobManager:
             "step": None,
             "progress": 0.0
         }
-    
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, nl_description, status, created_at, progress, state, version) "
+                "VALUES (?, ?, ?, ?, ?, NULL, 1)",
+                (job_id, nl_description, status, job["created_at"], 0.0)
+            )
+            self._conn.execute("DELETE FROM job_snapshots WHERE job_id = ?", (job_id,))
+            self._cache_put(job_id, job, 1)
+
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get job by ID."""
-        return self.jobs.get(job_id)
-    
+        with self._lock:
+            return self._load(job_id)
+
     def update_job(
         self,
         job_id: str,
@@ -44,26 +168,238 @@ class JobManager:
         error: Optional[str] = None
     ):
         """Update job fields."""
-        if job_id not in self.jobs:
-            return
-        
-        if status:
-            self.jobs[job_id]["status"] = status
-        if phase is not None:
-            self.jobs[job_id]["phase"] = phase
-        if step:
-            self.jobs[job_id]["step"] = step
-        if progress is not None:
-            self.jobs[job_id]["progress"] = progress
-        if state:
-            self.jobs[job_id]["state"] = state
-        if error:
-            self.jobs[job_id]["error"] = error
-    
+        with self._lock:
+            job = self._load(job_id)
+            if job is None:
+                return
+
+            # Reaching a checkpoint (or rewinding to one) snapshots the state there
+            snapshot = _is_checkpoint(status) and (bool(state) or status != job["status"])
+            if status:
+                job["status"] = status
+            if phase is not None:
+                job["phase"] = phase
+            if step:
+                job["step"] = step
+            if progress is not None:
+                job["progress"] = progress
+            if state:
+                job["state"] = state
+            if error:
+                job["error"] = error
+
+            self._save(job_id, job, with_state=bool(state) or snapshot)
+            if snapshot:
+                self._save_snapshot(job_id, status, job["state"])
+
     def update_job_state(self, job_id: str, state: Dict[str, Any]):
-        """Update job state."""
-        if job_id in self.jobs:
-            self.jobs[job_id]["state"] = state
+        """Update job state (at a checkpoint, e.g. after an edit, also its snapshot)."""
+        with self._lock:
+            job = self._load(job_id)
+            if job is not None:
+                job["state"] = state
+                self._save(job_id, job, with_state=True)
+                if _is_checkpoint(job["status"]):
+                    self._save_snapshot(job_id, job["status"], state)
+
+    def get_snapshot(self, job_id: str, checkpoint: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the job state as it was when the job reached a checkpoint.
+
+        Args:
+            job_id: Job identifier
+            checkpoint: Job status at the checkpoint (e.g. "checkpoint_entities")
+
+        Returns:
+            State snapshot, or None if the job never reached the checkpoint
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM job_snapshots WHERE job_id = ? AND checkpoint = ?",
+                (job_id, checkpoint)
+            ).fetchone()
+        return _decompress_state(row[0]) if row else None
+
+    def list_snapshots(self, job_id: str) -> List[str]:
+        """Checkpoints the job has state snapshots for, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT checkpoint FROM job_snapshots WHERE job_id = ? ORDER BY rowid",
+                (job_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def heartbeat(self, job_id: str):
+        """Renew this worker's lease on a job it is running."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE job_id = ? AND owner = ?",
+                (time.time(), job_id, self.worker_id)
+            )
+
+    @asynccontextmanager
+    async def lease(self, job_id: str) -> AsyncIterator[None]:
+        """Renew this worker's lease on a job in the background while the block runs."""
+        async def renew():
+            while True:
+                await asyncio.sleep(self.lease_ttl_sec / 3)
+                self.heartbeat(job_id)
+
+        renewal = asyncio.create_task(renew())
+        try:
+            yield
+        finally:
+            renewal.cancel()
+
+    def is_run_active(self, job_id: str) -> bool:
+        """Whether the job is queued or in progress under a live lease (in any worker)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, heartbeat_at FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return row is not None and self._lease_live(*row)
+
+    def recover_job(self, job_id: str, reason: str = "run interrupted") -> Optional[str]:
+        """
+        Reset a queued or in-progress job whose run no longer exists.
+
+        The job goes back to its last checkpoint (status and state from the
+        snapshot), or is marked failed if it never reached one. Jobs that are
+        not queued or in progress are left unchanged.
+
+        Args:
+            job_id: Job identifier
+            reason: Why the run was lost (logged, and the error of a failed job)
+
+        Returns:
+            The job's status afterwards, or None if the job does not exist
+        """
+        with self._lock:
+            job = self._load(job_id)
+            if job is None:
+                return None
+            if job["status"] not in ACTIVE_STATUSES:
+                return job["status"]
+
+            row = self._conn.execute(
+                "SELECT checkpoint, state FROM job_snapshots WHERE job_id = ? "
+                "ORDER BY rowid DESC LIMIT 1",
+                (job_id,)
+            ).fetchone()
+            if row is not None:
+                job["status"] = row[0]
+                job["state"] = _decompress_state(row[1])
+                job.pop("error", None)
+                self._save(job_id, job, with_state=True)
+            else:
+                job["status"] = "failed"
+                job["error"] = f"Pipeline run lost: {reason}"
+                self._save(job_id, job, with_state=False)
+            logger.warning(f"Job {job_id}: {reason}; reset to status '{job['status']}'")
+            return job["status"]
+
+    def recover_orphaned_jobs(self) -> List[str]:
+        """Recover every queued or in-progress job whose lease has expired; returns their ids."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT job_id, status, heartbeat_at FROM jobs "
+                f"WHERE status IN ({', '.join('?' * len(ACTIVE_STATUSES))})",
+                ACTIVE_STATUSES
+            ).fetchall()
+            orphaned = [job_id for job_id, status, heartbeat_at in rows if not self._lease_live(status, heartbeat_at)]
+            for job_id in orphaned:
+                self.recover_job(job_id, reason="lease expired")
+        return orphaned
+
+    def cached_job_count(self) -> int:
+        """Number of jobs currently held in memory."""
+        with self._lock:
+            self._evict()
+            return len(self._cache)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _lease_live(self, status: str, heartbeat_at: Optional[float]) -> bool:
+        return (
+            status in ACTIVE_STATUSES
+            and heartbeat_at is not None
+            and heartbeat_at >= time.time() - self.lease_ttl_sec
+        )
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cached job, (re)loaded from the database if evicted or updated by another worker."""
+        row = self._conn.execute("SELECT version FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            self._cache.pop(job_id, None)
+            return None
+
+        cached = self._cache.get(job_id)
+        if cached is not None and cached[1] == row[0]:
+            self._cache_put(job_id, cached[0], cached[1])
+            return cached[0]
+
+        row = self._conn.execute(
+            f"SELECT {', '.join(_FIELDS)}, state, version FROM jobs WHERE job_id = ?",
+            (job_id,)
+        ).fetchone()
+        job = {"job_id": job_id, **dict(zip(_FIELDS, row[:len(_FIELDS)]))}
+        if job["error"] is None:
+            del job["error"]
+        job["state"] = _decompress_state(row[len(_FIELDS)])
+        self._cache_put(job_id, job, row[-1])
+        return job
+
+    def _save(self, job_id: str, job: Dict[str, Any], with_state: bool):
+        """Write a cached job through to the database."""
+        values = [job.get(field) for field in _FIELDS[1:]]
+        assignments = ", ".join(f"{field} = ?" for field in _FIELDS[1:])
+        # Queued/in-progress jobs are leased by this worker; any other status releases the lease
+        assignments += ", owner = ?, heartbeat_at = ?"
+        if job.get("status") in ACTIVE_STATUSES:
+            values += [self.worker_id, time.time()]
+        else:
+            values += [None, None]
+        if with_state:
+            assignments += ", state = ?"
+            values.append(_compress_state(job["state"]))
+        self._conn.execute(
+            f"UPDATE jobs SET {assignments}, version = version + 1 WHERE job_id = ?",
+            (*values, job_id)
+        )
+        version = self._conn.execute("SELECT version FROM jobs WHERE job_id = ?", (job_id,)).fetchone()[0]
+        self._cache_put(job_id, job, version)
+
+    def _save_snapshot(self, job_id: str, checkpoint: str, state: Dict[str, Any]):
+        """
+        Snapshot the state at a checkpoint.
 
+        Re-snapshotting a checkpoint (an edit there, or a rewind to it) drops the
+        snapshots of the checkpoints reached after it, which are stale now.
+        """
+        row = self._conn.execute(
+            "SELECT rowid FROM job_snapshots WHERE job_id = ? AND checkpoint = ?", (job_id, checkpoint)
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM job_snapshots WHERE job_id = ? AND rowid >= ?", (job_id, row[0]))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO job_snapshots (job_id, checkpoint, created_at, state) VALUES (?, ?, ?, ?)",
+            (job_id, checkpoint, datetime.now(UTC).isoformat(), _compress_state(state))
+        )
 
+    def _cache_put(self, job_id: str, job: Dict[str, Any], version: int):
+        self._cache[job_id] = (job, version, time.monotonic())
+        self._cache.move_to_end(job_id)
+        self._evict()
 
+    def _evict(self):
+        """Drop jobs idle for longer than the TTL, then least recently used jobs over the limit."""
+        cutoff = time.monotonic() - self.cache_ttl_sec
+        while self._cache:
+            job_id, (_, _, last_access) = next(iter(self._cache.items()))
+            if last_access >= cutoff and len(self._cache) <= self.max_cached_jobs:
+                break
+            del self._cache[job_id]
+            logger.debug(f"Evicted job {job_id} from memory")
@@ -263,3 +263,26 @@ class WebSocketManager:
         )
         await self.send_event(job_id, event.model_dump())
 
+    async def send_checkpoint_status(
+        self,
+        job_id: str,
+        checkpoint: str,
+        status: str,
+        message: str,
+        level: str = "info",
+    ):
+        """Send checkpoint status event (background checkpoint run queued/running/ready/failed)."""
+        from backend.models.websocket_events import CheckpointStatusEvent
+
+        event = CheckpointStatusEvent(
+            data={
+                "job_id": job_id,
+                "seq": 0,  # set by send_event
+                "ts": datetime.now(UTC),
+                "checkpoint": checkpoint,
+                "status": status,
+                "message": message,
+                "level": level,
+            }
+        )
+        await self.send_event(job_id, event.model_dump())
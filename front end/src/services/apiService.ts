@@ -78,6 +78,10 @@ export const apiService = {
   // Checkpoint endpoints
   async getCheckpoint(jobId: string): Promise<CheckpointResponse> {
     const response = await apiClient.get<CheckpointResponse>(`/api/checkpoint/${jobId}`);
+    if (response.status === 202) {
+      // Checkpoint run still queued or in progress (callers retry on error.response.status === 202)
+      throw Object.assign(new Error('Checkpoint not ready yet'), { response });
+    }
     return response.data;
   },
   
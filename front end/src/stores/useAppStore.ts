@@ -14,7 +14,7 @@ import type {
 } from '../types/state';
 import { apiService } from '../services/apiService';
 import { calculateQualityScore } from '../services/qualityCalculator';
-import { MAX_STATUS_TRAIL_SIZE, MAX_UNDO_STACK_SIZE } from '../utils/constants';
+import { MAX_STATUS_TRAIL_SIZE, MAX_UNDO_STACK_SIZE, CHECKPOINT_RUN_MAX_POLLS } from '../utils/constants';
 
 interface AppStore extends AppState {
   // NL Input Actions
@@ -880,6 +880,11 @@ export const useAppStore = create<AppStore>()(
             const { fetchCheckpoint } = get();
             await fetchCheckpoint(jobId);
           }
+        } else if (response.status === "accepted") {
+          // Run enqueued on the backend worker pool - poll until the next checkpoint is ready
+          console.log(`Proceeding to checkpoint in background: ${response.next_checkpoint}`);
+          const { fetchCheckpoint } = get();
+          await fetchCheckpoint(jobId, 0, CHECKPOINT_RUN_MAX_POLLS);
         } else if (response.status === "error") {
           throw new Error(response.message);
         }
@@ -316,7 +316,7 @@ export interface CheckpointResponse {
 }
 
 export interface CheckpointProceedResponse {
-  status: "success" | "error";
+  status: "accepted" | "success" | "error";
   message: string;
   next_checkpoint?: string | null;
   checkpoint_data?: Record<string, any>;
@@ -34,3 +34,8 @@ export const MAX_STATUS_TRAIL_SIZE = 300;
  */
 export const MAX_UNDO_STACK_SIZE = 5;
 
+/**
+ * Maximum checkpoint polls while a background checkpoint run is in progress (max 5s apart)
+ */
+export const CHECKPOINT_RUN_MAX_POLLS = 360;
+